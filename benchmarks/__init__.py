@@ -0,0 +1 @@
+# Benchmarks del sistema de validación de requisitos de graduación
\ No newline at end of file
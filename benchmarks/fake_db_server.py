@@ -0,0 +1,504 @@
+"""
+Base de datos de prueba con latencia y errores configurables.
+
+Sirve por TCP o por un socket Unix las dos consultas de DBConnector (un
+registro y varios registros) sobre una cohorte sintética o los datos
+simulados, con una distribución de latencia, variación, colas lentas, tasa
+de errores y un límite de consultas simultáneas como el de un pool de
+conexiones del servidor. SocketDBConnector es el conector que la consulta.
+
+El protocolo es una línea JSON por solicitud y por respuesta:
+
+    {"op": "get", "code": "20210000001"}  ->  {"data": {...}}
+    {"op": "bulk", "codes": [...]}        ->  {"data": {codigo: {...}}}
+    cualquier error                       ->  {"error": "mensaje"}
+    
+    python -m benchmarks.fake_db_server --port 7000 --latency-ms 5 --error-rate 0.01
+"""
+import argparse
+import json
+import math
+import os
+import random
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.synthetic_data import SyntheticCohort
+from src.db_connector import DBConnector
+
+DISTRIBUTIONS = ("constant", "uniform", "exponential", "lognormal")
+
+
+class LatencyModel:
+    """Distribución de la latencia y de los errores de las consultas."""
+    
+    def __init__(self, distribution="lognormal", mean=0.005, jitter=0.5, per_code=0.0,
+                 slow_rate=0.0, slow_factor=20.0, error_rate=0.0, seed=None):
+        """
+        Inicializa el modelo.
+        
+        Args:
+            distribution (str, optional): 'constant', 'uniform', 'exponential'
+                o 'lognormal'.
+            mean (float, optional): Latencia media de una consulta, en segundos.
+            jitter (float, optional): Variación relativa: desviación del
+                logaritmo en 'lognormal' y semiancho relativo en 'uniform'.
+            per_code (float, optional): Segundos adicionales por código de una
+                consulta de varios registros.
+            slow_rate (float, optional): Fracción de consultas lentas (la cola
+                de latencia: bloqueos, páginas frías, pausas del servidor).
+            slow_factor (float, optional): Cuántas veces más tardan las
+                consultas lentas.
+            error_rate (float, optional): Fracción de consultas que fallan.
+            seed (int, optional): Semilla de las muestras.
+        
+        Raises:
+            ValueError: Si la distribución no existe.
+        """
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Distribución desconocida: {distribution!r}")
+        self.distribution = distribution
+        self.mean = mean
+        self.jitter = jitter
+        self.per_code = per_code
+        self.slow_rate = slow_rate
+        self.slow_factor = slow_factor
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+    
+    def sample(self, codes=1):
+        """
+        Sortea la latencia de una consulta.
+        
+        Args:
+            codes (int, optional): Códigos de la consulta.
+        
+        Returns:
+            float: Segundos de latencia.
+        """
+        rng = self._random
+        if self.mean <= 0:
+            latency = 0.0
+        elif self.distribution == "constant":
+            latency = self.mean
+        elif self.distribution == "uniform":
+            latency = self.mean * (1 + rng.uniform(-self.jitter, self.jitter))
+        elif self.distribution == "exponential":
+            latency = rng.expovariate(1 / self.mean)
+        else:
+            # mu se ajusta para que la media de la lognormal sea self.mean
+            sigma = self.jitter
+            latency = rng.lognormvariate(math.log(self.mean) - sigma * sigma / 2, sigma)
+        latency = max(0.0, latency) + self.per_code * codes
+        if self.slow_rate and rng.random() < self.slow_rate:
+            latency *= self.slow_factor
+        return latency
+    
+    def fails(self):
+        """
+        Sortea si una consulta falla.
+        
+        Returns:
+            bool: True si la consulta debe responder con error.
+        """
+        return bool(self.error_rate) and self._random.random() < self.error_rate
+
+
+class FakeDBRequestHandler(socketserver.StreamRequestHandler):
+    """Atiende las solicitudes de una conexión, una línea JSON por solicitud."""
+    
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.server.respond(json.loads(line))
+            except Exception as error:
+                response = {"error": f"Solicitud inválida: {error}"}
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _FakeDBMixin:
+    """Atributos compartidos por los servidores TCP y de socket Unix."""
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024
+    
+    def setup_database(self, records, latency, max_concurrency):
+        """
+        Configura los registros, la latencia y el límite de consultas del servidor.
+        
+        Args:
+            records (object): Origen de los registros con get(codigo).
+            latency (LatencyModel): Latencia y errores de las consultas.
+            max_concurrency (int): Consultas atendidas a la vez, o None sin límite.
+        """
+        self.records = records
+        self.latency = latency
+        self.slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self.queries = 0
+        self.errors = 0
+        self._counter_lock = threading.Lock()
+    
+    @property
+    def address(self):
+        """str: Cadena de conexión para SocketDBConnector."""
+        if isinstance(self.server_address, tuple):
+            return f"tcp://{self.server_address[0]}:{self.server_address[1]}"
+        return f"unix://{self.server_address}"
+    
+    def _lookup(self, student_code):
+        """
+        Busca el registro de un estudiante.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            dict: Datos del estudiante, o un diccionario vacío si no existe.
+        """
+        return self.records.get(student_code) or {}
+    
+    def respond(self, request):
+        """
+        Responde una solicitud después de la latencia sorteada.
+        
+        Args:
+            request (dict): Solicitud 'get' o 'bulk'.
+        
+        Returns:
+            dict: Respuesta con 'data' o 'error'.
+        """
+        op = request.get("op")
+        if op == "get":
+            codes = [request["code"]]
+        elif op == "bulk":
+            codes = request["codes"]
+        else:
+            return {"error": f"Operación desconocida: {op!r}"}
+        
+        # Sin un cupo libre la consulta espera, como en un servidor saturado
+        if self.slots is not None:
+            self.slots.acquire()
+        try:
+            time.sleep(self.latency.sample(len(codes)))
+            failed = self.latency.fails()
+        finally:
+            if self.slots is not None:
+                self.slots.release()
+        with self._counter_lock:
+            self.queries += 1
+            self.errors += failed
+        if failed:
+            return {"error": "Error simulado de la base de datos"}
+        
+        if op == "get":
+            return {"data": self._lookup(codes[0])}
+        data = {}
+        for student_code in codes:
+            student_data = self._lookup(student_code)
+            if student_data:
+                data[student_code] = student_data
+        return {"data": data}
+
+
+class FakeDBServer(_FakeDBMixin, socketserver.ThreadingTCPServer):
+    """Base de datos de prueba sobre TCP."""
+
+
+class FakeDBUnixServer(_FakeDBMixin, socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Base de datos de prueba sobre un socket Unix."""
+    
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def create_db_server(records=None, host="127.0.0.1", port=0, unix_socket=None, latency=None,
+                     max_concurrency=None):
+    """
+    Crea la base de datos de prueba, lista para serve_forever().
+    
+    Args:
+        records (object, optional): Origen de los registros con get(codigo),
+            p. ej. una SyntheticCohort o un diccionario. Por defecto, los datos
+            simulados de src.mock_data.
+        host (str, optional): Dirección TCP donde escuchar.
+        port (int, optional): Puerto TCP; 0 elige uno libre.
+        unix_socket (str, optional): Ruta de un socket Unix. Si se indica, se
+            usa en lugar de host y port.
+        latency (LatencyModel, optional): Latencia y errores. Por defecto, sin
+            latencia ni errores.
+        max_concurrency (int, optional): Consultas atendidas a la vez; las
+            demás esperan. None es sin límite.
+    
+    Returns:
+        socketserver.BaseServer: Servidor configurado; su atributo address es
+            la cadena de conexión.
+    """
+    if records is None:
+        from src.mock_data import ESTUDIANTES_DATA
+        records = ESTUDIANTES_DATA
+    if unix_socket:
+        server = FakeDBUnixServer(unix_socket, FakeDBRequestHandler)
+    else:
+        server = FakeDBServer((host, port), FakeDBRequestHandler)
+    server.setup_database(records, latency or LatencyModel(mean=0.0), max_concurrency)
+    return server
+
+
+def serve_in_background(server):
+    """
+    Atiende un servidor en un hilo daemon.
+    
+    Args:
+        server (socketserver.BaseServer): Servidor a atender.
+    
+    Returns:
+        threading.Thread: Hilo que atiende el servidor. Para detenerlo se
+            llama server.shutdown() y server.server_close().
+    """
+    thread = threading.Thread(target=server.serve_forever, name="fake-db-server", daemon=True)
+    thread.start()
+    return thread
+
+
+class SocketDBConnector(DBConnector):
+    """Conector que consulta una base de datos de prueba por TCP o socket Unix."""
+    
+    def __init__(self, connection_string, cache=None, metrics=None, known_codes=None, coalesce=False,
+                 call_policy=None, timeout=None):
+        """
+        Inicializa el conector. Cada hilo abre su propia conexión bajo demanda.
+        
+        Args:
+            connection_string (str): 'tcp://host:puerto' o 'unix:///ruta'.
+            cache (RecordCache, optional): Caché de registros.
+            metrics (Metrics, optional): Registro de métricas de las consultas.
+            known_codes (set or BloomFilter, optional): Índice de pertenencia.
+            coalesce (bool, optional): Agrupar las consultas simultáneas.
+            call_policy (CallPolicy, optional): Plazos, reintentos e interruptor.
+            timeout (float, optional): Tiempo máximo de espera del socket, en
+                segundos. Al vencer se cierra la conexión.
+        
+        Raises:
+            ValueError: Si la cadena de conexión no es válida.
+        """
+        super().__init__(
+            connection_string, cache=cache, metrics=metrics, known_codes=known_codes,
+            coalesce=coalesce, call_policy=call_policy
+        )
+        if connection_string.startswith("unix://"):
+            self._family = socket.AF_UNIX
+            self._address = connection_string[len("unix://"):]
+        elif connection_string.startswith("tcp://"):
+            host, _, port = connection_string[len("tcp://"):].rpartition(":")
+            self._family = socket.AF_INET
+            self._address = (host, int(port))
+        else:
+            raise ValueError(f"Cadena de conexión no válida: {connection_string!r}")
+        self.timeout = timeout
+        self._local = threading.local()
+    
+    def __getstate__(self):
+        # Las conexiones pertenecen a los hilos del proceso original
+        state = self.__dict__.copy()
+        del state["_local"]
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+    
+    def _connection(self):
+        """
+        Obtiene la conexión del hilo actual, abriéndola si hace falta.
+        
+        Returns:
+            tuple: (socket, archivo de lectura).
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            sock = socket.socket(self._family, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self._address)
+            except OSError:
+                sock.close()
+                raise
+            connection = self._local.connection = (sock, sock.makefile("rb"))
+        return connection
+    
+    def _close_connection(self):
+        """Cierra la conexión del hilo actual, p. ej. tras un error de red."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            self._local.connection = None
+            connection[1].close()
+            connection[0].close()
+    
+    def _request(self, request):
+        """
+        Envía una solicitud y espera su respuesta.
+        
+        Args:
+            request (dict): Solicitud del protocolo.
+        
+        Returns:
+            object: Campo 'data' de la respuesta.
+        
+        Raises:
+            ConnectionError: Si la base de datos responde con error o cierra la conexión.
+            OSError: Si falla la red o vence el tiempo de espera.
+        """
+        sock, reader = self._connection()
+        try:
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            line = reader.readline()
+        except OSError:
+            # La respuesta pendiente desincronizaría la conexión
+            self._close_connection()
+            raise
+        if not line:
+            self._close_connection()
+            raise ConnectionError("La base de datos cerró la conexión")
+        response = json.loads(line)
+        if "error" in response:
+            raise ConnectionError(response["error"])
+        return response["data"]
+    
+    def _fetch_student_data(self, student_code):
+        return self._request({"op": "get", "code": student_code})
+    
+    def _fetch_students_bulk(self, student_codes):
+        return self._request({"op": "bulk", "codes": list(student_codes)})
+
+
+def add_latency_arguments(parser):
+    """
+    Agrega a un analizador los argumentos de LatencyModel.
+    
+    Args:
+        parser (argparse.ArgumentParser): Analizador de argumentos.
+    """
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="lognormal",
+                        help="Distribución de la latencia.")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Latencia media por consulta.")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Variación relativa de la latencia.")
+    parser.add_argument("--per-code-ms", type=float, default=0.01,
+                        help="Latencia adicional por código de una consulta de varios registros.")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fracción de consultas lentas.")
+    parser.add_argument("--slow-factor", type=float, default=20.0,
+                        help="Cuántas veces más tardan las consultas lentas.")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fracción de consultas que fallan.")
+    parser.add_argument("--max-concurrency", type=int, default=None,
+                        help="Consultas atendidas a la vez por la base de datos.")
+    parser.add_argument("--cohort-size", type=int, default=10000,
+                        help="Estudiantes de la cohorte sintética.")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla de la cohorte y de la latencia.")
+
+
+def latency_from_arguments(args):
+    """
+    Construye el modelo de latencia de los argumentos de add_latency_arguments.
+    
+    Args:
+        args (argparse.Namespace): Argumentos interpretados.
+    
+    Returns:
+        LatencyModel: Modelo de latencia.
+    """
+    return LatencyModel(
+        distribution=args.distribution,
+        mean=args.latency_ms / 1000,
+        jitter=args.jitter,
+        per_code=args.per_code_ms / 1000,
+        slow_rate=args.slow_rate,
+        slow_factor=args.slow_factor,
+        error_rate=args.error_rate,
+        seed=args.seed
+    )
+
+
+def start_db_server_process(args):
+    """
+    Inicia la base de datos de prueba en otro proceso, con un puerto TCP libre.
+    
+    Así el servidor no compite por el GIL con quien genera la carga.
+    
+    Args:
+        args (argparse.Namespace): Argumentos de add_latency_arguments.
+    
+    Returns:
+        tuple: (subprocess.Popen, str) con el proceso y la cadena de conexión.
+            Quien lo inicia debe llamar terminate() y wait() al terminar.
+    
+    Raises:
+        RuntimeError: Si el servidor termina sin empezar a escuchar.
+    """
+    argv = [
+        sys.executable, "-m", "benchmarks.fake_db_server", "--port", "0",
+        "--distribution", args.distribution,
+        "--latency-ms", str(args.latency_ms),
+        "--jitter", str(args.jitter),
+        "--per-code-ms", str(args.per_code_ms),
+        "--slow-rate", str(args.slow_rate),
+        "--slow-factor", str(args.slow_factor),
+        "--error-rate", str(args.error_rate),
+        "--cohort-size", str(args.cohort_size),
+        "--seed", str(args.seed)
+    ]
+    if args.max_concurrency:
+        argv += ["--max-concurrency", str(args.max_concurrency)]
+    # El módulo se importa desde la raíz del repositorio
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen(argv, cwd=root, stdout=subprocess.PIPE, text=True)
+    # La primera línea anuncia la dirección cuando el servidor ya escucha
+    line = process.stdout.readline()
+    if not line:
+        process.wait()
+        raise RuntimeError(f"La base de datos de prueba terminó con código {process.returncode}")
+    return process, line.split()[-1]
+
+
+def main(argv=None):
+    """
+    Inicia la base de datos de prueba desde la línea de comandos.
+    
+    Args:
+        argv (list, optional): Argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Base de datos de prueba con latencia configurable.")
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección donde escuchar.")
+    parser.add_argument("--port", type=int, default=7000, help="Puerto TCP.")
+    parser.add_argument("--unix-socket", help="Escuchar en un socket Unix en lugar de TCP.")
+    add_latency_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    server = create_db_server(
+        SyntheticCohort(args.cohort_size, seed=args.seed),
+        host=args.host,
+        port=args.port,
+        unix_socket=args.unix_socket,
+        latency=latency_from_arguments(args),
+        max_concurrency=args.max_concurrency
+    )
+    print(f"Base de datos de prueba escuchando en {server.address}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
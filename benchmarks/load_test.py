@@ -0,0 +1,378 @@
+"""
+Prueba de carga de la validación contra una base de datos con latencia.
+
+Genera solicitudes a una tasa objetivo (carga abierta: las solicitudes llegan
+a su hora aunque las anteriores no hayan terminado) y mide el rendimiento
+logrado, los percentiles de latencia y los errores. La latencia se cuenta
+desde la hora programada de cada solicitud, de modo que la espera en cola
+cuando el sistema se satura también se mide; las solicitudes con error se
+miden aparte, porque un fallo rápido no es una respuesta rápida. Con varias
+tasas se obtiene la curva de carga y el punto de saturación.
+
+Sin --db, la base de datos de prueba se inicia en otro proceso para que no
+compita por el GIL con los hilos que generan la carga.
+
+Escenarios:
+
+- 'validate': validate_student_graduation de un código al azar.
+- 'report': generate_graduation_csv_report de un listado pequeño.
+
+    python -m benchmarks.load_test --rates 50 100 200 400 --duration 10 --latency-ms 5
+    python -m benchmarks.load_test --db tcp://127.0.0.1:7000 --scenario report --rates 1 2 4
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from itertools import islice
+
+from benchmarks.fake_db_server import SocketDBConnector, add_latency_arguments, start_db_server_process
+from benchmarks.synthetic_data import SyntheticCohort
+from src.generate_report import generate_graduation_csv_report
+from src.metrics import LatencyHistogram
+from src.resilience import build_call_policy
+from src.validacion_grado import GraduationValidator, validate_student_graduation
+
+# Versión del formato del archivo de resultados
+RESULTS_VERSION = 2
+
+# Fracción de la tasa objetivo por debajo de la cual se considera saturado
+DEFAULT_EFFICIENCY = 0.9
+
+
+def validation_task(db_connector, student_codes, seed=0):
+    """
+    Crea la tarea del escenario 'validate'.
+    
+    Args:
+        db_connector (DBConnector): Conector compartido por todas las solicitudes.
+        student_codes (list): Códigos entre los que se sortea cada solicitud.
+        seed (int, optional): Semilla del sorteo.
+    
+    Returns:
+        callable: Tarea sin argumentos que valida un estudiante.
+    """
+    rng = random.Random(seed)
+    
+    def task():
+        validate_student_graduation(rng.choice(student_codes), db_connector)
+    return task
+
+
+def report_task(db_connector, student_codes, directory):
+    """
+    Crea la tarea del escenario 'report'.
+    
+    Args:
+        db_connector (DBConnector): Conector compartido por todas las solicitudes.
+        student_codes (list): Códigos del listado de cada reporte.
+        directory (str): Directorio del listado y de los reportes temporales.
+    
+    Returns:
+        callable: Tarea sin argumentos que genera un reporte y lo borra. El
+            reporte informa en la salida estándar; quien ejecuta la carga
+            debe redirigirla una sola vez, porque redirigirla en cada hilo no
+            es seguro.
+    """
+    roster_path = os.path.join(directory, "estudiantes.txt")
+    with open(roster_path, "w", encoding="ascii") as f:
+        f.writelines(student_code + "\n" for student_code in student_codes)
+    validator = GraduationValidator(db_connector=db_connector)
+    
+    def task():
+        output = os.path.join(directory, f"reporte-{threading.get_ident()}.csv")
+        generate_graduation_csv_report(output, validator=validator, roster_path=roster_path)
+        os.remove(output)
+    return task
+
+
+def run_load(task, rate, duration, concurrency=32, arrival="poisson", seed=0, drain_timeout=30.0,
+             clock=time.perf_counter):
+    """
+    Ejecuta una tarea a una tasa objetivo durante un tiempo.
+    
+    Args:
+        task (callable): Tarea sin argumentos; cada llamada es una solicitud.
+        rate (float): Solicitudes por segundo a generar.
+        duration (float): Segundos durante los que se generan solicitudes.
+        concurrency (int, optional): Hilos que atienden las solicitudes, como
+            los trabajadores de un servidor.
+        arrival (str, optional): 'poisson' (llegadas aleatorias) o 'uniform'
+            (intervalos fijos).
+        seed (int, optional): Semilla de las llegadas.
+        drain_timeout (float, optional): Segundos que se esperan las
+            solicitudes pendientes al terminar; las que no terminan se
+            informan como 'unfinished'.
+        clock (callable, optional): Reloj en segundos.
+    
+    Returns:
+        dict: Tasa objetivo, solicitudes enviadas y su tasa, completadas, con
+            error y sin terminar, rendimiento logrado (respuestas sin error por
+            segundo), tasa de errores y latencias en milisegundos (media y
+            percentiles 50, 95 y 99, y máximo) de las solicitudes sin error
+            en 'latency_ms' y de las que fallaron en 'error_latency_ms'.
+    """
+    histogram = LatencyHistogram()
+    error_histogram = LatencyHistogram()
+    errors = Counter()
+    lock = threading.Lock()
+    rng = random.Random(seed)
+    last_done = [None]
+    
+    def run(scheduled):
+        try:
+            task()
+        except Exception as error:
+            done = clock()
+            with lock:
+                errors[type(error).__name__] += 1
+                error_histogram.observe(done - scheduled)
+                last_done[0] = done
+        else:
+            done = clock()
+            with lock:
+                histogram.observe(done - scheduled)
+                last_done[0] = done
+    
+    futures = []
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="load")
+    start = clock()
+    scheduled = start
+    try:
+        while True:
+            scheduled += rng.expovariate(rate) if arrival == "poisson" else 1 / rate
+            if scheduled - start >= duration:
+                break
+            delay = scheduled - clock()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(executor.submit(run, scheduled))
+        _, pending = wait(futures, timeout=drain_timeout)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    with lock:
+        # El rendimiento se mide hasta la última respuesta: si el sistema se
+        # atrasó, las solicitudes atendidas después de duration también cuentan
+        elapsed = max(duration, (last_done[0] or start) - start)
+        error_count = sum(errors.values())
+        completed = histogram.count + error_count
+        summary = histogram.summary()
+        error_summary = error_histogram.summary()
+    return {
+        "target_rate": rate,
+        "offered": len(futures),
+        "offered_rate": round(len(futures) / duration, 2),
+        "completed": completed,
+        "errors": error_count,
+        "error_types": dict(errors),
+        "unfinished": len(pending),
+        "seconds": round(elapsed, 3),
+        "throughput": round((completed - error_count) / elapsed, 2),
+        "error_rate": round(error_count / completed, 4) if completed else None,
+        "latency_ms": _milliseconds(summary),
+        "error_latency_ms": _milliseconds(error_summary)
+    }
+
+
+def _milliseconds(summary):
+    """
+    Convierte a milisegundos el resumen de un LatencyHistogram.
+    
+    Args:
+        summary (dict): Resumen en segundos.
+    
+    Returns:
+        dict: Media, percentiles 50, 95 y 99 y máximo en milisegundos, o None
+            sin observaciones.
+    """
+    return {
+        key: None if summary[key] is None else round(summary[key] * 1000, 3)
+        for key in ("mean", "p50", "p95", "p99", "max")
+    }
+
+
+def is_saturated(result, efficiency=DEFAULT_EFFICIENCY, slo=None, max_error_rate=None):
+    """
+    Indica si un paso de carga superó la capacidad del sistema.
+    
+    Args:
+        result (dict): Resultado de run_load.
+        efficiency (float, optional): Fracción mínima de la tasa enviada que
+            se debe lograr en respuestas sin error.
+        slo (float, optional): Percentil 99 máximo admitido, en milisegundos.
+        max_error_rate (float, optional): Tasa de errores máxima admitida.
+    
+    Returns:
+        bool: True si el sistema no sostuvo la carga.
+    """
+    if result["unfinished"]:
+        return True
+    # Con llegadas aleatorias se compara con la tasa realmente enviada. Solo
+    # cuentan las respuestas sin error: un servidor que falla rápido no tiene
+    # capacidad, aunque responda a tiempo
+    if result["throughput"] < result["offered_rate"] * efficiency:
+        return True
+    if slo is not None and result["latency_ms"]["p99"] is not None and result["latency_ms"]["p99"] > slo:
+        return True
+    return max_error_rate is not None and (result["error_rate"] or 0) > max_error_rate
+
+
+def sweep_rates(task, rates, duration, concurrency=32, efficiency=DEFAULT_EFFICIENCY, slo=None,
+                max_error_rate=None, stop_at_saturation=True, **kwargs):
+    """
+    Ejecuta pasos de carga crecientes y busca el punto de saturación.
+    
+    Args:
+        task (callable): Tarea sin argumentos.
+        rates (iterable): Tasas objetivo, en solicitudes por segundo.
+        duration (float): Segundos de cada paso.
+        concurrency (int, optional): Hilos que atienden las solicitudes.
+        efficiency (float, optional): Ver is_saturated.
+        slo (float, optional): Ver is_saturated.
+        max_error_rate (float, optional): Ver is_saturated.
+        stop_at_saturation (bool, optional): No ejecutar los pasos siguientes
+            al primero saturado.
+        **kwargs: Argumentos adicionales de run_load.
+    
+    Returns:
+        dict: 'steps' con el resultado de cada paso (con 'saturated'),
+            'saturation_rate' con la primera tasa saturada (o None) y
+            'max_sustained_rate' con el mayor rendimiento logrado sin saturar.
+    """
+    steps = []
+    saturation_rate = None
+    max_sustained = None
+    for rate in sorted(rates):
+        result = run_load(task, rate, duration, concurrency, **kwargs)
+        result["saturated"] = is_saturated(result, efficiency, slo, max_error_rate)
+        steps.append(result)
+        if result["saturated"]:
+            if saturation_rate is None:
+                saturation_rate = rate
+            if stop_at_saturation:
+                break
+        elif saturation_rate is None:
+            max_sustained = max(max_sustained or 0, result["throughput"])
+    return {"steps": steps, "saturation_rate": saturation_rate, "max_sustained_rate": max_sustained}
+
+
+def _build_call_policy(args):
+    """
+    Construye la política de llamadas pedida por la línea de comandos.
+    
+    Args:
+        args (argparse.Namespace): Argumentos interpretados.
+    
+    Returns:
+        CallPolicy: Política, o None si no se pidió plazo, reintentos ni respaldos.
+    """
+    return build_call_policy(args.deadline_ms, args.retries, args.hedge)
+
+
+def main(argv=None):
+    """
+    Ejecuta la prueba de carga desde la línea de comandos.
+    
+    Args:
+        argv (list, optional): Argumentos de la línea de comandos.
+    
+    Returns:
+        int: Código de salida.
+    """
+    parser = argparse.ArgumentParser(description="Prueba de carga de la validación de graduación.")
+    parser.add_argument("--scenario", choices=("validate", "report"), default="validate",
+                        help="Solicitud a generar.")
+    parser.add_argument("--rates", type=float, nargs="+", default=[50.0, 100.0, 200.0],
+                        help="Tasas objetivo, en solicitudes por segundo.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Segundos de cada paso.")
+    parser.add_argument("--concurrency", type=int, default=32,
+                        help="Hilos que atienden las solicitudes.")
+    parser.add_argument("--arrival", choices=("poisson", "uniform"), default="poisson",
+                        help="Distribución de las llegadas.")
+    parser.add_argument("--report-size", type=int, default=200,
+                        help="Estudiantes del listado de cada reporte en el escenario 'report'.")
+    parser.add_argument("--slo-ms", type=float, help="Percentil 99 máximo admitido.")
+    parser.add_argument("--max-error-rate", type=float, help="Tasa de errores máxima admitida.")
+    parser.add_argument("--db", help="Cadena de conexión de una base de datos de prueba ya iniciada "
+                                     "(python -m benchmarks.fake_db_server). Por defecto se inicia una "
+                                     "en otro proceso con los argumentos de latencia.")
+    parser.add_argument("--deadline-ms", type=float, help="Plazo de cada consulta (ver src.resilience).")
+    parser.add_argument("--retries", type=int, default=0, help="Reintentos de las consultas fallidas.")
+    parser.add_argument("--hedge", action="store_true",
+                        help="Enviar una consulta de respaldo tras el percentil 95.")
+    parser.add_argument("--output", default="load_results.json", help="Archivo JSON de resultados.")
+    add_latency_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    cohort = SyntheticCohort(args.cohort_size, seed=args.seed)
+    server_process = None
+    if args.db:
+        address = database = args.db
+    else:
+        database = {
+            "distribution": args.distribution,
+            "latency_ms": args.latency_ms,
+            "jitter": args.jitter,
+            "per_code_ms": args.per_code_ms,
+            "slow_rate": args.slow_rate,
+            "slow_factor": args.slow_factor,
+            "error_rate": args.error_rate,
+            "max_concurrency": args.max_concurrency
+        }
+        server_process, address = start_db_server_process(args)
+    
+    try:
+        db_connector = SocketDBConnector(address, call_policy=_build_call_policy(args))
+        student_codes = list(cohort.iter_roster())
+        with tempfile.TemporaryDirectory() as directory:
+            if args.scenario == "validate":
+                task = validation_task(db_connector, student_codes, seed=args.seed)
+            else:
+                report_codes = list(islice(student_codes, args.report_size))
+                task = report_task(db_connector, report_codes, directory)
+            with contextlib.redirect_stdout(io.StringIO()):
+                sweep = sweep_rates(
+                    task, args.rates, args.duration, args.concurrency,
+                    slo=args.slo_ms, max_error_rate=args.max_error_rate, arrival=args.arrival,
+                    seed=args.seed
+                )
+    finally:
+        if server_process is not None:
+            server_process.terminate()
+            server_process.wait()
+            server_process.stdout.close()
+    
+    print(f"{'objetivo':>10}{'logrado':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errores':>9}")
+    for step in sweep["steps"]:
+        latency = step["latency_ms"]
+        print(f"{step['target_rate']:>10.1f}{step['throughput']:>10.1f}"
+              f"{latency['p50'] or 0:>10.2f}{latency['p95'] or 0:>10.2f}{latency['p99'] or 0:>10.2f}"
+              f"{(step['error_rate'] or 0):>9.2%}" + ("  SATURADO" if step["saturated"] else ""))
+    if sweep["saturation_rate"] is None:
+        print("No se alcanzó la saturación con las tasas probadas")
+    else:
+        print(f"Saturación a {sweep['saturation_rate']:.1f} solicitudes/s; "
+              f"máximo sostenido {sweep['max_sustained_rate'] or 0:.1f} solicitudes/s")
+    
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": RESULTS_VERSION,
+            "timestamp": time.time(),
+            "scenario": args.scenario,
+            "database": database,
+            **sweep
+        }, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+"""
+Suite de benchmarks del sistema de validación de requisitos de graduación.
+
+Mide estudiantes por segundo y memoria pico de los conectores, del validador
+y de la generación del reporte CSV sobre cohortes sintéticas, y guarda los
+resultados en JSON para compararlos entre versiones:
+
+    python -m benchmarks.run_benchmarks --sizes 10000 1000000 --output bench_results.json
+    python -m benchmarks.run_benchmarks --baseline bench_results.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import islice
+
+from benchmarks.synthetic_data import SyntheticCohort, SyntheticDBConnector
+from src.generate_report import generate_graduation_csv_report
+from src.validacion_grado import GraduationValidator
+
+# Versión del formato del archivo de resultados
+RESULTS_VERSION = 1
+
+# Tamaños de cohorte por defecto; 1M y 10M se piden explícitamente con --sizes
+DEFAULT_SIZES = (10000,)
+
+# Los caminos por estudiante son lentos: se miden sobre una muestra acotada
+PER_STUDENT_SAMPLE = 100000
+
+# Listado que escribe la preparación de report_end_to_end
+ROSTER_FILE = "estudiantes.txt"
+
+
+def _bench_connector_lookup(cohort, size, directory):
+    """
+    Consulta los estudiantes uno por uno con get_student_data.
+    
+    Returns:
+        int: Cantidad de códigos consultados.
+    """
+    db_connector = SyntheticDBConnector(cohort)
+    students = 0
+    for student_code in islice(cohort.iter_roster(), size):
+        db_connector.get_student_data(student_code)
+        students += 1
+    return students
+
+
+def _bench_connector_bulk(cohort, size, directory):
+    """
+    Consulta el listado completo en lotes de 500 con get_students_bulk.
+    
+    Returns:
+        int: Cantidad de códigos consultados.
+    """
+    db_connector = SyntheticDBConnector(cohort)
+    codes = cohort.iter_roster()
+    students = 0
+    while True:
+        batch = list(islice(codes, 500))
+        if not batch:
+            break
+        db_connector.get_students_bulk(batch)
+        students += len(batch)
+    return students
+
+
+def _bench_validator_per_student(cohort, size, directory):
+    """
+    Valida los estudiantes uno por uno, con una consulta por requisito.
+    
+    Returns:
+        int: Cantidad de estudiantes validados.
+    """
+    validator = GraduationValidator(db_connector=SyntheticDBConnector(cohort))
+    students = 0
+    for student_code in islice(cohort.iter_roster(), size):
+        validator.validate_graduation_requirements(student_code)
+        students += 1
+    return students
+
+
+def _bench_validator_bulk(cohort, size, directory):
+    """
+    Valida el listado completo con validate_students_bulk.
+    
+    Returns:
+        int: Cantidad de estudiantes validados.
+    """
+    validator = GraduationValidator(db_connector=SyntheticDBConnector(cohort))
+    return sum(1 for _ in validator.validate_students_bulk(cohort.iter_roster()))
+
+
+def _setup_validator_records(cohort, directory):
+    """
+    Genera los registros de la cohorte, fuera de la medición.
+    
+    Args:
+        cohort (SyntheticCohort): Cohorte sintética.
+        directory (str): Directorio de trabajo del benchmark.
+    
+    Returns:
+        list: Pares (código, registro), con un diccionario vacío para los
+            códigos inexistentes.
+    """
+    return [(student_code, cohort.record(index) or {})
+            for index, student_code in enumerate(cohort.iter_roster())]
+
+
+def _bench_validator_records(cohort, size, directory, records):
+    """
+    Valida registros ya obtenidos con validate_student_record, sin métricas.
+    
+    Returns:
+        int: Cantidad de registros validados.
+    """
+    validator = GraduationValidator(db_connector=SyntheticDBConnector(cohort))
+    for student_code, student_data in records:
+        validator.validate_student_record(student_data, student_code)
+    return len(records)
+
+
+def _setup_report_end_to_end(cohort, directory):
+    """
+    Escribe el listado que lee el reporte, fuera de la medición.
+    
+    Args:
+        cohort (SyntheticCohort): Cohorte sintética.
+        directory (str): Directorio de trabajo del benchmark.
+    """
+    cohort.write_roster(os.path.join(directory, ROSTER_FILE))
+
+
+def _bench_report_end_to_end(cohort, size, directory):
+    """
+    Genera el reporte CSV a partir del listado escrito en la preparación.
+    
+    Returns:
+        int: Cantidad de códigos del listado, incluidos los inexistentes.
+    """
+    roster_path = os.path.join(directory, ROSTER_FILE)
+    validator = GraduationValidator(db_connector=SyntheticDBConnector(cohort))
+    with contextlib.redirect_stdout(io.StringIO()):
+        generate_graduation_csv_report(
+            os.path.join(directory, "resultado_graduacion.csv"),
+            validator=validator,
+            roster_path=roster_path
+        )
+    with open(roster_path, "r", encoding="utf-8") as f:
+        return sum(1 for line in f if line.strip())
+
+
+# Nombre del benchmark: (función, ¿se limita a PER_STUDENT_SAMPLE?, preparación o None).
+# La preparación recibe la cohorte y el directorio de trabajo y no se mide; si
+# devuelve algo distinto de None, la función lo recibe como cuarto argumento.
+BENCHMARKS = {
+    "connector_lookup": (_bench_connector_lookup, True, None),
+    "connector_bulk": (_bench_connector_bulk, False, None),
+    "validator_per_student": (_bench_validator_per_student, True, None),
+    "validator_bulk": (_bench_validator_bulk, False, None),
+    "validator_records": (_bench_validator_records, False, _setup_validator_records),
+    "report_end_to_end": (_bench_report_end_to_end, False, _setup_report_end_to_end)
+}
+
+
+def _measure(function, cohort, size, directory, measure_memory, prepared=None):
+    """
+    Ejecuta un benchmark y mide su duración y, opcionalmente, su memoria pico.
+    
+    La memoria se mide en una segunda ejecución, porque tracemalloc agrega
+    un costo considerable a cada asignación.
+    
+    Returns:
+        tuple: (segundos, estudiantes procesados, bytes_pico o None).
+    """
+    args = (cohort, size, directory) if prepared is None else (cohort, size, directory, prepared)
+    start = time.perf_counter()
+    students = function(*args)
+    seconds = time.perf_counter() - start
+    
+    peak_memory = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            function(*args)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return seconds, students, peak_memory
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, seed=0, names=None, measure_memory=True):
+    """
+    Ejecuta los benchmarks sobre cohortes sintéticas.
+    
+    Args:
+        sizes (iterable, optional): Tamaños de cohorte.
+        seed (int, optional): Semilla del generador sintético.
+        names (iterable, optional): Benchmarks a ejecutar. Por defecto, todos.
+        measure_memory (bool, optional): Medir la memoria pico con tracemalloc.
+    
+    Returns:
+        dict: Resultados con el formato del archivo JSON.
+    """
+    names = list(names or BENCHMARKS)
+    results = []
+    for size in sizes:
+        cohort = SyntheticCohort(size, seed=seed)
+        for name in names:
+            function, sampled, setup = BENCHMARKS[name]
+            limit = min(size, PER_STUDENT_SAMPLE) if sampled else size
+            with tempfile.TemporaryDirectory() as directory:
+                prepared = setup(cohort, directory) if setup is not None else None
+                seconds, students, peak_memory = _measure(
+                    function, cohort, limit, directory, measure_memory, prepared
+                )
+            results.append({
+                "name": name,
+                "size": size,
+                "students": students,
+                "seconds": round(seconds, 6),
+                "students_per_second": round(students / seconds, 1) if seconds else None,
+                "peak_memory_bytes": peak_memory
+            })
+    return {
+        "version": RESULTS_VERSION,
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": results
+    }
+
+
+def compare_results(current, baseline, tolerance=0.10):
+    """
+    Compara dos ejecuciones y detecta regresiones.
+    
+    Args:
+        current (dict): Resultados actuales.
+        baseline (dict): Resultados de referencia.
+        tolerance (float, optional): Variación relativa admitida.
+    
+    Returns:
+        list: Descripción de cada regresión encontrada.
+    """
+    reference = {(r["name"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        previous = reference.get((result["name"], result["size"]))
+        if previous is None:
+            continue
+        label = f"{result['name']}[{result['size']}]"
+        if previous["students_per_second"] and result["students_per_second"] \
+                and result["students_per_second"] < previous["students_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{label}: {result['students_per_second']:.0f} estudiantes/s "
+                f"(antes {previous['students_per_second']:.0f})"
+            )
+        if previous["peak_memory_bytes"] and result["peak_memory_bytes"] \
+                and result["peak_memory_bytes"] > previous["peak_memory_bytes"] * (1 + tolerance):
+            regressions.append(
+                f"{label}: {result['peak_memory_bytes']} bytes de memoria pico "
+                f"(antes {previous['peak_memory_bytes']})"
+            )
+    return regressions
+
+
+def main(argv=None):
+    """
+    Ejecuta la suite desde la línea de comandos.
+    
+    Args:
+        argv (list, optional): Argumentos de la línea de comandos.
+    
+    Returns:
+        int: Código de salida; 1 si hay regresiones respecto de --baseline.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks de validación de graduación.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Tamaños de cohorte, por ejemplo 10000 1000000 10000000.")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del generador sintético.")
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS),
+                        help="Benchmarks a ejecutar. Por defecto, todos.")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="No medir la memoria pico (evita la segunda ejecución).")
+    parser.add_argument("--output", default="bench_results.json",
+                        help="Archivo JSON donde se guardan los resultados.")
+    parser.add_argument("--baseline", help="Resultados previos con los que comparar.")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Variación relativa admitida antes de reportar una regresión.")
+    args = parser.parse_args(argv)
+    
+    current = run_benchmarks(args.sizes, seed=args.seed, names=args.benchmarks,
+                             measure_memory=not args.no_memory)
+    for result in current["results"]:
+        memory = result["peak_memory_bytes"]
+        memory_text = f"{memory / 2**20:8.1f} MiB" if memory is not None else "       -    "
+        rate = result["students_per_second"]
+        rate_text = f"{rate:>12.0f}" if rate is not None else f"{'-':>12}"
+        print(f"{result['name']:<24}{result['size']:>10}  "
+              f"{rate_text} est/s  {memory_text}")
+    
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare_results(current, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESIÓN {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Generador determinista de cohortes sintéticas para los benchmarks.
+Cada registro se deriva del índice del estudiante y de la semilla, por lo que
+una cohorte de millones de estudiantes no necesita almacenarse en memoria.
+"""
+import hashlib
+import math
+
+from src.db_connector import DBConnector
+
+# Proporciones aproximadas observadas en las cohortes reales
+DEFAULT_RATES = {
+    "not_enrolled": 0.03,     # estudiantes sin matrícula vigente
+    "welfare_pending": 0.06,  # pendientes con Bienestar universitario
+    "payment_pending": 0.15,  # sin pago de derechos de grado
+    "unknown_code": 0.01      # códigos del listado que no existen
+}
+
+# Distribución del promedio académico (normal truncada a [0, 5])
+AVERAGE_MEAN = 3.9
+AVERAGE_STDDEV = 0.45
+
+# Prefijo de los códigos sintéticos; los códigos inexistentes usan otro prefijo
+CODE_PREFIX = "2021"
+UNKNOWN_PREFIX = "9999"
+
+_NOMBRES = ("Ana", "Carlos", "María", "Juan", "Pedro", "Laura", "Andrés", "Sofía")
+_APELLIDOS = ("Martínez", "Gutiérrez", "López", "Rodríguez", "Sánchez", "Gómez", "Díaz")
+
+
+class SyntheticCohort:
+    """Cohorte sintética reproducible de estudiantes."""
+    
+    def __init__(self, size, seed=0, rates=None):
+        """
+        Inicializa la cohorte.
+        
+        Args:
+            size (int): Cantidad de estudiantes existentes.
+            seed (int, optional): Semilla que determina todos los registros.
+            rates (dict, optional): Proporciones de fallo por requisito, con las
+                claves de DEFAULT_RATES.
+        """
+        self.size = size
+        self.seed = seed
+        self.rates = dict(DEFAULT_RATES, **(rates or {}))
+    
+    def code(self, index):
+        """
+        Obtiene el código del estudiante en una posición.
+        
+        Args:
+            index (int): Posición del estudiante, entre 0 y size - 1.
+        
+        Returns:
+            str: Código del estudiante.
+        """
+        return f"{CODE_PREFIX}{index:07d}"
+    
+    def _uniforms(self, index):
+        digest = hashlib.blake2b(
+            f"{self.seed}:{index}".encode("ascii"), digest_size=20
+        ).digest()
+        return [int.from_bytes(digest[i:i + 4], "little") / 2**32 for i in range(0, 20, 4)]
+    
+    def record(self, index):
+        """
+        Genera el registro del estudiante en una posición.
+        
+        Args:
+            index (int): Posición del estudiante.
+        
+        Returns:
+            dict: Datos del estudiante con el formato de src.mock_data.
+        """
+        u_enrollment, u_average_1, u_average_2, u_welfare, u_payment = self._uniforms(index)
+        # Transformación de Box-Muller a partir de dos uniformes
+        normal = math.sqrt(-2.0 * math.log(1.0 - u_average_1)) * math.cos(2 * math.pi * u_average_2)
+        average = min(5.0, max(0.0, round(AVERAGE_MEAN + AVERAGE_STDDEV * normal, 2)))
+        return {
+            "nombre": f"{_NOMBRES[index % len(_NOMBRES)]} {_APELLIDOS[index % len(_APELLIDOS)]}",
+            "enrollment": u_enrollment >= self.rates["not_enrolled"],
+            "average": average,
+            "welfare": u_welfare >= self.rates["welfare_pending"],
+            "payment": u_payment >= self.rates["payment_pending"]
+        }
+    
+    def index_of(self, student_code):
+        """
+        Obtiene la posición de un código, o None si no pertenece a la cohorte.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            int: Posición del estudiante, o None.
+        """
+        if not student_code.startswith(CODE_PREFIX) or len(student_code) != len(CODE_PREFIX) + 7:
+            return None
+        suffix = student_code[len(CODE_PREFIX):]
+        if not suffix.isdigit():
+            return None
+        index = int(suffix)
+        return index if index < self.size else None
+    
+    def get(self, student_code):
+        """
+        Obtiene el registro de un código.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            dict: Datos del estudiante o un diccionario vacío si no existe.
+        """
+        index = self.index_of(student_code)
+        return {} if index is None else self.record(index)
+    
+    def iter_roster(self):
+        """
+        Genera el listado de códigos, intercalando códigos inexistentes según
+        la proporción 'unknown_code'.
+        
+        Yields:
+            str: Código de estudiante.
+        """
+        unknown_rate = self.rates["unknown_code"]
+        for index in range(self.size):
+            yield self.code(index)
+            if unknown_rate and self._uniforms(-index - 1)[0] < unknown_rate:
+                yield f"{UNKNOWN_PREFIX}{index:07d}"
+    
+    def write_roster(self, path):
+        """
+        Escribe el listado de códigos en un archivo, un código por línea.
+        
+        Args:
+            path (str): Ruta del archivo.
+        
+        Returns:
+            int: Cantidad de códigos escritos.
+        """
+        count = 0
+        with open(path, "w", encoding="ascii") as f:
+            for student_code in self.iter_roster():
+                f.write(student_code + "\n")
+                count += 1
+        return count
+
+
+class SyntheticDBConnector(DBConnector):
+    """Conector que responde con los registros de una cohorte sintética."""
+    
+    def __init__(self, cohort, cache=None, metrics=None):
+        """
+        Inicializa el conector.
+        
+        Args:
+            cohort (SyntheticCohort): Cohorte que define los registros.
+            cache (RecordCache, optional): Caché de registros.
+            metrics (Metrics, optional): Registro de métricas de las consultas.
+        """
+        super().__init__(
+            f"synthetic://{cohort.size}?seed={cohort.seed}", cache=cache, metrics=metrics
+        )
+        self.cohort = cohort
+    
+    def _fetch_student_data(self, student_code):
+        return self.cohort.get(student_code)
+    
+    def _fetch_students_bulk(self, student_codes):
+        students_data = {}
+        for student_code in student_codes:
+            student_data = self.cohort.get(student_code)
+            if student_data:
+                students_data[student_code] = student_data
+        return students_data
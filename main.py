@@ -1,19 +1,280 @@
-"""
-Script principal para ejecutar la validación de requisitos de graduación.
-"""
-from src.generate_report import generate_graduation_csv_report
-
-def main():
-    """
-    Función principal que ejecuta el programa.
-    """
-    print("Sistema de Validación de Requisitos de Graduación")
-    print("================================================")
-    
-    # Generar el reporte CSV
-    generate_graduation_csv_report()
-    
-    print("\nProceso completado.\n")
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+"""
+Script principal para ejecutar la validación de requisitos de graduación.
+"""
+import argparse
+
+from src.db_connector import DBConnector
+from src.generate_report import generate_graduation_csv_report
+from src.incremental import update_graduation_csv_report
+from src.membership import BloomFilter
+from src.metrics import Metrics
+from src.policy_sweep import parse_thresholds, sweep_min_average
+from src.requirement_index import load_roster_index
+from src.report_writers import REPORT_FORMATS
+from src.resilience import build_call_policy
+from src.roster import iter_student_codes, open_roster
+from src.sharding import generate_sharded_csv_report
+from src.student_reports import generate_student_reports
+from src.validacion_grado import REQUIREMENT_NAMES, GraduationValidator
+
+def _shard_worker(value):
+    """
+    Interpreta el argumento --shard-worker con la forma 'I/N'.
+    
+    Args:
+        value (str): Valor del argumento.
+    
+    Returns:
+        tuple: (indice, cantidad) del trabajador.
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("se espera la forma I/N, p. ej. 0/4") from None
+    if not 0 <= index < count:
+        raise argparse.ArgumentTypeError("I debe estar entre 0 y N - 1")
+    return index, count
+
+def _thresholds(value):
+    """
+    Interpreta el argumento --sweep.
+    
+    Args:
+        value (str): Umbrales separados por comas o rango 'inicio:fin:paso'.
+    
+    Returns:
+        list: Promedios mínimos a simular.
+    """
+    try:
+        thresholds = parse_thresholds(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from None
+    if not thresholds:
+        raise argparse.ArgumentTypeError("se espera al menos un umbral")
+    return thresholds
+
+def parse_args(argv=None):
+    """
+    Interpreta los argumentos de la línea de comandos.
+    
+    Args:
+        argv (list, optional): Argumentos a interpretar. Por defecto, los del proceso.
+    
+    Returns:
+        argparse.Namespace: Argumentos interpretados.
+    """
+    parser = argparse.ArgumentParser(
+        description="Valida los requisitos de graduación y genera el reporte CSV."
+    )
+    parser.add_argument(
+        "--roster", default="estudiantes.txt",
+        help="Listado de códigos: archivo, archivo .gz o '-' para la entrada estándar."
+    )
+    parser.add_argument("--encoding", default=None, help="Codificación del listado.")
+    parser.add_argument(
+        "--output", default="resultado_graduacion.csv", help="Ruta del reporte CSV."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Cantidad de hilos o procesos de validación."
+    )
+    parser.add_argument(
+        "--executor", choices=["thread", "process"], default="thread",
+        help="Tipo de pool a usar cuando --workers es mayor que 1."
+    )
+    parser.add_argument(
+        "--format", dest="output_format", choices=sorted(REPORT_FORMATS), default="csv",
+        help="Formato del reporte."
+    )
+    parser.add_argument(
+        "--compression", choices=["gzip", "zstd"], default=None,
+        help="Comprimir el reporte mientras se escribe ('zstd' requiere zstandard)."
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Actualizar el reporte existente validando solo los registros modificados."
+    )
+    parser.add_argument(
+        "--shard-size", type=int, default=None,
+        help="Generar el reporte por fragmentos reanudables de este tamaño."
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Con --shard-size, omitir los fragmentos terminados en una ejecución anterior."
+    )
+    parser.add_argument(
+        "--fresh", action="store_true",
+        help="Con --shard-size, eliminar los fragmentos de una ejecución anterior del mismo listado. "
+             "Con varios trabajadores, usarlo solo en uno y antes de lanzar los demás."
+    )
+    parser.add_argument(
+        "--shard-worker", type=_shard_worker, default=(0, 1), metavar="I/N",
+        help="Con --shard-size, procesar solo los fragmentos del trabajador I de N."
+    )
+    parser.add_argument(
+        "--sweep", type=_thresholds, metavar="UMBRALES",
+        help="Simular promedios mínimos ('3.3,3.5' o '3.3:4.0:0.1') en lugar de generar el reporte."
+    )
+    parser.add_argument(
+        "--sweep-output", default="simulacion_promedios.json",
+        help="Archivo JSON con la curva de aprobados y las listas de cada umbral."
+    )
+    parser.add_argument(
+        "--blocked-by", choices=REQUIREMENT_NAMES, metavar="REQUISITO",
+        help="Listar los estudiantes que no cumplen este requisito en lugar de generar el reporte."
+    )
+    parser.add_argument(
+        "--only", action="store_true",
+        help="Con --blocked-by, listar solo a quienes cumplen todos los demás requisitos."
+    )
+    parser.add_argument(
+        "--requirement-index", metavar="INDICE",
+        help="Con --blocked-by, guardar el índice por requisito y reutilizarlo en la siguiente "
+             "ejecución, actualizando solo los registros modificados."
+    )
+    parser.add_argument(
+        "--student-reports", metavar="DESTINO",
+        help="Generar también el informe de cada estudiante en un directorio o archivo .zip/.tar/.tar.gz."
+    )
+    parser.add_argument(
+        "--stats", metavar="RESUMEN",
+        help="Guardar en un archivo JSON las estadísticas de la cohorte calculadas al generar el reporte."
+    )
+    parser.add_argument(
+        "--known-codes", metavar="FILTRO",
+        help="Filtro de códigos existentes (python -m src.membership) para no consultar códigos desconocidos."
+    )
+    parser.add_argument(
+        "--deadline-ms", type=float, default=None,
+        help="Plazo de cada consulta en milisegundos; los estudiantes de una consulta vencida "
+             "quedan INDETERMINADO en el reporte."
+    )
+    parser.add_argument(
+        "--retries", type=int, default=0, help="Reintentos de las consultas fallidas."
+    )
+    parser.add_argument(
+        "--hedge", action="store_true",
+        help="Enviar una consulta de respaldo cuando una tarda más que el percentil 95."
+    )
+    parser.add_argument(
+        "--metrics",
+        help="Guardar las métricas de la ejecución: Prometheus si termina en '.prom', JSON si no."
+    )
+    args = parser.parse_args(argv)
+    if args.incremental and args.output_format != "csv":
+        parser.error("--incremental solo admite --format csv")
+    if args.shard_size is not None and args.shard_size < 1:
+        parser.error("--shard-size debe ser mayor que 0")
+    if args.fresh and args.resume:
+        parser.error("--fresh y --resume no se pueden usar juntos")
+    if args.shard_size is not None and (args.output_format != "csv" or args.compression):
+        parser.error("--shard-size solo admite --format csv sin --compression")
+    return args
+
+def main(argv=None):
+    """
+    Función principal que ejecuta el programa.
+    
+    Args:
+        argv (list, optional): Argumentos de la línea de comandos.
+    """
+    args = parse_args(argv)
+    
+    print("Sistema de Validación de Requisitos de Graduación")
+    print("================================================")
+    
+    metrics = Metrics() if args.metrics else None
+    known_codes = BloomFilter.load(args.known_codes) if args.known_codes else None
+    call_policy = build_call_policy(args.deadline_ms, args.retries, args.hedge, metrics=metrics)
+    db_connector = DBConnector(metrics=metrics, known_codes=known_codes, call_policy=call_policy)
+    validator = GraduationValidator(db_connector=db_connector, metrics=metrics)
+    
+    # Simular umbrales, o generar o actualizar el reporte CSV
+    if args.blocked_by:
+        try:
+            roster = open_roster(args.roster, encoding=args.encoding)
+        except FileNotFoundError:
+            print(f"Error: No se encontró el archivo '{args.roster}'")
+        else:
+            with roster:
+                index = load_roster_index(validator, iter_student_codes(roster), args.requirement_index)
+            if args.only:
+                codes = index.blocked_only_by(args.blocked_by)
+            else:
+                codes = index.blocked_by(args.blocked_by)
+            for student_code in codes:
+                print(student_code)
+            print(f"{len(codes)} estudiantes bloqueados por '{args.blocked_by}'")
+            if index.unavailable:
+                print(f"Advertencia: {len(index.unavailable)} estudiantes no se pudieron consultar a "
+                      f"tiempo y no se incluyen; el índice no se guardó")
+    elif args.sweep:
+        sweep = sweep_min_average(validator, roster_path=args.roster, encoding=args.encoding)
+        if sweep is not None:
+            for point in sweep.curve(args.sweep):
+                print(f"Promedio mínimo {point['min_average']:.2f}: {point['approved']} aprobados")
+            if sweep.unavailable:
+                print(f"Advertencia: {sweep.unavailable} estudiantes no se pudieron consultar a tiempo "
+                      f"y no se cuentan como aprobados ni rechazados")
+            sweep.write(args.sweep_output, args.sweep)
+            print(f"Simulación guardada en '{args.sweep_output}'")
+    elif args.incremental:
+        update_graduation_csv_report(
+            args.output,
+            validator=validator,
+            roster_path=args.roster,
+            encoding=args.encoding,
+            compression=args.compression
+        )
+    elif args.shard_size is not None:
+        generate_sharded_csv_report(
+            args.output,
+            validator=validator,
+            shard_size=args.shard_size,
+            resume=args.resume,
+            fresh=args.fresh,
+            worker_index=args.shard_worker[0],
+            worker_count=args.shard_worker[1],
+            workers=args.workers,
+            executor=args.executor,
+            roster_path=args.roster,
+            encoding=args.encoding,
+            stats_path=args.stats,
+            metrics=metrics
+        )
+    else:
+        generate_graduation_csv_report(
+            args.output,
+            validator=validator,
+            workers=args.workers,
+            executor=args.executor,
+            roster_path=args.roster,
+            encoding=args.encoding,
+            metrics=metrics,
+            output_format=args.output_format,
+            compression=args.compression,
+            stats_path=args.stats,
+            student_reports_path=args.student_reports
+        )
+    
+    # El reporte completo escribe los informes en su misma pasada; los demás
+    # modos pueden no validar todo el listado (fragmentos reanudados o de otros
+    # trabajadores, actualización incremental) y los generan aparte
+    if args.student_reports and (args.blocked_by or args.sweep or args.incremental
+                                 or args.shard_size is not None):
+        generate_student_reports(
+            args.student_reports,
+            validator=validator,
+            workers=args.workers,
+            executor=args.executor,
+            roster_path=args.roster,
+            encoding=args.encoding
+        )
+    
+    if metrics is not None:
+        metrics.write(args.metrics)
+        print(f"Métricas guardadas en '{args.metrics}'")
+    
+    print("\nProceso completado.\n")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
-# This file indicates that the src directory is a Python package
-# Makes imports cleaner for other modules
-
-from .db_connector import DBConnector
-from .validacion_grado import GraduationValidator, validate_student_graduation
-
-__all__ = ['DBConnector', 'GraduationValidator', 'validate_student_graduation']
\ No newline at end of file
+# This file indicates that the src directory is a Python package
+# Makes imports cleaner for other modules
+
+from .async_validacion import AsyncDBConnector, AsyncGraduationValidator
+from .db_connector import DBConnector
+from .record_cache import RecordCache
+from .sqlite_connector import SQLiteDBConnector
+from .student_store import ColumnarStudentStore, StudentRecord, StudentStore
+from .validacion_grado import GraduationValidator, validate_student_graduation
+
+__all__ = ['AsyncDBConnector', 'AsyncGraduationValidator', 'DBConnector', 'RecordCache', 'SQLiteDBConnector', 'ColumnarStudentStore', 'StudentRecord', 'StudentStore', 'GraduationValidator', 'validate_student_graduation']
\ No newline at end of file
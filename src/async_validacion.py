@@ -0,0 +1,282 @@
+"""
+Módulo para validar requisitos de graduación de forma asíncrona.
+Permite solapar la espera de red de varias consultas cuando la base de datos es remota.
+"""
+import asyncio
+import functools
+from collections import deque
+from typing import Protocol, runtime_checkable
+
+from src.db_connector import STUDENT_NOT_FOUND, DBConnector
+from src.resilience import QueryUnavailableError
+from src.single_flight import AsyncSingleFlight
+from src.validacion_grado import INDETERMINATE, GraduationValidator, _overall_status
+
+# Cantidad de estudiantes que se validan simultáneamente por defecto
+DEFAULT_MAX_CONCURRENCY = 50
+
+
+@runtime_checkable
+class AsyncDBConnector(Protocol):
+    """Interfaz de un conector asíncrono a la base de datos."""
+    
+    async def get_student_data(self, student_code):
+        """Obtiene el registro completo de un estudiante."""
+    
+    async def check_student_enrollment(self, student_code):
+        """Verifica si el estudiante está matriculado."""
+    
+    async def get_student_average(self, student_code):
+        """Obtiene el promedio académico del estudiante."""
+    
+    async def check_university_welfare_status(self, student_code):
+        """Verifica si el estudiante está a paz y salvo con Bienestar universitario."""
+    
+    async def check_graduation_payment(self, student_code):
+        """Verifica si el estudiante ha pagado los derechos de grado."""
+
+
+class SyncDBConnectorAdapter:
+    """Adapta un DBConnector síncrono a AsyncDBConnector ejecutándolo en hilos."""
+    
+    def __init__(self, db_connector=None):
+        """
+        Inicializa el adaptador.
+        
+        Args:
+            db_connector (DBConnector, optional): Conector síncrono.
+                Si no se proporciona, se crea uno nuevo.
+        """
+        self.db_connector = db_connector or DBConnector()
+    
+    async def get_student_data(self, student_code):
+        """Obtiene el registro completo de un estudiante en un hilo."""
+        return await asyncio.to_thread(self.db_connector.get_student_data, student_code)
+    
+    async def check_student_enrollment(self, student_code):
+        """Verifica la matrícula del estudiante en un hilo."""
+        return await asyncio.to_thread(self.db_connector.check_student_enrollment, student_code)
+    
+    async def get_student_average(self, student_code):
+        """Obtiene el promedio académico del estudiante en un hilo."""
+        return await asyncio.to_thread(self.db_connector.get_student_average, student_code)
+    
+    async def check_university_welfare_status(self, student_code):
+        """Verifica el paz y salvo de Bienestar universitario en un hilo."""
+        return await asyncio.to_thread(
+            self.db_connector.check_university_welfare_status, student_code
+        )
+    
+    async def check_graduation_payment(self, student_code):
+        """Verifica el pago de los derechos de grado en un hilo."""
+        return await asyncio.to_thread(self.db_connector.check_graduation_payment, student_code)
+
+
+class CoalescingAsyncDBConnector:
+    """
+    Envuelve un AsyncDBConnector agrupando las consultas simultáneas idénticas.
+    
+    Cada método se agrupa por separado con la clave (método, código): si
+    varias tareas piden el mismo dato del mismo estudiante a la vez, solo
+    una consulta llega al conector envuelto.
+    """
+    
+    def __init__(self, db_connector, metrics=None):
+        """
+        Inicializa el conector.
+        
+        Args:
+            db_connector (AsyncDBConnector): Conector asíncrono envuelto.
+            metrics (Metrics, optional): Registro donde se cuentan las consultas
+                ahorradas en 'coalesced_queries'.
+        """
+        self.db_connector = db_connector
+        self.single_flight = AsyncSingleFlight(metrics)
+    
+    async def _coalesced(self, method_name, student_code):
+        """Llama un método del conector envuelto, compartiendo la llamada en curso."""
+        method = getattr(self.db_connector, method_name)
+        return await self.single_flight.do((method_name, student_code), method, student_code)
+    
+    async def get_student_data(self, student_code):
+        """Obtiene el registro completo de un estudiante."""
+        return await self._coalesced("get_student_data", student_code)
+    
+    async def check_student_enrollment(self, student_code):
+        """Verifica si el estudiante está matriculado."""
+        return await self._coalesced("check_student_enrollment", student_code)
+    
+    async def get_student_average(self, student_code):
+        """Obtiene el promedio académico del estudiante."""
+        return await self._coalesced("get_student_average", student_code)
+    
+    async def check_university_welfare_status(self, student_code):
+        """Verifica si el estudiante está a paz y salvo con Bienestar universitario."""
+        return await self._coalesced("check_university_welfare_status", student_code)
+    
+    async def check_graduation_payment(self, student_code):
+        """Verifica si el estudiante ha pagado los derechos de grado."""
+        return await self._coalesced("check_graduation_payment", student_code)
+
+
+def _indeterminate_on_unavailable(method):
+    """
+    Versión asíncrona de validacion_grado.indeterminate_on_unavailable.
+    
+    Args:
+        method (callable): Verificación asíncrona que recibe el código del estudiante.
+    
+    Returns:
+        callable: Verificación decorada, que devuelve INDETERMINATE si la
+            consulta vence su plazo o el interruptor la rechaza.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, student_code):
+        try:
+            return await method(self, student_code)
+        except QueryUnavailableError:
+            self._count_indeterminate(1)
+            return INDETERMINATE
+    return wrapper
+
+
+class AsyncGraduationValidator:
+    """Clase para validar de forma asíncrona los requisitos de graduación."""
+    
+    def __init__(self, db_connector=None, max_concurrency=DEFAULT_MAX_CONCURRENCY, validator=None):
+        """
+        Inicializa el validador asíncrono.
+        
+        Args:
+            db_connector (AsyncDBConnector, optional): Conector asíncrono a la base
+                de datos. Si no se proporciona, se adapta un DBConnector nuevo.
+            max_concurrency (int, optional): Cantidad máxima de estudiantes
+                validándose al mismo tiempo.
+            validator (GraduationValidator, optional): Validador que evalúa los
+                registros obtenidos y define el promedio mínimo. Si no se
+                proporciona, se crea uno nuevo; no consulta la base de datos.
+        """
+        self.db_connector = db_connector or SyncDBConnectorAdapter()
+        self.validator = validator or GraduationValidator()
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+    
+    @property
+    def min_average(self):
+        """float: Promedio mínimo requerido, el del validador de registros."""
+        return self.validator.min_average
+    
+    def _count_indeterminate(self, count):
+        """
+        Cuenta requisitos INDETERMINATE en las métricas del validador, si hay.
+        
+        Args:
+            count (int): Cantidad de requisitos.
+        """
+        if self.validator.metrics is not None:
+            self.validator.metrics.increment("indeterminate_requirements", count)
+    
+    @_indeterminate_on_unavailable
+    async def check_enrollment(self, student_code):
+        """Verifica si el estudiante está matriculado."""
+        return await self.db_connector.check_student_enrollment(student_code)
+    
+    @_indeterminate_on_unavailable
+    async def check_academic_average(self, student_code):
+        """Verifica si el estudiante cumple con el mínimo promedio requerido."""
+        average = await self.db_connector.get_student_average(student_code)
+        return average >= self.min_average
+    
+    @_indeterminate_on_unavailable
+    async def check_welfare_status(self, student_code):
+        """Verifica si el estudiante está a paz y salvo con Bienestar universitario."""
+        return await self.db_connector.check_university_welfare_status(student_code)
+    
+    @_indeterminate_on_unavailable
+    async def check_payment(self, student_code):
+        """Verifica si el estudiante ha pagado los derechos de grado."""
+        return await self.db_connector.check_graduation_payment(student_code)
+    
+    async def _run_checks(self, student_code):
+        """Ejecuta las cuatro verificaciones de un estudiante de forma concurrente."""
+        enrollment, average, welfare, payment = await asyncio.gather(
+            self.check_enrollment(student_code),
+            self.check_academic_average(student_code),
+            self.check_welfare_status(student_code),
+            self.check_payment(student_code)
+        )
+        requirements = {
+            "matriculado": enrollment,
+            "promedio_minimo": average,
+            "paz_y_salvo_bienestar": welfare,
+            "derechos_de_grado_pagados": payment
+        }
+        return _overall_status(requirements), requirements
+    
+    async def validate_graduation_requirements(self, student_code):
+        """
+        Valida los requisitos ejecutando las cuatro verificaciones en paralelo.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            tuple: (bool, dict) con el mismo formato que
+                GraduationValidator.validate_graduation_requirements.
+        """
+        async with self._semaphore:
+            return await self._run_checks(student_code)
+    
+    async def validate_student(self, student_code):
+        """
+        Obtiene el registro del estudiante con una sola consulta y lo valida.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            tuple: (dict, bool, dict) con los datos del estudiante, el resultado
+                de la validación y el detalle de cada requisito. Un estudiante
+                inexistente tiene datos STUDENT_NOT_FOUND; si la consulta no
+                responde a tiempo, los datos quedan vacíos y el resultado y
+                todos los requisitos valen INDETERMINATE.
+        """
+        async with self._semaphore:
+            try:
+                student_data = await self.db_connector.get_student_data(student_code)
+            except QueryUnavailableError:
+                requirements = self.validator.indeterminate_requirements()
+                self._count_indeterminate(len(requirements))
+                return {}, INDETERMINATE, requirements
+        student_data = student_data or STUDENT_NOT_FOUND
+        graduation_status, requirements = self.validator.validate_student_record(student_data, student_code)
+        return student_data, graduation_status, requirements
+    
+    async def validate_students(self, student_codes):
+        """
+        Valida varios estudiantes manteniendo hasta max_concurrency en curso.
+        
+        Los resultados se entregan en el orden de student_codes y solo se crean
+        tareas para una ventana acotada, de modo que la memoria no crece con
+        el tamaño del listado.
+        
+        Args:
+            student_codes (iterable): Códigos de los estudiantes.
+        
+        Yields:
+            tuple: (codigo, datos, bool, dict) por cada estudiante.
+        """
+        window = 2 * self.max_concurrency
+        pending = deque()
+        try:
+            for student_code in student_codes:
+                pending.append((student_code, asyncio.ensure_future(self.validate_student(student_code))))
+                if len(pending) >= window:
+                    code, task = pending.popleft()
+                    yield (code,) + await task
+            while pending:
+                code, task = pending.popleft()
+                yield (code,) + await task
+        finally:
+            for _, task in pending:
+                task.cancel()
@@ -0,0 +1,201 @@
+"""
+Módulo para validar requisitos de graduación de cohortes completas en forma columnar.
+En lugar de un diccionario por estudiante, cada requisito se representa como una
+máscara booleana sobre toda la cohorte y el veredicto se calcula con operaciones
+vectorizadas. Usa NumPy si está instalado; si no, empaqueta las máscaras en enteros
+de Python para combinarlas con una sola operación AND.
+"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.validacion_grado import REQUIREMENT_NAMES
+
+
+class BatchValidationResult:
+    """Resultado compacto de la validación de una cohorte."""
+    
+    __slots__ = ("codes", "masks", "approved", "_count")
+    
+    def __init__(self, codes, masks, approved, count):
+        """
+        Inicializa el resultado.
+        
+        Args:
+            codes (sequence): Códigos de los estudiantes.
+            masks (dict): Máscara por requisito, con las claves de REQUIREMENT_NAMES.
+            approved (sequence): Máscara del veredicto final.
+            count (callable): Función que cuenta los valores verdaderos de una máscara.
+        """
+        self.codes = codes
+        self.masks = masks
+        self.approved = approved
+        self._count = count
+    
+    def __len__(self):
+        return len(self.codes)
+    
+    @property
+    def approved_count(self):
+        """int: Cantidad de estudiantes que cumplen todos los requisitos."""
+        return self._count(self.approved)
+    
+    def failure_counts(self):
+        """
+        Cuenta los estudiantes que no cumplen cada requisito.
+        
+        Returns:
+            dict: {nombre_requisito: cantidad_de_estudiantes_que_no_cumplen}.
+        """
+        total = len(self.codes)
+        return {name: total - self._count(mask) for name, mask in self.masks.items()}
+    
+    def approved_codes(self):
+        """
+        Obtiene los códigos de los estudiantes aprobados.
+        
+        Returns:
+            list: Códigos en el orden de entrada.
+        """
+        return [code for code, ok in zip(self.codes, self.approved) if ok]
+    
+    def requirements_at(self, index):
+        """
+        Reconstruye el resultado de un estudiante con el formato de
+        GraduationValidator.validate_graduation_requirements.
+        
+        Args:
+            index (int): Posición del estudiante en la cohorte.
+        
+        Returns:
+            tuple: (bool, dict) con el veredicto y el detalle de cada requisito.
+        """
+        requirements = {name: bool(self.masks[name][index]) for name in REQUIREMENT_NAMES}
+        return bool(self.approved[index]), requirements
+
+
+def _as_bool_array(column):
+    """
+    Convierte una columna booleana en un arreglo de NumPy.
+    
+    Args:
+        column (sequence): Valores booleanos, o bytes con un 0 o 1 por
+            estudiante como los de ColumnarStudentStore.columns.
+    
+    Returns:
+        numpy.ndarray: Máscara booleana.
+    """
+    if isinstance(column, (bytes, bytearray, memoryview)):
+        # np.asarray trataría los bytes como un único valor escalar
+        return np.frombuffer(column, dtype=np.uint8) != 0
+    return np.asarray(column, dtype=bool)
+
+
+def _validate_batch_numpy(codes, enrollment, average, welfare, payment, min_average):
+    """
+    Valida la cohorte con operaciones de arreglos de NumPy.
+    
+    Args:
+        codes (sequence): Códigos de los estudiantes.
+        enrollment (sequence): Matrícula de cada estudiante.
+        average (sequence): Promedio académico de cada estudiante.
+        welfare (sequence): Paz y salvo de Bienestar de cada estudiante.
+        payment (sequence): Pago de derechos de grado de cada estudiante.
+        min_average (float): Promedio mínimo requerido.
+    
+    Returns:
+        BatchValidationResult: Máscaras como arreglos booleanos.
+    """
+    masks = {
+        "matriculado": _as_bool_array(enrollment),
+        "promedio_minimo": np.asarray(average, dtype=np.float64) >= min_average,
+        "paz_y_salvo_bienestar": _as_bool_array(welfare),
+        "derechos_de_grado_pagados": _as_bool_array(payment)
+    }
+    approved = masks["matriculado"] & masks["promedio_minimo"] \
+        & masks["paz_y_salvo_bienestar"] & masks["derechos_de_grado_pagados"]
+    return BatchValidationResult(codes, masks, approved, np.count_nonzero)
+
+
+def _count_true_bytes(mask):
+    """
+    Cuenta los valores verdaderos de una máscara en bytes.
+    
+    Args:
+        mask (bytes): Un 0 o 1 por estudiante.
+    
+    Returns:
+        int: Cantidad de unos.
+    """
+    return mask.count(1)
+
+
+def _validate_batch_bytes(codes, enrollment, average, welfare, payment, min_average):
+    """
+    Valida la cohorte sin NumPy, con máscaras en bytes combinadas como enteros.
+    
+    Args:
+        codes (sequence): Códigos de los estudiantes.
+        enrollment (sequence): Matrícula de cada estudiante.
+        average (sequence): Promedio académico de cada estudiante.
+        welfare (sequence): Paz y salvo de Bienestar de cada estudiante.
+        payment (sequence): Pago de derechos de grado de cada estudiante.
+        min_average (float): Promedio mínimo requerido.
+    
+    Returns:
+        BatchValidationResult: Máscaras como bytes.
+    
+    Raises:
+        ValueError: Si alguna columna no tiene la longitud de codes.
+    """
+    # Cada máscara es un bytes con un 0 o 1 por estudiante; interpretada como un
+    # entero, el AND de las cuatro máscaras combina toda la cohorte de una vez
+    size = len(codes)
+    masks = {
+        "matriculado": bytes(map(bool, enrollment)),
+        "promedio_minimo": bytes(value >= min_average for value in average),
+        "paz_y_salvo_bienestar": bytes(map(bool, welfare)),
+        "derechos_de_grado_pagados": bytes(map(bool, payment))
+    }
+    for name, mask in masks.items():
+        if len(mask) != size:
+            raise ValueError(f"La columna de '{name}' no tiene {size} elementos")
+    combined = -1
+    for mask in masks.values():
+        combined &= int.from_bytes(mask, "little")
+    approved = combined.to_bytes(size, "little") if size else b""
+    return BatchValidationResult(codes, masks, approved, _count_true_bytes)
+
+
+def validate_batch(codes, enrollment, average, welfare, payment, min_average, use_numpy=None):
+    """
+    Valida una cohorte completa a partir de columnas de datos.
+    
+    Args:
+        codes (sequence): Códigos de los estudiantes.
+        enrollment (sequence): Matrícula de cada estudiante.
+        average (sequence): Promedio académico de cada estudiante.
+        welfare (sequence): Paz y salvo de Bienestar de cada estudiante.
+        payment (sequence): Pago de derechos de grado de cada estudiante.
+        min_average (float): Promedio mínimo requerido.
+        use_numpy (bool, optional): Forzar o desactivar el uso de NumPy.
+            Por defecto se usa si está instalado.
+    
+    Returns:
+        BatchValidationResult: Máscaras por requisito y veredicto final.
+    
+    Raises:
+        ValueError: Si las columnas no tienen la misma longitud.
+        ImportError: Si se pide NumPy y no está instalado.
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        if np is None:
+            raise ImportError("NumPy no está instalado")
+        lengths = {len(codes), len(enrollment), len(average), len(welfare), len(payment)}
+        if len(lengths) != 1:
+            raise ValueError("Todas las columnas deben tener la misma longitud")
+        return _validate_batch_numpy(codes, enrollment, average, welfare, payment, min_average)
+    return _validate_batch_bytes(codes, enrollment, average, welfare, payment, min_average)
@@ -0,0 +1,333 @@
+"""
+Módulo con las estadísticas de una cohorte calculadas en una sola pasada.
+
+CohortStats se alimenta con los mismos resultados que se escriben en el
+reporte (codigo, datos, bool, dict), así que se calcula mientras se valida,
+sin volver a leer el CSV. Todas sus partes se pueden sumar con merge, de modo
+que las estadísticas de varios fragmentos o trabajadores se combinan en las
+de la cohorte completa.
+"""
+import json
+import os
+from bisect import bisect_right
+from collections import Counter
+
+from src.validacion_grado import INDETERMINATE, REQUIREMENT_NAMES
+
+# Ancho de los intervalos del histograma de promedios; los cuantiles tienen un
+# error menor a este valor
+AVERAGE_BIN_WIDTH = 0.01
+
+# Promedio máximo de la escala; los mayores se cuentan aparte
+AVERAGE_MAX = 5.0
+
+# Límites inferiores de los intervalos [desde, desde + 0.01) del histograma de
+# promedios. Se redondean a dos decimales para que un promedio como 3.5 caiga
+# en el intervalo que empieza en 3.50 y no en el anterior
+AVERAGE_BINS = tuple(round(i * AVERAGE_BIN_WIDTH, 2) for i in range(round(AVERAGE_MAX / AVERAGE_BIN_WIDTH)))
+
+# Ancho de los intervalos del histograma que se muestra en el resumen
+SUMMARY_BIN_WIDTH = 0.5
+
+# Cuantiles del promedio incluidos en el resumen
+SUMMARY_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+def _round(value):
+    """Redondea un promedio a cuatro decimales, conservando None."""
+    return None if value is None else round(value, 4)
+
+
+class AverageHistogram:
+    """
+    Histograma de promedios académicos con intervalos [desde, hasta).
+    
+    El último intervalo incluye AVERAGE_MAX, y los promedios mayores se cuentan
+    en un intervalo adicional al final de counts.
+    """
+    
+    def __init__(self):
+        """Inicializa el histograma vacío."""
+        self.counts = [0] * (len(AVERAGE_BINS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+    
+    def observe(self, average):
+        """
+        Registra un promedio.
+        
+        Args:
+            average (float): Promedio del estudiante.
+        """
+        if average > AVERAGE_MAX:
+            index = len(AVERAGE_BINS)
+        else:
+            index = max(bisect_right(AVERAGE_BINS, average) - 1, 0)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += average
+        if self.min is None or average < self.min:
+            self.min = average
+        if self.max is None or average > self.max:
+            self.max = average
+    
+    def merge(self, other):
+        """
+        Suma las observaciones de otro histograma de promedios.
+        
+        Args:
+            other (AverageHistogram): Histograma a sumar.
+        """
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+    
+    def quantile(self, q):
+        """
+        Estima un cuantil interpolando dentro del intervalo que lo contiene.
+        
+        Args:
+            q (float): Cuantil entre 0 y 1.
+        
+        Returns:
+            float: Promedio estimado, o None si no hay observaciones.
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                if index < len(AVERAGE_BINS):
+                    lower = AVERAGE_BINS[index]
+                    upper = lower + AVERAGE_BIN_WIDTH
+                else:
+                    lower, upper = AVERAGE_MAX, self.max
+                estimate = lower + (upper - lower) * (rank - cumulative) / count
+                return min(max(estimate, self.min), self.max)
+            cumulative += count
+        return self.max
+    
+    def to_dict(self):
+        """
+        Serializa el histograma.
+        
+        Returns:
+            dict: Estado serializable a JSON.
+        """
+        return {"counts": self.counts, "count": self.count, "sum": self.total,
+                "min": self.min, "max": self.max}
+    
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Reconstruye un histograma guardado con to_dict.
+        
+        Args:
+            state (dict): Estado serializado.
+        
+        Returns:
+            AverageHistogram: Histograma reconstruido.
+        """
+        histogram = cls()
+        histogram.counts = list(state["counts"])
+        histogram.count = state["count"]
+        histogram.total = state["sum"]
+        histogram.min = state["min"]
+        histogram.max = state["max"]
+        return histogram
+
+
+class CohortStats:
+    """Estadísticas combinables de los resultados de una cohorte."""
+    
+    def __init__(self):
+        """Inicializa las estadísticas vacías."""
+        self.students = 0
+        self.approved = 0
+        self.not_found = 0
+        self.indeterminate = 0
+        self.failures = Counter()
+        self.combinations = Counter()
+        self.averages = AverageHistogram()
+    
+    def observe(self, student_code, student_data, graduation_status, requirements):
+        """
+        Registra el resultado de un estudiante.
+        
+        Args:
+            student_code (str): Código del estudiante.
+            student_data (dict): Datos del estudiante.
+            graduation_status (bool): Resultado de la validación, o INDETERMINATE.
+            requirements (dict): Detalle de cada requisito.
+        """
+        self.students += 1
+        # Los estudiantes inexistentes no tienen promedio que registrar; los
+        # indeterminados sin datos son los de una consulta que no respondió
+        if student_data:
+            self.averages.observe(float(student_data.get("average", 0.0)))
+        elif graduation_status is not INDETERMINATE:
+            self.not_found += 1
+        if graduation_status is INDETERMINATE:
+            # Ningún requisito falló, pero alguno no se pudo verificar
+            self.indeterminate += 1
+            return
+        if graduation_status:
+            self.approved += 1
+            return
+        # Los requisitos INDETERMINATE no cuentan como fallidos
+        failed = tuple(
+            name for name in REQUIREMENT_NAMES
+            if not requirements[name] and requirements[name] is not INDETERMINATE
+        )
+        self.failures.update(failed)
+        self.combinations[failed] += 1
+    
+    def observe_results(self, results):
+        """
+        Registra resultados a medida que pasan, sin retenerlos.
+        
+        Args:
+            results (iterable): Tuplas (codigo, datos, bool, dict).
+        
+        Yields:
+            tuple: Los mismos resultados, para seguir escribiéndolos.
+        """
+        for result in results:
+            self.observe(*result)
+            yield result
+    
+    def merge(self, other):
+        """
+        Suma las estadísticas de otra parte de la cohorte.
+        
+        Args:
+            other (CohortStats): Estadísticas a sumar.
+        """
+        self.students += other.students
+        self.approved += other.approved
+        self.not_found += other.not_found
+        self.indeterminate += other.indeterminate
+        self.failures.update(other.failures)
+        self.combinations.update(other.combinations)
+        self.averages.merge(other.averages)
+    
+    def to_dict(self):
+        """
+        Serializa el estado completo para combinarlo después.
+        
+        Returns:
+            dict: Estado serializable a JSON.
+        """
+        return {
+            "students": self.students,
+            "approved": self.approved,
+            "not_found": self.not_found,
+            "indeterminate": self.indeterminate,
+            "failures": dict(self.failures),
+            "combinations": {"+".join(failed): count for failed, count in self.combinations.items()},
+            "averages": self.averages.to_dict()
+        }
+    
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Reconstruye las estadísticas guardadas con to_dict.
+        
+        Args:
+            state (dict): Estado serializado.
+        
+        Returns:
+            CohortStats: Estadísticas reconstruidas.
+        """
+        stats = cls()
+        stats.students = state["students"]
+        stats.approved = state["approved"]
+        stats.not_found = state["not_found"]
+        stats.indeterminate = state["indeterminate"]
+        stats.failures.update(state["failures"])
+        # La clave vacía es la combinación sin requisitos fallidos
+        stats.combinations.update({
+            tuple(key.split("+")) if key else (): count for key, count in state["combinations"].items()
+        })
+        stats.averages = AverageHistogram.from_dict(state["averages"])
+        return stats
+    
+    @property
+    def approval_rate(self):
+        """float: Fracción de estudiantes aprobados, o None si no hay estudiantes."""
+        return self.approved / self.students if self.students else None
+    
+    def average_histogram(self, bin_width=SUMMARY_BIN_WIDTH):
+        """
+        Agrupa el histograma de promedios en intervalos más anchos.
+        
+        Args:
+            bin_width (float, optional): Ancho de los intervalos.
+        
+        Returns:
+            dict: {'desde-hasta': estudiantes} en orden. Cada intervalo
+                incluye 'desde' y excluye 'hasta', salvo el último, que
+                incluye 5.0. Los promedios mayores a 5.0, si los hay, se
+                agrupan en '>5.0'.
+        """
+        per_bin = round(bin_width / AVERAGE_BIN_WIDTH)
+        histogram = {}
+        fine_counts = self.averages.counts
+        for start in range(0, len(AVERAGE_BINS), per_bin):
+            lower = AVERAGE_BINS[start]
+            upper = min(round(lower + per_bin * AVERAGE_BIN_WIDTH, 2), AVERAGE_MAX)
+            histogram[f"{lower:.2f}-{upper:.2f}"] = sum(fine_counts[start:start + per_bin])
+        if fine_counts[-1]:
+            histogram[f">{AVERAGE_MAX:.1f}"] = fine_counts[-1]
+        return histogram
+    
+    def summary(self):
+        """
+        Resume las estadísticas de la cohorte.
+        
+        Returns:
+            dict: Totales, tasa de aprobación, fallas por requisito y por
+                combinación (de mayor a menor) y distribución de promedios.
+        """
+        averages = self.averages
+        return {
+            "students": self.students,
+            "approved": self.approved,
+            "rejected": self.students - self.approved - self.indeterminate,
+            "not_found": self.not_found,
+            "indeterminate": self.indeterminate,
+            "approval_rate": self.approval_rate,
+            "failures_by_requirement": {name: self.failures.get(name, 0) for name in REQUIREMENT_NAMES},
+            "failures_by_combination": {
+                "+".join(failed): count for failed, count in self.combinations.most_common()
+            },
+            "average": {
+                "count": averages.count,
+                "mean": _round(averages.total / averages.count) if averages.count else None,
+                "min": averages.min,
+                "max": averages.max,
+                "quantiles": {
+                    f"p{round(q * 100)}": _round(averages.quantile(q)) for q in SUMMARY_QUANTILES
+                },
+                "histogram": self.average_histogram()
+            }
+        }
+    
+    def write(self, path):
+        """
+        Guarda el resumen en un archivo JSON de forma atómica.
+        
+        Args:
+            path (str): Ruta del archivo.
+        """
+        temp_path = os.fspath(path) + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
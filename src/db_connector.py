@@ -1,82 +1,363 @@
-"""
-Módulo para gestionar las conexiones a la base de datos.
-En un entorno real, este módulo se conectaría a una base de datos.
-Para pruebas unitarias, se utilizarán funciones simuladas.
-"""
-
-class DBConnector:
-    """Clase para gestionar la conexión a la base de datos."""
-    
-    def __init__(self, connection_string=None):
-        """
-        Inicializa la conexión a la base de datos.
-        
-        Args:
-            connection_string (str, optional): Cadena de conexión a la base de datos.
-        """
-        self.connection_string = connection_string
-        # En un entorno real, aquí se inicializaría la conexión
-
-    def check_student_enrollment(self, student_code):
-        """
-        Verifica si el estudiante está matriculado.
-        
-        Args:
-            student_code (str): Código del estudiante.
-            
-        Returns:
-            bool: True si el estudiante está matriculado, False en caso contrario.
-        """
-        # En un entorno real, aquí habría una consulta a la base de datos
-        # Para pruebas, se simula la respuesta
-        from src.mock_data import get_student_data
-        student_data = get_student_data(student_code)
-        return student_data.get("enrollment", False)
-    
-    def get_student_average(self, student_code):
-        """
-        Obtiene el promedio académico del estudiante.
-        
-        Args:
-            student_code (str): Código del estudiante.
-            
-        Returns:
-            float: Promedio académico del estudiante.
-        """
-        # En un entorno real, aquí habría una consulta a la base de datos
-        # Para pruebas, se simula la respuesta
-        from src.mock_data import get_student_data
-        student_data = get_student_data(student_code)
-        return student_data.get("average", 0.0)
-    
-    def check_university_welfare_status(self, student_code):
-        """
-        Verifica si el estudiante está a paz y salvo con Bienestar universitario.
-        
-        Args:
-            student_code (str): Código del estudiante.
-            
-        Returns:
-            bool: True si el estudiante está a paz y salvo, False en caso contrario.
-        """
-        # En un entorno real, aquí habría una consulta a la base de datos
-        # Para pruebas, se simula la respuesta
-        from src.mock_data import get_student_data
-        student_data = get_student_data(student_code)
-        return student_data.get("welfare", False)
-    
-    def check_graduation_payment(self, student_code):
-        """
-        Verifica si el estudiante ha pagado los derechos de grado.
-        
-        Args:
-            student_code (str): Código del estudiante.
-            
-        Returns:
-            bool: True si el estudiante ha pagado, False en caso contrario.
-        """
-        # En un entorno real, aquí habría una consulta a la base de datos
-        # Para pruebas, se simula la respuesta
-        from src.mock_data import get_student_data
-        student_data = get_student_data(student_code)
+"""
+Módulo para gestionar las conexiones a la base de datos.
+En un entorno real, este módulo se conectaría a una base de datos.
+Para pruebas unitarias, se utilizarán funciones simuladas.
+"""
+from src.single_flight import SingleFlight
+
+
+class StudentNotFound(dict):
+    """
+    Registro vacío que indica que el código no existe.
+    
+    Se comporta como el diccionario vacío que devuelven las consultas, pero es
+    de solo lectura y se puede distinguir con 'is STUDENT_NOT_FOUND'.
+    """
+    
+    __slots__ = ()
+    
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("STUDENT_NOT_FOUND es de solo lectura")
+    
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    
+    def __repr__(self):
+        return "STUDENT_NOT_FOUND"
+    
+    def __reduce__(self):
+        # Al deserializar se recupera la misma instancia del módulo
+        return "STUDENT_NOT_FOUND"
+
+
+STUDENT_NOT_FOUND = StudentNotFound()
+
+
+class DBConnector:
+    """Clase para gestionar la conexión a la base de datos."""
+    
+    # Si changed_since devuelve solo los registros modificados. Los datos
+    # simulados y los almacenes en memoria no registran fechas de modificación
+    tracks_changes = False
+    
+    def __init__(self, connection_string=None, cache=None, metrics=None, store=None, known_codes=None,
+                 coalesce=False, call_policy=None):
+        """
+        Inicializa la conexión a la base de datos.
+        
+        Args:
+            connection_string (str, optional): Cadena de conexión a la base de datos.
+            cache (RecordCache, optional): Caché de registros compartida por todos
+                los métodos de consulta. Si no se proporciona, cada consulta
+                accede a la base de datos.
+            metrics (Metrics, optional): Registro donde se miden la cantidad y la
+                latencia de las consultas. Si es None no se mide nada.
+            store (StudentStore, optional): Almacén en memoria (StudentStore o
+                ColumnarStudentStore) que responde las consultas en lugar de
+                los datos simulados.
+            known_codes (set or BloomFilter, optional): Índice de pertenencia de
+                los códigos existentes (ver src.membership). Los códigos que no
+                están en el índice se responden con STUDENT_NOT_FOUND sin
+                consultar la base de datos ni la caché.
+            coalesce (bool, optional): Agrupar las consultas simultáneas de un
+                mismo código de varios hilos en una sola (ver src.single_flight).
+                Las consultas ahorradas se cuentan en 'coalesced_queries'.
+            call_policy (CallPolicy, optional): Plazo, consulta de respaldo,
+                reintentos e interruptor de cada consulta (ver src.resilience).
+                Si es None las consultas se ejecutan sin plazo.
+        """
+        self.connection_string = connection_string
+        self.cache = cache
+        self.metrics = metrics
+        self.store = store
+        self.known_codes = known_codes
+        self.single_flight = SingleFlight(metrics) if coalesce else None
+        self.call_policy = call_policy
+        # En un entorno real, aquí se inicializaría la conexión
+    
+    def get_student_data(self, student_code):
+        """
+        Obtiene el registro completo de un estudiante, usando la caché si existe.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            dict: Datos del estudiante o un diccionario vacío si no existe.
+                Si el índice de pertenencia descarta el código, se devuelve
+                STUDENT_NOT_FOUND.
+        """
+        if self.known_codes is not None and student_code not in self.known_codes:
+            self._count_unknown(1)
+            return STUDENT_NOT_FOUND
+        
+        if self.cache is None:
+            return self._load_student_data(student_code)
+        
+        student_data = self.cache.get(student_code)
+        if student_data is None:
+            student_data = self._load_student_data(student_code)
+            self.cache.put(student_code, student_data)
+        return student_data
+    
+    def get_students_bulk(self, student_codes):
+        """
+        Obtiene los registros completos de varios estudiantes en una sola consulta.
+        
+        Si hay caché, solo se consultan los códigos que no están almacenados.
+        
+        Args:
+            student_codes (iterable): Códigos de los estudiantes.
+        
+        Returns:
+            dict: Diccionario {codigo_estudiante: datos} que solo incluye
+                los estudiantes que existen.
+        """
+        if self.known_codes is not None:
+            known_codes = self.known_codes
+            requested = student_codes if isinstance(student_codes, list) else list(student_codes)
+            student_codes = [code for code in requested if code in known_codes]
+            self._count_unknown(len(requested) - len(student_codes))
+            if not student_codes:
+                return {}
+        
+        if self.cache is None:
+            return self._load_students_bulk(student_codes)
+        
+        students_data = {}
+        missing_codes = []
+        for student_code in student_codes:
+            student_data = self.cache.get(student_code)
+            if student_data is None:
+                missing_codes.append(student_code)
+            elif student_data:
+                students_data[student_code] = student_data
+        
+        if missing_codes:
+            fetched = self._load_students_bulk(missing_codes)
+            for student_code in missing_codes:
+                student_data = fetched.get(student_code, {})
+                self.cache.put(student_code, student_data)
+                if student_data:
+                    students_data[student_code] = student_data
+        return students_data
+    
+    def changed_since(self, since):
+        """
+        Obtiene los registros modificados después de un instante dado.
+        
+        Si tracks_changes es False se devuelven todos los registros; quien
+        solo necesita los de un listado debería consultarlos directamente.
+        
+        Args:
+            since (float): Marca de tiempo (segundos desde la época) de la
+                última sincronización.
+        
+        Returns:
+            dict: Diccionario {codigo_estudiante: datos} de los registros modificados.
+        """
+        # Ni los datos simulados ni los almacenes en memoria registran la fecha
+        # de modificación, así que se devuelven todos los registros; quien
+        # llama compara huellas para descartar los que no cambiaron
+        if self.store is not None:
+            return dict(self.store.items())
+        from src.mock_data import ESTUDIANTES_DATA
+        return dict(ESTUDIANTES_DATA)
+    
+    def iter_student_records(self):
+        """
+        Recorre todos los registros de la base de datos.
+        
+        Yields:
+            tuple: (codigo, datos) por cada estudiante.
+        """
+        if self.store is not None:
+            yield from self.store.items()
+            return
+        from src.mock_data import ESTUDIANTES_DATA
+        yield from ESTUDIANTES_DATA.items()
+    
+    def invalidate(self, student_code=None):
+        """
+        Descarta registros de la caché para forzar una nueva consulta.
+        
+        Args:
+            student_code (str, optional): Código del estudiante a descartar.
+                Si es None, se descarta toda la caché.
+        """
+        if self.cache is not None:
+            self.cache.invalidate(student_code)
+    
+    def _count_unknown(self, count):
+        """
+        Cuenta los códigos descartados por el índice de pertenencia.
+        
+        Args:
+            count (int): Cantidad de códigos descartados.
+        """
+        if count and self.metrics is not None:
+            self.metrics.increment("unknown_codes_filtered", count)
+    
+    def _load_student_data(self, student_code):
+        """
+        Consulta un registro, compartiendo la consulta en curso si hay agrupación.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            dict: Datos del estudiante o un diccionario vacío si no existe.
+        """
+        if self.single_flight is None:
+            return self._query("query_student_data", self._fetch_student_data, student_code)
+        return self.single_flight.do(
+            student_code, self._query, "query_student_data", self._fetch_student_data, student_code
+        )
+    
+    def _load_students_bulk(self, student_codes):
+        """
+        Consulta varios registros, esperando los que otro hilo ya está consultando.
+        
+        Args:
+            student_codes (list): Códigos de los estudiantes.
+        
+        Returns:
+            dict: Diccionario {codigo_estudiante: datos} que solo incluye
+                los estudiantes que existen.
+        """
+        if self.single_flight is None:
+            return self._query("query_students_bulk", self._fetch_students_bulk, student_codes)
+        fetched = self.single_flight.do_many(
+            student_codes,
+            lambda codes: self._query("query_students_bulk", self._fetch_students_bulk, codes),
+            missing={}
+        )
+        return {student_code: student_data for student_code, student_data in fetched.items() if student_data}
+    
+    def _query(self, name, fetch, argument):
+        """
+        Ejecuta una consulta aplicando la política de llamadas, si hay una.
+        
+        Args:
+            name (str): Nombre del histograma de la consulta.
+            fetch (callable): Método _fetch_* a ejecutar.
+            argument (object): Argumento de la consulta.
+        
+        Returns:
+            object: Resultado de la consulta.
+        
+        Raises:
+            QueryUnavailableError: Si la política de llamadas no obtiene una
+                respuesta a tiempo.
+        """
+        if self.call_policy is None:
+            return self._measured_query(name, fetch, argument)
+        return self.call_policy.call(name, self._measured_query, name, fetch, argument)
+    
+    def _measured_query(self, name, fetch, argument):
+        """
+        Ejecuta un intento de consulta y, si hay métricas, lo cuenta y mide su latencia.
+        
+        Args:
+            name (str): Nombre del histograma de la consulta.
+            fetch (callable): Método _fetch_* a ejecutar.
+            argument (object): Argumento de la consulta.
+        
+        Returns:
+            object: Resultado de la consulta.
+        """
+        metrics = self.metrics
+        if metrics is None:
+            return fetch(argument)
+        metrics.increment("db_queries")
+        with metrics.timer(name):
+            return fetch(argument)
+    
+    def _fetch_student_data(self, student_code):
+        """
+        Consulta el registro de un estudiante en la base de datos, sin caché.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            dict: Datos del estudiante o un diccionario vacío si no existe.
+        """
+        if self.store is not None:
+            return self.store.get(student_code) or {}
+        
+        # En un entorno real, aquí habría una consulta a la base de datos
+        # Para pruebas, se simula la respuesta
+        from src.mock_data import get_student_data
+        return get_student_data(student_code)
+    
+    def _fetch_students_bulk(self, student_codes):
+        """
+        Consulta los registros de varios estudiantes en la base de datos, sin caché.
+        
+        Args:
+            student_codes (list): Códigos de los estudiantes.
+        
+        Returns:
+            dict: Diccionario {codigo_estudiante: datos} que solo incluye
+                los estudiantes que existen.
+        """
+        if self.store is not None:
+            return self.store.get_many(student_codes)
+        
+        # En un entorno real, aquí habría una única consulta del tipo
+        # SELECT ... WHERE codigo IN (...)
+        from src.mock_data import get_students_data
+        return get_students_data(student_codes)
+    
+    def check_student_enrollment(self, student_code):
+        """
+        Verifica si el estudiante está matriculado.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            bool: True si el estudiante está matriculado, False en caso contrario.
+        """
+        student_data = self.get_student_data(student_code)
+        return student_data.get("enrollment", False)
+    
+    def get_student_average(self, student_code):
+        """
+        Obtiene el promedio académico del estudiante.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            float: Promedio académico del estudiante.
+        """
+        student_data = self.get_student_data(student_code)
+        return student_data.get("average", 0.0)
+    
+    def check_university_welfare_status(self, student_code):
+        """
+        Verifica si el estudiante está a paz y salvo con Bienestar universitario.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            bool: True si el estudiante está a paz y salvo, False en caso contrario.
+        """
+        student_data = self.get_student_data(student_code)
+        return student_data.get("welfare", False)
+    
+    def check_graduation_payment(self, student_code):
+        """
+        Verifica si el estudiante ha pagado los derechos de grado.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            bool: True si el estudiante ha pagado, False en caso contrario.
+        """
+        student_data = self.get_student_data(student_code)
         return student_data.get("payment", False)
\ No newline at end of file
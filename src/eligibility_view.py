@@ -0,0 +1,583 @@
+"""
+Módulo con una tabla de elegibilidad materializada que se mantiene al día con eventos.
+
+En lugar de volver a validar toda la cohorte en cada ejecución, EligibilityTable
+guarda el registro y el veredicto de cada estudiante del listado y escucha
+eventos de cambio (matrícula, Bienestar, pago o un nuevo promedio). Cada evento
+vuelve a validar solo al estudiante afectado con las reglas de
+GraduationValidator, así que exportar el reporte es solo escribir la tabla.
+
+Un evento es un diccionario con el código del estudiante y una de estas formas:
+
+- {"code": "20210001", "changes": {"payment": true}}: cambia algunos campos de
+  un registro existente. Si el estudiante no tiene registro el evento se ignora,
+  porque solo un registro completo puede crear su fila.
+- {"code": "20210001", "record": {...}}: reemplaza el registro completo.
+- {"code": "20210001", "deleted": true}: el estudiante ya no existe.
+
+Los estudiantes cuyo registro no se pudo consultar a tiempo al materializar la
+tabla quedan INDETERMINATE, se guardan como tales y se vuelven a consultar
+mientras la tabla sigue la fuente de eventos (ver retry_unavailable).
+
+La fuente de eventos es intercambiable: cualquier objeto con poll(timeout) y
+position. Se incluyen una cola en memoria (QueueEventSource) y la lectura
+continua de un archivo de eventos en el que solo se agregan líneas JSON
+(LogEventSource, ver append_event).
+"""
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+
+from src.db_connector import STUDENT_NOT_FOUND, DBConnector
+from src.generate_report import _open_roster_or_report
+from src.report_writers import create_report_writer, open_output
+from src.roster import iter_student_codes
+from src.validacion_grado import INDETERMINATE, GraduationValidator
+
+# Versión del formato del archivo de estado de la tabla
+STATE_VERSION = 2
+
+# Marca que cierra una QueueEventSource
+_CLOSED = object()
+
+
+def append_event(path, event):
+    """
+    Agrega un evento a un archivo de eventos.
+    
+    Cada evento se escribe como una línea JSON en una sola escritura, de modo
+    que quien lee el archivo nunca ve un evento a medias seguido de otro.
+    
+    Args:
+        path (str): Ruta del archivo de eventos.
+        event (dict): Evento de cambio.
+    """
+    line = json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n"
+    with open(path, "ab") as f:
+        f.write(line)
+
+
+class QueueEventSource:
+    """Fuente de eventos en memoria para publicar cambios desde el mismo proceso."""
+    
+    # Las colas no se pueden retomar después de reiniciar el proceso
+    position = None
+    
+    def __init__(self, maxsize=0, max_batch=1024):
+        """
+        Inicializa la cola de eventos.
+        
+        Args:
+            maxsize (int, optional): Eventos pendientes antes de que publish
+                espere. 0 es sin límite.
+            max_batch (int, optional): Eventos máximos que entrega cada poll.
+        """
+        self.max_batch = max_batch
+        self._queue = queue.Queue(maxsize)
+    
+    def publish(self, event):
+        """
+        Publica un evento de cambio.
+        
+        Args:
+            event (dict): Evento de cambio.
+        """
+        self._queue.put(event)
+    
+    def close(self):
+        """Indica que no habrá más eventos; poll devuelve None tras los pendientes."""
+        self._queue.put(_CLOSED)
+    
+    def poll(self, timeout=None):
+        """
+        Espera eventos y entrega los que están disponibles.
+        
+        Args:
+            timeout (float, optional): Segundos máximos de espera. None espera
+                hasta que haya un evento.
+        
+        Returns:
+            list: Eventos disponibles (vacía si venció la espera), o None si la
+                fuente se cerró.
+        """
+        try:
+            item = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return []
+        events = []
+        while True:
+            if item is _CLOSED:
+                if events:
+                    # Los eventos leídos se entregan antes de informar el cierre
+                    self._queue.put(_CLOSED)
+                    return events
+                return None
+            events.append(item)
+            if len(events) >= self.max_batch:
+                return events
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return events
+
+
+class LogEventSource:
+    """Fuente de eventos que lee de forma continua un archivo de líneas JSON."""
+    
+    def __init__(self, path, position=0, poll_interval=0.1):
+        """
+        Inicializa la lectura del archivo.
+        
+        Args:
+            path (str): Ruta del archivo de eventos. Puede no existir todavía.
+            position (int, optional): Byte desde el que se lee, p. ej. la
+                posición guardada por EligibilityTable para retomar la lectura.
+            poll_interval (float, optional): Segundos entre lecturas cuando no
+                hay eventos nuevos.
+        """
+        self.path = path
+        self.position = position
+        self.poll_interval = poll_interval
+        self.malformed = 0
+        self._closed = False
+    
+    def close(self):
+        """Detiene la lectura: poll devuelve None cuando no quedan eventos."""
+        self._closed = True
+    
+    def _read(self):
+        """
+        Lee los eventos completos agregados desde la última lectura.
+        
+        Una línea sin salto final todavía se está escribiendo y se deja para
+        la siguiente lectura. Las líneas que no son JSON se cuentan en
+        malformed y se omiten.
+        
+        Returns:
+            list: Eventos leídos.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self.position)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        end = data.rfind(b"\n")
+        if end < 0:
+            return []
+        self.position += end + 1
+        events = []
+        for line in data[:end].split(b"\n"):
+            if not line.strip():
+                continue
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                self.malformed += 1
+        return events
+    
+    def poll(self, timeout=None):
+        """
+        Espera eventos nuevos en el archivo y entrega los disponibles.
+        
+        Args:
+            timeout (float, optional): Segundos máximos de espera. None espera
+                hasta que haya un evento o se cierre la fuente.
+        
+        Returns:
+            list: Eventos disponibles (vacía si venció la espera), o None si la
+                fuente se cerró.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            events = self._read()
+            if events:
+                return events
+            if self._closed:
+                return None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                time.sleep(min(self.poll_interval, remaining))
+            else:
+                time.sleep(self.poll_interval)
+
+
+class EligibilityTable:
+    """Registros y veredictos de los estudiantes del listado, actualizados por eventos."""
+    
+    def __init__(self, validator=None, student_codes=(), records=None, unavailable=()):
+        """
+        Inicializa la tabla.
+        
+        Args:
+            validator (GraduationValidator, optional): Validador cuyas reglas
+                deciden cada veredicto con validate_student_record. Si no se
+                proporciona, se crea uno nuevo.
+            student_codes (iterable, optional): Códigos del listado, en el orden
+                del reporte. Los eventos de otros códigos se ignoran.
+            records (dict, optional): Registros iniciales {codigo: datos}. Los
+                códigos sin registro se consideran inexistentes.
+            unavailable (iterable, optional): Códigos cuyo registro no se pudo
+                consultar; quedan INDETERMINATE hasta retry_unavailable.
+        """
+        self.validator = validator or GraduationValidator()
+        self.codes = list(student_codes)
+        self.position = None
+        self.events_applied = 0
+        self.verdict_changes = 0
+        self.ignored = 0
+        self._rows = {}
+        self._unavailable = set(unavailable)
+        self._lock = threading.Lock()
+        records = records or {}
+        for student_code in self.codes:
+            if student_code in self._rows:
+                continue
+            if student_code in self._unavailable:
+                self._rows[student_code] = self._indeterminate()
+            else:
+                self._rows[student_code] = self._evaluate(records.get(student_code, STUDENT_NOT_FOUND))
+    
+    @classmethod
+    def from_roster(cls, validator=None, roster_path='estudiantes.txt', encoding=None):
+        """
+        Materializa la tabla validando una vez a todos los estudiantes del listado.
+        
+        Args:
+            validator (GraduationValidator, optional): Validador de requisitos.
+            roster_path (str, optional): Ruta del listado de estudiantes.
+            encoding (str, optional): Codificación del listado.
+        
+        Returns:
+            EligibilityTable: Tabla materializada, o None si el listado no existe.
+        """
+        roster = _open_roster_or_report(roster_path, encoding)
+        if roster is None:
+            return None
+        validator = validator or GraduationValidator()
+        table = cls(validator)
+        with roster:
+            for student_code, student_data, graduation_status, requirements in \
+                    validator.validate_students_bulk(iter_student_codes(roster)):
+                table.codes.append(student_code)
+                table._rows[student_code] = (student_data, graduation_status, requirements)
+                if graduation_status is INDETERMINATE and not student_data:
+                    table._unavailable.add(student_code)
+        return table
+    
+    def __len__(self):
+        return len(self.codes)
+    
+    @property
+    def unavailable(self):
+        """int: Estudiantes cuyo registro aún no se pudo consultar."""
+        return len(self._unavailable)
+    
+    def _indeterminate(self):
+        """
+        Construye la fila de un estudiante cuyo registro no se pudo consultar.
+        
+        Returns:
+            tuple: (datos, INDETERMINATE, dict) de la fila del estudiante.
+        """
+        return {}, INDETERMINATE, self.validator.indeterminate_requirements()
+    
+    def _evaluate(self, student_data):
+        """
+        Valida un registro sin consultar la base de datos.
+        
+        Args:
+            student_data (dict): Datos del estudiante.
+        
+        Returns:
+            tuple: (datos, bool, dict) de la fila del estudiante.
+        """
+        graduation_status, requirements = self.validator.validate_student_record(student_data)
+        return student_data, graduation_status, requirements
+    
+    def get(self, student_code):
+        """
+        Consulta el veredicto materializado de un estudiante.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            tuple: (datos, bool, dict), o None si el código no está en la tabla.
+        """
+        with self._lock:
+            return self._rows.get(student_code)
+    
+    def apply(self, event):
+        """
+        Aplica un evento de cambio y vuelve a validar solo al estudiante afectado.
+        
+        Args:
+            event (dict): Evento de cambio (ver la documentación del módulo).
+        
+        Returns:
+            bool: True si cambió el veredicto o el detalle de requisitos. Los
+                eventos de códigos fuera del listado y los cambios parciales de
+                estudiantes sin registro se cuentan en ignored y devuelven False.
+                Un estudiante INDETERMINATE solo se actualiza con un registro
+                completo o una baja; sus cambios parciales ya estarán en el
+                registro que traiga retry_unavailable.
+        
+        Raises:
+            ValueError: Si el evento no indica el código del estudiante.
+        """
+        student_code = event.get("code")
+        if student_code is None:
+            raise ValueError(f"Evento sin código de estudiante: {event!r}")
+        with self._lock:
+            current = self._rows.get(student_code)
+            if current is None:
+                self.ignored += 1
+                return False
+            if event.get("deleted"):
+                student_data = STUDENT_NOT_FOUND
+            elif "record" in event:
+                student_data = event["record"] or STUDENT_NOT_FOUND
+            elif current[0]:
+                student_data = {**current[0], **event.get("changes", {})}
+            else:
+                # Unos pocos campos no forman un registro válido
+                self.ignored += 1
+                return False
+            row = self._evaluate(student_data)
+            self._rows[student_code] = row
+            self._unavailable.discard(student_code)
+            self.events_applied += 1
+            changed = row[1:] != current[1:]
+            if changed:
+                self.verdict_changes += 1
+            return changed
+    
+    def apply_many(self, events):
+        """
+        Aplica varios eventos en orden.
+        
+        Args:
+            events (iterable): Eventos de cambio.
+        
+        Returns:
+            int: Cantidad de estudiantes cuyo veredicto cambió.
+        """
+        return sum(self.apply(event) for event in events)
+    
+    def retry_unavailable(self):
+        """
+        Vuelve a consultar a los estudiantes INDETERMINATE por lotes.
+        
+        Los que siguen sin responder conservan su fila. Un evento que llegue
+        durante la consulta tiene prioridad sobre el registro consultado.
+        
+        Returns:
+            int: Cantidad de estudiantes que se pudieron consultar.
+        """
+        with self._lock:
+            if not self._unavailable:
+                return 0
+            codes = [student_code for student_code in self.codes if student_code in self._unavailable]
+        resolved = 0
+        for student_code, student_data, graduation_status, requirements in \
+                self.validator.validate_students_bulk(codes):
+            if graduation_status is INDETERMINATE and not student_data:
+                continue
+            with self._lock:
+                if student_code not in self._unavailable:
+                    continue
+                self._unavailable.discard(student_code)
+                self._rows[student_code] = (student_data, graduation_status, requirements)
+                self.verdict_changes += 1
+                resolved += 1
+        return resolved
+    
+    def follow(self, source, stop=None, timeout=0.5, on_batch=None):
+        """
+        Aplica los eventos de una fuente hasta que se cierre o se active stop.
+        
+        Antes de cada poll se vuelve a consultar a los estudiantes
+        INDETERMINATE, si los hay (ver retry_unavailable).
+        
+        Args:
+            source (object): Fuente con poll(timeout) y position, p. ej.
+                QueueEventSource o LogEventSource.
+            stop (threading.Event, optional): Señal para dejar de escuchar.
+            timeout (float, optional): Espera máxima de cada poll, para revisar
+                stop con esa frecuencia.
+            on_batch (callable, optional): Función que recibe la tabla y la
+                cantidad de veredictos cambiados después de cada lote, p. ej.
+                para exportar la tabla.
+        """
+        while stop is None or not stop.is_set():
+            retried = self.retry_unavailable()
+            events = source.poll(timeout)
+            if events is None:
+                if retried and on_batch is not None:
+                    on_batch(self, retried)
+                return
+            if not events and not retried:
+                continue
+            changed = retried + self.apply_many(events)
+            with self._lock:
+                self.position = source.position
+            if on_batch is not None:
+                on_batch(self, changed)
+    
+    def results(self):
+        """
+        Copia las filas de la tabla en el orden del listado.
+        
+        Returns:
+            list: Tuplas (codigo, datos, bool, dict), el mismo formato de
+                GraduationValidator.validate_students_bulk.
+        """
+        with self._lock:
+            rows = self._rows
+            return [(student_code, *rows[student_code]) for student_code in self.codes]
+    
+    def export(self, file_path='resultado_graduacion.csv', output_format='csv', compression=None):
+        """
+        Escribe el reporte a partir de la tabla, sin validar ni consultar nada.
+        
+        El resultado es idéntico al de generate_graduation_csv_report con los
+        mismos registros. El archivo se reemplaza de forma atómica, así que
+        quien lo lee nunca ve un reporte a medio escribir.
+        
+        Args:
+            file_path (str, optional): Ruta del reporte.
+            output_format (str, optional): 'csv', 'jsonl' o 'columnar'.
+            compression (str, optional): None, 'gzip' o 'zstd'.
+        
+        Returns:
+            int: Cantidad de filas escritas.
+        """
+        results = self.results()
+        temp_path = os.fspath(file_path) + ".tmp"
+        writer = create_report_writer(open_output(temp_path, compression), output_format)
+        try:
+            writer.write_header()
+            rows_written = writer.write_rows(results)
+        finally:
+            writer.close()
+        os.replace(temp_path, file_path)
+        return rows_written
+    
+    def save(self, path):
+        """
+        Guarda los registros de la tabla y la posición de la fuente de forma atómica.
+        
+        Los veredictos no se guardan: se recalculan al cargar, sin consultas,
+        con las reglas del validador que se use entonces. Los estudiantes
+        INDETERMINATE se guardan aparte, en 'unavailable', para volver a
+        consultarlos después de cargar la tabla.
+        
+        Args:
+            path (str): Ruta del archivo de estado.
+        """
+        with self._lock:
+            state = {
+                "version": STATE_VERSION,
+                "position": self.position,
+                "codes": list(self.codes),
+                "records": {
+                    student_code: (student_data if student_data is not STUDENT_NOT_FOUND else None)
+                    for student_code, (student_data, _, _) in self._rows.items()
+                    if student_code not in self._unavailable
+                },
+                "unavailable": [code for code in self.codes if code in self._unavailable]
+            }
+        # Los registros no se modifican, se reemplazan: la copia se escribe sin el candado
+        temp_path = os.fspath(path) + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+    
+    @classmethod
+    def load(cls, path, validator=None):
+        """
+        Lee una tabla guardada con save.
+        
+        Args:
+            path (str): Ruta del archivo de estado.
+            validator (GraduationValidator, optional): Validador de requisitos.
+        
+        Returns:
+            EligibilityTable: Tabla leída, o None si no existe o tiene otro formato.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if state.get("version") != STATE_VERSION:
+            return None
+        records = {code: data for code, data in state["records"].items() if data is not None}
+        table = cls(validator, state["codes"], records, state["unavailable"])
+        table.position = state["position"]
+        return table
+
+
+def main(argv=None):
+    """
+    Mantiene el reporte al día a partir de un archivo de eventos.
+    
+    Args:
+        argv (list, optional): Argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Tabla de elegibilidad actualizada por eventos.")
+    parser.add_argument("events", help="Archivo de eventos (una línea JSON por evento).")
+    parser.add_argument("-o", "--output", default="resultado_graduacion.csv", help="Reporte a mantener.")
+    parser.add_argument("--state",
+                        help="Estado de la tabla. Por defecto, el reporte seguido de '.view.json'.")
+    parser.add_argument("--roster", default="estudiantes.txt", help="Listado de estudiantes.")
+    parser.add_argument("--encoding", default=None, help="Codificación del listado.")
+    parser.add_argument("--sqlite",
+                        help="Base SQLite de la carga inicial. Por defecto, los datos simulados.")
+    parser.add_argument("--interval", type=float, default=5.0,
+                        help="Segundos mínimos entre exportaciones del reporte.")
+    parser.add_argument("--once", action="store_true",
+                        help="Aplicar los eventos pendientes, exportar y terminar.")
+    args = parser.parse_args(argv)
+    state_path = args.state or args.output + ".view.json"
+    
+    if args.sqlite:
+        from src.sqlite_connector import SQLiteDBConnector
+        db_connector = SQLiteDBConnector(args.sqlite)
+    else:
+        db_connector = DBConnector()
+    validator = GraduationValidator(db_connector=db_connector)
+    table = EligibilityTable.load(state_path, validator)
+    if table is None:
+        table = EligibilityTable.from_roster(validator, args.roster, args.encoding)
+        if table is None:
+            return
+    source = LogEventSource(args.events, position=table.position or 0)
+    last_export = [0.0]
+    
+    def checkpoint(table, changed, force=False):
+        if force or time.monotonic() - last_export[0] >= args.interval:
+            table.export(args.output)
+            table.save(state_path)
+            last_export[0] = time.monotonic()
+    
+    if args.once:
+        source.close()
+    try:
+        table.follow(source, on_batch=checkpoint)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        checkpoint(table, 0, force=True)
+    print(f"Reporte actualizado en '{args.output}': {table.events_applied} eventos aplicados, "
+          f"{table.verdict_changes} veredictos cambiados")
+
+
+if __name__ == "__main__":
+    main()
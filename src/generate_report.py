@@ -1,67 +1,311 @@
-"""
-Módulo para generar reportes de cumplimiento de requisitos de graduación.
-"""
-import csv
-from src.validacion_grado import GraduationValidator
-from src.mock_data import get_student_data
-
-def generate_graduation_csv_report(file_path='resultado_graduacion.csv'):
-    """
-    Genera un reporte CSV con el resultado de la validación de requisitos de graduación
-    para los estudiantes listados en el archivo 'estudiantes.txt'.
-    
-    Args:
-        file_path (str, optional): Ruta del archivo CSV a generar.
-            Por defecto es 'resultado_graduacion.csv'.
-    """
-    # Leer los códigos de estudiantes del archivo
-    try:
-        with open('estudiantes.txt', 'r') as f:
-            student_codes = [line.strip() for line in f if line.strip()]
-    except FileNotFoundError:
-        print("Error: No se encontró el archivo 'estudiantes.txt'")
-        return
-    
-    # Crear el validador
-    validator = GraduationValidator()
-    
-    # Crear el archivo CSV
-    with open(file_path, 'w', newline='') as csvfile:
-        # Definir los campos del CSV
-        fieldnames = [
-            'Código', 
-            'Nombre', 
-            'Matriculado', 
-            'Promedio Mínimo', 
-            'Paz y Salvo Bienestar', 
-            'Derechos de Grado Pagados', 
-            'Resultado'
-        ]
-        
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        # Procesar cada estudiante
-        for student_code in student_codes:
-            # Obtener los resultados de la validación
-            graduation_status, requirements = validator.validate_graduation_requirements(student_code)
-            
-            # Obtener el nombre del estudiante
-            student_data = get_student_data(student_code)
-            student_name = student_data.get('nombre', 'Desconocido')
-            
-            # Escribir los resultados en el CSV
-            writer.writerow({
-                'Código': student_code,
-                'Nombre': student_name,
-                'Matriculado': 'Sí' if requirements['matriculado'] else 'No',
-                'Promedio Mínimo': 'Sí' if requirements['promedio_minimo'] else 'No',
-                'Paz y Salvo Bienestar': 'Sí' if requirements['paz_y_salvo_bienestar'] else 'No',
-                'Derechos de Grado Pagados': 'Sí' if requirements['derechos_de_grado_pagados'] else 'No',
-                'Resultado': 'APROBADO' if graduation_status else 'RECHAZADO'
-            })
-    
-    print(f"Reporte generado exitosamente en '{file_path}'")
-
-if __name__ == "__main__":
-    generate_graduation_csv_report()
\ No newline at end of file
+"""
+Módulo para generar reportes de cumplimiento de requisitos de graduación.
+"""
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from src.cohort_stats import CohortStats
+from src.report_writers import create_report_writer, open_output
+from src.roster import batched, iter_student_codes, open_roster
+from src.validacion_grado import BULK_BATCH_SIZE, GraduationValidator
+
+# Tipos de pool para validar bloques en paralelo
+EXECUTORS = ('thread', 'process')
+
+
+def _validate_chunk(validator, student_codes):
+    """
+    Valida un bloque de estudiantes.
+    
+    Args:
+        validator (GraduationValidator): Validador de requisitos.
+        student_codes (list): Códigos de los estudiantes del bloque.
+    
+    Returns:
+        list: Tuplas (codigo, datos, bool, dict) en el orden de student_codes.
+    """
+    return list(validator.validate_students_bulk(student_codes, batch_size=len(student_codes)))
+
+
+# Validador de cada proceso del pool, creado una sola vez por proceso
+_worker_validator = None
+
+
+def _init_process_worker(validator):
+    """
+    Inicializa un proceso del pool con su propia copia del validador.
+    
+    Args:
+        validator (GraduationValidator): Validador a usar en el proceso.
+    """
+    global _worker_validator
+    _worker_validator = validator
+
+
+def _run_chunk_in_process(chunk_fn, student_codes):
+    """
+    Procesa un bloque de estudiantes con el validador del proceso actual.
+    
+    Args:
+        chunk_fn (callable): Función (validador, códigos) -> lista. Debe poder
+            serializarse con pickle, es decir, estar definida a nivel de módulo.
+        student_codes (list): Códigos de los estudiantes del bloque.
+    
+    Returns:
+        list: Resultado de chunk_fn, en el orden de student_codes.
+    """
+    return chunk_fn(_worker_validator, student_codes)
+
+
+def _check_executor(executor):
+    """
+    Verifica el tipo de pool antes de abrir archivos.
+    
+    Los resultados se generan de forma perezosa, así que sin esta verificación
+    el error aparecería con el reporte ya creado y vacío.
+    
+    Args:
+        executor (str): Tipo de pool.
+    
+    Raises:
+        ValueError: Si el tipo de pool no está en EXECUTORS.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Tipo de pool desconocido: {executor!r}")
+
+
+def _ordered_parallel_map(executor, fn, iterable, max_pending):
+    """
+    Aplica fn en paralelo y entrega los resultados en el orden de entrada.
+    
+    A diferencia de Executor.map, solo mantiene max_pending tareas enviadas,
+    por lo que no consume el iterable completo por adelantado.
+    
+    Args:
+        executor (Executor): Pool de hilos o procesos.
+        fn (callable): Función a aplicar a cada elemento.
+        iterable (iterable): Elementos de entrada.
+        max_pending (int): Cantidad máxima de tareas sin recoger.
+    
+    Yields:
+        object: Resultado de fn para cada elemento, en orden.
+    """
+    pending = deque()
+    try:
+        for item in iterable:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _iter_results(validator, student_codes, workers, executor, chunk_size, chunk_fn=_validate_chunk):
+    """
+    Valida los estudiantes y entrega sus resultados en orden.
+    
+    Args:
+        validator (GraduationValidator): Validador de requisitos.
+        student_codes (iterable): Códigos de los estudiantes.
+        workers (int): Cantidad de hilos o procesos. Con 1 no se crea pool.
+        executor (str): 'thread' o 'process'.
+        chunk_size (int): Cantidad de estudiantes por bloque.
+        chunk_fn (callable, optional): Función (validador, códigos) -> lista
+            que procesa cada bloque. Por defecto, _validate_chunk.
+    
+    Yields:
+        object: Elementos de las listas de chunk_fn; con la función por
+            defecto, tuplas (codigo, datos, bool, dict) por estudiante.
+    """
+    if workers <= 1:
+        if chunk_fn is _validate_chunk:
+            yield from validator.validate_students_bulk(student_codes, batch_size=chunk_size)
+        else:
+            for chunk in batched(student_codes, chunk_size):
+                yield from chunk_fn(validator, chunk)
+        return
+    
+    if executor == 'thread':
+        pool = ThreadPoolExecutor(max_workers=workers)
+        fn = partial(chunk_fn, validator)
+    elif executor == 'process':
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_process_worker,
+            initargs=(validator,)
+        )
+        fn = partial(_run_chunk_in_process, chunk_fn)
+    else:
+        raise ValueError(f"Tipo de pool desconocido: {executor!r}")
+    
+    with pool:
+        chunks = batched(student_codes, chunk_size)
+        for results in _ordered_parallel_map(pool, fn, chunks, max_pending=2 * workers):
+            yield from results
+
+
+def _open_roster_or_report(roster_path, encoding):
+    """
+    Abre el listado de estudiantes, informando si no existe.
+    
+    Args:
+        roster_path (str): Ruta del listado, '.gz' o '-' para la entrada estándar.
+        encoding (str): Codificación del listado.
+    
+    Returns:
+        io.TextIOBase: Flujo del listado, o None si el archivo no existe.
+    """
+    try:
+        return open_roster(roster_path, encoding=encoding)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo '{roster_path}'")
+        return None
+
+
+def generate_graduation_csv_report(file_path='resultado_graduacion.csv', validator=None,
+                                   workers=1, executor='thread', chunk_size=BULK_BATCH_SIZE,
+                                   roster_path='estudiantes.txt', encoding=None, metrics=None,
+                                   output_format='csv', compression=None, stats_path=None,
+                                   student_reports_path=None):
+    """
+    Genera un reporte CSV con el resultado de la validación de requisitos de graduación
+    para los estudiantes listados en el archivo 'estudiantes.txt'.
+    
+    El listado se procesa como un flujo (leer códigos, validar por bloques y
+    escribir filas), por lo que la memoria usada no depende de su tamaño.
+    
+    Args:
+        file_path (str, optional): Ruta del archivo CSV a generar.
+            Por defecto es 'resultado_graduacion.csv'.
+        validator (GraduationValidator, optional): Validador de requisitos.
+            Si no se proporciona, se crea uno nuevo.
+        workers (int, optional): Cantidad de hilos o procesos que validan
+            bloques del listado en paralelo. Por defecto 1 (sin paralelismo).
+        executor (str, optional): 'thread' para conectores limitados por E/S o
+            'process' para reglas costosas en CPU. El validador debe poder
+            serializarse con pickle para usar procesos.
+        chunk_size (int, optional): Cantidad de estudiantes por bloque.
+        roster_path (str, optional): Ruta del listado de estudiantes. Puede ser
+            un archivo '.gz' o '-' para leer de la entrada estándar.
+        encoding (str, optional): Codificación del listado. Por defecto, la
+            del sistema.
+        metrics (Metrics, optional): Registro donde se guardan la cantidad de
+            filas y la duración del reporte. Para medir también las consultas y
+            las verificaciones, el mismo registro debe darse al conector y al
+            validador (las mediciones hechas en procesos del pool se pierden).
+        output_format (str, optional): 'csv' (por defecto), 'jsonl' o
+            'columnar'. Ver src.report_writers.
+        compression (str, optional): None, 'gzip' o 'zstd'. La extensión de
+            file_path no se modifica.
+        stats_path (str, optional): Si se indica, se calculan las estadísticas
+            de la cohorte durante la misma pasada y se guardan en este archivo
+            JSON (ver src.cohort_stats).
+        student_reports_path (str, optional): Si se indica, se escriben
+            durante la misma pasada los informes individuales en este
+            directorio o archivo .zip, .tar, .tar.gz o .tgz (ver
+            src.student_reports), sin volver a validar el listado.
+    
+    Raises:
+        ValueError: Si executor no es un tipo de pool conocido. Se verifica
+            antes de crear el reporte.
+    """
+    _check_executor(executor)
+    
+    # Abrir el listado de estudiantes antes de crear el CSV
+    roster = _open_roster_or_report(roster_path, encoding)
+    if roster is None:
+        return
+    
+    # Crear el validador
+    validator = validator or GraduationValidator()
+    
+    # Crear el archivo del reporte
+    start = time.perf_counter()
+    student_reports = None
+    with roster:
+        writer = create_report_writer(open_output(file_path, compression), output_format)
+        try:
+            writer.write_header()
+            
+            # Procesar los estudiantes por bloques: una consulta por bloque
+            # entrega todos los datos necesarios, incluido el nombre. Las filas
+            # se escriben a medida que terminan los bloques, en el orden original
+            student_codes = iter_student_codes(roster)
+            results = _iter_results(validator, student_codes, workers, executor, chunk_size)
+            stats = None
+            if stats_path is not None:
+                stats = CohortStats()
+                results = stats.observe_results(results)
+            if student_reports_path is not None:
+                from src.student_reports import StudentReportWriter
+                student_reports = StudentReportWriter(student_reports_path, validator)
+                results = student_reports.observe_results(results)
+            rows_written = writer.write_rows(results)
+        finally:
+            writer.close()
+            if student_reports is not None:
+                student_reports.close()
+    
+    if stats is not None:
+        stats.write(stats_path)
+    
+    if metrics is not None:
+        metrics.increment('report_rows', rows_written)
+        metrics.set_gauge('report_seconds', time.perf_counter() - start)
+    
+    print(f"Reporte generado exitosamente en '{file_path}'")
+    if student_reports is not None:
+        student_reports.print_summary()
+
+
+async def generate_graduation_csv_report_async(file_path='resultado_graduacion.csv', validator=None,
+                                               roster_path='estudiantes.txt', encoding=None,
+                                               output_format='csv', compression=None):
+    """
+    Genera el mismo reporte CSV que generate_graduation_csv_report validando
+    varios estudiantes de forma concurrente.
+    
+    Las filas se escriben en el orden del listado de estudiantes.
+    
+    Args:
+        file_path (str, optional): Ruta del archivo CSV a generar.
+            Por defecto es 'resultado_graduacion.csv'.
+        validator (AsyncGraduationValidator, optional): Validador asíncrono.
+            Si no se proporciona, se crea uno nuevo.
+        roster_path (str, optional): Ruta del listado de estudiantes.
+        encoding (str, optional): Codificación del listado.
+        output_format (str, optional): 'csv', 'jsonl' o 'columnar'.
+        compression (str, optional): None, 'gzip' o 'zstd'.
+    """
+    from src.async_validacion import AsyncGraduationValidator
+    
+    roster = _open_roster_or_report(roster_path, encoding)
+    if roster is None:
+        return
+    
+    validator = validator or AsyncGraduationValidator()
+    
+    with roster:
+        writer = create_report_writer(open_output(file_path, compression), output_format)
+        try:
+            writer.write_header()
+            
+            # Escribir por bloques para no hacer una escritura por estudiante
+            block = []
+            async for result in validator.validate_students(iter_student_codes(roster)):
+                block.append(result)
+                if len(block) >= writer.buffer_rows:
+                    writer.write_rows(block)
+                    block.clear()
+            writer.write_rows(block)
+        finally:
+            writer.close()
+    
+    print(f"Reporte generado exitosamente en '{file_path}'")
+
+if __name__ == "__main__":
+    generate_graduation_csv_report()
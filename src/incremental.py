@@ -0,0 +1,320 @@
+"""
+Módulo para actualizar el reporte CSV de forma incremental.
+Junto al reporte se guarda un archivo de estado con la huella de cada registro y
+el promedio mínimo usado; en cada ejecución solo se vuelven a validar los
+estudiantes cuyos registros cambiaron desde la sincronización anterior y los
+que quedaron INDETERMINADO porque su consulta no respondió a tiempo.
+"""
+import csv
+import hashlib
+import io
+import itertools
+import json
+import os
+import time
+
+from src.db_connector import STUDENT_NOT_FOUND
+from src.generate_report import _open_roster_or_report
+from src.report_writers import INDETERMINATE_TEXT, create_report_writer, open_input, open_output
+from src.resilience import QueryUnavailableError
+from src.roster import STDIN_SOURCE, batched, iter_student_codes
+from src.validacion_grado import BULK_BATCH_SIZE, INDETERMINATE, REQUIREMENT_NAMES, GraduationValidator
+
+# Versión del formato del archivo de estado
+STATE_VERSION = 1
+
+# Campos del registro que determinan el resultado de un estudiante
+FINGERPRINT_FIELDS = ("nombre", "enrollment", "average", "welfare", "payment")
+
+
+def record_fingerprint(student_data):
+    """
+    Calcula una huella corta del contenido de un registro.
+    
+    Args:
+        student_data (dict): Datos del estudiante.
+    
+    Returns:
+        str: Huella hexadecimal de 16 caracteres.
+    """
+    payload = "\x1f".join(repr(student_data.get(field)) for field in FINGERPRINT_FIELDS)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _load_state(state_path):
+    """
+    Lee el archivo de estado de la ejecución anterior.
+    
+    Args:
+        state_path (str): Ruta del archivo de estado.
+    
+    Returns:
+        dict: Estado guardado, o None si no existe o tiene otro formato.
+    """
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if state.get("version") != STATE_VERSION:
+        return None
+    return state
+
+
+def _save_state(state_path, min_average, synced_at, students, compression=None):
+    """
+    Guarda el archivo de estado de forma atómica.
+    
+    Args:
+        state_path (str): Ruta del archivo de estado.
+        min_average (float): Promedio mínimo usado en la validación.
+        synced_at (float): Instante de la consulta a la base de datos.
+        students (list): Pares [codigo, huella] en el orden del listado. La
+            huella es None si el estudiante quedó INDETERMINADO.
+        compression (str, optional): Compresión del reporte.
+    """
+    temp_path = state_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": STATE_VERSION,
+            "min_average": min_average,
+            "compression": compression,
+            "synced_at": synced_at,
+            "students": students
+        }, f)
+    os.replace(temp_path, state_path)
+
+
+def _roster_matches(roster_path, encoding, students):
+    """
+    Compara el listado, leído como flujo, con el del archivo de estado.
+    
+    Args:
+        roster_path (str): Ruta del listado de estudiantes.
+        encoding (str): Codificación del listado.
+        students (list): Pares [codigo, huella] del archivo de estado.
+    
+    Returns:
+        bool: True si el listado tiene los mismos códigos en el mismo orden,
+            False si cambió, o None si el listado no existe.
+    """
+    roster = _open_roster_or_report(roster_path, encoding)
+    if roster is None:
+        return None
+    with roster:
+        count = 0
+        for count, student_code in enumerate(iter_student_codes(roster), 1):
+            if count > len(students) or students[count - 1][0] != student_code:
+                return False
+    return count == len(students)
+
+
+def _rebuild_report(file_path, state_path, validator, roster, compression):
+    """
+    Genera el reporte completo y su archivo de estado.
+    
+    Args:
+        file_path (str): Ruta del reporte CSV.
+        state_path (str): Ruta del archivo de estado.
+        validator (GraduationValidator): Validador de requisitos.
+        roster (io.TextIOBase): Flujo del listado de estudiantes.
+        compression (str): Compresión del reporte (ver src.report_writers).
+    
+    Returns:
+        int: Cantidad de filas escritas.
+    """
+    synced_at = time.time()
+    students = []
+    
+    def fingerprinted(results):
+        for result in results:
+            # Sin huella, el estudiante se vuelve a consultar en la próxima actualización
+            fingerprint = None if result[2] is INDETERMINATE else record_fingerprint(result[1])
+            students.append([result[0], fingerprint])
+            yield result
+    
+    temp_path = file_path + ".tmp"
+    writer = create_report_writer(open_output(temp_path, compression), "csv")
+    try:
+        writer.write_header()
+        writer.write_rows(fingerprinted(validator.validate_students_bulk(iter_student_codes(roster))))
+    finally:
+        writer.close()
+    os.replace(temp_path, file_path)
+    _save_state(state_path, validator.min_average, synced_at, students, compression)
+    return len(students)
+
+
+def _result_from_row(row):
+    """
+    Reconstruye el resultado de validación de una fila del reporte CSV.
+    
+    Args:
+        row (list): Valores de la fila en el orden de CSV_FIELDNAMES.
+    
+    Returns:
+        tuple: (codigo, datos, bool, dict) que CSVReportWriter vuelve a
+            escribir como la misma fila.
+    """
+    requirements = {
+        name: INDETERMINATE if value == INDETERMINATE_TEXT else value == 'Sí'
+        for name, value in zip(REQUIREMENT_NAMES, row[2:6])
+    }
+    graduation_status = INDETERMINATE if row[6] == INDETERMINATE_TEXT else row[6] == 'APROBADO'
+    return row[0], {'nombre': row[1]}, graduation_status, requirements
+
+
+def _patch_report(file_path, validator, updates, compression):
+    """
+    Reescribe únicamente las filas de los estudiantes modificados.
+    
+    El archivo se copia fila por fila a un temporal que luego reemplaza al
+    original, de modo que un fallo no deja el reporte a medio escribir.
+    
+    Args:
+        file_path (str): Ruta del reporte CSV.
+        validator (GraduationValidator): Validador de requisitos.
+        updates (dict): Diccionario {codigo: datos} de los registros modificados.
+        compression (str): Compresión del reporte (ver src.report_writers).
+    """
+    def patched(reader):
+        for row in reader:
+            student_data = updates.get(row[0])
+            if student_data is None:
+                yield _result_from_row(row)
+            else:
+                graduation_status, requirements = validator.validate_student_record(student_data, row[0])
+                yield row[0], student_data, graduation_status, requirements
+    
+    temp_path = file_path + ".tmp"
+    # Sin codificación explícita, igual que CSVReportWriter
+    with io.TextIOWrapper(open_input(file_path, compression), newline="") as source:
+        reader = csv.reader(source)
+        next(reader)
+        writer = create_report_writer(open_output(temp_path, compression), "csv")
+        try:
+            writer.write_header()
+            writer.write_rows(patched(reader))
+        finally:
+            writer.close()
+    os.replace(temp_path, file_path)
+
+
+def _iter_roster_records(db_connector, student_codes):
+    """
+    Consulta por lotes los registros de los estudiantes del listado.
+    
+    Se usa con conectores que no registran fechas de modificación, para no
+    recorrer toda la tabla con changed_since, y para volver a consultar a los
+    estudiantes INDETERMINADO. Los lotes cuya consulta no responde a tiempo se
+    omiten: sus filas y huellas no cambian y se intentan en la próxima
+    actualización.
+    
+    Args:
+        db_connector (DBConnector): Conector a la base de datos.
+        student_codes (iterable): Códigos de los estudiantes.
+    
+    Yields:
+        tuple: (codigo, datos) por cada estudiante; STUDENT_NOT_FOUND si no existe.
+    """
+    # La caché podría tener registros anteriores a los cambios
+    db_connector.invalidate()
+    for batch in batched(student_codes, BULK_BATCH_SIZE):
+        try:
+            students_data = db_connector.get_students_bulk(batch)
+        except QueryUnavailableError:
+            continue
+        for student_code in batch:
+            yield student_code, students_data.get(student_code, STUDENT_NOT_FOUND)
+
+
+def update_graduation_csv_report(file_path='resultado_graduacion.csv', validator=None,
+                                 roster_path='estudiantes.txt', encoding=None, state_path=None,
+                                 compression=None):
+    """
+    Actualiza el reporte CSV volviendo a validar solo los registros modificados.
+    
+    Se regenera el reporte completo si no hay estado previo, si cambió el
+    promedio mínimo, la compresión o el listado de estudiantes. En otro caso
+    se buscan los registros modificados y se reescriben solo las filas cuya
+    huella cambió. Si el conector registra fechas de modificación
+    (tracks_changes), se consultan con changed_since; si no, se consultan por
+    lotes los registros del listado. Los estudiantes que quedaron INDETERMINADO
+    se vuelven a consultar en cada actualización. Los estudiantes eliminados de
+    la base de datos no se detectan de forma incremental.
+    
+    El listado se lee como flujo, sin cargarlo completo en memoria; el
+    archivo de estado sí guarda una huella por estudiante.
+    
+    Args:
+        file_path (str, optional): Ruta del archivo CSV.
+        validator (GraduationValidator, optional): Validador de requisitos.
+            Si no se proporciona, se crea uno nuevo.
+        roster_path (str, optional): Ruta del listado de estudiantes. La
+            entrada estándar no se admite porque el listado puede leerse dos veces.
+        encoding (str, optional): Codificación del listado.
+        state_path (str, optional): Ruta del archivo de estado. Por defecto,
+            file_path seguido de '.state.json'.
+        compression (str, optional): None, 'gzip' o 'zstd'.
+    
+    Returns:
+        int: Cantidad de filas escritas o reescritas, o None si no hay listado.
+    
+    Raises:
+        ValueError: Si el listado es la entrada estándar.
+    """
+    if roster_path == STDIN_SOURCE:
+        raise ValueError("La actualización incremental requiere un listado en archivo")
+    
+    validator = validator or GraduationValidator()
+    state_path = state_path or file_path + ".state.json"
+    state = _load_state(state_path)
+    
+    rebuild = (
+        state is None
+        or state["min_average"] != validator.min_average
+        or state.get("compression") != compression
+        or not os.path.exists(file_path)
+    )
+    if not rebuild:
+        matches = _roster_matches(roster_path, encoding, state["students"])
+        if matches is None:
+            return None
+        rebuild = not matches
+    if rebuild:
+        roster = _open_roster_or_report(roster_path, encoding)
+        if roster is None:
+            return None
+        with roster:
+            written = _rebuild_report(file_path, state_path, validator, roster, compression)
+        print(f"Reporte generado exitosamente en '{file_path}'")
+        return written
+    
+    synced_at = time.time()
+    db_connector = validator.db_connector
+    students = state["students"]
+    fingerprints = dict(students)
+    if db_connector.tracks_changes:
+        candidates = itertools.chain(
+            db_connector.changed_since(state["synced_at"]).items(),
+            _iter_roster_records(db_connector, [code for code, fingerprint in students if fingerprint is None])
+        )
+    else:
+        candidates = _iter_roster_records(db_connector, (code for code, _ in students))
+    updates = {}
+    for student_code, student_data in candidates:
+        if student_code not in fingerprints:
+            continue
+        fingerprint = record_fingerprint(student_data)
+        if fingerprint != fingerprints[student_code]:
+            fingerprints[student_code] = fingerprint
+            updates[student_code] = student_data
+            db_connector.invalidate(student_code)
+    
+    if updates:
+        _patch_report(file_path, validator, updates, compression)
+    for entry in students:
+        entry[1] = fingerprints[entry[0]]
+    _save_state(state_path, validator.min_average, synced_at, students, compression)
+    print(f"Reporte actualizado en '{file_path}': {len(updates)} estudiantes modificados")
+    return len(updates)
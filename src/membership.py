@@ -0,0 +1,180 @@
+"""
+Módulo con los índices de pertenencia de códigos de estudiantes.
+
+Un índice de pertenencia permite al conector descartar los códigos que no
+existen (errores de digitación, códigos dados de baja) sin consultar la base
+de datos. Puede ser un conjunto exacto (set) o, para tablas muy grandes, un
+filtro de Bloom: ocupa unos pocos bits por código y nunca descarta un código
+existente, aunque deja pasar una pequeña fracción de códigos inexistentes que
+se resuelven con la consulta normal. Los códigos descartados se responden
+con src.db_connector.STUDENT_NOT_FOUND.
+"""
+import argparse
+import hashlib
+import math
+import os
+import struct
+
+# Cabecera del archivo de un filtro: firma, bits, funciones hash y elementos
+BLOOM_MAGIC = b"GRADBLM1"
+_BLOOM_HEADER = struct.Struct("<8sQIQ")
+
+
+class BloomFilter:
+    """Filtro de Bloom de códigos de estudiantes."""
+    
+    def __init__(self, expected_items, false_positive_rate=0.001):
+        """
+        Crea un filtro vacío dimensionado para una cantidad de códigos.
+        
+        Args:
+            expected_items (int): Cantidad de códigos que se agregarán.
+            false_positive_rate (float, optional): Fracción esperada de
+                códigos inexistentes que el filtro deja pasar.
+        
+        Raises:
+            ValueError: Si false_positive_rate no está entre 0 y 1.
+        """
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate debe estar entre 0 y 1")
+        expected_items = max(1, expected_items)
+        self.size = max(8, math.ceil(-expected_items * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / expected_items * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+    
+    def _positions(self, student_code):
+        """
+        Calcula las posiciones de un código con doble hash.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            generator: Posiciones de los bits del código.
+        """
+        digest = hashlib.blake2b(student_code.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        return ((first + i * second) % size for i in range(self.hash_count))
+    
+    def add(self, student_code):
+        """
+        Agrega un código al filtro.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        """
+        bits = self._bits
+        for position in self._positions(student_code):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, student_code):
+        bits = self._bits
+        for position in self._positions(student_code):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+    
+    def __len__(self):
+        return self.count
+    
+    def save(self, path):
+        """
+        Guarda el filtro en un archivo de forma atómica.
+        
+        Args:
+            path (str): Ruta del archivo.
+        """
+        temp_path = os.fspath(path) + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(_BLOOM_HEADER.pack(BLOOM_MAGIC, self.size, self.hash_count, self.count))
+            f.write(self._bits)
+        os.replace(temp_path, path)
+    
+    @classmethod
+    def load(cls, path):
+        """
+        Lee un filtro guardado con save.
+        
+        Args:
+            path (str): Ruta del archivo.
+        
+        Returns:
+            BloomFilter: Filtro leído.
+        
+        Raises:
+            ValueError: Si el archivo no es un filtro válido.
+        """
+        with open(path, "rb") as f:
+            header = f.read(_BLOOM_HEADER.size)
+            bits = f.read()
+        if len(header) < _BLOOM_HEADER.size:
+            raise ValueError(f"'{path}' no es un filtro de códigos")
+        magic, size, hash_count, count = _BLOOM_HEADER.unpack(header)
+        if magic != BLOOM_MAGIC or len(bits) != (size + 7) // 8:
+            raise ValueError(f"'{path}' no es un filtro de códigos")
+        bloom = cls.__new__(cls)
+        bloom.size = size
+        bloom.hash_count = hash_count
+        bloom.count = count
+        bloom._bits = bytearray(bits)
+        return bloom
+
+
+def build_known_codes(records, expected_items=None, false_positive_rate=0.001):
+    """
+    Construye el índice de pertenencia de los códigos existentes.
+    
+    Args:
+        records (dict or iterable): Diccionario {codigo: datos} o pares
+            (codigo, datos), p. ej. db_connector.iter_student_records().
+        expected_items (int, optional): Si se indica, se construye un filtro
+            de Bloom dimensionado para esa cantidad de códigos; si no, un
+            conjunto exacto.
+        false_positive_rate (float, optional): Tasa de falsos positivos del
+            filtro de Bloom.
+    
+    Returns:
+        set or BloomFilter: Índice de pertenencia.
+    """
+    items = records.items() if hasattr(records, "items") else records
+    if expected_items is None:
+        return {student_code for student_code, _ in items}
+    bloom = BloomFilter(expected_items, false_positive_rate)
+    for student_code, _ in items:
+        bloom.add(student_code)
+    return bloom
+
+
+def main(argv=None):
+    """
+    Construye y guarda un filtro de Bloom desde los datos simulados o una base SQLite.
+    
+    Args:
+        argv (list, optional): Argumentos de la línea de comandos.
+    """
+    from src.db_connector import DBConnector
+    
+    parser = argparse.ArgumentParser(description="Construye el filtro de códigos existentes.")
+    parser.add_argument("output", help="Ruta del filtro a generar.")
+    parser.add_argument("--sqlite", help="Base SQLite de origen. Por defecto, los datos simulados.")
+    parser.add_argument("--fp-rate", type=float, default=0.001, help="Tasa de falsos positivos.")
+    args = parser.parse_args(argv)
+    
+    if args.sqlite:
+        from src.sqlite_connector import SQLiteDBConnector
+        source = SQLiteDBConnector(args.sqlite)
+    else:
+        source = DBConnector()
+    # Se cuentan los códigos en una primera pasada para dimensionar el filtro
+    expected_items = sum(1 for _ in source.iter_student_records())
+    bloom = build_known_codes(source.iter_student_records(), expected_items, args.fp_rate)
+    bloom.save(args.output)
+    print(f"Filtro con {len(bloom)} códigos generado en '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
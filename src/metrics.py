@@ -0,0 +1,299 @@
+"""
+Módulo de instrumentación para medir dónde se va el tiempo de una ejecución.
+Registra histogramas de latencia, contadores y valores puntuales, y los exporta
+como resumen JSON o en el formato de texto de Prometheus. Los componentes
+instrumentados reciben metrics=None por defecto y en ese caso solo comprueban
+ese valor, sin medir nada.
+"""
+import functools
+import json
+import threading
+import time
+from bisect import bisect_left
+
+# Límites superiores de los intervalos de los histogramas, en segundos:
+# progresión geométrica de razón raíz de 2 entre 1 microsegundo y ~100 segundos
+LATENCY_BUCKETS = tuple(1e-6 * 2 ** (i / 2) for i in range(54))
+
+
+class LatencyHistogram:
+    """Histograma de latencias con intervalos fijos."""
+    
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """
+        Inicializa el histograma.
+        
+        Args:
+            buckets (tuple, optional): Límites superiores ordenados, en segundos.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+    
+    def observe(self, seconds):
+        """
+        Registra una latencia.
+        
+        Args:
+            seconds (float): Duración medida.
+        """
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+    
+    def merge(self, other):
+        """
+        Suma las observaciones de otro histograma con los mismos intervalos.
+        
+        Args:
+            other (LatencyHistogram): Histograma a sumar.
+        """
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+    
+    def quantile(self, q):
+        """
+        Estima un cuantil interpolando dentro del intervalo que lo contiene.
+        
+        Args:
+            q (float): Cuantil entre 0 y 1.
+        
+        Returns:
+            float: Latencia estimada, o None si no hay observaciones.
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - cumulative) / count
+                return min(max(estimate, self.min), self.max)
+            cumulative += count
+        return self.max
+    
+    def summary(self):
+        """
+        Resume el histograma.
+        
+        Returns:
+            dict: Cantidad, suma, media, mínimo, máximo y percentiles 50, 95 y 99.
+        """
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99)
+        }
+
+
+class Metrics:
+    """Registro de métricas de una ejecución, seguro entre hilos."""
+    
+    def __init__(self, clock=time.perf_counter):
+        """
+        Inicializa el registro.
+        
+        Args:
+            clock (callable, optional): Reloj usado por timer.
+        """
+        self.clock = clock
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self._lock = threading.Lock()
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    def observe(self, name, seconds):
+        """
+        Registra una latencia en el histograma indicado.
+        
+        Args:
+            name (str): Nombre del histograma.
+            seconds (float): Duración medida.
+        """
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.observe(seconds)
+    
+    def increment(self, name, amount=1):
+        """
+        Incrementa un contador.
+        
+        Args:
+            name (str): Nombre del contador.
+            amount (int, optional): Cantidad a sumar.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def set_gauge(self, name, value):
+        """
+        Fija un valor puntual, como la duración total de una ejecución.
+        
+        Args:
+            name (str): Nombre del valor.
+            value (float): Valor.
+        """
+        with self._lock:
+            self.gauges[name] = value
+    
+    def timer(self, name):
+        """
+        Mide la duración de un bloque y la registra en un histograma.
+        
+        Args:
+            name (str): Nombre del histograma.
+        
+        Returns:
+            contextmanager: Administrador de contexto que mide el bloque.
+        """
+        return _Timer(self, name)
+    
+    def summary(self):
+        """
+        Resume todas las métricas, incluidas las derivadas de un reporte.
+        
+        Returns:
+            dict: Histogramas, contadores, valores puntuales y, si hubo un
+                reporte, filas por segundo y consultas por estudiante.
+        """
+        with self._lock:
+            summary = {
+                "histograms": {name: h.summary() for name, h in self.histograms.items()},
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges)
+            }
+        rows = summary["counters"].get("report_rows")
+        if rows:
+            seconds = summary["gauges"].get("report_seconds")
+            if seconds:
+                summary["rows_per_second"] = rows / seconds
+            summary["queries_per_student"] = summary["counters"].get("db_queries", 0) / rows
+        return summary
+    
+    def to_json(self):
+        """
+        Exporta el resumen en JSON.
+        
+        Returns:
+            str: Resumen en formato JSON.
+        """
+        return json.dumps(self.summary(), indent=2)
+    
+    def to_prometheus(self, prefix="graduacion"):
+        """
+        Exporta las métricas en el formato de texto de Prometheus.
+        
+        Args:
+            prefix (str, optional): Prefijo de los nombres de las métricas.
+        
+        Returns:
+            str: Métricas en formato de exposición de Prometheus.
+        """
+        lines = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                metric = f"{prefix}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+            for name, value in sorted(self.gauges.items()):
+                metric = f"{prefix}_{name}"
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f"{metric} {value!r}")
+            for name, histogram in sorted(self.histograms.items()):
+                metric = f"{prefix}_{name}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{le="{bound:.6g}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{le="+Inf"}} {histogram.count}')
+                lines.append(f"{metric}_sum {histogram.total!r}")
+                lines.append(f"{metric}_count {histogram.count}")
+        return "\n".join(lines) + "\n"
+    
+    def write(self, path):
+        """
+        Guarda las métricas en un archivo: formato Prometheus si la ruta
+        termina en '.prom' y resumen JSON en cualquier otro caso.
+        
+        Args:
+            path (str): Ruta del archivo.
+        """
+        content = self.to_prometheus() if str(path).endswith(".prom") else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+
+class _Timer:
+    """Administrador de contexto que registra la duración de un bloque."""
+    
+    __slots__ = ("metrics", "name", "start")
+    
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+    
+    def __enter__(self):
+        self.start = self.metrics.clock()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.name, self.metrics.clock() - self.start)
+        return False
+
+
+def timed(name):
+    """
+    Decorador de métodos que mide su duración en self.metrics.
+    
+    Si self.metrics es None, el método se llama directamente sin medir.
+    
+    Args:
+        name (str): Nombre del histograma.
+    
+    Returns:
+        callable: Decorador.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = self.metrics
+            if metrics is None:
+                return method(self, *args, **kwargs)
+            start = metrics.clock()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                metrics.observe(name, metrics.clock() - start)
+        return wrapper
+    return decorator
@@ -0,0 +1,201 @@
+"""
+Módulo para simular varios promedios mínimos de graduación en una sola pasada.
+
+Para responder "¿cuántos se graduarían con 3.3, 3.4, ... 4.0?" no hace falta
+validar la cohorte una vez por umbral: el promedio mínimo solo afecta a los
+estudiantes que ya cumplen los otros tres requisitos. Se consulta cada
+estudiante una vez, se ordenan los promedios de esos candidatos y cada umbral
+se responde con una búsqueda binaria, en O(n log n + k log n) en lugar de
+k validaciones completas. Los candidatos se eligen con las mismas reglas de
+GraduationValidator que el reporte.
+
+Los estudiantes cuyo lote no respondió a tiempo no se cuentan como
+candidatos ni como rechazados: se informan aparte como 'unavailable'.
+"""
+import json
+import os
+from bisect import bisect_left
+from operator import itemgetter
+
+from src.db_connector import STUDENT_NOT_FOUND
+from src.generate_report import _open_roster_or_report
+from src.resilience import QueryUnavailableError
+from src.roster import batched, iter_student_codes
+from src.validacion_grado import BULK_BATCH_SIZE, INDETERMINATE, GraduationValidator
+
+# Requisito que la simulación reemplaza por cada umbral
+AVERAGE_REQUIREMENT = "promedio_minimo"
+
+
+class PolicySweep:
+    """Promedios ordenados de los candidatos a grado, consultables por umbral."""
+    
+    def __init__(self, records, validator=None):
+        """
+        Construye la simulación a partir de los registros de la cohorte.
+        
+        Args:
+            records (iterable): Pares (codigo, datos) de cada estudiante del
+                listado. Un diccionario vacío representa a un estudiante
+                inexistente e INDETERMINATE a uno que no se pudo consultar.
+            validator (GraduationValidator, optional): Validador cuyas reglas,
+                salvo la del promedio, deciden quién es candidato. Si no se
+                proporciona, se crea uno nuevo.
+        """
+        validator = validator or GraduationValidator()
+        self.students = 0
+        self.unavailable = 0
+        candidates = []
+        for student_code, student_data in records:
+            self.students += 1
+            if student_data is INDETERMINATE:
+                self.unavailable += 1
+                continue
+            _, requirements = validator.validate_student_record(student_data, student_code)
+            if all(value is True for name, value in requirements.items() if name != AVERAGE_REQUIREMENT):
+                candidates.append((student_data.get("average", 0.0), student_code))
+        # El ordenamiento es estable: a igual promedio se conserva el orden del listado
+        candidates.sort(key=itemgetter(0))
+        self._averages = [average for average, _ in candidates]
+        self._codes = [student_code for _, student_code in candidates]
+    
+    @property
+    def candidates(self):
+        """int: Estudiantes que cumplen los requisitos distintos del promedio."""
+        return len(self._codes)
+    
+    def approved_count(self, min_average):
+        """
+        Cuenta los estudiantes que se graduarían con un promedio mínimo.
+        
+        Args:
+            min_average (float): Promedio mínimo a simular.
+        
+        Returns:
+            int: Cantidad de estudiantes aprobados.
+        """
+        return len(self._averages) - bisect_left(self._averages, min_average)
+    
+    def approved_codes(self, min_average):
+        """
+        Lista los estudiantes que se graduarían con un promedio mínimo.
+        
+        Args:
+            min_average (float): Promedio mínimo a simular.
+        
+        Returns:
+            list: Códigos de los aprobados, de menor a mayor promedio.
+        """
+        return self._codes[bisect_left(self._averages, min_average):]
+    
+    def curve(self, thresholds, include_students=False):
+        """
+        Calcula la curva de aprobados para varios promedios mínimos.
+        
+        Args:
+            thresholds (iterable): Promedios mínimos a simular.
+            include_students (bool, optional): Incluir la lista de aprobados
+                de cada umbral.
+        
+        Returns:
+            list: Un diccionario por umbral, en orden ascendente, con
+                'min_average', 'approved', 'approval_rate' y 'unavailable'
+                (estudiantes sin consultar, que podrían sumarse a los
+                aprobados) y, si se pide, 'students'.
+        """
+        points = []
+        for min_average in sorted(thresholds):
+            start = bisect_left(self._averages, min_average)
+            approved = len(self._averages) - start
+            point = {
+                "min_average": min_average,
+                "approved": approved,
+                "approval_rate": approved / self.students if self.students else None,
+                "unavailable": self.unavailable
+            }
+            if include_students:
+                point["students"] = self._codes[start:]
+            points.append(point)
+        return points
+    
+    def write(self, path, thresholds, include_students=True):
+        """
+        Guarda la curva en un archivo JSON de forma atómica.
+        
+        Args:
+            path (str): Ruta del archivo.
+            thresholds (iterable): Promedios mínimos a simular.
+            include_students (bool, optional): Incluir la lista de aprobados
+                de cada umbral.
+        """
+        temp_path = os.fspath(path) + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "students": self.students,
+                "candidates": self.candidates,
+                "unavailable": self.unavailable,
+                "curve": self.curve(thresholds, include_students)
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
+
+
+def parse_thresholds(value):
+    """
+    Interpreta una lista de umbrales: '3.3,3.5,4.0' o un rango 'inicio:fin:paso'.
+    
+    Args:
+        value (str): Umbrales separados por comas o rango con fin incluido.
+    
+    Returns:
+        list: Promedios mínimos, redondeados a dos decimales.
+    
+    Raises:
+        ValueError: Si el valor no tiene ninguna de las dos formas.
+    """
+    if ":" in value:
+        start, stop, step = (float(part) for part in value.split(":"))
+        if step <= 0:
+            raise ValueError("El paso del rango debe ser mayor que 0")
+        count = int(round((stop - start) / step)) + 1
+        return [round(start + i * step, 2) for i in range(max(0, count))]
+    return [round(float(part), 2) for part in value.split(",") if part.strip()]
+
+
+def sweep_min_average(validator=None, roster_path='estudiantes.txt', encoding=None,
+                      batch_size=BULK_BATCH_SIZE):
+    """
+    Consulta una vez cada estudiante del listado y prepara la simulación de umbrales.
+    
+    Args:
+        validator (GraduationValidator, optional): Validador cuyo conector se
+            usa para las consultas. Si no se proporciona, se crea uno nuevo.
+        roster_path (str, optional): Ruta del listado de estudiantes.
+        encoding (str, optional): Codificación del listado.
+        batch_size (int, optional): Cantidad de estudiantes por consulta. Si
+            la consulta de un lote no responde a tiempo (QueryUnavailableError),
+            sus estudiantes se cuentan en unavailable y se sigue con el
+            siguiente.
+    
+    Returns:
+        PolicySweep: Simulación lista para consultar, o None si el listado no existe.
+    """
+    roster = _open_roster_or_report(roster_path, encoding)
+    if roster is None:
+        return None
+    
+    validator = validator or GraduationValidator()
+    db_connector = validator.db_connector
+    
+    def iter_records():
+        for batch in batched(iter_student_codes(roster), batch_size):
+            try:
+                students_data = db_connector.get_students_bulk(batch)
+            except QueryUnavailableError:
+                for student_code in batch:
+                    yield student_code, INDETERMINATE
+                continue
+            for student_code in batch:
+                yield student_code, students_data.get(student_code, STUDENT_NOT_FOUND)
+    
+    with roster:
+        return PolicySweep(iter_records(), validator)
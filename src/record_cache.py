@@ -0,0 +1,115 @@
+"""
+Módulo con la caché de registros de estudiantes usada por los conectores.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class RecordCache:
+    """Caché LRU con expiración por tiempo (TTL) para registros de estudiantes."""
+    
+    def __init__(self, max_size=10000, ttl=None, clock=time.monotonic):
+        """
+        Inicializa la caché de registros.
+        
+        Args:
+            max_size (int, optional): Cantidad máxima de registros almacenados.
+                Al superarse se descarta el registro usado hace más tiempo.
+            ttl (float, optional): Segundos que un registro permanece válido.
+                Si es None, los registros no expiran.
+            clock (callable, optional): Función que devuelve el tiempo actual
+                en segundos. Permite controlar el tiempo en las pruebas.
+        """
+        if max_size <= 0:
+            raise ValueError("max_size debe ser mayor que cero")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __getstate__(self):
+        # Al copiarse a otro proceso la caché se envía vacía y sin el candado
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_entries"] = OrderedDict()
+        state["hits"] = 0
+        state["misses"] = 0
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def get(self, student_code):
+        """
+        Obtiene un registro de la caché.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            dict: Registro almacenado, o None si no está o ya expiró.
+        """
+        with self._lock:
+            entry = self._entries.get(student_code)
+            if entry is not None:
+                expires_at, student_data = entry
+                if expires_at is None or expires_at > self.clock():
+                    self._entries.move_to_end(student_code)
+                    self.hits += 1
+                    return student_data
+                del self._entries[student_code]
+            self.misses += 1
+            return None
+    
+    def put(self, student_code, student_data):
+        """
+        Almacena un registro en la caché.
+        
+        Args:
+            student_code (str): Código del estudiante.
+            student_data (dict): Datos del estudiante. Un diccionario vacío
+                también se almacena para no repetir consultas de códigos inexistentes.
+        """
+        expires_at = None if self.ttl is None else self.clock() + self.ttl
+        with self._lock:
+            self._entries[student_code] = (expires_at, student_data)
+            self._entries.move_to_end(student_code)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, student_code=None):
+        """
+        Elimina registros de la caché.
+        
+        Args:
+            student_code (str, optional): Código del estudiante a eliminar.
+                Si es None, se vacía la caché completa.
+        """
+        with self._lock:
+            if student_code is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(student_code, None)
+    
+    def stats(self):
+        """
+        Devuelve los contadores de uso de la caché.
+        
+        Returns:
+            dict: Aciertos, fallos, tamaño actual y tasa de aciertos.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,427 @@
+"""
+Módulo con los escritores de reportes de graduación.
+
+Los escritores reciben resultados de validación (codigo, datos, bool, dict) y los
+escriben en bloques grandes sobre un flujo binario, opcionalmente comprimido.
+El formato CSV usa plantillas precalculadas para la parte de cada fila que solo
+depende de los requisitos, de modo que por fila solo se arma código y nombre.
+Los requisitos y resultados INDETERMINATE (consultas que no respondieron a
+tiempo) se escriben como 'INDETERMINADO'.
+
+Formatos disponibles:
+
+- 'csv': idéntico byte a byte al de csv.DictWriter usado originalmente.
+- 'jsonl': un objeto JSON por línea.
+- 'columnar': formato binario por bloques de columnas (ver ColumnarReportWriter).
+"""
+import abc
+import gzip
+import io
+import json
+import operator
+import struct
+
+from src.validacion_grado import INDETERMINATE, REQUIREMENT_NAMES
+
+# Campos del CSV, en el orden en que se escriben
+CSV_FIELDNAMES = [
+    'Código',
+    'Nombre',
+    'Matriculado',
+    'Promedio Mínimo',
+    'Paz y Salvo Bienestar',
+    'Derechos de Grado Pagados',
+    'Resultado'
+]
+
+# Cantidad de filas que se acumulan antes de cada escritura
+DEFAULT_BUFFER_ROWS = 4096
+
+# Tamaño del búfer de los archivos de salida sin comprimir
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+COMPRESSIONS = (None, 'gzip', 'zstd')
+
+# Texto de un requisito o resultado que no se pudo verificar
+INDETERMINATE_TEXT = 'INDETERMINADO'
+
+
+def open_output(file_path, compression=None):
+    """
+    Abre un archivo de salida binario con búfer grande y compresión opcional.
+    
+    Args:
+        file_path (str): Ruta del archivo.
+        compression (str, optional): None, 'gzip' o 'zstd'. 'zstd' requiere el
+            paquete opcional zstandard.
+    
+    Returns:
+        io.BufferedIOBase: Flujo binario de escritura.
+    
+    Raises:
+        ValueError: Si la compresión no es válida.
+        ImportError: Si se pide 'zstd' y zstandard no está instalado.
+    """
+    if compression is None:
+        return open(file_path, 'wb', buffering=OUTPUT_BUFFER_SIZE)
+    if compression == 'gzip':
+        # Nivel 6: buena compresión sin que la CPU limite la escritura
+        return gzip.open(file_path, 'wb', compresslevel=6)
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError as error:
+            raise ImportError("La compresión 'zstd' requiere el paquete zstandard") from error
+        raw = open(file_path, 'wb', buffering=OUTPUT_BUFFER_SIZE)
+        return zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=True)
+    raise ValueError(f"Compresión desconocida: {compression!r}")
+
+
+def open_input(file_path, compression=None):
+    """
+    Abre para lectura un archivo escrito con open_output.
+    
+    Args:
+        file_path (str): Ruta del archivo.
+        compression (str, optional): None, 'gzip' o 'zstd'.
+    
+    Returns:
+        io.BufferedIOBase: Flujo binario de lectura, ya descomprimido.
+    
+    Raises:
+        ValueError: Si la compresión no es válida.
+        ImportError: Si se pide 'zstd' y zstandard no está instalado.
+    """
+    if compression is None:
+        return open(file_path, 'rb', buffering=OUTPUT_BUFFER_SIZE)
+    if compression == 'gzip':
+        return gzip.open(file_path, 'rb')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError as error:
+            raise ImportError("La compresión 'zstd' requiere el paquete zstandard") from error
+        raw = open(file_path, 'rb', buffering=OUTPUT_BUFFER_SIZE)
+        return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    raise ValueError(f"Compresión desconocida: {compression!r}")
+
+
+def _requirements_mask(requirements):
+    """
+    Codifica el detalle de requisitos como un entero de 4 bits.
+    
+    Args:
+        requirements (dict): Detalle de cada requisito.
+    
+    Returns:
+        int: Bit i encendido si se cumple el i-ésimo de REQUIREMENT_NAMES.
+    """
+    mask = 0
+    for bit, name in enumerate(REQUIREMENT_NAMES):
+        if requirements[name]:
+            mask |= 1 << bit
+    return mask
+
+
+# Valores de los requisitos de un detalle, en el orden de REQUIREMENT_NAMES
+_requirement_values = operator.itemgetter(*REQUIREMENT_NAMES)
+
+
+def _indeterminate_mask(requirements):
+    """
+    Codifica qué requisitos no se pudieron verificar como un entero de 4 bits.
+    
+    Args:
+        requirements (dict): Detalle de cada requisito.
+    
+    Returns:
+        int: Bit i encendido si el i-ésimo de REQUIREMENT_NAMES es INDETERMINATE.
+    """
+    mask = 0
+    for bit, name in enumerate(REQUIREMENT_NAMES):
+        if requirements[name] is INDETERMINATE:
+            mask |= 1 << bit
+    return mask
+
+
+def _result_text(graduation_status):
+    """
+    Devuelve el texto del resultado de la validación.
+    
+    Args:
+        graduation_status (bool): Resultado, o INDETERMINATE.
+    
+    Returns:
+        str: 'APROBADO', 'RECHAZADO' o 'INDETERMINADO'.
+    """
+    if graduation_status is INDETERMINATE:
+        return INDETERMINATE_TEXT
+    return 'APROBADO' if graduation_status else 'RECHAZADO'
+
+
+def _csv_field(value):
+    """
+    Escribe un campo con las reglas de csv.QUOTE_MINIMAL del dialecto excel.
+    
+    Como csv.DictWriter, None se escribe como un campo vacío y los demás
+    valores que no son texto se convierten con str().
+    
+    Args:
+        value (str): Valor del campo.
+    
+    Returns:
+        str: Campo, entre comillas si contiene separadores, comillas o saltos.
+    """
+    if not isinstance(value, str):
+        value = '' if value is None else str(value)
+    if ',' in value or '"' in value or '\r' in value or '\n' in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+class ReportWriter(abc.ABC):
+    """Base de los escritores: acumula filas y las escribe por bloques."""
+    
+    def __init__(self, stream, buffer_rows=DEFAULT_BUFFER_ROWS):
+        """
+        Inicializa el escritor.
+        
+        Args:
+            stream (io.BufferedIOBase): Flujo binario de salida.
+            buffer_rows (int, optional): Filas acumuladas por escritura.
+        """
+        self.stream = stream
+        self.buffer_rows = buffer_rows
+        self.rows_written = 0
+    
+    def write_header(self):
+        """Escribe la cabecera del formato, si tiene."""
+    
+    @abc.abstractmethod
+    def write_rows(self, results):
+        """
+        Escribe resultados de validación.
+        
+        Args:
+            results (iterable): Tuplas (codigo, datos, bool, dict).
+        
+        Returns:
+            int: Cantidad de filas escritas.
+        """
+    
+    def close(self):
+        """Termina el formato y cierra el flujo."""
+        self.stream.close()
+
+
+class CSVReportWriter(ReportWriter):
+    """Escritor CSV con plantillas de fila precalculadas."""
+    
+    def __init__(self, stream, buffer_rows=DEFAULT_BUFFER_ROWS, encoding=None):
+        """
+        Inicializa el escritor.
+        
+        Args:
+            stream (io.BufferedIOBase): Flujo binario de salida.
+            buffer_rows (int, optional): Filas acumuladas por escritura.
+            encoding (str, optional): Codificación del texto. Por defecto, la
+                del sistema, igual que open().
+        """
+        super().__init__(stream, buffer_rows)
+        self._text = io.TextIOWrapper(stream, encoding=encoding, newline='', write_through=True)
+        # Una terminación de fila por cada combinación de valores de los
+        # requisitos y resultado, construida la primera vez que aparece
+        self._suffixes = {}
+    
+    def _suffix(self, key):
+        """
+        Construye y guarda la terminación de fila de una combinación.
+        
+        Args:
+            key (tuple): (resultado, valores de los requisitos en el orden de
+                REQUIREMENT_NAMES). Cualquiera puede ser INDETERMINATE.
+        
+        Returns:
+            str: Columnas de requisitos y resultado, con el salto de línea.
+        """
+        graduation_status, values = key
+        columns = [
+            INDETERMINATE_TEXT if value is INDETERMINATE else 'Sí' if value else 'No'
+            for value in values
+        ]
+        columns.append(_result_text(graduation_status))
+        suffix = self._suffixes[key] = ',' + ','.join(columns) + '\r\n'
+        return suffix
+    
+    def write_header(self):
+        self._text.write(','.join(CSV_FIELDNAMES) + '\r\n')
+    
+    def write_rows(self, results):
+        suffixes = self._suffixes
+        requirement_values = _requirement_values
+        parts = []
+        count = 0
+        for student_code, student_data, graduation_status, requirements in results:
+            parts.append(_csv_field(student_code))
+            parts.append(',')
+            parts.append(_csv_field(student_data.get('nombre', 'Desconocido')))
+            # INDETERMINATE no es igual a False, así que tiene sus propias claves
+            key = (graduation_status, requirement_values(requirements))
+            suffix = suffixes.get(key)
+            if suffix is None:
+                suffix = self._suffix(key)
+            parts.append(suffix)
+            count += 1
+            if count % self.buffer_rows == 0:
+                self._text.write(''.join(parts))
+                parts.clear()
+        if parts:
+            self._text.write(''.join(parts))
+        self.rows_written += count
+        return count
+    
+    def close(self):
+        self._text.close()
+
+
+class JSONLinesReportWriter(ReportWriter):
+    """
+    Escritor JSON Lines: un objeto por estudiante.
+    
+    Un requisito INDETERMINATE se escribe como null y un resultado
+    INDETERMINATE como 'INDETERMINADO'.
+    """
+    
+    def write_rows(self, results):
+        dumps = json.dumps
+        lines = []
+        count = 0
+        for student_code, student_data, graduation_status, requirements in results:
+            row = {'codigo': student_code, 'nombre': student_data.get('nombre', 'Desconocido')}
+            for name in REQUIREMENT_NAMES:
+                value = requirements[name]
+                row[name] = None if value is INDETERMINATE else bool(value)
+            row['resultado'] = _result_text(graduation_status)
+            lines.append(dumps(row, ensure_ascii=False))
+            count += 1
+            if count % self.buffer_rows == 0:
+                self.stream.write(('\n'.join(lines) + '\n').encode('utf-8'))
+                lines.clear()
+        if lines:
+            self.stream.write(('\n'.join(lines) + '\n').encode('utf-8'))
+        self.rows_written += count
+        return count
+
+
+# Formato columnar: cabecera mágica seguida de bloques. Cada bloque tiene la
+# cantidad de filas y los tamaños de sus secciones, luego los códigos y los
+# nombres en UTF-8 separados por '\0' (pueden contener saltos de línea), un
+# byte de banderas por fila (bits 0-3: requisitos cumplidos en el orden de
+# REQUIREMENT_NAMES, bit 4: aprobado, bit 5: resultado indeterminado) y otro
+# byte por fila con los requisitos indeterminados (bits 0-3).
+COLUMNAR_MAGIC = b'GRADCOL2'
+_COLUMNAR_BLOCK = struct.Struct('<III')
+_APPROVED_FLAG = 1 << len(REQUIREMENT_NAMES)
+_INDETERMINATE_FLAG = _APPROVED_FLAG << 1
+
+
+class ColumnarReportWriter(ReportWriter):
+    """Escritor binario columnar por bloques."""
+    
+    def write_header(self):
+        self.stream.write(COLUMNAR_MAGIC)
+    
+    def _write_block(self, codes, names, flags, indeterminate):
+        codes_block = '\0'.join(codes).encode('utf-8')
+        names_block = '\0'.join(names).encode('utf-8')
+        self.stream.write(_COLUMNAR_BLOCK.pack(len(flags), len(codes_block), len(names_block)))
+        self.stream.write(codes_block)
+        self.stream.write(names_block)
+        self.stream.write(flags)
+        self.stream.write(indeterminate)
+    
+    def write_rows(self, results):
+        codes, names, flags, indeterminate = [], [], bytearray(), bytearray()
+        count = 0
+        for student_code, student_data, graduation_status, requirements in results:
+            codes.append(student_code)
+            names.append(student_data.get('nombre', 'Desconocido'))
+            if graduation_status is INDETERMINATE:
+                status_flag = _INDETERMINATE_FLAG
+            else:
+                status_flag = _APPROVED_FLAG if graduation_status else 0
+            flags.append(_requirements_mask(requirements) | status_flag)
+            indeterminate.append(_indeterminate_mask(requirements))
+            count += 1
+            if len(flags) == self.buffer_rows:
+                self._write_block(codes, names, flags, indeterminate)
+                codes, names, flags, indeterminate = [], [], bytearray(), bytearray()
+        if flags:
+            self._write_block(codes, names, flags, indeterminate)
+        self.rows_written += count
+        return count
+
+
+def read_columnar_report(stream):
+    """
+    Lee un reporte en formato columnar.
+    
+    Args:
+        stream (io.BufferedIOBase): Flujo binario del reporte (descomprimido).
+    
+    Yields:
+        tuple: (codigo, nombre, dict_de_requisitos, resultado) por fila. Los
+            requisitos y el resultado son bool o INDETERMINATE.
+    """
+    if stream.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError("El flujo no es un reporte columnar")
+    while True:
+        header = stream.read(_COLUMNAR_BLOCK.size)
+        if not header:
+            return
+        rows, codes_size, names_size = _COLUMNAR_BLOCK.unpack(header)
+        codes = stream.read(codes_size).decode('utf-8').split('\0')
+        names = stream.read(names_size).decode('utf-8').split('\0')
+        flags = stream.read(rows)
+        indeterminate = stream.read(rows)
+        for student_code, name, flag, unknown in zip(codes, names, flags, indeterminate):
+            requirements = {
+                requirement: INDETERMINATE if unknown & (1 << bit) else bool(flag & (1 << bit))
+                for bit, requirement in enumerate(REQUIREMENT_NAMES)
+            }
+            status = INDETERMINATE if flag & _INDETERMINATE_FLAG else bool(flag & _APPROVED_FLAG)
+            yield student_code, name, requirements, status
+
+
+REPORT_FORMATS = {
+    'csv': CSVReportWriter,
+    'jsonl': JSONLinesReportWriter,
+    'columnar': ColumnarReportWriter
+}
+
+
+def create_report_writer(stream, output_format='csv', buffer_rows=DEFAULT_BUFFER_ROWS, encoding=None):
+    """
+    Crea el escritor de un formato.
+    
+    Args:
+        stream (io.BufferedIOBase): Flujo binario de salida.
+        output_format (str, optional): 'csv', 'jsonl' o 'columnar'.
+        buffer_rows (int, optional): Filas acumuladas por escritura.
+        encoding (str, optional): Codificación del CSV. Los formatos 'jsonl'
+            y 'columnar' escriben siempre UTF-8.
+    
+    Returns:
+        ReportWriter: Escritor del formato.
+    
+    Raises:
+        ValueError: Si el formato no existe. En ese caso el flujo se cierra.
+    """
+    try:
+        writer_class = REPORT_FORMATS[output_format]
+    except KeyError:
+        stream.close()
+        raise ValueError(f"Formato de reporte desconocido: {output_format!r}") from None
+    if writer_class is CSVReportWriter:
+        return writer_class(stream, buffer_rows, encoding)
+    return writer_class(stream, buffer_rows)
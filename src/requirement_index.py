@@ -0,0 +1,369 @@
+"""
+Módulo con índices invertidos por requisito de graduación.
+
+RequirementIndex guarda, para cada requisito, un mapa de bits con los
+estudiantes que no lo cumplen. Las consultas del tipo "bloqueados solo por el
+pago" o "bloqueados por Bienestar" se resuelven combinando esos mapas con
+operaciones de bits, sin recorrer los registros, y cada actualización de un
+registro solo modifica sus bits.
+
+El índice se puede guardar en un archivo y reutilizar entre ejecuciones con
+load_roster_index: si el listado y el promedio mínimo no cambiaron, solo se
+actualizan los registros modificados desde que se guardó.
+"""
+import os
+import struct
+import time
+
+from src.db_connector import STUDENT_NOT_FOUND
+from src.resilience import QueryUnavailableError
+from src.roster import batched
+from src.validacion_grado import BULK_BATCH_SIZE, REQUIREMENT_NAMES, GraduationValidator
+
+# Cabecera del archivo del índice: marca, promedio mínimo, instante de la
+# última sincronización y tamaños de los códigos y de cada mapa de bits. Luego
+# vienen los códigos en UTF-8 separados por '\0', el mapa de presentes y un
+# mapa por requisito en el orden de REQUIREMENT_NAMES
+INDEX_MAGIC = b"GRADIDX1"
+_INDEX_HEADER = struct.Struct("<8sddQQ")
+
+# Posiciones de los bits encendidos de cada valor de byte
+_BIT_POSITIONS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+
+def _set_bit(bitmap, position, value):
+    """
+    Enciende o apaga un bit, ampliando el mapa si hace falta.
+    
+    Args:
+        bitmap (bytearray): Mapa de bits.
+        position (int): Posición del bit.
+        value (bool): Valor del bit.
+    """
+    byte = position >> 3
+    if byte >= len(bitmap):
+        bitmap.extend(bytes(byte + 1 - len(bitmap)))
+    if value:
+        bitmap[byte] |= 1 << (position & 7)
+    else:
+        bitmap[byte] &= ~(1 << (position & 7)) & 0xFF
+
+
+class RequirementIndex:
+    """Mapas de bits de los estudiantes que no cumplen cada requisito."""
+    
+    def __init__(self, validator=None, records=None):
+        """
+        Inicializa el índice.
+        
+        Args:
+            validator (GraduationValidator, optional): Validador que decide el
+                resultado de cada requisito con validate_student_record. Si
+                cambia su promedio mínimo, el índice debe reconstruirse.
+            records (dict or iterable, optional): Registros iniciales, como
+                diccionario {codigo: datos} o pares (codigo, datos).
+        """
+        self.validator = validator or GraduationValidator()
+        # Instante de la última sincronización con la base de datos, que save guarda
+        self.synced_at = None
+        # Códigos que no se pudieron consultar al construir el índice
+        self.unavailable = []
+        self.codes = []
+        self._positions = {}
+        self._present = bytearray()
+        self._failed = {name: bytearray() for name in REQUIREMENT_NAMES}
+        if records is not None:
+            self.update_many(records)
+    
+    def __len__(self):
+        return sum(len(_BIT_POSITIONS[byte]) for byte in self._present)
+    
+    def __contains__(self, student_code):
+        position = self._positions.get(student_code)
+        return position is not None and bool(self._present[position >> 3] >> (position & 7) & 1)
+    
+    def update(self, student_code, student_data):
+        """
+        Agrega o actualiza un estudiante.
+        
+        Un estudiante sin datos (STUDENT_NOT_FOUND) conserva su posición pero
+        no aparece en las consultas.
+        
+        Args:
+            student_code (str): Código del estudiante.
+            student_data (dict): Datos del estudiante.
+        """
+        position = self._positions.get(student_code)
+        if position is None:
+            position = self._positions[student_code] = len(self.codes)
+            self.codes.append(student_code)
+        if not student_data:
+            _set_bit(self._present, position, False)
+            return
+        _, requirements = self.validator.validate_student_record(student_data)
+        _set_bit(self._present, position, True)
+        for name in REQUIREMENT_NAMES:
+            _set_bit(self._failed[name], position, not requirements[name])
+    
+    def update_many(self, records):
+        """
+        Agrega o actualiza varios estudiantes.
+        
+        Args:
+            records (dict or iterable): Diccionario {codigo: datos} o pares
+                (codigo, datos).
+        """
+        items = records.items() if hasattr(records, "items") else records
+        for student_code, student_data in items:
+            self.update(student_code, student_data)
+    
+    def remove(self, student_code):
+        """
+        Quita un estudiante del índice. Su posición queda libre sin reutilizarse.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        """
+        position = self._positions.get(student_code)
+        if position is not None:
+            _set_bit(self._present, position, False)
+    
+    def save(self, path):
+        """
+        Guarda el índice en un archivo de forma atómica, junto con el promedio
+        mínimo del validador y synced_at.
+        
+        Args:
+            path (str): Ruta del archivo.
+        """
+        codes_block = "\0".join(self.codes).encode("utf-8")
+        size = len(self._present)
+        temp_path = os.fspath(path) + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(_INDEX_HEADER.pack(
+                INDEX_MAGIC, self.validator.min_average, self.synced_at or 0.0, len(codes_block), size
+            ))
+            f.write(codes_block)
+            f.write(self._present)
+            for name in REQUIREMENT_NAMES:
+                bitmap = self._failed[name]
+                f.write(bitmap + bytes(size - len(bitmap)))
+        os.replace(temp_path, path)
+    
+    @classmethod
+    def load(cls, path, validator=None):
+        """
+        Lee un índice guardado con save.
+        
+        Args:
+            path (str): Ruta del archivo.
+            validator (GraduationValidator, optional): Validador de las
+                actualizaciones siguientes.
+        
+        Returns:
+            RequirementIndex: Índice leído.
+        
+        Raises:
+            ValueError: Si el archivo no es un índice válido o se construyó con
+                otro promedio mínimo.
+        """
+        with open(path, "rb") as f:
+            header = f.read(_INDEX_HEADER.size)
+            body = f.read()
+        if len(header) < _INDEX_HEADER.size:
+            raise ValueError(f"'{path}' no es un índice por requisito")
+        magic, min_average, synced_at, codes_size, size = _INDEX_HEADER.unpack(header)
+        if magic != INDEX_MAGIC or len(body) != codes_size + size * (1 + len(REQUIREMENT_NAMES)):
+            raise ValueError(f"'{path}' no es un índice por requisito")
+        index = cls(validator)
+        if min_average != index.validator.min_average:
+            raise ValueError(f"El índice '{path}' se construyó con otro promedio mínimo")
+        index.synced_at = synced_at
+        index.codes = body[:codes_size].decode("utf-8").split("\0") if codes_size else []
+        index._positions = {student_code: position for position, student_code in enumerate(index.codes)}
+        offset = codes_size
+        index._present = bytearray(body[offset:offset + size])
+        for name in REQUIREMENT_NAMES:
+            offset += size
+            index._failed[name] = bytearray(body[offset:offset + size])
+        return index
+    
+    def _mask(self, failed, passed):
+        """
+        Combina los mapas de bits de una consulta.
+        
+        Args:
+            failed (iterable): Requisitos que los estudiantes no deben cumplir.
+            passed (iterable): Requisitos que los estudiantes deben cumplir.
+        
+        Returns:
+            int: Mapa de bits de los estudiantes seleccionados.
+        
+        Raises:
+            ValueError: Si algún requisito no existe.
+        """
+        mask = int.from_bytes(self._present, "little")
+        for names, keep_failed in ((failed, True), (passed, False)):
+            for name in names:
+                if name not in self._failed:
+                    raise ValueError(f"Requisito desconocido: {name!r}")
+                bitmap = int.from_bytes(self._failed[name], "little")
+                mask &= bitmap if keep_failed else ~bitmap
+        return mask
+    
+    def _codes_in(self, mask):
+        """
+        Lista los códigos de un mapa de bits, en orden de inserción.
+        
+        Args:
+            mask (int): Mapa de bits.
+        
+        Returns:
+            list: Códigos de los bits encendidos.
+        """
+        codes = self.codes
+        selected = []
+        for byte_index, byte in enumerate(mask.to_bytes(len(self._present), "little")):
+            if byte:
+                base = byte_index << 3
+                selected.extend(codes[base + bit] for bit in _BIT_POSITIONS[byte])
+        return selected
+    
+    def query(self, failed=(), passed=()):
+        """
+        Lista los estudiantes que no cumplen unos requisitos y sí cumplen otros.
+        
+        Args:
+            failed (iterable, optional): Requisitos no cumplidos.
+            passed (iterable, optional): Requisitos cumplidos.
+        
+        Returns:
+            list: Códigos de los estudiantes, en orden de inserción.
+        """
+        return self._codes_in(self._mask(failed, passed))
+    
+    def count(self, failed=(), passed=()):
+        """
+        Cuenta los estudiantes que no cumplen unos requisitos y sí cumplen otros.
+        
+        Args:
+            failed (iterable, optional): Requisitos no cumplidos.
+            passed (iterable, optional): Requisitos cumplidos.
+        
+        Returns:
+            int: Cantidad de estudiantes.
+        """
+        return bin(self._mask(failed, passed)).count("1")
+    
+    def blocked_by(self, requirement):
+        """
+        Lista los estudiantes que no cumplen un requisito, cumplan o no los demás.
+        
+        Args:
+            requirement (str): Nombre del requisito, p. ej. 'paz_y_salvo_bienestar'.
+        
+        Returns:
+            list: Códigos de los estudiantes.
+        """
+        return self.query(failed=(requirement,))
+    
+    def blocked_only_by(self, requirement):
+        """
+        Lista los estudiantes que cumplen todo excepto un requisito.
+        
+        Args:
+            requirement (str): Nombre del requisito, p. ej. 'derechos_de_grado_pagados'.
+        
+        Returns:
+            list: Códigos de los estudiantes.
+        """
+        others = [name for name in REQUIREMENT_NAMES if name != requirement]
+        return self.query(failed=(requirement,), passed=others)
+    
+    def summary(self):
+        """
+        Cuenta, por requisito, los estudiantes bloqueados por él y solo por él.
+        
+        Returns:
+            dict: {requisito: {'blocked': n, 'blocked_only': m}}.
+        """
+        return {
+            name: {
+                "blocked": self.count(failed=(name,)),
+                "blocked_only": self.count(
+                    failed=(name,), passed=[other for other in REQUIREMENT_NAMES if other != name]
+                )
+            }
+            for name in REQUIREMENT_NAMES
+        }
+
+
+def load_roster_index(validator, student_codes, index_path=None):
+    """
+    Obtiene el índice de los estudiantes de un listado.
+    
+    Si index_path tiene un índice del mismo listado y del mismo promedio
+    mínimo, y el conector registra las fechas de modificación, solo se
+    actualizan los registros modificados desde que se guardó. En otro caso el
+    índice se construye consultando por lotes los estudiantes del listado, no
+    toda la base de datos. Con index_path, el índice resultante se guarda.
+    
+    Si la consulta de los cambios no responde a tiempo (QueryUnavailableError)
+    el índice se reconstruye. Los estudiantes de un lote que no responde quedan
+    fuera de las consultas y en el atributo unavailable del índice; en ese caso
+    el índice no se guarda, para que otra ejecución no reutilice un índice
+    incompleto.
+    
+    Args:
+        validator (GraduationValidator): Validador con el conector a usar.
+        student_codes (iterable): Códigos del listado. Los repetidos se
+            indexan una sola vez.
+        index_path (str, optional): Archivo donde se guarda el índice.
+    
+    Returns:
+        RequirementIndex: Índice de los estudiantes del listado.
+    """
+    db_connector = validator.db_connector
+    codes = list(dict.fromkeys(student_codes))
+    synced_at = time.time()
+    
+    index = None
+    if index_path is not None and os.path.exists(index_path) and db_connector.tracks_changes:
+        try:
+            index = RequirementIndex.load(index_path, validator)
+        except ValueError:
+            index = None
+        if index is not None and index.codes != codes:
+            index = None
+    
+    if index is not None:
+        try:
+            changes = db_connector.changed_since(index.synced_at)
+        except QueryUnavailableError:
+            index = None
+        else:
+            positions = index._positions
+            for student_code, student_data in changes.items():
+                if student_code in positions:
+                    index.update(student_code, student_data)
+    
+    if index is None:
+        index = RequirementIndex(validator)
+        # La caché podría tener registros anteriores a los cambios
+        db_connector.invalidate()
+        for batch in batched(codes, BULK_BATCH_SIZE):
+            try:
+                students_data = db_connector.get_students_bulk(batch)
+            except QueryUnavailableError:
+                # Conservan su posición, pero no aparecen en las consultas
+                for student_code in batch:
+                    index.update(student_code, STUDENT_NOT_FOUND)
+                index.unavailable.extend(batch)
+                continue
+            for student_code in batch:
+                index.update(student_code, students_data.get(student_code, STUDENT_NOT_FOUND))
+    
+    index.synced_at = synced_at
+    if index_path is not None and not index.unavailable:
+        index.save(index_path)
+    return index
@@ -0,0 +1,396 @@
+"""
+Módulo con las políticas de tiempo límite, reintento y corte de las consultas.
+
+Una consulta lenta no debe detener la validación: CallPolicy ejecuta cada
+consulta del conector con un plazo máximo y, si tarda más que el percentil 95
+observado para ese tipo de consulta, envía una copia (consulta de respaldo) y
+usa la primera respuesta. Los errores transitorios se reintentan con espera
+exponencial aleatoria y, si la base de datos falla de forma repetida, el
+interruptor (CircuitBreaker) rechaza las consultas de inmediato durante un
+tiempo en lugar de acumular esperas.
+
+Las consultas que no se pueden responder terminan en QueryUnavailableError;
+GraduationValidator las convierte en el estado INDETERMINATE del requisito.
+"""
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from src.metrics import LatencyHistogram
+
+
+class QueryUnavailableError(Exception):
+    """La consulta no se pudo responder a tiempo o la base de datos no está disponible."""
+
+
+class DeadlineExceeded(QueryUnavailableError, TimeoutError):
+    """La consulta no terminó dentro de su plazo."""
+
+
+class CircuitOpenError(QueryUnavailableError):
+    """El interruptor está abierto y la consulta se rechazó sin ejecutarse."""
+
+
+class RetriesExhausted(QueryUnavailableError):
+    """La consulta falló en todos sus intentos. El último error queda en __cause__."""
+
+
+class CircuitBreaker:
+    """Interruptor que deja de consultar una base de datos que falla de forma repetida."""
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        """
+        Inicializa el interruptor cerrado.
+        
+        Args:
+            failure_threshold (int, optional): Fallos consecutivos que abren el
+                interruptor.
+            reset_timeout (float, optional): Segundos que permanece abierto antes
+                de dejar pasar una consulta de prueba.
+            clock (callable, optional): Reloj en segundos.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    def before_call(self):
+        """
+        Autoriza una consulta.
+        
+        Con el interruptor abierto se rechaza hasta que pasa reset_timeout; a
+        partir de ahí se deja pasar una sola consulta de prueba cuyo resultado
+        lo cierra o lo vuelve a abrir.
+        
+        Raises:
+            CircuitOpenError: Si el interruptor no deja pasar la consulta.
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                if self.clock() - self.opened_at < self.reset_timeout:
+                    raise CircuitOpenError("La base de datos no está disponible (interruptor abierto)")
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    raise CircuitOpenError("La base de datos no está disponible (consulta de prueba en curso)")
+                self._trial_in_flight = True
+    
+    def record_success(self):
+        """Registra una consulta exitosa y cierra el interruptor."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+    
+    def record_failure(self):
+        """Registra una consulta fallida y abre el interruptor si corresponde."""
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+
+class RetryPolicy:
+    """Reintentos con espera exponencial y aleatoria (full jitter)."""
+    
+    def __init__(self, attempts=3, base_delay=0.05, max_delay=1.0, retry_on=(OSError,), seed=None):
+        """
+        Inicializa la política.
+        
+        Args:
+            attempts (int, optional): Intentos totales, incluido el primero.
+            base_delay (float, optional): Espera máxima antes del primer
+                reintento, en segundos. Se duplica en cada intento.
+            max_delay (float, optional): Tope de la espera, en segundos.
+            retry_on (tuple, optional): Excepciones que se reintentan. Los
+                plazos vencidos no se reintentan.
+            seed (int, optional): Semilla de la espera aleatoria.
+        """
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+        self._random = random.Random(seed)
+    
+    def backoff(self, attempt):
+        """
+        Calcula la espera antes de un reintento.
+        
+        La espera es uniforme entre 0 y el tope exponencial, para que los
+        clientes que fallaron a la vez no reintenten a la vez.
+        
+        Args:
+            attempt (int): Número del intento que falló, desde 0.
+        
+        Returns:
+            float: Segundos de espera.
+        """
+        return self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CallPolicy:
+    """Ejecuta consultas con plazo, consulta de respaldo, reintentos e interruptor."""
+    
+    def __init__(self, deadline=None, hedge_quantile=0.95, hedge_min_samples=20, retry=None,
+                 breaker=None, metrics=None, max_workers=16, clock=time.monotonic, sleep=time.sleep):
+        """
+        Inicializa la política.
+        
+        Args:
+            deadline (float, optional): Plazo de cada consulta en segundos,
+                reintentos incluidos. Si es None no hay plazo.
+            hedge_quantile (float, optional): Cuantil de la latencia observada
+                tras el cual se envía la consulta de respaldo. Si es None no se
+                envían consultas de respaldo.
+            hedge_min_samples (int, optional): Consultas observadas de un tipo
+                antes de empezar a enviar respaldos.
+            retry (RetryPolicy, optional): Política de reintentos. Si es None no
+                se reintenta.
+            breaker (CircuitBreaker, optional): Interruptor compartido por todas
+                las consultas. Si es None no hay interruptor.
+            metrics (Metrics, optional): Registro donde se cuentan 'query_timeouts',
+                'query_retries', 'hedged_queries', 'hedge_wins' y
+                'circuit_rejections'.
+            max_workers (int, optional): Hilos que ejecutan las consultas con
+                plazo o respaldo. Una consulta vencida ocupa su hilo hasta que
+                termina, pero ya nadie la espera.
+            clock (callable, optional): Reloj en segundos.
+            sleep (callable, optional): Función de espera de los reintentos.
+        """
+        self.deadline = deadline
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.retry = retry
+        self.breaker = breaker
+        self.metrics = metrics
+        self.max_workers = max_workers
+        self.clock = clock
+        self.sleep = sleep
+        self._latencies = {}
+        self._executor = None
+        self._lock = threading.Lock()
+    
+    def __getstate__(self):
+        # Los hilos y las latencias observadas pertenecen al proceso original
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_executor"] = None
+        state["_latencies"] = {}
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    def _count(self, name):
+        """
+        Incrementa un contador de métricas, si hay registro.
+        
+        Args:
+            name (str): Nombre del contador.
+        """
+        if self.metrics is not None:
+            self.metrics.increment(name)
+    
+    def _observe(self, name, seconds):
+        """
+        Registra la latencia de una consulta exitosa.
+        
+        Args:
+            name (str): Tipo de consulta.
+            seconds (float): Duración medida.
+        """
+        with self._lock:
+            histogram = self._latencies.get(name)
+            if histogram is None:
+                histogram = self._latencies[name] = LatencyHistogram()
+            histogram.observe(seconds)
+    
+    def hedge_delay(self, name):
+        """
+        Calcula tras cuánto tiempo se envía la consulta de respaldo.
+        
+        Args:
+            name (str): Tipo de consulta.
+        
+        Returns:
+            float: Segundos, o None si todavía no hay suficientes observaciones
+                o los respaldos están desactivados.
+        """
+        if self.hedge_quantile is None:
+            return None
+        with self._lock:
+            histogram = self._latencies.get(name)
+            if histogram is None or histogram.count < self.hedge_min_samples:
+                return None
+            return histogram.quantile(self.hedge_quantile)
+    
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="call-policy"
+                )
+            return self._executor
+    
+    def call(self, name, fn, *args):
+        """
+        Ejecuta una consulta aplicando la política.
+        
+        Args:
+            name (str): Tipo de consulta, p. ej. 'query_student_data'. Las
+                latencias se observan por separado para cada tipo.
+            fn (callable): Consulta a ejecutar.
+            *args: Argumentos de fn.
+        
+        Returns:
+            object: Resultado de la consulta.
+        
+        Raises:
+            DeadlineExceeded: Si la consulta no termina dentro del plazo.
+            CircuitOpenError: Si el interruptor rechaza la consulta.
+            RetriesExhausted: Si fallan todos los intentos con errores reintentables.
+        """
+        deadline_at = None if self.deadline is None else self.clock() + self.deadline
+        attempt = 0
+        while True:
+            if self.breaker is not None:
+                try:
+                    self.breaker.before_call()
+                except CircuitOpenError:
+                    self._count("circuit_rejections")
+                    raise
+            try:
+                result = self._attempt(name, fn, args, deadline_at)
+            except DeadlineExceeded:
+                self._count("query_timeouts")
+                if self.breaker is not None:
+                    self.breaker.record_failure()
+                raise
+            except Exception as error:
+                if self.breaker is not None:
+                    self.breaker.record_failure()
+                if self.retry is None or not isinstance(error, self.retry.retry_on):
+                    raise
+                attempt += 1
+                if attempt >= self.retry.attempts:
+                    raise RetriesExhausted(f"La consulta {name} falló en {attempt} intentos") from error
+                delay = self.retry.backoff(attempt - 1)
+                if deadline_at is not None and self.clock() + delay >= deadline_at:
+                    self._count("query_timeouts")
+                    raise DeadlineExceeded(f"La consulta {name} no terminó dentro del plazo") from error
+                self._count("query_retries")
+                self.sleep(delay)
+                continue
+            if self.breaker is not None:
+                self.breaker.record_success()
+            return result
+    
+    def _attempt(self, name, fn, args, deadline_at):
+        """
+        Ejecuta un intento, con plazo y consulta de respaldo si corresponden.
+        
+        Sin plazo ni respaldo la consulta se ejecuta en el hilo que llama.
+        
+        Args:
+            name (str): Tipo de consulta.
+            fn (callable): Consulta a ejecutar.
+            args (tuple): Argumentos de fn.
+            deadline_at (float): Instante límite según clock, o None.
+        
+        Returns:
+            object: Resultado de la primera copia que termina bien.
+        
+        Raises:
+            DeadlineExceeded: Si ninguna copia termina dentro del plazo.
+        """
+        hedge_delay = self.hedge_delay(name)
+        start = self.clock()
+        if deadline_at is None and hedge_delay is None:
+            result = fn(*args)
+            self._observe(name, self.clock() - start)
+            return result
+        
+        if deadline_at is not None and start >= deadline_at:
+            raise DeadlineExceeded(f"La consulta {name} no terminó dentro del plazo")
+        executor = self._get_executor()
+        primary = executor.submit(fn, *args)
+        pending = {primary}
+        hedge_at = None if hedge_delay is None else start + hedge_delay
+        error = None
+        while pending:
+            wake_times = [t for t in (deadline_at, hedge_at) if t is not None]
+            timeout = max(0.0, min(wake_times) - self.clock()) if wake_times else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    self._observe(name, self.clock() - start)
+                    if future is not primary:
+                        self._count("hedge_wins")
+                    return future.result()
+                error = future.exception()
+            if not pending:
+                break
+            now = self.clock()
+            if deadline_at is not None and now >= deadline_at:
+                for other in pending:
+                    other.cancel()
+                raise DeadlineExceeded(f"La consulta {name} no terminó dentro del plazo")
+            if hedge_at is not None and now >= hedge_at:
+                # Una copia de la consulta suele esquivar la causa de la cola
+                # de latencia (una conexión o un servidor lentos)
+                hedge_at = None
+                pending.add(executor.submit(fn, *args))
+                self._count("hedged_queries")
+        raise error
+
+
+def build_call_policy(deadline_ms=None, retries=0, hedge=False, metrics=None):
+    """
+    Construye la política de llamadas pedida con opciones de línea de comandos.
+    
+    Con plazo se agrega además un interruptor, para no acumular esperas si la
+    base de datos deja de responder.
+    
+    Args:
+        deadline_ms (float, optional): Plazo de cada consulta en milisegundos.
+        retries (int, optional): Reintentos de las consultas fallidas.
+        hedge (bool, optional): Enviar una consulta de respaldo tras el
+            percentil 95 de la latencia observada.
+        metrics (Metrics, optional): Registro de los contadores de la política.
+    
+    Returns:
+        CallPolicy: Política, o None si no se pidió plazo, reintentos ni respaldos.
+    """
+    if deadline_ms is None and not retries and not hedge:
+        return None
+    return CallPolicy(
+        deadline=None if deadline_ms is None else deadline_ms / 1000,
+        hedge_quantile=0.95 if hedge else None,
+        retry=RetryPolicy(attempts=retries + 1) if retries else None,
+        breaker=CircuitBreaker() if deadline_ms is not None else None,
+        metrics=metrics
+    )
@@ -0,0 +1,70 @@
+"""
+Módulo para leer listados de códigos de estudiantes de forma incremental.
+Los códigos se leen línea por línea, por lo que la memoria usada no depende
+del tamaño del listado.
+"""
+import gzip
+import sys
+from itertools import islice
+
+# Valor de source que indica leer el listado desde la entrada estándar
+STDIN_SOURCE = '-'
+
+
+def open_roster(source='estudiantes.txt', encoding=None):
+    """
+    Abre un listado de estudiantes como flujo de texto.
+    
+    Args:
+        source (str): Ruta del archivo, ruta terminada en '.gz' para un archivo
+            comprimido con gzip, o '-' para leer de la entrada estándar.
+        encoding (str, optional): Codificación del listado. Si es None se usa
+            la codificación predeterminada del sistema.
+    
+    Returns:
+        io.TextIOBase: Flujo de texto con un código por línea.
+    
+    Raises:
+        FileNotFoundError: Si el archivo no existe.
+    """
+    if source == STDIN_SOURCE:
+        # closefd=False permite cerrar el flujo sin cerrar la entrada estándar
+        return open(sys.stdin.fileno(), 'r', encoding=encoding, closefd=False)
+    if str(source).endswith('.gz'):
+        return gzip.open(source, 'rt', encoding=encoding)
+    return open(source, 'r', encoding=encoding)
+
+
+def iter_student_codes(stream):
+    """
+    Entrega los códigos de un flujo de texto, omitiendo las líneas vacías.
+    
+    Args:
+        stream (iterable): Flujo de texto o cualquier iterable de líneas.
+    
+    Yields:
+        str: Código de estudiante sin espacios al inicio ni al final.
+    """
+    for line in stream:
+        student_code = line.strip()
+        if student_code:
+            yield student_code
+
+
+def batched(iterable, size):
+    """
+    Divide un iterable en listas de tamaño fijo (la última puede ser menor).
+    
+    Args:
+        iterable (iterable): Elementos a dividir.
+        size (int): Cantidad de elementos por bloque.
+    
+    Yields:
+        list: Bloque de elementos.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
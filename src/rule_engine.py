@@ -0,0 +1,284 @@
+"""
+Módulo con un motor de reglas para los requisitos de graduación.
+En el modo de solo veredicto el motor se detiene en la primera regla que falla
+y reordena las reglas según la tasa de fallos y la latencia observadas, para
+evaluar primero las que más probablemente descartan al estudiante a menor costo.
+Las reglas sin latencia medida se evalúan primero hasta medirlas, y cada cierto
+número de evaluaciones se ejecutan todas, para que las reglas que quedan detrás
+de un fallo frecuente no conserven estadísticas viejas.
+"""
+import threading
+import time
+
+
+class Rule:
+    """Regla de validación con estadísticas de ejecución."""
+    
+    def __init__(self, name, check, cost=None):
+        """
+        Inicializa la regla.
+        
+        Args:
+            name (str): Nombre del requisito en el detalle de la validación.
+            check (callable): Función que recibe el código del estudiante (y
+                los argumentos adicionales de la evaluación) y devuelve True si
+                cumple el requisito.
+            cost (float, optional): Costo estimado de una evaluación, en
+                segundos, que se usa mientras no haya latencias observadas. Si
+                es None, la prioridad sale solo de las observaciones.
+        """
+        self.name = name
+        self.check = check
+        self.cost = cost
+        self.evaluations = 0
+        self.failures = 0
+        self.timed_evaluations = 0
+        self.total_time = 0.0
+    
+    @property
+    def failure_rate(self):
+        """float: Proporción de fallos observada, suavizada para pocas muestras."""
+        return (self.failures + 1) / (self.evaluations + 2)
+    
+    @property
+    def mean_latency(self):
+        """float: Latencia media observada en segundos, o el costo estimado si no hay datos."""
+        if self.timed_evaluations == 0:
+            return self.cost
+        return self.total_time / self.timed_evaluations
+    
+    def priority(self, use_observed_latency):
+        """
+        Calcula la prioridad de la regla: menor valor se evalúa antes.
+        
+        Para una conjunción de reglas independientes, ordenar por costo dividido
+        entre probabilidad de fallo minimiza el costo esperado de la evaluación.
+        Una regla sin costo conocido tiene prioridad 0, de modo que se evalúa
+        primero y se mide.
+        
+        Args:
+            use_observed_latency (bool): Usar la latencia medida en lugar del
+                costo estimado.
+        
+        Returns:
+            float: Prioridad de la regla.
+        """
+        cost = self.mean_latency if use_observed_latency else self.cost
+        if cost is None:
+            return 0.0
+        return cost / self.failure_rate
+
+
+class RuleEngine:
+    """Motor que evalúa reglas de validación completas o con cortocircuito, seguro entre hilos."""
+    
+    def __init__(self, adaptive=True, reorder_every=100, explore_every=50, clock=time.perf_counter):
+        """
+        Inicializa el motor de reglas.
+        
+        Args:
+            adaptive (bool, optional): Reordenar las reglas según las
+                estadísticas observadas. Si es False se usa el costo estimado.
+            reorder_every (int, optional): Cantidad de evaluaciones entre
+                reordenamientos.
+            explore_every (int, optional): Cada cuántas llamadas a is_satisfied
+                se evalúan todas las reglas sin cortocircuito, para seguir
+                midiendo las que casi nunca se alcanzan. Con 0 no se explora.
+            clock (callable, optional): Reloj usado para medir latencias.
+        """
+        self.adaptive = adaptive
+        self.reorder_every = reorder_every
+        self.explore_every = explore_every
+        self.clock = clock
+        self._rules = []
+        self._order = []
+        self._since_reorder = 0
+        self._since_explore = 0
+        self._lock = threading.Lock()
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    def register(self, name, check, cost=None):
+        """
+        Registra una regla. El detalle completo respeta el orden de registro.
+        
+        Args:
+            name (str): Nombre del requisito.
+            check (callable): Función que recibe el código del estudiante.
+            cost (float, optional): Costo estimado de la regla, en segundos.
+        
+        Returns:
+            Rule: Regla registrada.
+        
+        Raises:
+            ValueError: Si ya existe una regla con ese nombre.
+        """
+        with self._lock:
+            if any(rule.name == name for rule in self._rules):
+                raise ValueError(f"Ya existe una regla llamada '{name}'")
+            rule = Rule(name, check, cost)
+            self._rules.append(rule)
+            self._reorder()
+        return rule
+    
+    @property
+    def rules(self):
+        """list: Reglas en el orden de registro."""
+        return list(self._rules)
+    
+    def __len__(self):
+        """int: Cantidad de reglas registradas."""
+        return len(self._rules)
+    
+    def execution_order(self):
+        """
+        Obtiene el orden actual de evaluación en el modo de solo veredicto.
+        
+        Returns:
+            list: Nombres de las reglas.
+        """
+        return [rule.name for rule in self._order]
+    
+    def _reorder(self):
+        """
+        Recalcula el orden de evaluación según la prioridad de cada regla.
+        
+        Se llama con self._lock tomado. El orden se reemplaza por una lista
+        nueva, así que los hilos que recorren la anterior no se ven afectados.
+        """
+        self._order = sorted(self._rules, key=lambda rule: rule.priority(self.adaptive))
+        self._since_reorder = 0
+    
+    def _run(self, rule, student_code, args):
+        """
+        Evalúa una regla midiendo su latencia y actualiza sus estadísticas.
+        
+        Args:
+            rule (Rule): Regla a evaluar.
+            student_code (str): Código del estudiante.
+            args (tuple): Argumentos adicionales de la regla.
+        
+        Returns:
+            bool: Resultado de la regla.
+        """
+        start = self.clock()
+        passed = rule.check(student_code, *args)
+        elapsed = self.clock() - start
+        with self._lock:
+            rule.total_time += elapsed
+            rule.timed_evaluations += 1
+            rule.evaluations += 1
+            if not passed:
+                rule.failures += 1
+        return passed
+    
+    def _count_evaluation(self):
+        """
+        Cuenta una evaluación y reordena las reglas cada reorder_every.
+        
+        Se llama con self._lock tomado.
+        """
+        if self.adaptive:
+            self._since_reorder += 1
+            if self._since_reorder >= self.reorder_every:
+                self._reorder()
+    
+    def evaluate(self, student_code, *args, measure_latency=True):
+        """
+        Evalúa todas las reglas y devuelve el detalle de cada una.
+        
+        Args:
+            student_code (str): Código del estudiante.
+            *args: Argumentos adicionales de cada regla, como un registro ya
+                obtenido.
+            measure_latency (bool, optional): Medir la latencia de cada regla.
+                Con False solo se cuentan evaluaciones y fallos, p. ej. cuando
+                las reglas leen un registro ya obtenido y su latencia no
+                refleja el costo de consultarlo.
+        
+        Returns:
+            tuple: (bool, dict) donde el bool indica si se cumplen todas las
+                reglas y el dict contiene el resultado de cada una, en el
+                orden de registro.
+        """
+        if measure_latency:
+            results = {rule.name: self._run(rule, student_code, args) for rule in self._rules}
+            with self._lock:
+                self._count_evaluation()
+        else:
+            results = {rule.name: rule.check(student_code, *args) for rule in self._rules}
+            # Una sola vez el candado por registro, no una por regla
+            with self._lock:
+                for rule in self._rules:
+                    rule.evaluations += 1
+                    if not results[rule.name]:
+                        rule.failures += 1
+                self._count_evaluation()
+        return all(results.values()), results
+    
+    def _should_explore(self):
+        """
+        Indica si la llamada actual a is_satisfied debe evaluar todas las reglas.
+        
+        Returns:
+            bool: True una vez cada explore_every llamadas.
+        """
+        if not (self.adaptive and self.explore_every):
+            return False
+        with self._lock:
+            self._since_explore += 1
+            if self._since_explore < self.explore_every:
+                return False
+            self._since_explore = 0
+            return True
+    
+    def is_satisfied(self, student_code, *args):
+        """
+        Evalúa las reglas en orden de prioridad y se detiene en el primer fallo.
+        
+        Una vez cada explore_every llamadas se evalúan todas las reglas, con
+        el mismo resultado, para actualizar las estadísticas de las que
+        quedan detrás de un fallo.
+        
+        Args:
+            student_code (str): Código del estudiante.
+            *args: Argumentos adicionales de cada regla.
+        
+        Returns:
+            bool: True si se cumplen todas las reglas.
+        """
+        try:
+            if self._should_explore():
+                return all([self._run(rule, student_code, args) for rule in self._order])
+            for rule in self._order:
+                if not self._run(rule, student_code, args):
+                    return False
+            return True
+        finally:
+            with self._lock:
+                self._count_evaluation()
+    
+    def stats(self):
+        """
+        Devuelve las estadísticas observadas de cada regla.
+        
+        Returns:
+            dict: {nombre: {evaluations, failures, failure_rate, mean_latency}}.
+        """
+        with self._lock:
+            return {
+                rule.name: {
+                    "evaluations": rule.evaluations,
+                    "failures": rule.failures,
+                    "failure_rate": rule.failure_rate,
+                    "mean_latency": rule.mean_latency
+                }
+                for rule in self._rules
+            }
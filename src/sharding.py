@@ -0,0 +1,391 @@
+"""
+Módulo para generar el reporte CSV por fragmentos reanudables.
+
+El listado se divide en fragmentos consecutivos de shard_size estudiantes. Cada
+fragmento se escribe como un archivo parcial (filas del CSV sin encabezado) en
+un directorio de trabajo, y al terminarlo se guarda su marca de finalización.
+Si la ejecución se interrumpe, con resume=True solo se procesan los fragmentos
+sin marca. Al completarse todos, se concatenan en orden bajo el encabezado y
+el resultado es idéntico al de generate_graduation_csv_report.
+
+Los fragmentos se reparten de forma fija entre worker_count trabajadores: el
+trabajador i procesa los fragmentos cuyo índice módulo worker_count es i. Así,
+varios procesos de una máquina o de varios nodos con un sistema de archivos
+compartido pueden trabajar sobre el mismo directorio sin coordinarse. Una
+ejecución sin resume vacía el directorio de trabajo, así que solo el primer
+trabajador de un trabajo nuevo se lanza sin resume; los demás se unen con
+resume=True.
+"""
+import hashlib
+import json
+import os
+import shutil
+import socket
+import time
+
+from src.cohort_stats import CohortStats
+from src.generate_report import _check_executor, _iter_results, _open_roster_or_report
+from src.report_writers import create_report_writer, open_output
+from src.roster import STDIN_SOURCE, batched, iter_student_codes
+from src.validacion_grado import BULK_BATCH_SIZE, GraduationValidator
+
+# Versión del formato del manifiesto y de las marcas de finalización. La 2
+# cambió los intervalos del histograma de promedios guardado en cada marca
+MANIFEST_VERSION = 2
+
+# Cantidad de estudiantes por fragmento por defecto
+DEFAULT_SHARD_SIZE = 10000
+
+_MANIFEST_NAME = "manifest.json"
+
+
+def _temp_suffix():
+    """
+    Devuelve un sufijo de archivo temporal único por nodo y proceso.
+    
+    Returns:
+        str: Sufijo para nombres de archivos temporales.
+    """
+    return f".tmp-{socket.gethostname()}-{os.getpid()}"
+
+
+def _write_json_atomic(path, payload):
+    """
+    Escribe un archivo JSON de forma atómica.
+    
+    Args:
+        path (str): Ruta del archivo.
+        payload (dict): Contenido a guardar.
+    """
+    temp_path = path + _temp_suffix()
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    os.replace(temp_path, path)
+
+
+def _read_json(path):
+    """
+    Lee un archivo JSON.
+    
+    Args:
+        path (str): Ruta del archivo.
+    
+    Returns:
+        dict: Contenido, o None si no existe o está incompleto.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _part_path(work_dir, shard_index):
+    """
+    Devuelve la ruta del archivo parcial de un fragmento.
+    
+    Args:
+        work_dir (str): Directorio de trabajo.
+        shard_index (int): Índice del fragmento.
+    
+    Returns:
+        str: Ruta del archivo parcial.
+    """
+    return os.path.join(work_dir, f"part-{shard_index:05d}.csv")
+
+
+def _done_path(work_dir, shard_index):
+    """
+    Devuelve la ruta de la marca de finalización de un fragmento.
+    
+    Args:
+        work_dir (str): Directorio de trabajo.
+        shard_index (int): Índice del fragmento.
+    
+    Returns:
+        str: Ruta de la marca de finalización.
+    """
+    return os.path.join(work_dir, f"part-{shard_index:05d}.done.json")
+
+
+def _roster_manifest(roster_path, encoding, shard_size, min_average):
+    """
+    Describe el listado y los parámetros que determinan los fragmentos.
+    
+    Args:
+        roster_path (str): Ruta del listado.
+        encoding (str): Codificación del listado.
+        shard_size (int): Cantidad de estudiantes por fragmento.
+        min_average (float): Promedio mínimo del validador.
+    
+    Returns:
+        dict: Manifiesto, o None si el listado no existe.
+    """
+    roster = _open_roster_or_report(roster_path, encoding)
+    if roster is None:
+        return None
+    
+    digest = hashlib.blake2b(digest_size=16)
+    students = 0
+    with roster:
+        for student_code in iter_student_codes(roster):
+            digest.update(student_code.encode("utf-8") + b"\n")
+            students += 1
+    return {
+        "version": MANIFEST_VERSION,
+        "roster_digest": digest.hexdigest(),
+        "students": students,
+        "shard_size": shard_size,
+        "shards": -(-students // shard_size),
+        "min_average": min_average
+    }
+
+
+def _prepare_work_dir(work_dir, manifest, resume, fresh=False):
+    """
+    Crea el directorio de trabajo o comprueba que corresponde al mismo listado.
+    
+    Los fragmentos del directorio solo se eliminan si su manifiesto es de
+    otro listado o de otros parámetros, o si se pide fresh. Así ningún
+    trabajador borra los fragmentos que otro ya terminó, sin importar el
+    orden en que se lancen.
+    
+    Args:
+        work_dir (str): Directorio de trabajo.
+        manifest (dict): Manifiesto de la ejecución actual.
+        resume (bool): Si se reanuda una ejecución anterior.
+        fresh (bool, optional): Eliminar los fragmentos aunque correspondan
+            al mismo listado, p. ej. porque cambiaron los registros.
+    
+    Raises:
+        ValueError: Si se pide reanudar un directorio de otro listado o con
+            otros parámetros.
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    manifest_path = os.path.join(work_dir, _MANIFEST_NAME)
+    previous = _read_json(manifest_path)
+    if fresh and resume:
+        raise ValueError("fresh y resume no se pueden usar juntos")
+    if not fresh and previous == manifest:
+        return
+    if resume and previous is not None:
+        raise ValueError(
+            f"El directorio '{work_dir}' corresponde a otro listado o a otros "
+            "parámetros; no se puede reanudar"
+        )
+    for name in os.listdir(work_dir):
+        if name.startswith("part-"):
+            os.remove(os.path.join(work_dir, name))
+    _write_json_atomic(manifest_path, manifest)
+
+
+def is_shard_complete(work_dir, shard_index):
+    """
+    Indica si un fragmento terminó de escribirse.
+    
+    Args:
+        work_dir (str): Directorio de trabajo.
+        shard_index (int): Índice del fragmento.
+    
+    Returns:
+        bool: True si existe su marca y el archivo parcial tiene el tamaño registrado.
+    """
+    done = _read_json(_done_path(work_dir, shard_index))
+    if done is None:
+        return False
+    try:
+        return os.path.getsize(_part_path(work_dir, shard_index)) == done["bytes"]
+    except OSError:
+        return False
+
+
+def _write_shard(work_dir, shard_index, validator, student_codes, workers, executor, chunk_size):
+    """
+    Valida un fragmento y escribe su archivo parcial y su marca de
+    finalización, que incluye las estadísticas del fragmento.
+    
+    El archivo parcial se escribe en un temporal que solo se renombra al
+    terminar, por lo que un fallo nunca deja un fragmento a medio escribir.
+    
+    Args:
+        work_dir (str): Directorio de trabajo.
+        shard_index (int): Índice del fragmento.
+        validator (GraduationValidator): Validador de requisitos.
+        student_codes (list): Códigos de los estudiantes del fragmento.
+        workers (int): Cantidad de hilos o procesos de validación.
+        executor (str): 'thread' o 'process'.
+        chunk_size (int): Cantidad de estudiantes por bloque.
+    
+    Returns:
+        int: Cantidad de filas del fragmento.
+    """
+    part_path = _part_path(work_dir, shard_index)
+    temp_path = part_path + _temp_suffix()
+    done_path = _done_path(work_dir, shard_index)
+    if os.path.exists(done_path):
+        os.remove(done_path)
+    stats = CohortStats()
+    try:
+        writer = create_report_writer(open_output(temp_path), "csv")
+        try:
+            results = _iter_results(validator, student_codes, workers, executor, chunk_size)
+            rows = writer.write_rows(stats.observe_results(results))
+        finally:
+            writer.close()
+        os.replace(temp_path, part_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    _write_json_atomic(done_path, {
+        "rows": rows,
+        "bytes": os.path.getsize(part_path),
+        "stats": stats.to_dict()
+    })
+    return rows
+
+
+def merge_shards(file_path, work_dir, stats_path=None):
+    """
+    Une los archivos parciales en el reporte CSV final.
+    
+    El reporte se escribe en un temporal que reemplaza al destino al final.
+    
+    Args:
+        file_path (str): Ruta del reporte CSV.
+        work_dir (str): Directorio de trabajo con el manifiesto y los fragmentos.
+        stats_path (str, optional): Si se indica, se combinan las estadísticas
+            de los fragmentos y se guardan en este archivo JSON.
+    
+    Returns:
+        int: Cantidad de filas del reporte.
+    
+    Raises:
+        ValueError: Si falta el manifiesto o algún fragmento está incompleto.
+    """
+    manifest = _read_json(os.path.join(work_dir, _MANIFEST_NAME))
+    if manifest is None:
+        raise ValueError(f"No hay un manifiesto de fragmentos en '{work_dir}'")
+    pending = [i for i in range(manifest["shards"]) if not is_shard_complete(work_dir, i)]
+    if pending:
+        raise ValueError(f"Faltan {len(pending)} de {manifest['shards']} fragmentos en '{work_dir}'")
+    
+    temp_path = os.fspath(file_path) + _temp_suffix()
+    writer = create_report_writer(open_output(temp_path), "csv")
+    writer.write_header()
+    writer.close()
+    
+    rows = 0
+    stats = CohortStats()
+    with open(temp_path, "ab") as target:
+        for shard_index in range(manifest["shards"]):
+            with open(_part_path(work_dir, shard_index), "rb") as part:
+                shutil.copyfileobj(part, target, 1 << 20)
+            done = _read_json(_done_path(work_dir, shard_index))
+            rows += done["rows"]
+            stats.merge(CohortStats.from_dict(done["stats"]))
+    os.replace(temp_path, file_path)
+    if stats_path is not None:
+        stats.write(stats_path)
+    return rows
+
+
+def generate_sharded_csv_report(file_path='resultado_graduacion.csv', validator=None,
+                                shard_size=DEFAULT_SHARD_SIZE, work_dir=None, resume=False,
+                                worker_index=0, worker_count=1, workers=1, executor='thread',
+                                chunk_size=BULK_BATCH_SIZE, roster_path='estudiantes.txt',
+                                encoding=None, keep_shards=False, stats_path=None, metrics=None,
+                                fresh=False):
+    """
+    Genera el reporte CSV por fragmentos reanudables.
+    
+    Cada trabajador procesa sus fragmentos y, si al terminar están completos
+    todos los del listado, une los archivos parciales en file_path. El reporte
+    final solo aparece cuando está completo. Los fragmentos de otros
+    trabajadores se conservan mientras el manifiesto coincida; para
+    descartar una ejecución anterior del mismo listado se usa fresh, en un
+    solo trabajador y antes de lanzar los demás.
+    
+    Args:
+        file_path (str, optional): Ruta del reporte CSV.
+        validator (GraduationValidator, optional): Validador de requisitos.
+            Si no se proporciona, se crea uno nuevo.
+        shard_size (int, optional): Cantidad de estudiantes por fragmento.
+            Todos los trabajadores deben usar el mismo valor.
+        work_dir (str, optional): Directorio de trabajo. Por defecto,
+            file_path seguido de '.shards'.
+        resume (bool, optional): Omitir los fragmentos ya terminados. Si es
+            False, este trabajador vuelve a escribir todos los suyos.
+        worker_index (int, optional): Índice de este trabajador, de 0 a
+            worker_count - 1.
+        worker_count (int, optional): Cantidad total de trabajadores.
+        workers (int, optional): Hilos o procesos de validación dentro de
+            cada fragmento.
+        executor (str, optional): 'thread' o 'process'.
+        chunk_size (int, optional): Cantidad de estudiantes por bloque.
+        roster_path (str, optional): Ruta del listado. La entrada estándar no
+            se admite porque el listado se lee más de una vez.
+        encoding (str, optional): Codificación del listado.
+        keep_shards (bool, optional): Conservar el directorio de trabajo tras
+            la unión. Con varios trabajadores siempre se conserva, porque otro
+            trabajador puede estar uniendo los mismos fragmentos.
+        stats_path (str, optional): Archivo JSON donde se guardan las
+            estadísticas de la cohorte, combinadas a partir de las de cada
+            fragmento al unirlos.
+        metrics (Metrics, optional): Registro donde se guardan las filas
+            escritas por este trabajador y la duración de su ejecución.
+        fresh (bool, optional): Eliminar los fragmentos de ejecuciones
+            anteriores aunque correspondan al mismo listado. No se combina
+            con resume.
+    
+    Returns:
+        int: Cantidad de filas escritas por este trabajador, o None si el
+            listado no existe.
+    
+    Raises:
+        ValueError: Si los parámetros no son válidos o se pide reanudar un
+            directorio de trabajo de otro listado.
+    """
+    if roster_path == STDIN_SOURCE:
+        raise ValueError("La ejecución por fragmentos requiere un listado en archivo")
+    if shard_size < 1:
+        raise ValueError("shard_size debe ser mayor que 0")
+    if not 0 <= worker_index < worker_count:
+        raise ValueError("worker_index debe estar entre 0 y worker_count - 1")
+    _check_executor(executor)
+    
+    validator = validator or GraduationValidator()
+    work_dir = work_dir or os.fspath(file_path) + ".shards"
+    manifest = _roster_manifest(roster_path, encoding, shard_size, validator.min_average)
+    if manifest is None:
+        return None
+    _prepare_work_dir(work_dir, manifest, resume, fresh)
+    
+    start = time.perf_counter()
+    rows_written = 0
+    roster = _open_roster_or_report(roster_path, encoding)
+    if roster is None:
+        return None
+    with roster:
+        for shard_index, student_codes in enumerate(batched(iter_student_codes(roster), shard_size)):
+            if shard_index % worker_count != worker_index:
+                continue
+            if resume and is_shard_complete(work_dir, shard_index):
+                continue
+            rows_written += _write_shard(
+                work_dir, shard_index, validator, student_codes, workers, executor, chunk_size
+            )
+    
+    if metrics is not None:
+        metrics.increment("report_rows", rows_written)
+        metrics.set_gauge("report_seconds", time.perf_counter() - start)
+    
+    completed = sum(is_shard_complete(work_dir, i) for i in range(manifest["shards"]))
+    if completed < manifest["shards"]:
+        print(f"Fragmentos completos: {completed} de {manifest['shards']} en '{work_dir}'")
+        return rows_written
+    
+    merge_shards(file_path, work_dir, stats_path)
+    if worker_count == 1 and not keep_shards:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print(f"Reporte generado exitosamente en '{file_path}'")
+    return rows_written
@@ -0,0 +1,205 @@
+"""
+Módulo para agrupar consultas concurrentes idénticas (single-flight).
+
+Cuando varios hilos o tareas piden el mismo código al mismo tiempo, solo el
+primero ejecuta la consulta y los demás esperan y comparten su resultado (o
+su excepción). Una vez terminada, la siguiente petición vuelve a consultar:
+no es una caché, solo evita consultas duplicadas simultáneas.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+
+# Contador de métricas con las consultas ahorradas
+COALESCED_COUNTER = "coalesced_queries"
+
+
+class SingleFlight:
+    """Agrupa consultas concurrentes por clave entre hilos."""
+    
+    def __init__(self, metrics=None):
+        """
+        Inicializa el grupo de consultas en curso.
+        
+        Args:
+            metrics (Metrics, optional): Registro donde se cuentan las consultas
+                ahorradas en el contador 'coalesced_queries'.
+        """
+        self.metrics = metrics
+        self.queries = 0
+        self.coalesced = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+    
+    def __getstate__(self):
+        # Las consultas en curso pertenecen a los hilos del proceso original
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_flights"] = {}
+        state["queries"] = 0
+        state["coalesced"] = 0
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    def _count_coalesced(self, count):
+        """
+        Cuenta consultas ahorradas. Debe llamarse con el candado tomado.
+        
+        Args:
+            count (int): Cantidad de consultas ahorradas.
+        """
+        self.coalesced += count
+        if self.metrics is not None:
+            self.metrics.increment(COALESCED_COUNTER, count)
+    
+    def do(self, key, fn, *args):
+        """
+        Ejecuta fn(*args) o espera el resultado de la ejecución en curso de key.
+        
+        Args:
+            key (hashable): Clave de la consulta, p. ej. el código del estudiante.
+            fn (callable): Consulta a ejecutar.
+            *args: Argumentos de fn.
+        
+        Returns:
+            object: Resultado de fn.
+        """
+        with self._lock:
+            future = self._flights.get(key)
+            leader = future is None
+            if leader:
+                future = self._flights[key] = Future()
+                self.queries += 1
+            else:
+                self._count_coalesced(1)
+        if not leader:
+            return future.result()
+        
+        try:
+            result = fn(*args)
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._flights[key]
+    
+    def do_many(self, keys, fetch_many, missing=None):
+        """
+        Consulta varias claves agrupando las que ya están en curso.
+        
+        Las claves que nadie está consultando se piden en una sola llamada a
+        fetch_many; para las demás se espera la consulta en curso.
+        
+        Args:
+            keys (iterable): Claves a consultar.
+            fetch_many (callable): Función lista_de_claves -> {clave: valor}
+                que puede omitir las claves sin valor.
+            missing (object, optional): Valor de las claves omitidas por fetch_many.
+        
+        Returns:
+            dict: {clave: valor} con todas las claves pedidas.
+        """
+        owned = {}
+        waiting = {}
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                future = self._flights.get(key)
+                if future is None:
+                    owned[key] = self._flights[key] = Future()
+                else:
+                    waiting[key] = future
+            if owned:
+                self.queries += 1
+            if waiting:
+                self._count_coalesced(len(waiting))
+        
+        results = {}
+        if owned:
+            try:
+                fetched = fetch_many(list(owned))
+            except BaseException as error:
+                for future in owned.values():
+                    future.set_exception(error)
+                raise
+            else:
+                for key, future in owned.items():
+                    results[key] = fetched.get(key, missing)
+                    future.set_result(results[key])
+            finally:
+                with self._lock:
+                    for key in owned:
+                        del self._flights[key]
+        
+        for key, future in waiting.items():
+            results[key] = future.result()
+        return results
+    
+    def stats(self):
+        """
+        Devuelve las estadísticas de uso.
+        
+        Returns:
+            dict: Consultas ejecutadas ('queries') y ahorradas ('coalesced').
+        """
+        with self._lock:
+            return {"queries": self.queries, "coalesced": self.coalesced}
+
+
+class AsyncSingleFlight:
+    """Agrupa consultas concurrentes por clave entre tareas de asyncio."""
+    
+    def __init__(self, metrics=None):
+        """
+        Inicializa el grupo de consultas en curso.
+        
+        Args:
+            metrics (Metrics, optional): Registro donde se cuentan las consultas
+                ahorradas en el contador 'coalesced_queries'.
+        """
+        self.metrics = metrics
+        self.queries = 0
+        self.coalesced = 0
+        self._flights = {}
+    
+    async def do(self, key, fn, *args):
+        """
+        Espera fn(*args) o el resultado de la ejecución en curso de key.
+        
+        La consulta compartida se protege con asyncio.shield: cancelar una de
+        las tareas que esperan no cancela la consulta de las demás.
+        
+        Args:
+            key (hashable): Clave de la consulta.
+            fn (callable): Función asíncrona a ejecutar.
+            *args: Argumentos de fn.
+        
+        Returns:
+            object: Resultado de fn.
+        """
+        task = self._flights.get(key)
+        if task is not None:
+            self.coalesced += 1
+            if self.metrics is not None:
+                self.metrics.increment(COALESCED_COUNTER)
+        else:
+            task = asyncio.ensure_future(fn(*args))
+            self._flights[key] = task
+            self.queries += 1
+            task.add_done_callback(lambda _: self._flights.pop(key, None))
+        return await asyncio.shield(task)
+    
+    def stats(self):
+        """
+        Devuelve las estadísticas de uso.
+        
+        Returns:
+            dict: Consultas ejecutadas ('queries') y ahorradas ('coalesced').
+        """
+        return {"queries": self.queries, "coalesced": self.coalesced}
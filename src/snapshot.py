@@ -0,0 +1,322 @@
+"""
+Módulo para compilar los datos de estudiantes en una instantánea binaria y
+consultarla con mmap.
+
+La instantánea tiene una cabecera fija seguida de registros de ancho fijo
+ordenados por código, de modo que el propio archivo es el índice: una
+búsqueda elige un bloque de registros por búsqueda binaria sobre un índice
+disperso (el primer código de cada bloque, leído con la primera búsqueda) y
+busca el código dentro del bloque con mmap.find, sin copiar registros. Al
+abrir solo se valida la cabecera. Varios procesos que abren la misma
+instantánea comparten sus páginas a través de la caché del sistema operativo.
+
+Uso desde la línea de comandos:
+
+    python -m src.snapshot estudiantes.snap            # desde los datos simulados
+    python -m src.snapshot estudiantes.snap --sqlite estudiantes.db
+"""
+import argparse
+import mmap
+import os
+import struct
+from bisect import bisect_right
+
+from src.db_connector import DBConnector
+
+SNAPSHOT_MAGIC = b"GRADSNP1"
+SNAPSHOT_VERSION = 1
+
+# Cabecera: magic, versión, cantidad de registros, ancho del código, ancho del nombre
+_HEADER = struct.Struct("<8sIIHH12x")
+
+# Bits del campo de requisitos booleanos de cada registro
+_ENROLLMENT_FLAG = 1
+_WELFARE_FLAG = 2
+_PAYMENT_FLAG = 4
+
+# Registros por bloque del índice disperso: la búsqueda binaria elige el
+# bloque entre los primeros códigos de cada uno y mmap.find busca el código
+# dentro del bloque, sin copiar registros
+_BLOCK_RECORDS = 128
+
+
+def _record_struct(code_width, name_width):
+    """
+    Construye el formato de un registro: código, requisitos, promedio y nombre.
+    
+    Args:
+        code_width (int): Bytes reservados para el código.
+        name_width (int): Bytes reservados para el nombre en UTF-8.
+    
+    Returns:
+        struct.Struct: Formato del registro, sin relleno de alineación.
+    """
+    return struct.Struct(f"<{code_width}sBd{name_width}s")
+
+
+def compile_snapshot(records, path):
+    """
+    Escribe una instantánea binaria con los registros ordenados por código.
+    
+    El archivo se escribe en un temporal y luego reemplaza al anterior, así
+    que los procesos que ya tienen mapeada la versión anterior no se ven
+    afectados.
+    
+    Args:
+        records (dict or iterable): Diccionario {codigo: datos} o pares
+            (codigo, datos) con el formato de src.mock_data.
+        path (str): Ruta del archivo a generar.
+    
+    Returns:
+        int: Cantidad de registros escritos.
+    """
+    items = records.items() if hasattr(records, "items") else records
+    encoded = sorted(
+        (code.encode("ascii"), data["nombre"].encode("utf-8"), data) for code, data in items
+    )
+    code_width = max((len(code) for code, _, _ in encoded), default=1)
+    name_width = max((len(name) for _, name, _ in encoded), default=1)
+    record = _record_struct(code_width, name_width)
+    
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(encoded), code_width, name_width))
+        previous = None
+        for code, name, data in encoded:
+            if code == previous:
+                raise ValueError(f"Código duplicado: {code.decode('ascii')}")
+            previous = code
+            flags = (
+                (_ENROLLMENT_FLAG if data["enrollment"] else 0)
+                | (_WELFARE_FLAG if data["welfare"] else 0)
+                | (_PAYMENT_FLAG if data["payment"] else 0)
+            )
+            f.write(record.pack(code, flags, float(data["average"]), name))
+    os.replace(temp_path, path)
+    return len(encoded)
+
+
+class MmapDBConnector(DBConnector):
+    """Conector que responde las consultas desde una instantánea mapeada en memoria."""
+    
+    def __init__(self, connection_string, cache=None, metrics=None, known_codes=None, coalesce=False,
+                 call_policy=None):
+        """
+        Abre y mapea la instantánea.
+        
+        Args:
+            connection_string (str): Ruta de la instantánea generada con compile_snapshot.
+            cache (RecordCache, optional): Caché de registros.
+            metrics (Metrics, optional): Registro de métricas de las consultas.
+            known_codes (set or BloomFilter, optional): Índice de pertenencia de
+                los códigos existentes.
+            coalesce (bool, optional): Agrupar las consultas simultáneas de un
+                mismo código (ver DBConnector).
+            call_policy (CallPolicy, optional): Plazo, reintentos e interruptor
+                de las consultas (ver src.resilience).
+        
+        Raises:
+            ValueError: Si el archivo no es una instantánea válida.
+        """
+        super().__init__(connection_string, cache=cache, metrics=metrics, known_codes=known_codes,
+                         coalesce=coalesce, call_policy=call_policy)
+        self._open()
+    
+    def _open(self):
+        """
+        Mapea la instantánea y valida su cabecera y su tamaño.
+        
+        Raises:
+            ValueError: Si el archivo no es una instantánea válida. El mapa se
+                cierra antes de lanzar el error.
+        """
+        with open(self.connection_string, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._map) < _HEADER.size:
+                raise ValueError(f"'{self.connection_string}' no es una instantánea válida")
+            magic, version, count, code_width, name_width = _HEADER.unpack_from(self._map, 0)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                raise ValueError(f"'{self.connection_string}' no es una instantánea válida")
+            self._record = _record_struct(code_width, name_width)
+            if len(self._map) != _HEADER.size + count * self._record.size:
+                raise ValueError(f"La instantánea '{self.connection_string}' está incompleta")
+        except ValueError:
+            self._map.close()
+            raise
+        self._count = count
+        self._code_width = code_width
+        # El índice disperso se construye con la primera búsqueda
+        self._fences = None
+    
+    def __getstate__(self):
+        # Cada proceso vuelve a mapear el archivo y comparte las páginas en caché
+        state = self.__dict__.copy()
+        for attribute in ("_map", "_record", "_fences"):
+            del state[attribute]
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._open()
+    
+    def _build_fences(self):
+        """
+        Lee el primer código de cada bloque de _BLOCK_RECORDS registros.
+        
+        Returns:
+            list: Códigos con relleno, en orden, uno por bloque.
+        """
+        stride = self._record.size
+        width = self._code_width
+        fences = []
+        for position in range(0, self._count, _BLOCK_RECORDS):
+            start = _HEADER.size + position * stride
+            fences.append(self._map[start:start + width])
+        self._fences = fences
+        return fences
+    
+    def __len__(self):
+        return self._count
+    
+    def close(self):
+        """Libera el mapa de memoria."""
+        self._map.close()
+    
+    def _position(self, student_code):
+        """
+        Busca la posición de un código.
+        
+        La búsqueda binaria sobre el índice disperso elige el bloque y
+        mmap.find compara el código con los registros del bloque en el propio
+        mapa. Las coincidencias que no empiezan en un registro (p. ej. dentro
+        de un nombre) se descartan.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            int: Posición del registro, o None si no existe.
+        """
+        try:
+            key = student_code.encode("ascii")
+        except UnicodeEncodeError:
+            return None
+        if len(key) > self._code_width:
+            return None
+        key = key.ljust(self._code_width, b"\0")
+        fences = self._fences or self._build_fences()
+        block = bisect_right(fences, key) - 1
+        if block < 0:
+            return None
+        stride = self._record.size
+        start = _HEADER.size + block * _BLOCK_RECORDS * stride
+        end = min(start + _BLOCK_RECORDS * stride, len(self._map))
+        offset = self._map.find(key, start, end)
+        while offset != -1:
+            position, misaligned = divmod(offset - _HEADER.size, stride)
+            if not misaligned:
+                return position
+            offset = self._map.find(key, offset + 1, end)
+        return None
+    
+    def _read(self, position):
+        """
+        Lee el registro de una posición.
+        
+        Args:
+            position (int): Posición del registro.
+        
+        Returns:
+            dict: Datos del estudiante con el formato de src.mock_data.
+        """
+        _, flags, average, name = self._record.unpack_from(
+            self._map, _HEADER.size + position * self._record.size
+        )
+        return {
+            "nombre": name.rstrip(b"\0").decode("utf-8"),
+            "enrollment": bool(flags & _ENROLLMENT_FLAG),
+            "average": average,
+            "welfare": bool(flags & _WELFARE_FLAG),
+            "payment": bool(flags & _PAYMENT_FLAG)
+        }
+    
+    def _fetch_student_data(self, student_code):
+        """
+        Busca el registro de un estudiante en la instantánea.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            dict: Datos del estudiante o un diccionario vacío si no existe.
+        """
+        position = self._position(student_code)
+        return {} if position is None else self._read(position)
+    
+    def _fetch_students_bulk(self, student_codes):
+        """
+        Busca varios estudiantes en la instantánea.
+        
+        Args:
+            student_codes (list): Códigos de los estudiantes.
+        
+        Returns:
+            dict: Diccionario {codigo_estudiante: datos} que solo incluye
+                los estudiantes que existen.
+        """
+        students_data = {}
+        for student_code in student_codes:
+            position = self._position(student_code)
+            if position is not None:
+                students_data[student_code] = self._read(position)
+        return students_data
+    
+    def iter_student_records(self):
+        """
+        Recorre todos los registros de la instantánea en orden de código.
+        
+        Yields:
+            tuple: (codigo, datos) por cada estudiante.
+        """
+        offset, stride = _HEADER.size, self._record.size
+        for position in range(self._count):
+            code = self._record.unpack_from(self._map, offset + position * stride)[0]
+            yield code.rstrip(b"\0").decode("ascii"), self._read(position)
+    
+    def changed_since(self, since):
+        """
+        La instantánea no registra fechas de modificación: devuelve todos los registros.
+        
+        Args:
+            since (float): Marca de tiempo de la última sincronización (no se usa).
+        
+        Returns:
+            dict: Diccionario {codigo_estudiante: datos}.
+        """
+        return dict(self.iter_student_records())
+
+
+def main(argv=None):
+    """
+    Compila una instantánea desde los datos simulados o una base SQLite.
+    
+    Args:
+        argv (list, optional): Argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Compila la instantánea binaria de estudiantes.")
+    parser.add_argument("output", help="Ruta de la instantánea a generar.")
+    parser.add_argument("--sqlite", help="Base SQLite de origen. Por defecto, los datos simulados.")
+    args = parser.parse_args(argv)
+    
+    if args.sqlite:
+        from src.sqlite_connector import SQLiteDBConnector
+        source = SQLiteDBConnector(args.sqlite)
+    else:
+        source = DBConnector()
+    count = compile_snapshot(source.iter_student_records(), args.output)
+    print(f"Instantánea con {count} estudiantes generada en '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""
+Módulo con un conector a una base de datos SQLite local.
+Implementa la misma interfaz que DBConnector, por lo que puede usarse
+directamente con GraduationValidator(db_connector=...).
+"""
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from src.db_connector import DBConnector
+
+# Máximo de parámetros por consulta IN (...); SQLite antiguo admite 999
+DEFAULT_CHUNK_SIZE = 500
+
+_CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS students (
+    code TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    enrollment INTEGER NOT NULL,
+    average REAL NOT NULL,
+    welfare INTEGER NOT NULL,
+    payment INTEGER NOT NULL,
+    updated_at REAL NOT NULL DEFAULT 0
+) WITHOUT ROWID
+"""
+_CREATE_UPDATED_AT_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS students_updated_at ON students (updated_at)"
+)
+
+_SELECT_COLUMNS = "SELECT code, nombre, enrollment, average, welfare, payment FROM students"
+_SELECT_ONE_SQL = _SELECT_COLUMNS + " WHERE code = ?"
+_SELECT_ALL_SQL = _SELECT_COLUMNS + " ORDER BY code"
+_SELECT_CHANGED_SQL = _SELECT_COLUMNS + " WHERE updated_at > ?"
+# updated_at solo avanza cuando algún campo cambia de valor
+_UPSERT_SQL = (
+    "INSERT INTO students (code, nombre, enrollment, average, welfare, payment, updated_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(code) DO UPDATE SET nombre = excluded.nombre, "
+    "enrollment = excluded.enrollment, average = excluded.average, "
+    "welfare = excluded.welfare, payment = excluded.payment, "
+    "updated_at = excluded.updated_at "
+    "WHERE students.nombre IS NOT excluded.nombre "
+    "OR students.enrollment IS NOT excluded.enrollment "
+    "OR students.average IS NOT excluded.average "
+    "OR students.welfare IS NOT excluded.welfare "
+    "OR students.payment IS NOT excluded.payment"
+)
+
+
+def _select_many_sql(count):
+    """
+    Construye la consulta IN (...) para una cantidad fija de códigos.
+    
+    Args:
+        count (int): Cantidad de parámetros.
+    
+    Returns:
+        str: Sentencia SQL.
+    """
+    return f"{_SELECT_COLUMNS} WHERE code IN ({', '.join('?' * count)})"
+
+
+def _row_to_student_data(row):
+    """
+    Convierte una fila de la tabla students al formato de registro de DBConnector.
+    
+    Args:
+        row (tuple): Fila (code, nombre, enrollment, average, welfare, payment).
+    
+    Returns:
+        dict: Datos del estudiante.
+    """
+    return {
+        "nombre": row[1],
+        "enrollment": bool(row[2]),
+        "average": row[3],
+        "welfare": bool(row[4]),
+        "payment": bool(row[5])
+    }
+
+
+class ConnectionPool:
+    """Pool de conexiones SQLite reutilizables y seguras entre hilos."""
+    
+    def __init__(self, database, size=4):
+        """
+        Inicializa el pool. Las conexiones se abren bajo demanda.
+        
+        Args:
+            database (str): Ruta del archivo SQLite.
+            size (int, optional): Cantidad máxima de conexiones abiertas.
+        """
+        self.database = database
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._closed = False
+        self._lock = threading.Lock()
+    
+    def __getstate__(self):
+        # Las conexiones no se comparten entre procesos: cada copia abre las suyas
+        return {"database": self.database, "size": self.size}
+    
+    def __setstate__(self, state):
+        self.__init__(state["database"], size=state["size"])
+    
+    def _open(self):
+        connection = sqlite3.connect(
+            self.database, check_same_thread=False, cached_statements=256
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+    
+    def acquire(self):
+        """
+        Obtiene una conexión libre, abriendo una nueva si no se ha alcanzado el límite.
+        
+        Returns:
+            sqlite3.Connection: Conexión a la base de datos.
+        """
+        if self._closed:
+            raise RuntimeError("El pool de conexiones está cerrado")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            can_open = self._created < self.size
+            if can_open:
+                self._created += 1
+        
+        if can_open:
+            return self._open()
+        return self._idle.get()
+    
+    def release(self, connection):
+        """
+        Devuelve una conexión al pool.
+        
+        Args:
+            connection (sqlite3.Connection): Conexión obtenida con acquire.
+        """
+        if self._closed:
+            connection.close()
+        else:
+            self._idle.put(connection)
+    
+    @contextmanager
+    def connection(self):
+        """
+        Administra el préstamo de una conexión del pool.
+        
+        Yields:
+            sqlite3.Connection: Conexión a la base de datos.
+        """
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+    
+    def close(self):
+        """Cierra todas las conexiones libres y rechaza nuevos préstamos."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class SQLiteDBConnector(DBConnector):
+    """Conector a una base de datos SQLite con pool de conexiones y lecturas por lotes."""
+    
+    # updated_at permite consultar solo los registros modificados
+    tracks_changes = True
+    
+    def __init__(self, connection_string, cache=None, pool_size=4, chunk_size=DEFAULT_CHUNK_SIZE,
+                 metrics=None, known_codes=None, coalesce=False, requirement_index=None,
+                 call_policy=None):
+        """
+        Inicializa el conector y crea la tabla students si no existe.
+        
+        Args:
+            connection_string (str): Ruta del archivo SQLite.
+            cache (RecordCache, optional): Caché de registros.
+            pool_size (int, optional): Cantidad máxima de conexiones simultáneas.
+            chunk_size (int, optional): Cantidad máxima de códigos por consulta IN (...).
+            metrics (Metrics, optional): Registro de métricas de las consultas.
+            known_codes (set or BloomFilter, optional): Índice de pertenencia de
+                los códigos existentes. upsert_students agrega los códigos nuevos.
+            coalesce (bool, optional): Agrupar las consultas simultáneas de un
+                mismo código.
+            requirement_index (RequirementIndex, optional): Índice por requisito
+                que upsert_students mantiene actualizado.
+            call_policy (CallPolicy, optional): Plazo, reintentos e interruptor
+                de las consultas. sqlite3.OperationalError (p. ej. base de datos
+                bloqueada) solo se reintenta si se incluye en su RetryPolicy.
+        """
+        super().__init__(
+            connection_string, cache=cache, metrics=metrics, known_codes=known_codes,
+            coalesce=coalesce, call_policy=call_policy
+        )
+        self.requirement_index = requirement_index
+        self.chunk_size = chunk_size
+        self.pool = ConnectionPool(connection_string, size=pool_size)
+        self._select_chunk_sql = _select_many_sql(chunk_size)
+        with self.pool.connection() as connection:
+            connection.execute(_CREATE_TABLE_SQL)
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(students)")}
+            if "updated_at" not in columns:
+                # Tablas creadas antes de registrar la fecha de modificación
+                connection.execute(
+                    "ALTER TABLE students ADD COLUMN updated_at REAL NOT NULL DEFAULT 0"
+                )
+            connection.execute(_CREATE_UPDATED_AT_INDEX_SQL)
+            connection.commit()
+    
+    def upsert_students(self, students_data):
+        """
+        Inserta o actualiza registros de estudiantes. Los registros cuyo
+        contenido cambia quedan marcados con la hora actual para changed_since,
+        y los índices de pertenencia y por requisito, si existen, se actualizan.
+        
+        Args:
+            students_data (dict): Diccionario {codigo_estudiante: datos} con el
+                formato de src.mock_data.ESTUDIANTES_DATA.
+        """
+        updated_at = time.time()
+        rows = (
+            (
+                code,
+                data["nombre"],
+                int(data["enrollment"]),
+                float(data["average"]),
+                int(data["welfare"]),
+                int(data["payment"]),
+                updated_at
+            )
+            for code, data in students_data.items()
+        )
+        with self.pool.connection() as connection:
+            with connection:
+                connection.executemany(_UPSERT_SQL, rows)
+        for student_code in students_data:
+            if self.known_codes is not None:
+                self.known_codes.add(student_code)
+            self.invalidate(student_code)
+        if self.requirement_index is not None:
+            self.requirement_index.update_many(students_data)
+    
+    def changed_since(self, since):
+        """
+        Obtiene los registros modificados después de un instante dado.
+        
+        Args:
+            since (float): Marca de tiempo (segundos desde la época) de la
+                última sincronización.
+        
+        Returns:
+            dict: Diccionario {codigo_estudiante: datos} de los registros modificados.
+        """
+        with self.pool.connection() as connection:
+            rows = connection.execute(_SELECT_CHANGED_SQL, (since,)).fetchall()
+        return {row[0]: _row_to_student_data(row) for row in rows}
+    
+    def iter_student_records(self):
+        """
+        Recorre todos los registros en orden de código.
+        
+        Yields:
+            tuple: (codigo, datos) por cada estudiante.
+        """
+        with self.pool.connection() as connection:
+            for row in connection.execute(_SELECT_ALL_SQL):
+                yield row[0], _row_to_student_data(row)
+    
+    def close(self):
+        """Cierra las conexiones del pool."""
+        self.pool.close()
+    
+    def _fetch_student_data(self, student_code):
+        """
+        Consulta el registro de un estudiante por su código.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            dict: Datos del estudiante o un diccionario vacío si no existe.
+        """
+        with self.pool.connection() as connection:
+            row = connection.execute(_SELECT_ONE_SQL, (student_code,)).fetchone()
+        return _row_to_student_data(row) if row else {}
+    
+    def _fetch_students_bulk(self, student_codes):
+        """
+        Consulta varios estudiantes con sentencias IN (...) de tamaño acotado.
+        
+        Args:
+            student_codes (list): Códigos de los estudiantes.
+        
+        Returns:
+            dict: Diccionario {codigo_estudiante: datos} que solo incluye
+                los estudiantes que existen.
+        """
+        student_codes = list(dict.fromkeys(student_codes))
+        students_data = {}
+        with self.pool.connection() as connection:
+            for start in range(0, len(student_codes), self.chunk_size):
+                chunk = student_codes[start:start + self.chunk_size]
+                if len(chunk) == self.chunk_size:
+                    sql = self._select_chunk_sql
+                else:
+                    sql = _select_many_sql(len(chunk))
+                for row in connection.execute(sql, chunk):
+                    students_data[row[0]] = _row_to_student_data(row)
+        return students_data
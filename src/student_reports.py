@@ -0,0 +1,251 @@
+"""
+Módulo para generar los informes individuales de graduación de una cohorte.
+
+Cada estudiante del listado recibe su propio informe de texto, el mismo que
+devuelve GraduationValidator.generate_graduation_report. Los informes se
+escriben en un directorio o, según la extensión del destino, dentro de un
+único archivo .zip, .tar, .tar.gz o .tgz que se va escribiendo como un flujo.
+Cada código del listado produce un solo informe, aunque aparezca repetido.
+"""
+import hashlib
+import io
+import os
+import re
+import tarfile
+import time
+import zipfile
+
+from src.generate_report import _iter_results, _open_roster_or_report
+from src.roster import iter_student_codes
+from src.validacion_grado import BULK_BATCH_SIZE, GraduationValidator
+
+# Caracteres que no se usan en el nombre de archivo de un informe
+_UNSAFE_NAME_CHARS = re.compile(r'[^0-9A-Za-z_-]')
+
+
+def report_file_name(student_code):
+    """
+    Devuelve el nombre del archivo del informe de un estudiante.
+    
+    Los códigos con caracteres no permitidos se reemplazan y reciben además un
+    sufijo con un hash del código original, para que dos códigos distintos no
+    compartan archivo. El sufijo va tras un punto, que nunca aparece en un
+    código sin reemplazos.
+    
+    Args:
+        student_code (str): Código del estudiante.
+    
+    Returns:
+        str: Nombre del archivo, sin separadores de ruta.
+    """
+    name = _UNSAFE_NAME_CHARS.sub('_', student_code)
+    if name != student_code:
+        name += '.' + hashlib.sha1(student_code.encode('utf-8')).hexdigest()[:12]
+    return name + '.txt'
+
+
+def _render_chunk(validator, student_codes):
+    """
+    Valida un bloque de estudiantes y construye sus informes.
+    
+    Args:
+        validator (GraduationValidator): Validador de requisitos.
+        student_codes (list): Códigos de los estudiantes del bloque.
+    
+    Returns:
+        list: Pares (codigo, bytes) en el orden de student_codes.
+    """
+    render = validator.render_graduation_report
+    return [
+        (student_code, render(student_code, graduation_status, requirements).encode('utf-8'))
+        for student_code, _, graduation_status, requirements
+        in validator.validate_students_bulk(student_codes, batch_size=len(student_codes))
+    ]
+
+
+class _DirectorySink:
+    """Destino que escribe cada informe como un archivo de un directorio."""
+    
+    def __init__(self, path):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+    
+    def add(self, name, data):
+        with open(os.path.join(self.path, name), 'wb') as report_file:
+            report_file.write(data)
+    
+    def close(self):
+        pass
+
+
+class _ZipSink:
+    """Destino que agrega cada informe a un archivo zip."""
+    
+    def __init__(self, path):
+        self.archive = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED)
+        self.date_time = time.localtime()[:6]
+    
+    def add(self, name, data):
+        info = zipfile.ZipInfo(name, date_time=self.date_time)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        self.archive.writestr(info, data)
+    
+    def close(self):
+        self.archive.close()
+
+
+class _TarSink:
+    """Destino que agrega cada informe a un archivo tar, opcionalmente con gzip."""
+    
+    def __init__(self, path, compressed):
+        # Modo de flujo: el archivo se escribe secuencialmente, sin búsquedas
+        self.archive = tarfile.open(os.fspath(path), 'w|gz' if compressed else 'w|')
+        self.mtime = time.time()
+    
+    def add(self, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = self.mtime
+        self.archive.addfile(info, io.BytesIO(data))
+    
+    def close(self):
+        self.archive.close()
+
+
+def _open_sink(destination):
+    """
+    Abre el destino de los informes según su extensión.
+    
+    Args:
+        destination (str): Directorio o archivo .zip, .tar, .tar.gz o .tgz.
+    
+    Returns:
+        object: Destino con los métodos add(nombre, bytes) y close().
+    """
+    lowered = os.fspath(destination).lower()
+    if lowered.endswith('.zip'):
+        return _ZipSink(destination)
+    if lowered.endswith(('.tar.gz', '.tgz')):
+        return _TarSink(destination, compressed=True)
+    if lowered.endswith('.tar'):
+        return _TarSink(destination, compressed=False)
+    return _DirectorySink(destination)
+
+
+class StudentReportWriter:
+    """Escribe los informes individuales en un destino, uno por código."""
+    
+    def __init__(self, destination, validator):
+        """
+        Abre el destino de los informes.
+        
+        Args:
+            destination (str): Directorio, o archivo .zip, .tar, .tar.gz o .tgz.
+            validator (GraduationValidator): Validador que construye los informes.
+        """
+        self.destination = destination
+        self.render = validator.render_graduation_report
+        self.reports_written = 0
+        self.duplicates = 0
+        self._written_codes = set()
+        self._sink = _open_sink(destination)
+    
+    def add(self, student_code, data):
+        """
+        Escribe el informe de un estudiante, salvo que ya se haya escrito.
+        
+        Args:
+            student_code (str): Código del estudiante.
+            data (bytes): Informe codificado en UTF-8.
+        """
+        if student_code in self._written_codes:
+            self.duplicates += 1
+            return
+        self._written_codes.add(student_code)
+        self._sink.add(report_file_name(student_code), data)
+        self.reports_written += 1
+    
+    def add_result(self, student_code, graduation_status, requirements):
+        """
+        Construye y escribe el informe de un resultado ya calculado.
+        
+        Args:
+            student_code (str): Código del estudiante.
+            graduation_status (bool): Resultado de la validación.
+            requirements (dict): Detalle de cada requisito.
+        """
+        if student_code in self._written_codes:
+            self.duplicates += 1
+            return
+        self.add(student_code, self.render(student_code, graduation_status, requirements).encode('utf-8'))
+    
+    def observe_results(self, results):
+        """
+        Escribe el informe de cada resultado y lo deja pasar sin cambios.
+        
+        Permite generar los informes en la misma pasada que el reporte.
+        
+        Args:
+            results (iterable): Tuplas (codigo, datos, bool, dict).
+        
+        Yields:
+            tuple: Los mismos resultados, en el mismo orden.
+        """
+        for result in results:
+            self.add_result(result[0], result[2], result[3])
+            yield result
+    
+    def close(self):
+        """Cierra el destino."""
+        self._sink.close()
+    
+    def print_summary(self):
+        """Informa dónde quedaron los informes y cuántos códigos repetidos se omitieron."""
+        if self.duplicates:
+            print(f"Se omitieron {self.duplicates} códigos repetidos del listado")
+        print(f"Informes generados exitosamente en '{self.destination}'")
+
+
+def generate_student_reports(destination, validator=None, workers=1, executor='thread',
+                             chunk_size=BULK_BATCH_SIZE, roster_path='estudiantes.txt', encoding=None):
+    """
+    Genera el informe individual de graduación de cada estudiante del listado.
+    
+    Los estudiantes se validan y sus informes se construyen por bloques,
+    opcionalmente en paralelo; los informes se escriben en el orden del
+    listado a medida que terminan los bloques.
+    
+    Args:
+        destination (str): Directorio de salida, o archivo .zip, .tar, .tar.gz
+            o .tgz. Cada informe se llama '<codigo>.txt'.
+        validator (GraduationValidator, optional): Validador de requisitos.
+            Si no se proporciona, se crea uno nuevo.
+        workers (int, optional): Cantidad de hilos o procesos que validan y
+            construyen informes en paralelo. Por defecto 1.
+        executor (str, optional): 'thread' o 'process'.
+        chunk_size (int, optional): Cantidad de estudiantes por bloque.
+        roster_path (str, optional): Ruta del listado de estudiantes.
+        encoding (str, optional): Codificación del listado.
+    
+    Returns:
+        int: Cantidad de informes escritos, sin contar los códigos repetidos,
+            o None si el listado no existe.
+    """
+    roster = _open_roster_or_report(roster_path, encoding)
+    if roster is None:
+        return None
+    
+    validator = validator or GraduationValidator()
+    
+    with roster:
+        writer = StudentReportWriter(destination, validator)
+        try:
+            student_codes = iter_student_codes(roster)
+            for student_code, data in _iter_results(validator, student_codes, workers, executor,
+                                                    chunk_size, chunk_fn=_render_chunk):
+                writer.add(student_code, data)
+        finally:
+            writer.close()
+    
+    writer.print_summary()
+    return writer.reports_written
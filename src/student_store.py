@@ -0,0 +1,316 @@
+"""
+Módulo con almacenes compactos de registros de estudiantes en memoria.
+Con millones de registros, un diccionario por estudiante ocupa varias veces más
+memoria que los datos. Aquí hay dos alternativas:
+
+- StudentStore: un StudentRecord con __slots__ por estudiante.
+- ColumnarStudentStore: columnas contiguas (promedios en float64, requisitos
+  booleanos empaquetados en mapas de bits y nombres internados), con búsqueda
+  de código en O(1).
+
+Ambos devuelven StudentRecord, que se puede leer igual que los diccionarios de
+src.mock_data (record.get('nombre'), record['average']), por lo que sirven
+directamente para DBConnector(store=...) y el resto del sistema.
+"""
+import sys
+from array import array
+
+# Campos de un registro de estudiante, en el orden de los datos simulados
+STUDENT_FIELDS = ("nombre", "enrollment", "average", "welfare", "payment")
+
+# Decimales a los que se redondean los promedios al guardarlos en la representación
+# columnar, para que el registro y las columnas vean el mismo valor
+AVERAGE_DECIMALS = 4
+
+# Para cada byte, los ocho bits como bytes de 0 y 1 (del menos significativo al más)
+_BIT_TABLE = [bytes((byte >> bit) & 1 for bit in range(8)) for byte in range(256)]
+
+
+class StudentRecord:
+    """Registro de un estudiante con atributos fijos."""
+    
+    __slots__ = STUDENT_FIELDS
+    
+    def __init__(self, nombre, enrollment, average, welfare, payment):
+        """
+        Inicializa el registro.
+        
+        Args:
+            nombre (str): Nombre del estudiante.
+            enrollment (bool): Si está matriculado.
+            average (float): Promedio académico.
+            welfare (bool): Si está a paz y salvo con Bienestar universitario.
+            payment (bool): Si pagó los derechos de grado.
+        """
+        self.nombre = nombre
+        self.enrollment = enrollment
+        self.average = average
+        self.welfare = welfare
+        self.payment = payment
+    
+    @classmethod
+    def from_dict(cls, student_data):
+        """
+        Crea un registro a partir de un diccionario con el formato de src.mock_data.
+        
+        Args:
+            student_data (dict): Datos del estudiante.
+        
+        Returns:
+            StudentRecord: Registro creado.
+        """
+        return cls(
+            student_data["nombre"],
+            bool(student_data["enrollment"]),
+            float(student_data["average"]),
+            bool(student_data["welfare"]),
+            bool(student_data["payment"])
+        )
+    
+    def get(self, field, default=None):
+        """
+        Obtiene un campo, con la misma firma que dict.get.
+        
+        Args:
+            field (str): Nombre del campo.
+            default (object, optional): Valor si el campo no existe.
+        
+        Returns:
+            object: Valor del campo.
+        """
+        if field in STUDENT_FIELDS:
+            return getattr(self, field)
+        return default
+    
+    def __getitem__(self, field):
+        if field not in STUDENT_FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+    
+    def __contains__(self, field):
+        return field in STUDENT_FIELDS
+    
+    def keys(self):
+        """Devuelve los nombres de los campos."""
+        return STUDENT_FIELDS
+    
+    def to_dict(self):
+        """
+        Convierte el registro en un diccionario con el formato de src.mock_data.
+        
+        Returns:
+            dict: Datos del estudiante.
+        """
+        return {field: getattr(self, field) for field in STUDENT_FIELDS}
+    
+    def __eq__(self, other):
+        if isinstance(other, StudentRecord):
+            other = other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+    
+    def __repr__(self):
+        return f"StudentRecord({self.to_dict()!r})"
+
+
+class StudentStore:
+    """Almacén de registros StudentRecord indexados por código."""
+    
+    def __init__(self, records=None):
+        """
+        Inicializa el almacén.
+        
+        Args:
+            records (dict, optional): Diccionario {codigo: datos} inicial, con
+                datos en formato dict o StudentRecord.
+        """
+        self._records = {}
+        for student_code, student_data in (records or {}).items():
+            self.put(student_code, student_data)
+    
+    def __len__(self):
+        return len(self._records)
+    
+    def __contains__(self, student_code):
+        return student_code in self._records
+    
+    def put(self, student_code, student_data):
+        """
+        Inserta o reemplaza un registro.
+        
+        Args:
+            student_code (str): Código del estudiante.
+            student_data (dict): Datos del estudiante (dict o StudentRecord).
+        """
+        if not isinstance(student_data, StudentRecord):
+            student_data = StudentRecord.from_dict(student_data)
+        self._records[sys.intern(student_code)] = student_data
+    
+    def get(self, student_code):
+        """
+        Obtiene el registro de un estudiante.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            StudentRecord: Registro, o None si no existe.
+        """
+        return self._records.get(student_code)
+    
+    def get_many(self, student_codes):
+        """
+        Obtiene los registros de varios estudiantes.
+        
+        Args:
+            student_codes (iterable): Códigos de los estudiantes.
+        
+        Returns:
+            dict: Diccionario {codigo: StudentRecord} de los que existen.
+        """
+        records = self._records
+        return {code: records[code] for code in student_codes if code in records}
+    
+    def items(self):
+        """Devuelve los pares (codigo, StudentRecord)."""
+        return self._records.items()
+
+
+class ColumnarStudentStore:
+    """Almacén columnar de registros con búsqueda de código en O(1)."""
+    
+    def __init__(self, records=None):
+        """
+        Inicializa el almacén.
+        
+        Args:
+            records (dict, optional): Diccionario {codigo: datos} inicial.
+        """
+        self._index = {}
+        self.codes = []
+        self._names = []
+        self._averages = array("d")
+        self._enrollment = bytearray()
+        self._welfare = bytearray()
+        self._payment = bytearray()
+        for student_code, student_data in (records or {}).items():
+            self.put(student_code, student_data)
+    
+    def __len__(self):
+        return len(self.codes)
+    
+    def __contains__(self, student_code):
+        return student_code in self._index
+    
+    @staticmethod
+    def _get_bit(bitmap, position):
+        return bool((bitmap[position >> 3] >> (position & 7)) & 1)
+    
+    @staticmethod
+    def _set_bit(bitmap, position, value):
+        if position >> 3 >= len(bitmap):
+            bitmap.append(0)
+        if value:
+            bitmap[position >> 3] |= 1 << (position & 7)
+        else:
+            bitmap[position >> 3] &= ~(1 << (position & 7)) & 0xFF
+    
+    def put(self, student_code, student_data):
+        """
+        Inserta un registro o reemplaza el existente en su misma posición.
+        
+        Args:
+            student_code (str): Código del estudiante.
+            student_data (dict): Datos del estudiante (dict o StudentRecord).
+        """
+        position = self._index.get(student_code)
+        if position is None:
+            position = len(self.codes)
+            student_code = sys.intern(student_code)
+            self._index[student_code] = position
+            self.codes.append(student_code)
+            self._names.append(None)
+            self._averages.append(0.0)
+        self._names[position] = sys.intern(student_data["nombre"])
+        self._averages[position] = round(float(student_data["average"]), AVERAGE_DECIMALS)
+        self._set_bit(self._enrollment, position, student_data["enrollment"])
+        self._set_bit(self._welfare, position, student_data["welfare"])
+        self._set_bit(self._payment, position, student_data["payment"])
+    
+    def _record_at(self, position):
+        return StudentRecord(
+            self._names[position],
+            self._get_bit(self._enrollment, position),
+            self._averages[position],
+            self._get_bit(self._welfare, position),
+            self._get_bit(self._payment, position)
+        )
+    
+    def get(self, student_code):
+        """
+        Obtiene el registro de un estudiante.
+        
+        Los promedios se guardan redondeados a AVERAGE_DECIMALS decimales.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            StudentRecord: Registro, o None si no existe.
+        """
+        position = self._index.get(student_code)
+        return None if position is None else self._record_at(position)
+    
+    def get_many(self, student_codes):
+        """
+        Obtiene los registros de varios estudiantes.
+        
+        Args:
+            student_codes (iterable): Códigos de los estudiantes.
+        
+        Returns:
+            dict: Diccionario {codigo: StudentRecord} de los que existen.
+        """
+        index = self._index
+        return {
+            code: self._record_at(index[code]) for code in student_codes if code in index
+        }
+    
+    def items(self):
+        """Genera los pares (codigo, StudentRecord) en orden de inserción."""
+        for position, student_code in enumerate(self.codes):
+            yield student_code, self._record_at(position)
+    
+    def _unpack(self, bitmap):
+        return b"".join([_BIT_TABLE[byte] for byte in bitmap])[:len(self.codes)]
+    
+    def columns(self):
+        """
+        Devuelve las columnas listas para GraduationValidator.validate_batch.
+        
+        Returns:
+            tuple: (codes, enrollment, average, welfare, payment), donde las
+                columnas booleanas son bytes con un 0 o 1 por estudiante y los
+                promedios son los mismos que devuelve get.
+        """
+        return (
+            self.codes,
+            self._unpack(self._enrollment),
+            self._averages,
+            self._unpack(self._welfare),
+            self._unpack(self._payment)
+        )
+    
+    def memory_usage(self):
+        """
+        Estima los bytes ocupados por las columnas (sin el índice ni los códigos).
+        
+        Returns:
+            int: Bytes de las columnas de datos.
+        """
+        return (
+            self._averages.itemsize * len(self._averages)
+            + len(self._enrollment) + len(self._welfare) + len(self._payment)
+            + sys.getsizeof(self._names)
+        )
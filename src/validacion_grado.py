@@ -1,128 +1,462 @@
-"""
-Módulo para validar los requisitos de graduación de un estudiante.
-"""
-from src.db_connector import DBConnector
-
-class GraduationValidator:
-    """Clase para validar los requisitos de graduación de un estudiante."""
-    
-    def __init__(self, db_connector=None):
-        """
-        Inicializa el validador de requisitos de graduación.
-        
-        Args:
-            db_connector (DBConnector, optional): Conector a la base de datos.
-                Si no se proporciona, se crea uno nuevo.
-        """
-        self.db_connector = db_connector or DBConnector()
-        self.min_average = 3.5
-    
-    def check_enrollment(self, student_code):
-        """
-        Verifica si el estudiante está matriculado.
-        
-        Args:
-            student_code (str): Código del estudiante.
-            
-        Returns:
-            bool: True si el estudiante está matriculado, False en caso contrario.
-        """
-        return self.db_connector.check_student_enrollment(student_code)
-    
-    def check_academic_average(self, student_code):
-        """
-        Verifica si el estudiante cumple con el mínimo promedio requerido.
-        
-        Args:
-            student_code (str): Código del estudiante.
-            
-        Returns:
-            bool: True si el estudiante cumple con el mínimo promedio, False en caso contrario.
-        """
-        average = self.db_connector.get_student_average(student_code)
-        return average >= self.min_average
-    
-    def check_welfare_status(self, student_code):
-        """
-        Verifica si el estudiante está a paz y salvo con Bienestar universitario.
-        
-        Args:
-            student_code (str): Código del estudiante.
-            
-        Returns:
-            bool: True si el estudiante está a paz y salvo, False en caso contrario.
-        """
-        return self.db_connector.check_university_welfare_status(student_code)
-    
-    def check_payment(self, student_code):
-        """
-        Verifica si el estudiante ha pagado los derechos de grado.
-        
-        Args:
-            student_code (str): Código del estudiante.
-            
-        Returns:
-            bool: True si el estudiante ha pagado, False en caso contrario.
-        """
-        return self.db_connector.check_graduation_payment(student_code)
-    
-    def validate_graduation_requirements(self, student_code):
-        """
-        Valida si el estudiante cumple con todos los requisitos para graduarse.
-        
-        Args:
-            student_code (str): Código del estudiante.
-            
-        Returns:
-            tuple: (bool, dict) donde el bool indica si cumple con todos los requisitos
-                  y el dict contiene el detalle de cada requisito.
-        """
-        requirements = {
-            "matriculado": self.check_enrollment(student_code),
-            "promedio_minimo": self.check_academic_average(student_code),
-            "paz_y_salvo_bienestar": self.check_welfare_status(student_code),
-            "derechos_de_grado_pagados": self.check_payment(student_code)
-        }
-        
-        all_requirements_met = all(requirements.values())
-        
-        return all_requirements_met, requirements
-    
-    def generate_graduation_report(self, student_code):
-        """
-        Genera un informe detallado sobre el cumplimiento de requisitos de graduación.
-        
-        Args:
-            student_code (str): Código del estudiante.
-            
-        Returns:
-            str: Mensaje detallado sobre el cumplimiento de requisitos.
-        """
-        graduation_status, requirements = self.validate_graduation_requirements(student_code)
-        
-        if graduation_status:
-            message = f"El estudiante con código {student_code} CUMPLE con todos los requisitos para graduarse."
-        else:
-            message = f"El estudiante con código {student_code} NO CUMPLE con todos los requisitos para graduarse."
-        
-        message += "\n\nDetalle de requisitos:"
-        
-        for req_name, req_status in requirements.items():
-            status_text = "CUMPLE" if req_status else "NO CUMPLE"
-            message += f"\n- {req_name.replace('_', ' ').title()}: {status_text}"
-        
-        return message
-
-
-def validate_student_graduation(student_code):
-    """
-    Función principal que valida si un estudiante cumple con los requisitos para graduarse.
-    
-    Args:
-        student_code (str): Código del estudiante.
-        
-    Returns:
-        str: Mensaje detallado sobre el cumplimiento de requisitos.
-    """
-    validator = GraduationValidator()
+"""
+Módulo para validar los requisitos de graduación de un estudiante.
+"""
+import functools
+import inspect
+import types
+from functools import lru_cache
+from itertools import islice
+
+from src.db_connector import STUDENT_NOT_FOUND, DBConnector
+from src.metrics import timed
+from src.resilience import QueryUnavailableError
+from src.rule_engine import RuleEngine
+
+# Cantidad de estudiantes que se consultan en cada lote de la validación masiva
+BULK_BATCH_SIZE = 500
+
+# Nombres de los requisitos, en el orden en que se reportan
+REQUIREMENT_NAMES = (
+    "matriculado",
+    "promedio_minimo",
+    "paz_y_salvo_bienestar",
+    "derechos_de_grado_pagados"
+)
+
+# Costo estimado de verificar cada requisito, en segundos, que ordena las
+# reglas mientras no haya latencias medidas. El pago es una sola marca y el
+# que más falla, así que se verifica primero; el promedio es el más costoso
+RULE_COSTS = {
+    "matriculado": 0.002,
+    "promedio_minimo": 0.003,
+    "paz_y_salvo_bienestar": 0.002,
+    "derechos_de_grado_pagados": 0.001
+}
+
+
+class Indeterminate:
+    """
+    Resultado de un requisito que no se pudo verificar a tiempo.
+    
+    Es falso en contextos booleanos, de modo que quien solo pregunta si se
+    cumple el requisito lo trata como no cumplido, pero se puede distinguir
+    con 'is INDETERMINATE'.
+    """
+    
+    __slots__ = ()
+    
+    def __bool__(self):
+        return False
+    
+    def __repr__(self):
+        return "INDETERMINATE"
+    
+    def __reduce__(self):
+        # Al deserializar se recupera la misma instancia del módulo
+        return "INDETERMINATE"
+
+
+INDETERMINATE = Indeterminate()
+
+# Encabezados del informe según el resultado de la validación
+_REPORT_HEADERS = {
+    True: "El estudiante con código {} CUMPLE con todos los requisitos para graduarse.",
+    False: "El estudiante con código {} NO CUMPLE con todos los requisitos para graduarse.",
+    INDETERMINATE: "No se pudo verificar a tiempo si el estudiante con código {} cumple con todos "
+                   "los requisitos para graduarse."
+}
+
+
+def _overall_status(requirements):
+    """
+    Combina el detalle de requisitos en el resultado de la validación.
+    
+    Args:
+        requirements (dict): Detalle de cada requisito.
+    
+    Returns:
+        bool or Indeterminate: False si algún requisito no se cumple,
+            INDETERMINATE si ninguno falla pero alguno no se pudo verificar, y
+            True si se cumplen todos.
+    """
+    status = True
+    for requirement_status in requirements.values():
+        if requirement_status is INDETERMINATE:
+            status = INDETERMINATE
+        elif not requirement_status:
+            return False
+    return status
+
+
+def indeterminate_on_unavailable(method):
+    """
+    Decorador de verificaciones que devuelve INDETERMINATE si la consulta no responde.
+    
+    Las consultas que vencen su plazo o que el interruptor rechaza (ver
+    src.resilience) no detienen la validación; se cuentan en el contador
+    'indeterminate_requirements' de self.metrics, si hay registro.
+    
+    Args:
+        method (callable): Verificación que recibe el código del estudiante y,
+            opcionalmente, su registro.
+    
+    Returns:
+        callable: Verificación decorada.
+    """
+    @functools.wraps(method)
+    def wrapper(self, student_code, student_data=None):
+        try:
+            return method(self, student_code, student_data)
+        except QueryUnavailableError:
+            if self.metrics is not None:
+                self.metrics.increment("indeterminate_requirements")
+            return INDETERMINATE
+    return wrapper
+
+
+@lru_cache(maxsize=None)
+def _requirement_label(req_name):
+    """
+    Devuelve la etiqueta legible de un requisito, p. ej. 'Promedio Minimo'.
+    
+    Args:
+        req_name (str): Nombre interno del requisito.
+    
+    Returns:
+        str: Etiqueta del requisito.
+    """
+    return req_name.replace('_', ' ').title()
+
+
+@lru_cache(maxsize=256)
+def _requirements_detail(requirement_items):
+    """
+    Construye la sección de detalle del informe para una combinación de requisitos.
+    
+    Solo hay tantas combinaciones como resultados posibles, por lo que cada
+    sección se construye una vez y se reutiliza en todos los informes.
+    
+    Args:
+        requirement_items (tuple): Pares (nombre, cumple) en orden.
+    
+    Returns:
+        str: Sección de detalle del informe.
+    """
+    lines = ["\n\nDetalle de requisitos:"]
+    for req_name, req_status in requirement_items:
+        if req_status is INDETERMINATE:
+            status_text = "INDETERMINADO"
+        else:
+            status_text = "CUMPLE" if req_status else "NO CUMPLE"
+        lines.append(f"\n- {_requirement_label(req_name)}: {status_text}")
+    return "".join(lines)
+
+def _undecorated(check):
+    """
+    Obtiene una verificación sin los decoradores que la envuelven.
+    
+    Args:
+        check (callable): Función o método ligado, decorado con functools.wraps.
+    
+    Returns:
+        callable: La función original, ligada a la misma instancia si check
+            es un método.
+    """
+    if isinstance(check, types.MethodType):
+        return types.MethodType(inspect.unwrap(check.__func__), check.__self__)
+    return inspect.unwrap(check)
+
+
+class GraduationValidator:
+    """Clase para validar los requisitos de graduación de un estudiante."""
+    
+    def __init__(self, db_connector=None, metrics=None):
+        """
+        Inicializa el validador de requisitos de graduación.
+        
+        Args:
+            db_connector (DBConnector, optional): Conector a la base de datos.
+                Si no se proporciona, se crea uno nuevo.
+            metrics (Metrics, optional): Registro donde se mide la latencia de
+                cada verificación. Si es None no se mide nada.
+        """
+        self.db_connector = db_connector or DBConnector()
+        self.metrics = metrics
+        self.min_average = 3.5
+        self.rule_engine = RuleEngine()
+        # Verificaciones sin decoradores que usa validate_student_record sin
+        # registro de métricas; se reconstruyen si se registran más reglas
+        self._record_checks = ()
+        self.rule_engine.register("matriculado", self.check_enrollment, RULE_COSTS["matriculado"])
+        self.rule_engine.register(
+            "promedio_minimo", self.check_academic_average, RULE_COSTS["promedio_minimo"]
+        )
+        self.rule_engine.register(
+            "paz_y_salvo_bienestar", self.check_welfare_status, RULE_COSTS["paz_y_salvo_bienestar"]
+        )
+        self.rule_engine.register(
+            "derechos_de_grado_pagados", self.check_payment, RULE_COSTS["derechos_de_grado_pagados"]
+        )
+    
+    def __getstate__(self):
+        # Las funciones sin decorar no se pueden reconstruir por nombre; el
+        # proceso que recibe el validador vuelve a obtenerlas
+        state = self.__dict__.copy()
+        state["_record_checks"] = ()
+        return state
+    
+    @timed("check_enrollment")
+    @indeterminate_on_unavailable
+    def check_enrollment(self, student_code, student_data=None):
+        """
+        Verifica si el estudiante está matriculado.
+        
+        Args:
+            student_code (str): Código del estudiante.
+            student_data (dict, optional): Registro ya obtenido del estudiante.
+                Si es None, se consulta al conector.
+        
+        Returns:
+            bool: True si el estudiante está matriculado, False en caso contrario.
+        """
+        if student_data is None:
+            return self.db_connector.check_student_enrollment(student_code)
+        return student_data.get("enrollment", False)
+    
+    @timed("check_academic_average")
+    @indeterminate_on_unavailable
+    def check_academic_average(self, student_code, student_data=None):
+        """
+        Verifica si el estudiante cumple con el mínimo promedio requerido.
+        
+        Args:
+            student_code (str): Código del estudiante.
+            student_data (dict, optional): Registro ya obtenido del estudiante.
+                Si es None, se consulta al conector.
+        
+        Returns:
+            bool: True si el estudiante cumple con el mínimo promedio, False en caso contrario.
+        """
+        if student_data is None:
+            average = self.db_connector.get_student_average(student_code)
+        else:
+            average = student_data.get("average", 0.0)
+        return average >= self.min_average
+    
+    @timed("check_welfare_status")
+    @indeterminate_on_unavailable
+    def check_welfare_status(self, student_code, student_data=None):
+        """
+        Verifica si el estudiante está a paz y salvo con Bienestar universitario.
+        
+        Args:
+            student_code (str): Código del estudiante.
+            student_data (dict, optional): Registro ya obtenido del estudiante.
+                Si es None, se consulta al conector.
+        
+        Returns:
+            bool: True si el estudiante está a paz y salvo, False en caso contrario.
+        """
+        if student_data is None:
+            return self.db_connector.check_university_welfare_status(student_code)
+        return student_data.get("welfare", False)
+    
+    @timed("check_payment")
+    @indeterminate_on_unavailable
+    def check_payment(self, student_code, student_data=None):
+        """
+        Verifica si el estudiante ha pagado los derechos de grado.
+        
+        Args:
+            student_code (str): Código del estudiante.
+            student_data (dict, optional): Registro ya obtenido del estudiante.
+                Si es None, se consulta al conector.
+        
+        Returns:
+            bool: True si el estudiante ha pagado, False en caso contrario.
+        """
+        if student_data is None:
+            return self.db_connector.check_graduation_payment(student_code)
+        return student_data.get("payment", False)
+    
+    def validate_graduation_requirements(self, student_code):
+        """
+        Valida si el estudiante cumple con todos los requisitos para graduarse.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            tuple: (bool, dict) donde el bool indica si cumple con todos los requisitos
+                  y el dict contiene el detalle de cada requisito. Si el conector
+                  tiene plazos (call_policy), un requisito cuya consulta no
+                  responde a tiempo vale INDETERMINATE, y el resultado también
+                  si ningún otro requisito falla.
+        """
+        _, requirements = self.rule_engine.evaluate(student_code)
+        return _overall_status(requirements), requirements
+    
+    def is_eligible(self, student_code):
+        """
+        Indica si el estudiante cumple todos los requisitos, sin el detalle.
+        
+        Se detiene en el primer requisito que no se cumple y evalúa primero los
+        que con mayor probabilidad fallan a menor costo, según lo observado.
+        Un requisito INDETERMINATE cuenta como no cumplido.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            bool: True si el estudiante cumple con todos los requisitos.
+        """
+        return self.rule_engine.is_satisfied(student_code)
+    
+    def validate_student_record(self, student_data, student_code=None):
+        """
+        Valida los requisitos de graduación a partir de un registro ya obtenido.
+        
+        No realiza consultas a la base de datos, por lo que permite validar
+        registros obtenidos previamente con DBConnector.get_students_bulk. Las
+        reglas son las mismas verificaciones check_* del motor de reglas; con
+        registro de métricas se cuentan sus fallos, pero no su latencia, que
+        sin consulta no refleja el costo de cada requisito.
+        
+        Sin registro de métricas las verificaciones se llaman sin sus
+        decoradores y sin actualizar las estadísticas del motor: timed no mide
+        nada sin registro e indeterminate_on_unavailable no tiene consulta que
+        proteger, así que el resultado es el mismo a una fracción del costo.
+        
+        Args:
+            student_data (dict): Datos del estudiante. Un diccionario vacío
+                representa a un estudiante inexistente.
+            student_code (str, optional): Código del estudiante.
+        
+        Returns:
+            tuple: (bool, dict) con el mismo formato que
+                validate_graduation_requirements.
+        """
+        if self.metrics is not None:
+            _, requirements = self.rule_engine.evaluate(student_code, student_data, measure_latency=False)
+            return _overall_status(requirements), requirements
+        
+        checks = self._record_checks
+        if len(checks) != len(self.rule_engine):
+            checks = self._record_checks = tuple(
+                (rule.name, _undecorated(rule.check)) for rule in self.rule_engine.rules
+            )
+        requirements = {name: check(student_code, student_data) for name, check in checks}
+        if all(requirements.values()):
+            return True, requirements
+        return _overall_status(requirements), requirements
+    
+    def indeterminate_requirements(self):
+        """
+        Construye el detalle de un estudiante cuyo registro no se pudo consultar a tiempo.
+        
+        Returns:
+            dict: Todos los requisitos con valor INDETERMINATE.
+        """
+        return {rule.name: INDETERMINATE for rule in self.rule_engine.rules}
+    
+    def validate_students_bulk(self, student_codes, batch_size=BULK_BATCH_SIZE):
+        """
+        Valida los requisitos de graduación de varios estudiantes por lotes.
+        
+        Cada lote se obtiene con una sola llamada a DBConnector.get_students_bulk,
+        en lugar de cuatro consultas por estudiante. Si la consulta de un lote
+        no responde a tiempo (QueryUnavailableError), sus estudiantes se
+        entregan con datos vacíos, resultado INDETERMINATE y todos los
+        requisitos INDETERMINATE, y la validación sigue con el lote siguiente.
+        
+        Args:
+            student_codes (iterable): Códigos de los estudiantes.
+            batch_size (int, optional): Cantidad de estudiantes por consulta.
+        
+        Yields:
+            tuple: (codigo, datos, bool, dict) por cada estudiante, en el mismo
+                orden de student_codes.
+        """
+        codes_iter = iter(student_codes)
+        while True:
+            batch = list(islice(codes_iter, batch_size))
+            if not batch:
+                return
+            
+            try:
+                students_data = self.db_connector.get_students_bulk(batch)
+            except QueryUnavailableError:
+                if self.metrics is not None:
+                    self.metrics.increment(
+                        "indeterminate_requirements", len(batch) * len(self.rule_engine.rules)
+                    )
+                for student_code in batch:
+                    yield student_code, {}, INDETERMINATE, self.indeterminate_requirements()
+                continue
+            for student_code in batch:
+                student_data = students_data.get(student_code, STUDENT_NOT_FOUND)
+                graduation_status, requirements = self.validate_student_record(student_data, student_code)
+                yield student_code, student_data, graduation_status, requirements
+    
+    def validate_batch(self, codes, enrollment, average, welfare, payment):
+        """
+        Valida una cohorte completa a partir de columnas de datos, con
+        operaciones vectorizadas en lugar de un diccionario por estudiante.
+        
+        Args:
+            codes (sequence): Códigos de los estudiantes.
+            enrollment (sequence): Matrícula de cada estudiante.
+            average (sequence): Promedio académico de cada estudiante.
+            welfare (sequence): Paz y salvo de Bienestar de cada estudiante.
+            payment (sequence): Pago de derechos de grado de cada estudiante.
+        
+        Returns:
+            BatchValidationResult: Máscaras por requisito y veredicto final.
+        """
+        from src.batch_validation import validate_batch
+        return validate_batch(codes, enrollment, average, welfare, payment, self.min_average)
+    
+    def generate_graduation_report(self, student_code):
+        """
+        Genera un informe detallado sobre el cumplimiento de requisitos de graduación.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            str: Mensaje detallado sobre el cumplimiento de requisitos.
+        """
+        graduation_status, requirements = self.validate_graduation_requirements(student_code)
+        return self.render_graduation_report(student_code, graduation_status, requirements)
+    
+    def render_graduation_report(self, student_code, graduation_status, requirements):
+        """
+        Construye el informe de un estudiante a partir de un resultado ya calculado.
+        
+        Args:
+            student_code (str): Código del estudiante.
+            graduation_status (bool): Resultado de la validación, o INDETERMINATE.
+            requirements (dict): Detalle de cada requisito.
+        
+        Returns:
+            str: Mensaje detallado sobre el cumplimiento de requisitos.
+        """
+        status_key = graduation_status if graduation_status is INDETERMINATE else bool(graduation_status)
+        header = _REPORT_HEADERS[status_key].format(student_code)
+        return header + _requirements_detail(tuple(requirements.items()))
+
+
+def validate_student_graduation(student_code, db_connector=None):
+    """
+    Función principal que valida si un estudiante cumple con los requisitos para graduarse.
+    
+    Args:
+        student_code (str): Código del estudiante.
+        db_connector (DBConnector, optional): Conector a la base de datos. Permite
+            reutilizar entre llamadas un conector con caché de registros.
+    
+    Returns:
+        str: Mensaje detallado sobre el cumplimiento de requisitos.
+    """
+    validator = GraduationValidator(db_connector=db_connector)
     return validator.generate_graduation_report(student_code)
\ No newline at end of file
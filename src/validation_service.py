@@ -0,0 +1,366 @@
+"""
+Servicio local de validación de requisitos de graduación.
+
+Mantiene en memoria un GraduationValidator, su conector y la caché de registros,
+y atiende solicitudes HTTP en localhost o en un socket Unix. Las solicitudes
+individuales que llegan con pocos milisegundos de diferencia se agrupan en una
+sola consulta DBConnector.get_students_bulk.
+
+    python -m src.validation_service --port 8080
+    curl http://127.0.0.1:8080/validate/20210001
+    curl http://127.0.0.1:8080/validate/20210001?format=json
+"""
+import argparse
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from src.db_connector import STUDENT_NOT_FOUND, DBConnector
+from src.record_cache import RecordCache
+from src.report_writers import INDETERMINATE_TEXT
+from src.resilience import QueryUnavailableError
+from src.validacion_grado import INDETERMINATE, GraduationValidator
+
+# Tiempo máximo que una solicitud espera a que se le unan otras, en segundos
+DEFAULT_MAX_WAIT = 0.005
+
+# Cantidad máxima de solicitudes agrupadas en una consulta
+DEFAULT_MAX_BATCH = 500
+
+# Marca que detiene el hilo del agrupador
+_STOP = object()
+
+
+class MicroBatcher:
+    """Agrupa solicitudes concurrentes de validación en consultas por lotes."""
+    
+    def __init__(self, validator, max_wait=DEFAULT_MAX_WAIT, max_batch=DEFAULT_MAX_BATCH):
+        """
+        Inicializa el agrupador e inicia su hilo de trabajo.
+        
+        Args:
+            validator (GraduationValidator): Validador de requisitos.
+            max_wait (float, optional): Segundos que se espera a más solicitudes
+                después de recibir la primera de un lote.
+            max_batch (int, optional): Cantidad máxima de solicitudes por lote.
+        """
+        self.validator = validator
+        self.max_wait = max_wait
+        self.max_batch = max_batch
+        self.batches = 0
+        self.requests = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+    
+    def submit(self, student_code):
+        """
+        Encola la validación de un estudiante.
+        
+        Args:
+            student_code (str): Código del estudiante.
+        
+        Returns:
+            Future: Se resuelve con (codigo, datos, bool, dict).
+        """
+        future = Future()
+        self._queue.put((student_code, future))
+        return future
+    
+    def validate(self, student_code, timeout=None):
+        """
+        Valida un estudiante esperando a que termine su lote.
+        
+        Args:
+            student_code (str): Código del estudiante.
+            timeout (float, optional): Segundos máximos de espera.
+        
+        Returns:
+            tuple: (codigo, datos, bool, dict).
+        """
+        return self.submit(student_code).result(timeout)
+    
+    def close(self):
+        """Detiene el hilo después de atender las solicitudes ya encoladas."""
+        self._queue.put(_STOP)
+        self._thread.join()
+    
+    def _collect(self, first):
+        """
+        Reúne las solicitudes que llegan durante max_wait después de la primera.
+        
+        Args:
+            first (tuple): Primera solicitud del lote, (codigo, Future).
+        
+        Returns:
+            list: Solicitudes del lote, a lo sumo max_batch.
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+    
+    def _run(self):
+        """
+        Atiende los lotes en el hilo del agrupador hasta recibir la marca de fin.
+        
+        Si la consulta de un lote no responde a tiempo (QueryUnavailableError),
+        cada solicitud se resuelve con resultado y requisitos INDETERMINATE,
+        como en el reporte; otros errores se entregan a cada solicitud.
+        """
+        validator = self.validator
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = self._collect(first)
+            self.batches += 1
+            self.requests += len(batch)
+            codes = list(dict.fromkeys(code for code, _ in batch))
+            try:
+                students_data = validator.db_connector.get_students_bulk(codes)
+            except QueryUnavailableError:
+                if validator.metrics is not None:
+                    validator.metrics.increment(
+                        "indeterminate_requirements", len(codes) * len(validator.rule_engine.rules)
+                    )
+                for student_code, future in batch:
+                    future.set_result(
+                        (student_code, {}, INDETERMINATE, validator.indeterminate_requirements())
+                    )
+                continue
+            except Exception as error:
+                for _, future in batch:
+                    future.set_exception(error)
+                continue
+            for student_code, future in batch:
+                student_data = students_data.get(student_code, STUDENT_NOT_FOUND)
+                try:
+                    graduation_status, requirements = validator.validate_student_record(
+                        student_data, student_code
+                    )
+                except Exception as error:
+                    future.set_exception(error)
+                else:
+                    future.set_result((student_code, student_data, graduation_status, requirements))
+
+
+def result_to_json(student_code, student_data, graduation_status, requirements):
+    """
+    Convierte un resultado de validación en un objeto serializable a JSON.
+    
+    Args:
+        student_code (str): Código del estudiante.
+        student_data (dict): Datos del estudiante.
+        graduation_status (bool): Resultado de la validación, o INDETERMINATE.
+        requirements (dict): Detalle de cada requisito.
+    
+    Returns:
+        dict: Código, nombre, si existe, veredicto y detalle de requisitos.
+            Como en el reporte JSON Lines, un veredicto INDETERMINATE se
+            escribe 'INDETERMINADO' y un requisito INDETERMINATE como null;
+            si el registro no se pudo consultar, 'encontrado' también es null.
+    """
+    indeterminate = graduation_status is INDETERMINATE
+    return {
+        "codigo": student_code,
+        "nombre": student_data.get("nombre", "Desconocido"),
+        "encontrado": None if indeterminate and not student_data else student_data is not STUDENT_NOT_FOUND,
+        "cumple": INDETERMINATE_TEXT if indeterminate else bool(graduation_status),
+        "requisitos": {
+            name: None if status is INDETERMINATE else bool(status)
+            for name, status in requirements.items()
+        }
+    }
+
+
+class ValidationRequestHandler(BaseHTTPRequestHandler):
+    """Atiende GET /validate/<codigo>[?format=json] y GET /health."""
+    
+    server_version = "GraduationValidation/1.0"
+    protocol_version = "HTTP/1.1"
+    
+    def do_GET(self):
+        """
+        Responde la validación de un estudiante, en texto o JSON, o el estado
+        del servicio. Si la validación falla o vence request_timeout responde 503.
+        """
+        url = urlsplit(self.path)
+        if url.path == "/health":
+            self._send(200, "text/plain; charset=utf-8", "ok")
+            return
+        if not url.path.startswith("/validate/") or len(url.path) <= len("/validate/"):
+            self._send(404, "text/plain; charset=utf-8", "Ruta no encontrada")
+            return
+        
+        student_code = url.path[len("/validate/"):]
+        output_format = parse_qs(url.query).get("format", ["text"])[0]
+        try:
+            result = self.server.batcher.validate(student_code, timeout=self.server.request_timeout)
+        except Exception as error:
+            self._send(503, "text/plain; charset=utf-8", f"Error al validar: {error}")
+            return
+        
+        if output_format == "json":
+            body = json.dumps(result_to_json(*result), ensure_ascii=False)
+            self._send(200, "application/json; charset=utf-8", body)
+        else:
+            _, _, graduation_status, requirements = result
+            body = self.server.batcher.validator.render_graduation_report(
+                student_code, graduation_status, requirements
+            )
+            self._send(200, "text/plain; charset=utf-8", body)
+    
+    def _send(self, status, content_type, body):
+        """
+        Envía una respuesta completa con su longitud.
+        
+        Args:
+            status (int): Código de estado HTTP.
+            content_type (str): Tipo de contenido de la respuesta.
+            body (str): Cuerpo de la respuesta.
+        """
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def address_string(self):
+        # En un socket Unix la dirección del cliente es una cadena vacía
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class _ServiceMixin:
+    """Atributos compartidos por los servidores TCP y de socket Unix."""
+    
+    daemon_threads = True
+    request_queue_size = 1024
+    
+    def setup_service(self, batcher, request_timeout, verbose):
+        """
+        Configura el agrupador y las opciones del servicio.
+        
+        Args:
+            batcher (MicroBatcher): Agrupador que valida las solicitudes.
+            request_timeout (float): Segundos máximos de espera por solicitud.
+            verbose (bool): Registrar cada solicitud en la salida de errores.
+        """
+        self.batcher = batcher
+        self.request_timeout = request_timeout
+        self.verbose = verbose
+    
+    def server_close(self):
+        super().server_close()
+        self.batcher.close()
+
+
+class ValidationHTTPServer(_ServiceMixin, ThreadingHTTPServer):
+    """Servidor HTTP multihilo del servicio de validación."""
+
+
+class ValidationUnixHTTPServer(_ServiceMixin, socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Servidor HTTP multihilo del servicio de validación sobre un socket Unix."""
+    
+    def server_bind(self):
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name = "localhost"
+        self.server_port = 0
+    
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def create_server(validator=None, host="127.0.0.1", port=8080, unix_socket=None,
+                  max_wait=DEFAULT_MAX_WAIT, max_batch=DEFAULT_MAX_BATCH,
+                  request_timeout=30.0, verbose=False):
+    """
+    Crea el servidor del servicio de validación, listo para serve_forever().
+    
+    Args:
+        validator (GraduationValidator, optional): Validador a mantener en memoria.
+            Por defecto, uno con DBConnector y una caché de registros.
+        host (str, optional): Dirección TCP donde escuchar.
+        port (int, optional): Puerto TCP; 0 elige uno libre.
+        unix_socket (str, optional): Ruta de un socket Unix. Si se indica, se
+            usa en lugar de host y port.
+        max_wait (float, optional): Ventana de agrupamiento en segundos.
+        max_batch (int, optional): Cantidad máxima de solicitudes por lote.
+        request_timeout (float, optional): Segundos máximos de espera por solicitud.
+        verbose (bool, optional): Registrar cada solicitud en la salida de errores.
+    
+    Returns:
+        socketserver.BaseServer: Servidor configurado.
+    """
+    validator = validator or GraduationValidator(
+        db_connector=DBConnector(cache=RecordCache(max_size=100000, ttl=300))
+    )
+    if unix_socket:
+        server = ValidationUnixHTTPServer(unix_socket, ValidationRequestHandler)
+    else:
+        server = ValidationHTTPServer((host, port), ValidationRequestHandler)
+    server.setup_service(MicroBatcher(validator, max_wait, max_batch), request_timeout, verbose)
+    return server
+
+
+def main(argv=None):
+    """
+    Inicia el servicio desde la línea de comandos.
+    
+    Args:
+        argv (list, optional): Argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Servicio local de validación de graduación.")
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección donde escuchar.")
+    parser.add_argument("--port", type=int, default=8080, help="Puerto TCP.")
+    parser.add_argument("--unix-socket", help="Escuchar en un socket Unix en lugar de TCP.")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT * 1000,
+                        help="Milisegundos que se esperan solicitudes para agruparlas.")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                        help="Cantidad máxima de solicitudes por consulta.")
+    parser.add_argument("--verbose", action="store_true", help="Registrar cada solicitud.")
+    args = parser.parse_args(argv)
+    
+    server = create_server(
+        host=args.host,
+        port=args.port,
+        unix_socket=args.unix_socket,
+        max_wait=args.max_wait_ms / 1000,
+        max_batch=args.max_batch,
+        verbose=args.verbose
+    )
+    print(f"Servicio de validación escuchando en {args.unix_socket or f'{args.host}:{args.port}'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Pruebas unitarias para el validador asíncrono de requisitos de graduación.
+"""
+import asyncio
+import csv
+
+import pytest
+from unittest.mock import Mock
+from src.async_validacion import (
+    AsyncDBConnector,
+    AsyncGraduationValidator,
+    SyncDBConnectorAdapter,
+)
+from src.db_connector import STUDENT_NOT_FOUND
+from src.generate_report import generate_graduation_csv_report_async
+from src.metrics import Metrics
+from src.mock_data import ESTUDIANTES_DATA
+from src.resilience import DeadlineExceeded
+from src.validacion_grado import INDETERMINATE, GraduationValidator
+
+class FakeAsyncDBConnector:
+    """Conector asíncrono simulado que registra la concurrencia alcanzada."""
+    
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    async def _lookup(self, student_code, field, default):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # Los estudiantes con código menor tardan más, para desordenar las respuestas
+            await asyncio.sleep(self.delay / int(student_code[-1] or 1))
+            student_data = ESTUDIANTES_DATA.get(student_code, {})
+            return student_data if field is None else student_data.get(field, default)
+        finally:
+            self.in_flight -= 1
+    
+    async def get_student_data(self, student_code):
+        return await self._lookup(student_code, None, {})
+    
+    async def check_student_enrollment(self, student_code):
+        return await self._lookup(student_code, "enrollment", False)
+    
+    async def get_student_average(self, student_code):
+        return await self._lookup(student_code, "average", 0.0)
+    
+    async def check_university_welfare_status(self, student_code):
+        return await self._lookup(student_code, "welfare", False)
+    
+    async def check_graduation_payment(self, student_code):
+        return await self._lookup(student_code, "payment", False)
+
+class TestAsyncGraduationValidator:
+    """Clase para probar el validador asíncrono."""
+    
+    @pytest.fixture
+    def db_connector(self):
+        """
+        Fixture que proporciona un conector asíncrono simulado.
+        
+        Returns:
+            FakeAsyncDBConnector: Conector asíncrono simulado.
+        """
+        return FakeAsyncDBConnector()
+    
+    def test_connectors_implement_protocol(self, db_connector):
+        """
+        Prueba que el conector simulado y el adaptador cumplen la interfaz AsyncDBConnector.
+        
+        Args:
+            db_connector (FakeAsyncDBConnector): Conector asíncrono simulado.
+        """
+        # Verificar
+        assert isinstance(db_connector, AsyncDBConnector)
+        assert isinstance(SyncDBConnectorAdapter(), AsyncDBConnector)
+    
+    def test_validate_graduation_requirements_runs_checks_concurrently(self, db_connector):
+        """
+        Prueba que las cuatro verificaciones de un estudiante se ejecutan a la vez.
+        
+        Args:
+            db_connector (FakeAsyncDBConnector): Conector asíncrono simulado.
+        """
+        # Configurar
+        validator = AsyncGraduationValidator(db_connector=db_connector)
+        
+        # Ejecutar
+        status, requirements = asyncio.run(validator.validate_graduation_requirements("20210004"))
+        
+        # Verificar
+        assert status is False
+        assert requirements["promedio_minimo"] is False
+        assert db_connector.max_in_flight == 4
+    
+    def test_validate_students_bounds_concurrency_and_keeps_order(self, db_connector):
+        """
+        Prueba que validate_students respeta max_concurrency y el orden de entrada.
+        
+        Args:
+            db_connector (FakeAsyncDBConnector): Conector asíncrono simulado.
+        """
+        # Configurar
+        validator = AsyncGraduationValidator(db_connector=db_connector, max_concurrency=2)
+        codes = list(ESTUDIANTES_DATA) * 3
+        
+        async def collect():
+            return [result async for result in validator.validate_students(codes)]
+        
+        # Ejecutar
+        results = asyncio.run(collect())
+        
+        # Verificar
+        assert [result[0] for result in results] == codes
+        # Dos estudiantes a la vez, cada uno con una sola consulta
+        assert db_connector.max_in_flight == 2
+    
+    def test_sync_adapter_matches_sync_validator(self):
+        """
+        Prueba que el adaptador de un DBConnector síncrono entrega los mismos resultados.
+        """
+        # Configurar
+        validator = AsyncGraduationValidator()
+        
+        # Ejecutar
+        student_data, status, requirements = asyncio.run(validator.validate_student("20210005"))
+        
+        # Verificar
+        assert student_data["nombre"] == "Pedro Sánchez"
+        assert status is False
+        assert requirements["derechos_de_grado_pagados"] is False
+    
+    def test_validate_student_unknown_and_unavailable(self, db_connector):
+        """
+        Prueba los estudiantes inexistentes y las consultas que no responden a tiempo.
+        
+        Args:
+            db_connector (FakeAsyncDBConnector): Conector asíncrono simulado.
+        """
+        # Configurar
+        metrics = Metrics()
+        validator = AsyncGraduationValidator(
+            db_connector=db_connector, validator=GraduationValidator(metrics=metrics)
+        )
+        
+        # Ejecutar
+        student_data, status, _ = asyncio.run(validator.validate_student("99999999"))
+        db_connector.get_student_data = Mock(side_effect=DeadlineExceeded("sin respuesta"))
+        unavailable = asyncio.run(validator.validate_student("20210001"))
+        
+        # Verificar
+        assert student_data is STUDENT_NOT_FOUND
+        assert status is False
+        assert unavailable[1] is INDETERMINATE
+        assert set(unavailable[2].values()) == {INDETERMINATE}
+        assert metrics.counters["indeterminate_requirements"] == 4
+    
+    def test_min_average_comes_from_validator(self, db_connector):
+        """
+        Prueba que el promedio mínimo es el del validador de registros.
+        
+        Args:
+            db_connector (FakeAsyncDBConnector): Conector asíncrono simulado.
+        """
+        # Configurar
+        record_validator = GraduationValidator()
+        record_validator.min_average = 3.0
+        validator = AsyncGraduationValidator(db_connector=db_connector, validator=record_validator)
+        
+        # Ejecutar
+        _, status, requirements = asyncio.run(validator.validate_student("20210004"))
+        
+        # Verificar
+        assert validator.min_average == 3.0
+        assert requirements["promedio_minimo"] is True
+        assert status is True
+    
+    def test_generate_report_async_writes_rows_in_order(self, db_connector, tmp_path, monkeypatch):
+        """
+        Prueba que el reporte asíncrono escribe las filas en el orden del archivo de entrada.
+        
+        Args:
+            db_connector (FakeAsyncDBConnector): Conector asíncrono simulado.
+            tmp_path (Path): Directorio temporal de pytest.
+            monkeypatch (MonkeyPatch): Utilidad de pytest para cambiar el directorio.
+        """
+        # Configurar
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "estudiantes.txt").write_text("20210005\n20210001\n20210004\n")
+        validator = AsyncGraduationValidator(db_connector=db_connector, max_concurrency=3)
+        
+        # Ejecutar
+        asyncio.run(generate_graduation_csv_report_async("salida.csv", validator=validator))
+        
+        # Verificar
+        with open(tmp_path / "salida.csv", newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert [row['Código'] for row in rows] == ["20210005", "20210001", "20210004"]
+        assert [row['Resultado'] for row in rows] == ["RECHAZADO", "APROBADO", "RECHAZADO"]
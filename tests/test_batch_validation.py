@@ -0,0 +1,128 @@
+"""
+Pruebas unitarias para la validación columnar de cohortes.
+"""
+import pytest
+from src.batch_validation import np, validate_batch
+from src.mock_data import ESTUDIANTES_DATA
+from src.student_store import ColumnarStudentStore
+from src.validacion_grado import GraduationValidator
+
+BACKENDS = [False] + ([True] if np is not None else [])
+
+class TestValidateBatch:
+    """Clase para probar la validación vectorizada de una cohorte."""
+    
+    @pytest.fixture
+    def columns(self):
+        """
+        Fixture que proporciona los datos simulados en forma columnar.
+        
+        Returns:
+            tuple: (codes, enrollment, average, welfare, payment).
+        """
+        codes = list(ESTUDIANTES_DATA)
+        return (
+            codes,
+            [ESTUDIANTES_DATA[code]["enrollment"] for code in codes],
+            [ESTUDIANTES_DATA[code]["average"] for code in codes],
+            [ESTUDIANTES_DATA[code]["welfare"] for code in codes],
+            [ESTUDIANTES_DATA[code]["payment"] for code in codes],
+        )
+    
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_matches_per_student_validation(self, columns, use_numpy):
+        """
+        Prueba que el resultado columnar coincide con la validación por estudiante.
+        
+        Args:
+            columns (tuple): Columnas de datos de la cohorte.
+            use_numpy (bool): Implementación a probar.
+        """
+        # Configurar
+        validator = GraduationValidator()
+        
+        # Ejecutar
+        result = validate_batch(*columns, min_average=validator.min_average, use_numpy=use_numpy)
+        
+        # Verificar
+        assert len(result) == 5
+        for index, code in enumerate(columns[0]):
+            expected = validator.validate_student_record(ESTUDIANTES_DATA[code])
+            assert result.requirements_at(index) == expected
+    
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_aggregates(self, columns, use_numpy):
+        """
+        Prueba los conteos de aprobados y de fallos por requisito.
+        
+        Args:
+            columns (tuple): Columnas de datos de la cohorte.
+            use_numpy (bool): Implementación a probar.
+        """
+        # Ejecutar
+        result = validate_batch(*columns, min_average=3.5, use_numpy=use_numpy)
+        
+        # Verificar
+        assert result.approved_count == 3
+        assert result.approved_codes() == ["20210001", "20210002", "20210003"]
+        assert result.failure_counts() == {
+            "matriculado": 0,
+            "promedio_minimo": 1,
+            "paz_y_salvo_bienestar": 0,
+            "derechos_de_grado_pagados": 1
+        }
+    
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_columnar_store_columns(self, use_numpy):
+        """
+        Prueba las columnas de ColumnarStudentStore, con booleanos en bytes.
+        
+        Args:
+            use_numpy (bool): Implementación a probar.
+        """
+        # Configurar
+        columns = ColumnarStudentStore(ESTUDIANTES_DATA).columns()
+        
+        # Ejecutar
+        result = validate_batch(*columns, min_average=3.5, use_numpy=use_numpy)
+        
+        # Verificar
+        assert result.approved_codes() == ["20210001", "20210002", "20210003"]
+        assert result.failure_counts()["derechos_de_grado_pagados"] == 1
+    
+    def test_validator_uses_its_min_average(self, columns):
+        """
+        Prueba que GraduationValidator.validate_batch aplica su promedio mínimo.
+        
+        Args:
+            columns (tuple): Columnas de datos de la cohorte.
+        """
+        # Configurar
+        validator = GraduationValidator()
+        validator.min_average = 4.0
+        
+        # Ejecutar
+        result = validator.validate_batch(*columns)
+        
+        # Verificar
+        assert result.approved_codes() == ["20210001"]
+    
+    def test_empty_cohort(self):
+        """
+        Prueba que una cohorte vacía no produce errores.
+        """
+        # Ejecutar
+        result = validate_batch([], [], [], [], [], min_average=3.5, use_numpy=False)
+        
+        # Verificar
+        assert len(result) == 0
+        assert result.approved_count == 0
+    
+    def test_mismatched_columns(self):
+        """
+        Prueba que columnas de distinta longitud producen un error.
+        """
+        # Ejecutar y verificar
+        with pytest.raises(ValueError):
+            validate_batch(["1", "2"], [True], [4.0, 4.0], [True, True], [True, True],
+                           min_average=3.5, use_numpy=False)
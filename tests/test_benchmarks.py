@@ -0,0 +1,129 @@
+"""
+Pruebas unitarias para el generador sintético y la suite de benchmarks.
+"""
+import pytest
+import benchmarks.run_benchmarks as run_benchmarks_module
+from benchmarks.run_benchmarks import BENCHMARKS, compare_results, run_benchmarks
+from benchmarks.synthetic_data import SyntheticCohort, SyntheticDBConnector
+from src.validacion_grado import GraduationValidator
+
+class TestSyntheticCohort:
+    """Clase para probar la cohorte sintética."""
+    
+    def test_records_are_deterministic(self):
+        """
+        Prueba que la misma semilla genera los mismos registros y otra semilla no.
+        """
+        # Ejecutar y verificar
+        assert SyntheticCohort(10, seed=1).record(3) == SyntheticCohort(10, seed=1).record(3)
+        assert [SyntheticCohort(10, seed=1).record(i) for i in range(10)] != \
+            [SyntheticCohort(10, seed=2).record(i) for i in range(10)]
+    
+    def test_failure_rates_are_realistic(self):
+        """
+        Prueba que las proporciones de fallo se acercan a las configuradas.
+        """
+        # Configurar
+        cohort = SyntheticCohort(5000, seed=7)
+        records = [cohort.record(i) for i in range(cohort.size)]
+        
+        # Ejecutar
+        payment_pending = sum(not r["payment"] for r in records) / cohort.size
+        
+        # Verificar
+        assert payment_pending == pytest.approx(0.15, abs=0.02)
+        assert all(0.0 <= r["average"] <= 5.0 for r in records)
+    
+    def test_roster_includes_unknown_codes(self):
+        """
+        Prueba que el listado incluye códigos inexistentes que el conector no encuentra.
+        """
+        # Configurar
+        cohort = SyntheticCohort(2000, seed=3)
+        db_connector = SyntheticDBConnector(cohort)
+        
+        # Ejecutar
+        roster = list(cohort.iter_roster())
+        found = db_connector.get_students_bulk(roster)
+        
+        # Verificar
+        assert len(found) == 2000
+        assert len(roster) > 2000
+    
+    def test_connector_works_with_validator(self):
+        """
+        Prueba que el conector sintético sirve para el validador.
+        """
+        # Configurar
+        cohort = SyntheticCohort(100, seed=0)
+        validator = GraduationValidator(db_connector=SyntheticDBConnector(cohort))
+        
+        # Ejecutar
+        results = list(validator.validate_students_bulk(cohort.iter_roster()))
+        
+        # Verificar
+        expected = validator.validate_graduation_requirements(cohort.code(0))
+        assert results[0][2:] == expected
+
+class TestRunBenchmarks:
+    """Clase para probar la suite de benchmarks."""
+    
+    def test_run_benchmarks_records_every_benchmark(self):
+        """
+        Prueba que la suite produce un resultado por benchmark y tamaño.
+        """
+        # Ejecutar
+        current = run_benchmarks(sizes=[50], measure_memory=True)
+        
+        # Verificar
+        assert [r["name"] for r in current["results"]] == list(BENCHMARKS)
+        assert all(r["students_per_second"] > 0 for r in current["results"])
+        assert all(r["peak_memory_bytes"] is not None for r in current["results"])
+    
+    def test_compare_results_detects_regressions(self):
+        """
+        Prueba que compare_results reporta caídas de rendimiento y aumentos de memoria.
+        """
+        # Configurar
+        baseline = {"results": [{"name": "validator_bulk", "size": 10, "students_per_second": 1000.0,
+                                 "peak_memory_bytes": 100}]}
+        current = {"results": [{"name": "validator_bulk", "size": 10, "students_per_second": 800.0,
+                                "peak_memory_bytes": 105}]}
+        
+        # Ejecutar
+        regressions = compare_results(current, baseline, tolerance=0.10)
+        
+        # Verificar
+        assert len(regressions) == 1
+        assert "estudiantes/s" in regressions[0]
+    
+    def test_students_per_second_counts_the_whole_roster(self):
+        """
+        Prueba que el reporte y la validación masiva cuentan también los códigos inexistentes.
+        """
+        # Configurar
+        roster_length = len(list(SyntheticCohort(2000, seed=0).iter_roster()))
+        
+        # Ejecutar
+        current = run_benchmarks(sizes=[2000], names=["validator_bulk", "report_end_to_end"],
+                                 measure_memory=False)
+        
+        # Verificar
+        assert [r["students"] for r in current["results"]] == [roster_length, roster_length]
+        assert roster_length > 2000
+    
+    def test_main_prints_results_without_rate(self, tmp_path, monkeypatch, capsys):
+        """
+        Prueba que la tabla de resultados admite una tasa desconocida.
+        """
+        # Configurar
+        current = {"results": [{"name": "validator_bulk", "size": 10, "students_per_second": None,
+                                "peak_memory_bytes": None}]}
+        monkeypatch.setattr(run_benchmarks_module, "run_benchmarks", lambda *args, **kwargs: current)
+        
+        # Ejecutar
+        exit_code = run_benchmarks_module.main(["--output", str(tmp_path / "bench.json")])
+        
+        # Verificar
+        assert exit_code == 0
+        assert "validator_bulk" in capsys.readouterr().out
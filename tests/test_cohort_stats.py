@@ -0,0 +1,150 @@
+"""
+Pruebas unitarias para las estadísticas de la cohorte.
+"""
+import json
+import pickle
+
+import pytest
+from src.cohort_stats import CohortStats
+from src.generate_report import generate_graduation_csv_report
+from src.sharding import generate_sharded_csv_report
+from src.validacion_grado import INDETERMINATE, REQUIREMENT_NAMES, GraduationValidator
+
+CODES = ["20210001", "20210002", "20210003", "20210004", "20210005", "99999999"]
+
+class TestCohortStats:
+    """Clase para probar las estadísticas de la cohorte."""
+    
+    @pytest.fixture
+    def results(self):
+        """
+        Fixture con los resultados de validación de los estudiantes simulados.
+        
+        Returns:
+            list: Tuplas (codigo, datos, bool, dict).
+        """
+        return list(GraduationValidator().validate_students_bulk(CODES))
+    
+    def test_summary(self, results):
+        """
+        Prueba los totales, las fallas y la distribución de promedios.
+        
+        Args:
+            results (list): Resultados de validación.
+        """
+        stats = CohortStats()
+        assert list(stats.observe_results(iter(results))) == results
+        
+        summary = stats.summary()
+        assert summary["students"] == 6
+        assert summary["approved"] == 3
+        assert summary["not_found"] == 1
+        assert summary["approval_rate"] == 0.5
+        assert summary["failures_by_requirement"]["promedio_minimo"] == 2
+        assert summary["failures_by_combination"]["derechos_de_grado_pagados"] == 1
+        assert summary["average"]["count"] == 5
+        assert summary["average"]["min"] == 3.2
+        assert summary["average"]["max"] == 4.2
+        assert sum(summary["average"]["histogram"].values()) == 5
+        assert summary["average"]["histogram"]["3.50-4.00"] == 3
+        assert 3.5 <= summary["average"]["quantiles"]["p50"] <= 3.8
+    
+    def test_histogram_bins_include_lower_bound(self):
+        """
+        Prueba que cada intervalo incluye su límite inferior y el último incluye 5.0.
+        """
+        # Configurar
+        stats = CohortStats()
+        requirements = {name: True for name in REQUIREMENT_NAMES}
+        
+        # Ejecutar
+        for average in (3.3, 3.5, 4.0, 5.0):
+            stats.observe("1", {"average": average}, True, requirements)
+        histogram = stats.average_histogram()
+        
+        # Verificar
+        assert histogram["3.00-3.50"] == 1
+        assert histogram["3.50-4.00"] == 1
+        assert histogram["4.00-4.50"] == 1
+        assert histogram["4.50-5.00"] == 1
+        assert ">5.0" not in histogram
+    
+    def test_round_trip_keeps_empty_combination(self):
+        """
+        Prueba que una combinación sin requisitos fallidos sobrevive a to_dict y from_dict.
+        """
+        # Configurar
+        stats = CohortStats()
+        stats.combinations[()] += 2
+        
+        # Ejecutar
+        restored = CohortStats.from_dict(json.loads(json.dumps(stats.to_dict())))
+        
+        # Verificar
+        assert restored.combinations == {(): 2}
+    
+    def test_indeterminate_is_not_a_failure(self):
+        """
+        Prueba que los resultados INDETERMINATE se cuentan aparte de rechazados e inexistentes.
+        """
+        # Configurar
+        stats = CohortStats()
+        unknown = dict.fromkeys(REQUIREMENT_NAMES, INDETERMINATE)
+        partial = dict.fromkeys(REQUIREMENT_NAMES, True)
+        partial["promedio_minimo"] = INDETERMINATE
+        partial["derechos_de_grado_pagados"] = False
+        
+        # Ejecutar
+        stats.observe("20210001", {}, INDETERMINATE, unknown)
+        stats.observe("20210005", {"average": 3.9}, False, partial)
+        
+        # Verificar
+        summary = CohortStats.from_dict(stats.to_dict()).summary()
+        assert summary["indeterminate"] == 1
+        assert summary["not_found"] == 0
+        assert summary["rejected"] == 1
+        assert summary["failures_by_requirement"]["derechos_de_grado_pagados"] == 1
+        assert summary["failures_by_requirement"]["promedio_minimo"] == 0
+    
+    def test_merge_matches_single_pass(self, results):
+        """
+        Prueba que combinar partes da lo mismo que una sola pasada.
+        
+        Args:
+            results (list): Resultados de validación.
+        """
+        whole = CohortStats()
+        for result in results:
+            whole.observe(*result)
+        
+        first, second = CohortStats(), CohortStats()
+        for result in results[:2]:
+            first.observe(*result)
+        for result in results[2:]:
+            second.observe(*result)
+        # Una de las partes viaja como JSON y la otra con pickle, como entre procesos
+        merged = CohortStats.from_dict(json.loads(json.dumps(first.to_dict())))
+        merged.merge(pickle.loads(pickle.dumps(second)))
+        
+        assert merged.summary() == whole.summary()
+    
+    def test_report_and_sharded_report_write_same_summary(self, tmp_path):
+        """
+        Prueba que el reporte y el reporte por fragmentos producen el mismo resumen.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        roster_path = tmp_path / "estudiantes.txt"
+        roster_path.write_text("\n".join(CODES) + "\n")
+        
+        generate_graduation_csv_report(
+            str(tmp_path / "a.csv"), roster_path=str(roster_path), stats_path=tmp_path / "a.json"
+        )
+        generate_sharded_csv_report(
+            str(tmp_path / "b.csv"), shard_size=4, roster_path=str(roster_path), stats_path=tmp_path / "b.json"
+        )
+        
+        summary = json.loads((tmp_path / "a.json").read_text(encoding="utf-8"))
+        assert summary["students"] == len(CODES)
+        assert summary == json.loads((tmp_path / "b.json").read_text(encoding="utf-8"))
@@ -0,0 +1,70 @@
+"""
+Pruebas unitarias para el módulo de conexión a la base de datos.
+"""
+import pytest
+from src.db_connector import DBConnector
+
+class TestDBConnector:
+    """Clase para probar el conector a la base de datos simulada."""
+    
+    @pytest.fixture
+    def db_connector(self):
+        """
+        Fixture que proporciona un conector a la base de datos simulada.
+        
+        Returns:
+            DBConnector: Conector a la base de datos.
+        """
+        return DBConnector()
+    
+    def test_get_student_data_existing(self, db_connector):
+        """
+        Prueba que get_student_data devuelve el registro completo de un estudiante existente.
+        
+        Args:
+            db_connector (DBConnector): Conector a la base de datos.
+        """
+        # Ejecutar
+        student_data = db_connector.get_student_data("20210001")
+        
+        # Verificar
+        assert student_data["nombre"] == "Ana Martínez"
+        assert student_data["average"] == 4.2
+    
+    def test_get_student_data_unknown(self, db_connector):
+        """
+        Prueba que get_student_data devuelve un diccionario vacío si el estudiante no existe.
+        
+        Args:
+            db_connector (DBConnector): Conector a la base de datos.
+        """
+        # Ejecutar y verificar
+        assert db_connector.get_student_data("99999999") == {}
+    
+    def test_get_students_bulk(self, db_connector):
+        """
+        Prueba que get_students_bulk devuelve solo los estudiantes existentes.
+        
+        Args:
+            db_connector (DBConnector): Conector a la base de datos.
+        """
+        # Ejecutar
+        students_data = db_connector.get_students_bulk(["20210004", "99999999", "20210005"])
+        
+        # Verificar
+        assert set(students_data) == {"20210004", "20210005"}
+        assert students_data["20210005"]["payment"] is False
+    
+    def test_accessors_use_student_record(self, db_connector):
+        """
+        Prueba que los métodos de consulta individuales leen del registro del estudiante.
+        
+        Args:
+            db_connector (DBConnector): Conector a la base de datos.
+        """
+        # Ejecutar y verificar
+        assert db_connector.check_student_enrollment("20210004") is True
+        assert db_connector.get_student_average("20210004") == 3.2
+        assert db_connector.check_university_welfare_status("20210004") is True
+        assert db_connector.check_graduation_payment("20210005") is False
+        assert db_connector.get_student_average("99999999") == 0.0
@@ -0,0 +1,244 @@
+"""
+Pruebas unitarias para la tabla de elegibilidad actualizada por eventos.
+"""
+import threading
+
+import pytest
+from benchmarks.synthetic_data import SyntheticCohort, SyntheticDBConnector
+from src.db_connector import STUDENT_NOT_FOUND, DBConnector
+from src.eligibility_view import (EligibilityTable, LogEventSource, QueueEventSource, append_event,
+                                  main)
+from src.generate_report import generate_graduation_csv_report
+from src.resilience import CallPolicy, CircuitBreaker
+from src.validacion_grado import INDETERMINATE, GraduationValidator
+
+class TestEligibilityTable:
+    """Clase para probar la tabla materializada."""
+    
+    @pytest.fixture
+    def roster_path(self, tmp_path):
+        """
+        Fixture con un listado de los estudiantes simulados y un código inexistente.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        
+        Returns:
+            str: Ruta del listado.
+        """
+        path = tmp_path / "estudiantes.txt"
+        path.write_text("20210001\n20210004\n99999999\n20210005\n")
+        return str(path)
+    
+    def test_export_matches_full_report(self, tmp_path):
+        """
+        Prueba que exportar la tabla produce el mismo reporte que validar todo.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        cohort = SyntheticCohort(3000, seed=11)
+        roster_path = tmp_path / "estudiantes.txt"
+        cohort.write_roster(roster_path)
+        validator = GraduationValidator(SyntheticDBConnector(cohort))
+        generate_graduation_csv_report(
+            str(tmp_path / "completo.csv"), validator=validator, roster_path=str(roster_path)
+        )
+        
+        table = EligibilityTable.from_roster(validator, str(roster_path))
+        rows = table.export(tmp_path / "tabla.csv")
+        
+        assert rows == len(list(cohort.iter_roster()))
+        assert (tmp_path / "tabla.csv").read_bytes() == (tmp_path / "completo.csv").read_bytes()
+    
+    def test_change_event_revalidates_one_student(self, roster_path):
+        """
+        Prueba que un evento actualiza el veredicto del estudiante afectado.
+        
+        Args:
+            roster_path (str): Ruta del listado.
+        """
+        table = EligibilityTable.from_roster(roster_path=roster_path)
+        assert table.get("20210005")[1] is False
+        
+        assert table.apply({"code": "20210005", "changes": {"payment": True}}) is True
+        
+        student_data, graduation_status, requirements = table.get("20210005")
+        assert graduation_status is True
+        assert requirements["derechos_de_grado_pagados"] is True
+        assert student_data["nombre"] == "Pedro Sánchez"
+        assert table.events_applied == 1
+        assert table.verdict_changes == 1
+    
+    def test_event_without_verdict_change(self, roster_path):
+        """
+        Prueba que un cambio que no afecta los requisitos no cuenta como cambio de veredicto.
+        
+        Args:
+            roster_path (str): Ruta del listado.
+        """
+        table = EligibilityTable.from_roster(roster_path=roster_path)
+        
+        assert table.apply({"code": "20210001", "changes": {"average": 4.5}}) is False
+        assert table.get("20210001")[0]["average"] == 4.5
+        assert table.verdict_changes == 0
+    
+    def test_deleted_and_unknown_codes(self, roster_path):
+        """
+        Prueba las bajas y los eventos de códigos que no están en el listado.
+        
+        Args:
+            roster_path (str): Ruta del listado.
+        """
+        table = EligibilityTable.from_roster(roster_path=roster_path)
+        
+        assert table.apply({"code": "20210001", "deleted": True}) is True
+        assert table.apply({"code": "20219999", "changes": {"payment": True}}) is False
+        
+        assert table.get("20210001")[0] is STUDENT_NOT_FOUND
+        assert table.ignored == 1
+        with pytest.raises(ValueError):
+            table.apply({"changes": {"payment": True}})
+    
+    def test_changes_do_not_create_a_missing_student(self, roster_path):
+        """
+        Prueba que un cambio parcial de un estudiante inexistente se ignora y un registro completo lo crea.
+        
+        Args:
+            roster_path (str): Ruta del listado.
+        """
+        # Configurar
+        table = EligibilityTable.from_roster(roster_path=roster_path)
+        record = {"nombre": "Nuevo Estudiante", "enrollment": True, "average": 4.0,
+                  "welfare": True, "payment": True}
+        
+        # Ejecutar y verificar
+        assert table.apply({"code": "99999999", "changes": {"payment": True}}) is False
+        assert table.get("99999999")[0] is STUDENT_NOT_FOUND
+        assert table.ignored == 1
+        assert table.events_applied == 0
+        
+        assert table.apply({"code": "99999999", "record": record}) is True
+        assert table.get("99999999")[1] is True
+        assert table.apply({"code": "99999999", "changes": {"payment": False}}) is True
+        assert table.get("99999999")[0]["nombre"] == "Nuevo Estudiante"
+    
+    def test_follow_queue_source(self, roster_path):
+        """
+        Prueba que la tabla aplica en segundo plano los eventos de una cola.
+        
+        Args:
+            roster_path (str): Ruta del listado.
+        """
+        table = EligibilityTable.from_roster(roster_path=roster_path)
+        source = QueueEventSource()
+        batches = []
+        listener = threading.Thread(
+            target=table.follow, args=(source,),
+            kwargs={"on_batch": lambda _, changed: batches.append(changed)}
+        )
+        listener.start()
+        
+        source.publish({"code": "20210005", "changes": {"payment": True}})
+        source.publish({"code": "20210004", "changes": {"average": 3.9}})
+        source.close()
+        listener.join(timeout=5)
+        
+        assert not listener.is_alive()
+        assert sum(batches) == 2
+        assert table.get("20210004")[1] is True
+    
+    def test_log_source_reads_complete_lines_and_resumes(self, tmp_path):
+        """
+        Prueba que el archivo de eventos se lee por líneas completas y desde la posición guardada.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        log_path = tmp_path / "eventos.jsonl"
+        append_event(log_path, {"code": "20210005", "changes": {"payment": True}})
+        with open(log_path, "ab") as f:
+            f.write(b"no es json\n{\"code\": \"2021")
+        source = LogEventSource(log_path)
+        
+        assert source.poll(timeout=0) == [{"code": "20210005", "changes": {"payment": True}}]
+        assert source.malformed == 1
+        assert source.poll(timeout=0) == []
+        
+        with open(log_path, "ab") as f:
+            f.write(b"0004\", \"deleted\": true}\n")
+        resumed = LogEventSource(log_path, position=source.position)
+        assert resumed.poll(timeout=0) == [{"code": "20210004", "deleted": True}]
+    
+    def test_save_and_load(self, roster_path, tmp_path):
+        """
+        Prueba que la tabla guardada conserva registros, orden y posición de la fuente.
+        
+        Args:
+            roster_path (str): Ruta del listado.
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        table = EligibilityTable.from_roster(roster_path=roster_path)
+        table.apply({"code": "20210005", "changes": {"payment": True}})
+        table.position = 42
+        table.save(tmp_path / "tabla.json")
+        
+        loaded = EligibilityTable.load(tmp_path / "tabla.json")
+        
+        assert loaded.results() == table.results()
+        assert loaded.position == 42
+        assert loaded.get("99999999")[0] is STUDENT_NOT_FOUND
+        assert EligibilityTable.load(tmp_path / "no_existe.json") is None
+    
+    def test_indeterminate_rows_survive_save_and_are_retried(self, roster_path, tmp_path):
+        """
+        Prueba que una tabla materializada durante una falla conserva los INDETERMINATE y los vuelve a consultar.
+        
+        Args:
+            roster_path (str): Ruta del listado.
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        # Configurar: el interruptor abierto hace que ningún lote responda
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        unavailable = GraduationValidator(DBConnector(call_policy=CallPolicy(breaker=breaker)))
+        table = EligibilityTable.from_roster(unavailable, roster_path)
+        table.save(tmp_path / "tabla.json")
+        
+        # Ejecutar
+        loaded = EligibilityTable.load(tmp_path / "tabla.json")
+        
+        # Verificar
+        assert loaded.unavailable == 4
+        assert loaded.get("20210005")[1] is INDETERMINATE
+        assert loaded.apply({"code": "20210005", "changes": {"payment": True}}) is False
+        
+        # Ejecutar: al seguir la fuente se consultan de nuevo
+        source = QueueEventSource()
+        source.close()
+        loaded.follow(source)
+        
+        # Verificar
+        assert loaded.unavailable == 0
+        assert loaded.results() == EligibilityTable.from_roster(roster_path=roster_path).results()
+    
+    def test_main_applies_pending_events(self, roster_path, tmp_path):
+        """
+        Prueba que la línea de comandos aplica los eventos pendientes y exporta el reporte.
+        
+        Args:
+            roster_path (str): Ruta del listado.
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        log_path = str(tmp_path / "eventos.jsonl")
+        output = str(tmp_path / "reporte.csv")
+        append_event(log_path, {"code": "20210005", "changes": {"payment": True}})
+        
+        main([log_path, "-o", output, "--roster", roster_path, "--once"])
+        main([log_path, "-o", output, "--roster", roster_path, "--once"])
+        
+        lines = (tmp_path / "reporte.csv").read_text(encoding="utf-8").splitlines()
+        assert lines[-1].startswith("20210005,Pedro Sánchez,") and lines[-1].endswith("APROBADO")
+        # La segunda ejecución retoma desde el estado guardado sin repetir eventos
+        state = EligibilityTable.load(output + ".view.json")
+        assert state.position == (tmp_path / "eventos.jsonl").stat().st_size
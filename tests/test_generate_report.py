@@ -0,0 +1,124 @@
+"""
+Pruebas unitarias para el módulo de generación de reportes.
+"""
+import gzip
+
+import pytest
+from src.db_connector import DBConnector
+from src.generate_report import generate_graduation_csv_report
+from src.record_cache import RecordCache
+from src.validacion_grado import GraduationValidator
+
+EXPECTED_CSV = (
+    "Código,Nombre,Matriculado,Promedio Mínimo,Paz y Salvo Bienestar,Derechos de Grado Pagados,Resultado\r\n"
+    "20210001,Ana Martínez,Sí,Sí,Sí,Sí,APROBADO\r\n"
+    "20210002,Carlos Gutiérrez,Sí,Sí,Sí,Sí,APROBADO\r\n"
+    "20210003,María López,Sí,Sí,Sí,Sí,APROBADO\r\n"
+    "20210004,Juan Rodríguez,Sí,No,Sí,Sí,RECHAZADO\r\n"
+    "20210005,Pedro Sánchez,Sí,Sí,Sí,No,RECHAZADO\r\n"
+    "99999999,Desconocido,No,No,No,No,RECHAZADO\r\n"
+)
+
+class TestGenerateGraduationCsvReport:
+    """Clase para probar la generación del reporte CSV."""
+    
+    @pytest.fixture
+    def roster_dir(self, tmp_path, monkeypatch):
+        """
+        Fixture que crea un archivo 'estudiantes.txt' y cambia al directorio temporal.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            monkeypatch (MonkeyPatch): Utilidad de pytest para cambiar el directorio.
+        
+        Returns:
+            Path: Directorio con el archivo de estudiantes.
+        """
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "estudiantes.txt").write_text(
+            "20210001\n20210002\n20210003\n20210004\n20210005\n99999999\n"
+        )
+        return tmp_path
+    
+    def test_sequential_report(self, roster_dir):
+        """
+        Prueba el contenido exacto del reporte generado sin paralelismo.
+        
+        Args:
+            roster_dir (Path): Directorio con el archivo de estudiantes.
+        """
+        # Ejecutar
+        generate_graduation_csv_report("salida.csv")
+        
+        # Verificar
+        assert (roster_dir / "salida.csv").read_bytes() == EXPECTED_CSV.encode("utf-8")
+    
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_parallel_report_matches_sequential(self, roster_dir, executor):
+        """
+        Prueba que el reporte en paralelo es idéntico al secuencial y conserva el orden.
+        
+        Args:
+            roster_dir (Path): Directorio con el archivo de estudiantes.
+            executor (str): Tipo de pool a usar.
+        """
+        # Configurar
+        validator = GraduationValidator(db_connector=DBConnector(cache=RecordCache()))
+        
+        # Ejecutar
+        generate_graduation_csv_report(
+            "salida.csv", validator=validator, workers=3, executor=executor, chunk_size=2
+        )
+        
+        # Verificar
+        assert (roster_dir / "salida.csv").read_bytes() == EXPECTED_CSV.encode("utf-8")
+    
+    def test_streaming_gzip_roster(self, roster_dir):
+        """
+        Prueba que un listado comprimido produce un reporte idéntico.
+        
+        Args:
+            roster_dir (Path): Directorio con el archivo de estudiantes.
+        """
+        # Configurar
+        with gzip.open(roster_dir / "estudiantes.txt.gz", "wb") as f:
+            f.write((roster_dir / "estudiantes.txt").read_bytes())
+        
+        # Ejecutar
+        generate_graduation_csv_report(
+            "salida.csv", roster_path="estudiantes.txt.gz", encoding="utf-8"
+        )
+        
+        # Verificar
+        assert (roster_dir / "salida.csv").read_bytes() == EXPECTED_CSV.encode("utf-8")
+    
+    def test_unknown_executor(self, roster_dir):
+        """
+        Prueba que un tipo de pool desconocido produce un error sin crear el reporte.
+        
+        Args:
+            roster_dir (Path): Directorio con el archivo de estudiantes.
+        """
+        # Ejecutar y verificar
+        with pytest.raises(ValueError):
+            generate_graduation_csv_report("salida.csv", workers=2, executor="gpu")
+        assert not (roster_dir / "salida.csv").exists()
+    
+    def test_missing_roster(self, tmp_path, monkeypatch, capsys):
+        """
+        Prueba que sin archivo de estudiantes no se genera el reporte.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            monkeypatch (MonkeyPatch): Utilidad de pytest para cambiar el directorio.
+            capsys (CaptureFixture): Captura de la salida estándar.
+        """
+        # Configurar
+        monkeypatch.chdir(tmp_path)
+        
+        # Ejecutar
+        generate_graduation_csv_report("salida.csv")
+        
+        # Verificar
+        assert "No se encontró el archivo 'estudiantes.txt'" in capsys.readouterr().out
+        assert not (tmp_path / "salida.csv").exists()
@@ -0,0 +1,241 @@
+"""
+Pruebas unitarias para la actualización incremental del reporte CSV.
+"""
+import gzip
+import json
+
+import pytest
+from unittest.mock import Mock
+from src.db_connector import DBConnector
+from src.incremental import record_fingerprint, update_graduation_csv_report
+from src.mock_data import ESTUDIANTES_DATA
+from src.resilience import DeadlineExceeded
+from src.sqlite_connector import SQLiteDBConnector
+from src.student_store import StudentStore
+from src.validacion_grado import GraduationValidator
+
+class TestUpdateGraduationCsvReport:
+    """Clase para probar el modo incremental del reporte."""
+    
+    @pytest.fixture
+    def db_connector(self, tmp_path):
+        """
+        Fixture que proporciona un conector SQLite con los datos simulados.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        
+        Returns:
+            SQLiteDBConnector: Conector a la base de datos.
+        """
+        db_connector = SQLiteDBConnector(str(tmp_path / "estudiantes.db"))
+        db_connector.upsert_students(ESTUDIANTES_DATA)
+        yield db_connector
+        db_connector.close()
+    
+    @pytest.fixture
+    def roster_path(self, tmp_path):
+        """
+        Fixture que crea el listado de estudiantes.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        
+        Returns:
+            str: Ruta del listado.
+        """
+        path = tmp_path / "estudiantes.txt"
+        path.write_text("\n".join(ESTUDIANTES_DATA) + "\n")
+        return str(path)
+    
+    def test_first_run_builds_report_and_state(self, tmp_path, db_connector, roster_path):
+        """
+        Prueba que sin estado previo se genera el reporte completo y el estado.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            db_connector (SQLiteDBConnector): Conector a la base de datos.
+            roster_path (str): Ruta del listado.
+        """
+        # Configurar
+        file_path = str(tmp_path / "salida.csv")
+        validator = GraduationValidator(db_connector=db_connector)
+        
+        # Ejecutar
+        written = update_graduation_csv_report(file_path, validator=validator, roster_path=roster_path)
+        
+        # Verificar
+        assert written == 5
+        state = json.loads((tmp_path / "salida.csv.state.json").read_text())
+        assert state["min_average"] == 3.5
+        assert state["students"][0] == ["20210001", record_fingerprint(ESTUDIANTES_DATA["20210001"])]
+    
+    def test_patches_only_changed_rows(self, tmp_path, db_connector, roster_path):
+        """
+        Prueba que solo se reescriben las filas de los registros modificados.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            db_connector (SQLiteDBConnector): Conector a la base de datos.
+            roster_path (str): Ruta del listado.
+        """
+        # Configurar
+        file_path = str(tmp_path / "salida.csv")
+        validator = GraduationValidator(db_connector=db_connector)
+        update_graduation_csv_report(file_path, validator=validator, roster_path=roster_path)
+        original = (tmp_path / "salida.csv").read_text(encoding="utf-8")
+        db_connector.upsert_students({"20210005": dict(ESTUDIANTES_DATA["20210005"], payment=True)})
+        # Volver a escribir un registro sin cambios no debe marcarlo como modificado
+        db_connector.upsert_students({"20210001": ESTUDIANTES_DATA["20210001"]})
+        
+        # Ejecutar
+        patched = update_graduation_csv_report(file_path, validator=validator, roster_path=roster_path)
+        
+        # Verificar
+        assert patched == 1
+        updated = (tmp_path / "salida.csv").read_text(encoding="utf-8")
+        assert updated == original.replace(
+            "20210005,Pedro Sánchez,Sí,Sí,Sí,No,RECHAZADO",
+            "20210005,Pedro Sánchez,Sí,Sí,Sí,Sí,APROBADO"
+        )
+        assert update_graduation_csv_report(file_path, validator=validator, roster_path=roster_path) == 0
+    
+    def test_min_average_change_rebuilds(self, tmp_path, db_connector, roster_path):
+        """
+        Prueba que un cambio del promedio mínimo regenera el reporte completo.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            db_connector (SQLiteDBConnector): Conector a la base de datos.
+            roster_path (str): Ruta del listado.
+        """
+        # Configurar
+        file_path = str(tmp_path / "salida.csv")
+        validator = GraduationValidator(db_connector=db_connector)
+        update_graduation_csv_report(file_path, validator=validator, roster_path=roster_path)
+        validator.min_average = 4.0
+        
+        # Ejecutar
+        written = update_graduation_csv_report(file_path, validator=validator, roster_path=roster_path)
+        
+        # Verificar
+        assert written == 5
+        assert (tmp_path / "salida.csv").read_text(encoding="utf-8").count("APROBADO") == 1
+    
+    def test_indeterminate_rows_are_retried(self, tmp_path, db_connector, roster_path, monkeypatch):
+        """
+        Prueba que las filas INDETERMINADO se vuelven a consultar aunque su registro no cambie.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            db_connector (SQLiteDBConnector): Conector a la base de datos.
+            roster_path (str): Ruta del listado.
+            monkeypatch (MonkeyPatch): Utilidad de pytest para simular la falla.
+        """
+        # Configurar
+        file_path = str(tmp_path / "salida.csv")
+        validator = GraduationValidator(db_connector=db_connector)
+        update_graduation_csv_report(file_path, validator=validator, roster_path=roster_path)
+        expected = (tmp_path / "salida.csv").read_text(encoding="utf-8")
+        (tmp_path / "salida.csv").unlink()
+        (tmp_path / "salida.csv.state.json").unlink()
+        monkeypatch.setattr(db_connector, "get_students_bulk", Mock(side_effect=DeadlineExceeded("lento")))
+        update_graduation_csv_report(file_path, validator=validator, roster_path=roster_path)
+        assert (tmp_path / "salida.csv").read_text(encoding="utf-8").count("INDETERMINADO") == 25
+        monkeypatch.undo()
+        
+        # Ejecutar
+        patched = update_graduation_csv_report(file_path, validator=validator, roster_path=roster_path)
+        
+        # Verificar
+        assert patched == 5
+        assert (tmp_path / "salida.csv").read_text(encoding="utf-8") == expected
+        assert update_graduation_csv_report(file_path, validator=validator, roster_path=roster_path) == 0
+    
+    def test_mock_connector_compares_fingerprints(self, tmp_path, roster_path):
+        """
+        Prueba que con los datos simulados, que no registran fechas, no se reescribe nada.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            roster_path (str): Ruta del listado.
+        """
+        # Configurar
+        file_path = str(tmp_path / "salida.csv")
+        update_graduation_csv_report(file_path, roster_path=roster_path)
+        
+        # Ejecutar y verificar
+        assert update_graduation_csv_report(file_path, roster_path=roster_path) == 0
+    
+    def test_compressed_report_is_patched(self, tmp_path, db_connector, roster_path):
+        """
+        Prueba que un reporte comprimido se genera y se actualiza con el escritor CSV.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            db_connector (SQLiteDBConnector): Conector a la base de datos.
+            roster_path (str): Ruta del listado.
+        """
+        # Configurar
+        file_path = str(tmp_path / "salida.csv.gz")
+        validator = GraduationValidator(db_connector=db_connector)
+        update_graduation_csv_report(file_path, validator=validator, roster_path=roster_path,
+                                     compression="gzip")
+        original = gzip.open(file_path, "rb").read()
+        db_connector.upsert_students({"20210005": dict(ESTUDIANTES_DATA["20210005"], payment=True)})
+        
+        # Ejecutar
+        patched = update_graduation_csv_report(file_path, validator=validator, roster_path=roster_path,
+                                               compression="gzip")
+        
+        # Verificar
+        assert patched == 1
+        assert gzip.open(file_path, "rb").read() == original.replace(
+            "20210005,Pedro Sánchez,Sí,Sí,Sí,No,RECHAZADO".encode(),
+            "20210005,Pedro Sánchez,Sí,Sí,Sí,Sí,APROBADO".encode()
+        )
+    
+    def test_connector_without_change_tracking(self, tmp_path, roster_path):
+        """
+        Prueba que sin fechas de modificación se consultan solo los registros del listado.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            roster_path (str): Ruta del listado.
+        """
+        # Configurar
+        file_path = str(tmp_path / "salida.csv")
+        store = StudentStore(ESTUDIANTES_DATA)
+        db_connector = DBConnector(store=store)
+        db_connector.changed_since = Mock(side_effect=AssertionError("recorre toda la tabla"))
+        validator = GraduationValidator(db_connector=db_connector)
+        update_graduation_csv_report(file_path, validator=validator, roster_path=roster_path)
+        store.put("20210004", dict(ESTUDIANTES_DATA["20210004"], average=3.8))
+        
+        # Ejecutar
+        patched = update_graduation_csv_report(file_path, validator=validator, roster_path=roster_path)
+        
+        # Verificar
+        assert patched == 1
+        assert "20210004,Juan Rodríguez,Sí,Sí,Sí,Sí,APROBADO" in (tmp_path / "salida.csv").read_text(
+            encoding="utf-8"
+        )
+    
+    def test_roster_change_rebuilds_and_stdin_is_rejected(self, tmp_path, roster_path):
+        """
+        Prueba que un cambio del listado regenera el reporte y que no se admite la entrada estándar.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            roster_path (str): Ruta del listado.
+        """
+        # Configurar
+        file_path = str(tmp_path / "salida.csv")
+        update_graduation_csv_report(file_path, roster_path=roster_path)
+        with open(roster_path, "a") as f:
+            f.write("99999999\n")
+        
+        # Ejecutar y verificar
+        assert update_graduation_csv_report(file_path, roster_path=roster_path) == 6
+        with pytest.raises(ValueError):
+            update_graduation_csv_report(file_path, roster_path="-")
@@ -0,0 +1,180 @@
+"""
+Pruebas unitarias para la base de datos de prueba y la prueba de carga.
+"""
+import argparse
+import time
+
+import pytest
+from benchmarks.fake_db_server import (LatencyModel, SocketDBConnector, add_latency_arguments,
+                                       create_db_server, serve_in_background, start_db_server_process)
+from benchmarks.load_test import is_saturated, run_load, sweep_rates, validation_task
+from benchmarks.synthetic_data import SyntheticCohort
+from src.resilience import CallPolicy, RetryPolicy
+from src.validacion_grado import GraduationValidator, validate_student_graduation
+
+@pytest.fixture
+def db_server():
+    """
+    Fixture que atiende en segundo plano una base de datos de prueba sin latencia.
+    
+    Yields:
+        socketserver.BaseServer: Servidor en ejecución.
+    """
+    server = create_db_server()
+    serve_in_background(server)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+class TestFakeDBServer:
+    """Clase para probar la base de datos de prueba y su conector."""
+    
+    def test_serves_connector_queries_over_tcp(self, db_server):
+        """
+        Prueba que el conector obtiene por TCP los mismos datos que el conector simulado.
+        
+        Args:
+            db_server (socketserver.BaseServer): Servidor en ejecución.
+        """
+        db_connector = SocketDBConnector(db_server.address)
+        
+        assert db_connector.get_student_data("20210001")["nombre"] == "Ana Martínez"
+        assert db_connector.get_student_data("99999999") == {}
+        assert set(db_connector.get_students_bulk(["20210004", "99999999", "20210005"])) == \
+            {"20210004", "20210005"}
+        assert "CUMPLE con todos" in validate_student_graduation("20210001", db_connector)
+        assert db_server.queries == 7
+    
+    def test_serves_over_unix_socket(self, tmp_path):
+        """
+        Prueba el servidor sobre un socket Unix con una cohorte sintética.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        cohort = SyntheticCohort(100, seed=3)
+        server = create_db_server(cohort, unix_socket=str(tmp_path / "db.sock"))
+        serve_in_background(server)
+        try:
+            validator = GraduationValidator(SocketDBConnector(server.address))
+            results = list(validator.validate_students_bulk(cohort.iter_roster()))
+        finally:
+            server.shutdown()
+            server.server_close()
+        
+        assert [data for _, data, _, _ in results if data][0] == cohort.record(0)
+        assert not (tmp_path / "db.sock").exists()
+    
+    def test_server_process_serves_the_same_cohort(self):
+        """Prueba que la base de datos iniciada en otro proceso sirve la cohorte de los argumentos."""
+        # Configurar
+        parser = argparse.ArgumentParser()
+        add_latency_arguments(parser)
+        args = parser.parse_args(["--latency-ms", "0", "--cohort-size", "50", "--seed", "4"])
+        cohort = SyntheticCohort(50, seed=4)
+        
+        # Ejecutar
+        process, address = start_db_server_process(args)
+        try:
+            record = SocketDBConnector(address).get_student_data(cohort.code(0))
+        finally:
+            process.terminate()
+            process.wait()
+            process.stdout.close()
+        
+        # Verificar
+        assert address.startswith("tcp://127.0.0.1:")
+        assert record == cohort.record(0)
+    
+    def test_injected_errors_are_retryable(self):
+        """Prueba que los errores simulados llegan como ConnectionError y se pueden reintentar."""
+        server = create_db_server(latency=LatencyModel(mean=0.0, error_rate=1.0, seed=1))
+        serve_in_background(server)
+        try:
+            db_connector = SocketDBConnector(server.address)
+            with pytest.raises(ConnectionError):
+                db_connector.get_student_data("20210001")
+            
+            server.latency.error_rate = 0.5
+            retrying = SocketDBConnector(
+                server.address, call_policy=CallPolicy(retry=RetryPolicy(attempts=20, base_delay=0))
+            )
+            assert retrying.get_student_data("20210001")["nombre"] == "Ana Martínez"
+        finally:
+            server.shutdown()
+            server.server_close()
+    
+    def test_latency_model(self):
+        """Prueba que las muestras son reproducibles y respetan la media y las colas lentas."""
+        samples = [LatencyModel("lognormal", mean=0.01, seed=5).sample() for _ in range(2)]
+        assert samples[0] == samples[1]
+        
+        model = LatencyModel("exponential", mean=0.01, seed=5)
+        mean = sum(model.sample() for _ in range(20000)) / 20000
+        assert mean == pytest.approx(0.01, rel=0.05)
+        
+        slow = LatencyModel("constant", mean=0.01, per_code=0.001, slow_rate=1.0, slow_factor=10)
+        assert slow.sample(codes=10) == pytest.approx(0.2)
+        with pytest.raises(ValueError):
+            LatencyModel("gamma")
+
+class TestLoadTest:
+    """Clase para probar el generador de carga."""
+    
+    def test_run_load_measures_latency_and_errors(self):
+        """Prueba que se envían las solicitudes a la tasa pedida y se cuentan los errores."""
+        calls = []
+        
+        def task():
+            calls.append(1)
+            if len(calls) % 4 == 0:
+                raise ConnectionError("falla")
+            time.sleep(0.002)
+        
+        result = run_load(task, rate=200, duration=0.5, concurrency=4, arrival="uniform")
+        
+        assert result["offered"] == pytest.approx(100, abs=1)
+        assert result["completed"] == result["offered"]
+        assert result["errors"] == result["completed"] // 4
+        assert result["error_types"] == {"ConnectionError": result["errors"]}
+        # Los fallos inmediatos no acortan la latencia de las respuestas
+        assert result["latency_ms"]["p50"] >= 1.0
+        assert result["error_latency_ms"]["p50"] < result["latency_ms"]["p50"]
+        # Una de cada cuatro respuestas es un error: el rendimiento útil no llega al 90 %
+        assert is_saturated(result)
+        assert not is_saturated(result, efficiency=0.5)
+        assert is_saturated(result, efficiency=0.5, max_error_rate=0.1)
+    
+    def test_fast_failures_are_saturated(self):
+        """Prueba que un sistema que responde a tiempo pero siempre con error se considera saturado."""
+        def task():
+            raise ConnectionError("interruptor abierto")
+        
+        sweep = sweep_rates(task, [50, 100], duration=0.2, concurrency=2, arrival="uniform")
+        
+        assert sweep["saturation_rate"] == 50
+        assert sweep["max_sustained_rate"] is None
+    
+    def test_sweep_finds_saturation(self):
+        """Prueba que la curva de carga se detiene en la primera tasa que no se sostiene."""
+        # Un solo hilo y 10 ms por solicitud: la capacidad es de unas 100 solicitudes/s
+        sweep = sweep_rates(lambda: time.sleep(0.01), [20, 400, 800], duration=0.25, concurrency=1,
+                            arrival="uniform", drain_timeout=5)
+        
+        assert sweep["saturation_rate"] == 400
+        assert [step["saturated"] for step in sweep["steps"]] == [False, True]
+        assert sweep["max_sustained_rate"] == pytest.approx(20, rel=0.2)
+    
+    def test_validation_task_against_server(self, db_server):
+        """
+        Prueba el escenario de validación de punta a punta contra el servidor.
+        
+        Args:
+            db_server (socketserver.BaseServer): Servidor en ejecución.
+        """
+        task = validation_task(SocketDBConnector(db_server.address), ["20210001", "20210005"], seed=1)
+        
+        result = run_load(task, rate=100, duration=0.3, concurrency=4)
+        
+        assert result["errors"] == 0
+        assert db_server.queries == 4 * result["completed"]
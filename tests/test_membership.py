@@ -0,0 +1,136 @@
+"""
+Pruebas unitarias para los índices de pertenencia de códigos.
+"""
+import pickle
+from unittest.mock import patch
+
+import pytest
+from src.db_connector import STUDENT_NOT_FOUND, DBConnector
+from src.membership import BloomFilter, build_known_codes
+from src.metrics import Metrics
+from src.mock_data import ESTUDIANTES_DATA
+from src.sqlite_connector import SQLiteDBConnector
+from src.validacion_grado import GraduationValidator
+
+class TestBloomFilter:
+    """Clase para probar el filtro de Bloom."""
+    
+    def test_no_false_negatives(self):
+        """Prueba que todos los códigos agregados pertenecen al filtro."""
+        codes = [f"2021{i:07d}" for i in range(5000)]
+        bloom = build_known_codes(((code, None) for code in codes), expected_items=len(codes))
+        
+        assert isinstance(bloom, BloomFilter)
+        assert len(bloom) == len(codes)
+        assert all(code in bloom for code in codes)
+    
+    def test_false_positive_rate(self):
+        """Prueba que la tasa de falsos positivos es cercana a la pedida."""
+        bloom = BloomFilter(5000, false_positive_rate=0.01)
+        for i in range(5000):
+            bloom.add(f"2021{i:07d}")
+        
+        false_positives = sum(f"9999{i:07d}" in bloom for i in range(20000))
+        assert false_positives / 20000 < 0.03
+    
+    def test_save_and_load(self, tmp_path):
+        """
+        Prueba que un filtro guardado se lee con el mismo contenido.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        bloom = build_known_codes(ESTUDIANTES_DATA, expected_items=len(ESTUDIANTES_DATA))
+        bloom.save(tmp_path / "codigos.bloom")
+        
+        loaded = BloomFilter.load(tmp_path / "codigos.bloom")
+        assert len(loaded) == len(ESTUDIANTES_DATA)
+        assert all(code in loaded for code in ESTUDIANTES_DATA)
+        
+        (tmp_path / "otro.bin").write_bytes(b"no es un filtro")
+        with pytest.raises(ValueError):
+            BloomFilter.load(tmp_path / "otro.bin")
+    
+    def test_student_not_found_is_distinct(self):
+        """Prueba que STUDENT_NOT_FOUND se comporta como {} pero es distinguible y de solo lectura."""
+        assert STUDENT_NOT_FOUND == {}
+        assert not STUDENT_NOT_FOUND
+        assert STUDENT_NOT_FOUND.get("nombre", "Desconocido") == "Desconocido"
+        assert pickle.loads(pickle.dumps(STUDENT_NOT_FOUND)) is STUDENT_NOT_FOUND
+        with pytest.raises(TypeError):
+            STUDENT_NOT_FOUND["nombre"] = "X"
+
+class TestConnectorWithKnownCodes:
+    """Clase para probar el uso del índice en el conector."""
+    
+    @pytest.fixture(params=["exact", "bloom"])
+    def db_connector(self, request):
+        """
+        Fixture que proporciona un conector con índice exacto o de Bloom.
+        
+        Args:
+            request (FixtureRequest): Parámetro del tipo de índice.
+        
+        Returns:
+            DBConnector: Conector con índice de pertenencia y métricas.
+        """
+        expected_items = len(ESTUDIANTES_DATA) if request.param == "bloom" else None
+        known_codes = build_known_codes(ESTUDIANTES_DATA, expected_items=expected_items)
+        return DBConnector(known_codes=known_codes, metrics=Metrics())
+    
+    def test_unknown_code_skips_query(self, db_connector):
+        """
+        Prueba que un código desconocido se responde sin consultar la base de datos.
+        
+        Args:
+            db_connector (DBConnector): Conector con índice.
+        """
+        with patch.object(db_connector, "_fetch_student_data") as fetch:
+            assert db_connector.get_student_data("2021000X") is STUDENT_NOT_FOUND
+            assert not db_connector.check_student_enrollment("2021000X")
+        
+        fetch.assert_not_called()
+        assert db_connector.metrics.counters["unknown_codes_filtered"] == 2
+    
+    def test_bulk_filters_unknown_codes(self, db_connector):
+        """
+        Prueba que la consulta masiva solo pide los códigos conocidos.
+        
+        Args:
+            db_connector (DBConnector): Conector con índice.
+        """
+        with patch.object(db_connector, "_fetch_students_bulk", return_value={}) as fetch:
+            db_connector.get_students_bulk(["20210001", "2021000X", "20210002"])
+            assert db_connector.get_students_bulk(["2021000X"]) == {}
+        
+        fetch.assert_called_once_with(["20210001", "20210002"])
+    
+    def test_report_for_unknown_code(self, db_connector):
+        """
+        Prueba que el validador rechaza el código desconocido sin consultarlo.
+        
+        Args:
+            db_connector (DBConnector): Conector con índice.
+        """
+        validator = GraduationValidator(db_connector)
+        
+        results = list(validator.validate_students_bulk(["20210001", "2021000X"]))
+        
+        assert results[1][1] is STUDENT_NOT_FOUND
+        assert results[1][2] is False
+        assert db_connector.metrics.counters["db_queries"] == 1
+    
+    def test_sqlite_upsert_adds_codes(self, tmp_path):
+        """
+        Prueba que los códigos insertados en SQLite se agregan al índice.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        db_connector = SQLiteDBConnector(str(tmp_path / "estudiantes.db"), known_codes=set())
+        assert db_connector.get_student_data("20210001") is STUDENT_NOT_FOUND
+        
+        db_connector.upsert_students(ESTUDIANTES_DATA)
+        
+        assert db_connector.get_student_data("20210001")["nombre"] == "Ana Martínez"
+        db_connector.close()
@@ -0,0 +1,149 @@
+"""
+Pruebas unitarias para la instrumentación de validador, conector y reporte.
+"""
+import itertools
+import json
+
+import pytest
+from unittest.mock import Mock
+from src.db_connector import DBConnector
+from src.metrics import LatencyHistogram, Metrics
+from src.validacion_grado import GraduationValidator
+
+class TestLatencyHistogram:
+    """Clase para probar el histograma de latencias."""
+    
+    def test_quantiles(self):
+        """
+        Prueba que los percentiles estimados quedan cerca de los reales.
+        """
+        # Configurar
+        histogram = LatencyHistogram()
+        for millis in range(1, 1001):
+            histogram.observe(millis / 1000)
+        
+        # Ejecutar
+        summary = histogram.summary()
+        
+        # Verificar
+        assert summary["count"] == 1000
+        assert summary["p50"] == pytest.approx(0.5, rel=0.2)
+        assert summary["p95"] == pytest.approx(0.95, rel=0.2)
+        assert summary["p99"] <= summary["max"] == 1.0
+    
+    def test_empty_histogram(self):
+        """
+        Prueba que un histograma vacío no tiene percentiles.
+        """
+        # Ejecutar y verificar
+        assert LatencyHistogram().summary()["p50"] is None
+    
+    def test_merge(self):
+        """
+        Prueba que merge suma las observaciones de otro histograma.
+        """
+        # Configurar
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.observe(0.001)
+        second.observe(0.002)
+        
+        # Ejecutar
+        first.merge(second)
+        
+        # Verificar
+        assert first.count == 2
+        assert first.max == 0.002
+
+class TestMetrics:
+    """Clase para probar el registro de métricas y su instrumentación."""
+    
+    @pytest.fixture
+    def metrics(self):
+        """
+        Fixture que proporciona un registro con un reloj que avanza un segundo por lectura.
+        
+        Returns:
+            Metrics: Registro de métricas.
+        """
+        return Metrics(clock=Mock(side_effect=itertools.count()))
+    
+    def test_validator_times_each_check(self, metrics):
+        """
+        Prueba que cada verificación del validador queda registrada en su histograma.
+        
+        Args:
+            metrics (Metrics): Registro de métricas.
+        """
+        # Configurar
+        mock_db_connector = Mock()
+        mock_db_connector.get_student_average.return_value = 4.0
+        validator = GraduationValidator(db_connector=mock_db_connector, metrics=metrics)
+        
+        # Ejecutar
+        validator.validate_graduation_requirements("12345")
+        
+        # Verificar
+        assert set(metrics.histograms) == {
+            "check_enrollment", "check_academic_average", "check_welfare_status", "check_payment"
+        }
+        assert metrics.histograms["check_payment"].summary()["mean"] == 1.0
+    
+    def test_connector_counts_queries(self, metrics):
+        """
+        Prueba que el conector cuenta y mide sus consultas.
+        
+        Args:
+            metrics (Metrics): Registro de métricas.
+        """
+        # Configurar
+        db_connector = DBConnector(metrics=metrics)
+        
+        # Ejecutar
+        db_connector.get_student_data("20210001")
+        db_connector.get_students_bulk(["20210001", "20210002"])
+        
+        # Verificar
+        assert metrics.counters["db_queries"] == 2
+        assert metrics.histograms["query_student_data"].count == 1
+        assert metrics.histograms["query_students_bulk"].count == 1
+    
+    def test_summary_derives_report_rates(self, metrics):
+        """
+        Prueba que el resumen calcula filas por segundo y consultas por estudiante.
+        
+        Args:
+            metrics (Metrics): Registro de métricas.
+        """
+        # Configurar
+        metrics.increment("db_queries", 2)
+        metrics.increment("report_rows", 10)
+        metrics.set_gauge("report_seconds", 0.5)
+        
+        # Ejecutar
+        summary = json.loads(metrics.to_json())
+        
+        # Verificar
+        assert summary["rows_per_second"] == 20.0
+        assert summary["queries_per_student"] == 0.2
+    
+    def test_prometheus_export(self, metrics, tmp_path):
+        """
+        Prueba el formato de texto de Prometheus.
+        
+        Args:
+            metrics (Metrics): Registro de métricas.
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        # Configurar
+        metrics.increment("db_queries")
+        with metrics.timer("check_payment"):
+            pass
+        
+        # Ejecutar
+        metrics.write(str(tmp_path / "metricas.prom"))
+        
+        # Verificar
+        text = (tmp_path / "metricas.prom").read_text()
+        assert "graduacion_db_queries_total 1" in text
+        assert 'graduacion_check_payment_seconds_bucket{le="+Inf"} 1' in text
+        assert "graduacion_check_payment_seconds_count 1" in text
@@ -0,0 +1,155 @@
+"""
+Pruebas unitarias para la simulación de promedios mínimos.
+"""
+import json
+
+import pytest
+from unittest.mock import Mock
+from benchmarks.synthetic_data import SyntheticCohort, SyntheticDBConnector
+from src.metrics import Metrics
+from src.policy_sweep import PolicySweep, parse_thresholds, sweep_min_average
+from src.resilience import CircuitOpenError
+from src.roster import batched
+from src.validacion_grado import GraduationValidator
+
+THRESHOLDS = parse_thresholds("3.0:4.5:0.1")
+
+class TestPolicySweep:
+    """Clase para probar la simulación de promedios mínimos."""
+    
+    @pytest.fixture
+    def cohort(self, tmp_path):
+        """
+        Fixture con una cohorte sintética y su listado.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        
+        Returns:
+            tuple: (SyntheticCohort, ruta del listado).
+        """
+        cohort = SyntheticCohort(2000, seed=7)
+        roster_path = tmp_path / "estudiantes.txt"
+        cohort.write_roster(roster_path)
+        return cohort, str(roster_path)
+    
+    def test_matches_full_validation(self, cohort):
+        """
+        Prueba que cada umbral coincide con una validación completa con ese promedio.
+        
+        Args:
+            cohort (tuple): Cohorte sintética y ruta del listado.
+        """
+        cohort, roster_path = cohort
+        metrics = Metrics()
+        sweep = sweep_min_average(
+            GraduationValidator(SyntheticDBConnector(cohort, metrics=metrics)),
+            roster_path=roster_path, batch_size=500
+        )
+        
+        # Cada estudiante se consulta una sola vez, por lotes
+        codes = list(cohort.iter_roster())
+        assert sweep.students == len(codes)
+        assert metrics.counters["db_queries"] == -(-len(codes) // 500)
+        
+        for point in sweep.curve(THRESHOLDS[::5], include_students=True):
+            validator = GraduationValidator(SyntheticDBConnector(cohort))
+            validator.min_average = point["min_average"]
+            approved = [code for code, _, status, _ in validator.validate_students_bulk(codes) if status]
+            assert point["approved"] == len(approved)
+            assert sorted(point["students"]) == sorted(approved)
+            assert sweep.approved_count(point["min_average"]) == len(approved)
+    
+    def test_curve_is_monotonic(self, cohort, tmp_path):
+        """
+        Prueba que la curva no crece al subir el promedio y se guarda en JSON.
+        
+        Args:
+            cohort (tuple): Cohorte sintética y ruta del listado.
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        cohort, roster_path = cohort
+        sweep = sweep_min_average(GraduationValidator(SyntheticDBConnector(cohort)), roster_path=roster_path)
+        sweep.write(tmp_path / "curva.json", THRESHOLDS, include_students=False)
+        
+        curve = json.loads((tmp_path / "curva.json").read_text(encoding="utf-8"))["curve"]
+        counts = [point["approved"] for point in curve]
+        assert len(curve) == len(THRESHOLDS)
+        assert counts == sorted(counts, reverse=True)
+        assert "students" not in curve[0]
+    
+    def test_boundary_is_inclusive(self):
+        """Prueba que un promedio igual al umbral aprueba, como en el validador."""
+        passing = {"enrollment": True, "welfare": True, "payment": True}
+        sweep = PolicySweep([
+            ("a", dict(passing, average=3.5)),
+            ("b", dict(passing, average=3.4)),
+            ("c", dict(passing, average=4.0, payment=False)),
+            ("d", {}),
+        ])
+        
+        assert sweep.candidates == 2
+        assert sweep.approved_codes(3.5) == ["a"]
+        assert sweep.approved_count(3.41) == 1
+        assert sweep.approved_count(0) == 2
+    
+    def test_candidates_follow_the_validator_rules(self):
+        """Prueba que los candidatos se eligen con las reglas del validador, no con otra copia."""
+        # Configurar: un validador que ya no exige el paz y salvo de Bienestar
+        class NoWelfareValidator(GraduationValidator):
+            def check_welfare_status(self, student_code, student_data=None):
+                return True
+        
+        records = [
+            ("a", {"enrollment": True, "welfare": False, "payment": True, "average": 3.8}),
+            ("b", {"enrollment": True, "welfare": True, "payment": False, "average": 3.8}),
+        ]
+        
+        # Ejecutar
+        sweep = PolicySweep(records, NoWelfareValidator())
+        
+        # Verificar
+        assert sweep.approved_codes(3.5) == ["a"]
+        assert PolicySweep(records).candidates == 0
+    
+    def test_unavailable_batches_are_counted(self, cohort, tmp_path):
+        """
+        Prueba que un lote sin respuesta se informa aparte y no aborta la simulación.
+        
+        Args:
+            cohort (tuple): Cohorte sintética y ruta del listado.
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        # Configurar
+        cohort, roster_path = cohort
+        db_connector = SyntheticDBConnector(cohort)
+        codes = list(cohort.iter_roster())
+        db_connector.get_students_bulk = Mock(side_effect=[
+            CircuitOpenError("abierto"),
+            *(db_connector.get_students_bulk(batch) for batch in batched(codes[500:], 500))
+        ])
+        
+        # Ejecutar
+        sweep = sweep_min_average(GraduationValidator(db_connector), roster_path=roster_path, batch_size=500)
+        sweep.write(tmp_path / "curva.json", [3.5], include_students=False)
+        
+        # Verificar
+        assert sweep.students == len(codes)
+        assert sweep.unavailable == 500
+        saved = json.loads((tmp_path / "curva.json").read_text(encoding="utf-8"))
+        assert saved["unavailable"] == 500
+        assert saved["curve"][0]["unavailable"] == 500
+    
+    @pytest.mark.parametrize("value, expected", [
+        ("3.3,3.5", [3.3, 3.5]),
+        ("3.3:3.6:0.1", [3.3, 3.4, 3.5, 3.6]),
+    ])
+    def test_parse_thresholds(self, value, expected):
+        """
+        Prueba la interpretación de las listas y rangos de umbrales.
+        
+        Args:
+            value (str): Umbrales.
+            expected (list): Promedios esperados.
+        """
+        assert parse_thresholds(value) == expected
@@ -0,0 +1,131 @@
+"""
+Pruebas unitarias para la caché de registros de estudiantes.
+"""
+import pytest
+from unittest.mock import patch
+from src.db_connector import DBConnector
+from src.record_cache import RecordCache
+
+class FakeClock:
+    """Reloj controlable para probar la expiración de registros."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+class TestRecordCache:
+    """Clase para probar la caché LRU/TTL de registros."""
+    
+    @pytest.fixture
+    def clock(self):
+        """
+        Fixture que proporciona un reloj controlable.
+        
+        Returns:
+            FakeClock: Reloj de prueba.
+        """
+        return FakeClock()
+    
+    def test_get_counts_hits_and_misses(self):
+        """
+        Prueba que get registra aciertos y fallos.
+        """
+        # Configurar
+        cache = RecordCache(max_size=2)
+        cache.put("1", {"nombre": "A"})
+        
+        # Ejecutar
+        assert cache.get("1") == {"nombre": "A"}
+        assert cache.get("2") is None
+        
+        # Verificar
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "hit_rate": 0.5}
+    
+    def test_evicts_least_recently_used(self):
+        """
+        Prueba que al superar max_size se descarta el registro usado hace más tiempo.
+        """
+        # Configurar
+        cache = RecordCache(max_size=2)
+        cache.put("1", {"nombre": "A"})
+        cache.put("2", {"nombre": "B"})
+        cache.get("1")
+        
+        # Ejecutar
+        cache.put("3", {"nombre": "C"})
+        
+        # Verificar
+        assert cache.get("2") is None
+        assert cache.get("1") == {"nombre": "A"}
+        assert cache.get("3") == {"nombre": "C"}
+    
+    def test_entries_expire_after_ttl(self, clock):
+        """
+        Prueba que los registros expiran al cumplirse el TTL.
+        
+        Args:
+            clock (FakeClock): Reloj de prueba.
+        """
+        # Configurar
+        cache = RecordCache(max_size=10, ttl=60, clock=clock)
+        cache.put("1", {"nombre": "A"})
+        
+        # Ejecutar y verificar
+        clock.now = 59
+        assert cache.get("1") == {"nombre": "A"}
+        clock.now = 60
+        assert cache.get("1") is None
+        assert len(cache) == 0
+    
+    def test_invalidate(self):
+        """
+        Prueba la invalidación explícita de un registro y de la caché completa.
+        """
+        # Configurar
+        cache = RecordCache()
+        cache.put("1", {"nombre": "A"})
+        cache.put("2", {"nombre": "B"})
+        
+        # Ejecutar y verificar
+        cache.invalidate("1")
+        assert cache.get("1") is None
+        assert cache.get("2") == {"nombre": "B"}
+        cache.invalidate()
+        assert len(cache) == 0
+    
+    def test_connector_accessors_share_cache(self):
+        """
+        Prueba que los cuatro métodos de consulta del conector comparten una sola consulta.
+        """
+        # Configurar
+        db_connector = DBConnector(cache=RecordCache())
+        
+        with patch("src.mock_data.get_student_data", return_value={"enrollment": True}) as fetch:
+            # Ejecutar
+            db_connector.check_student_enrollment("1")
+            db_connector.get_student_average("1")
+            db_connector.check_university_welfare_status("1")
+            db_connector.check_graduation_payment("1")
+        
+        # Verificar
+        fetch.assert_called_once_with("1")
+        assert db_connector.cache.stats()["hits"] == 3
+    
+    def test_connector_bulk_fetches_only_missing_codes(self):
+        """
+        Prueba que get_students_bulk solo consulta los códigos que no están en caché.
+        """
+        # Configurar
+        db_connector = DBConnector(cache=RecordCache())
+        db_connector.get_student_data("20210001")
+        
+        with patch("src.mock_data.get_students_data", return_value={}) as fetch:
+            # Ejecutar
+            students_data = db_connector.get_students_bulk(["20210001", "99999999"])
+            db_connector.get_students_bulk(["99999999"])
+        
+        # Verificar
+        fetch.assert_called_once_with(["99999999"])
+        assert list(students_data) == ["20210001"]
@@ -0,0 +1,207 @@
+"""
+Pruebas unitarias para el módulo de escritores de reportes.
+"""
+import csv
+import gzip
+import io
+import json
+import sys
+
+import pytest
+from src.report_writers import (
+    CSV_FIELDNAMES,
+    ReportWriter,
+    create_report_writer,
+    open_input,
+    open_output,
+    read_columnar_report
+)
+from src.validacion_grado import INDETERMINATE, REQUIREMENT_NAMES
+
+def _requirements(*flags):
+    """
+    Construye el detalle de requisitos a partir de cuatro valores.
+    
+    Args:
+        *flags (bool): Cumplimiento de cada requisito de REQUIREMENT_NAMES.
+    
+    Returns:
+        dict: Detalle de requisitos.
+    """
+    return dict(zip(REQUIREMENT_NAMES, flags))
+
+RESULTS = [
+    ("20210001", {"nombre": "Ana Martínez"}, True, _requirements(True, True, True, True)),
+    ("20210004", {"nombre": 'Rodríguez, "Juan"'}, False, _requirements(True, False, True, True)),
+    ("20210006", {"nombre": "Línea\nnueva"}, False, _requirements(False, True, False, True)),
+    ("99999999", {}, False, _requirements(False, False, False, False)),
+]
+
+class TestReportWriters:
+    """Clase para probar los escritores de reportes."""
+    
+    def _write(self, output_format, buffer_rows=2):
+        """
+        Escribe RESULTS en memoria con el formato indicado.
+        
+        Args:
+            output_format (str): Formato del reporte.
+            buffer_rows (int): Filas por escritura.
+        
+        Returns:
+            bytes: Contenido escrito.
+        """
+        stream = io.BytesIO()
+        stream.close = lambda: None
+        writer = create_report_writer(stream, output_format, buffer_rows=buffer_rows, encoding="utf-8")
+        writer.write_header()
+        assert writer.write_rows(iter(RESULTS)) == len(RESULTS)
+        writer.close()
+        return stream.getvalue()
+    
+    def test_csv_matches_csv_module(self):
+        """Prueba que el CSV es idéntico al de csv.DictWriter, incluidas las comillas."""
+        # Preparar
+        expected = io.StringIO(newline="")
+        writer = csv.DictWriter(expected, fieldnames=CSV_FIELDNAMES)
+        writer.writeheader()
+        for code, data, status, reqs in RESULTS:
+            row = [code, data.get("nombre", "Desconocido")]
+            row += ["Sí" if reqs[name] else "No" for name in REQUIREMENT_NAMES]
+            row.append("APROBADO" if status else "RECHAZADO")
+            writer.writerow(dict(zip(CSV_FIELDNAMES, row)))
+        
+        # Ejecutar y verificar
+        assert self._write("csv") == expected.getvalue().encode("utf-8")
+    
+    def test_jsonl(self):
+        """Prueba que cada línea es un objeto JSON con el resultado del estudiante."""
+        lines = self._write("jsonl").decode("utf-8").splitlines()
+        rows = [json.loads(line) for line in lines]
+        
+        assert len(rows) == len(RESULTS)
+        assert rows[1]["nombre"] == 'Rodríguez, "Juan"'
+        assert rows[1]["promedio_minimo"] is False
+        assert rows[0]["resultado"] == "APROBADO"
+        assert rows[3]["nombre"] == "Desconocido"
+    
+    def test_columnar_round_trip(self):
+        """Prueba que el formato columnar se lee con los mismos valores."""
+        rows = list(read_columnar_report(io.BytesIO(self._write("columnar"))))
+        
+        assert [row[0] for row in rows] == [result[0] for result in RESULTS]
+        assert [row[1] for row in rows] == ['Ana Martínez', 'Rodríguez, "Juan"', "Línea\nnueva", "Desconocido"]
+        assert [row[2] for row in rows] == [result[3] for result in RESULTS]
+        assert [row[3] for row in rows] == [result[2] for result in RESULTS]
+    
+    def test_csv_none_name_is_empty(self):
+        """Prueba que un nombre None se escribe vacío, como con csv.DictWriter."""
+        # Configurar
+        stream = io.BytesIO()
+        stream.close = lambda: None
+        writer = create_report_writer(stream, "csv", encoding="utf-8")
+        
+        # Ejecutar
+        writer.write_rows([("20210001", {"nombre": None}, True, _requirements(True, True, True, True))])
+        writer.close()
+        
+        # Verificar
+        assert stream.getvalue() == "20210001,,Sí,Sí,Sí,Sí,APROBADO\r\n".encode("utf-8")
+    
+    def test_indeterminate_in_every_format(self):
+        """Prueba que los requisitos y resultados INDETERMINATE se distinguen de un fallo."""
+        # Configurar
+        requirements = _requirements(True, INDETERMINATE, True, False)
+        results = [
+            ("20210001", {"nombre": "Ana Martínez"}, INDETERMINATE, _requirements(*[INDETERMINATE] * 4)),
+            ("20210002", {"nombre": "Carlos Gutiérrez"}, False, requirements),
+        ]
+        written = {}
+        for output_format in ("csv", "jsonl", "columnar"):
+            stream = io.BytesIO()
+            stream.close = lambda: None
+            writer = create_report_writer(stream, output_format, encoding="utf-8")
+            writer.write_header()
+            writer.write_rows(results)
+            writer.close()
+            written[output_format] = stream.getvalue()
+        
+        # Verificar
+        assert written["csv"].decode("utf-8").split("\r\n", 1)[1] == (
+            "20210001,Ana Martínez,INDETERMINADO,INDETERMINADO,INDETERMINADO,INDETERMINADO,INDETERMINADO\r\n"
+            "20210002,Carlos Gutiérrez,Sí,INDETERMINADO,Sí,No,RECHAZADO\r\n"
+        )
+        rows = [json.loads(line) for line in written["jsonl"].decode("utf-8").splitlines()]
+        assert rows[0]["resultado"] == "INDETERMINADO"
+        assert rows[1]["promedio_minimo"] is None
+        assert rows[1]["derechos_de_grado_pagados"] is False
+        columnar = list(read_columnar_report(io.BytesIO(written["columnar"])))
+        assert columnar[0][3] is INDETERMINATE
+        assert all(value is INDETERMINATE for value in columnar[0][2].values())
+        assert columnar[1][2] == requirements
+        assert columnar[1][2]["promedio_minimo"] is INDETERMINATE
+        assert columnar[1][3] is False
+    
+    def test_base_writer_is_abstract(self):
+        """Prueba que un escritor sin write_rows no se puede instanciar."""
+        with pytest.raises(TypeError):
+            ReportWriter(io.BytesIO())
+    
+    def test_unknown_format(self):
+        """Prueba que un formato desconocido lanza ValueError."""
+        with pytest.raises(ValueError):
+            create_report_writer(io.BytesIO(), "xml")
+    
+    def test_gzip_output(self, tmp_path):
+        """
+        Prueba que la salida gzip se descomprime al mismo CSV.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        path = tmp_path / "reporte.csv.gz"
+        writer = create_report_writer(open_output(path, "gzip"), "csv", encoding="utf-8")
+        writer.write_header()
+        writer.write_rows(RESULTS)
+        writer.close()
+        
+        assert gzip.decompress(path.read_bytes()) == self._write("csv")
+    
+    def test_zstd_round_trip(self, tmp_path):
+        """
+        Prueba que la salida zstd se lee con open_input y da el mismo CSV.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        pytest.importorskip("zstandard")
+        path = tmp_path / "reporte.csv.zst"
+        writer = create_report_writer(open_output(path, "zstd"), "csv", encoding="utf-8")
+        writer.write_header()
+        writer.write_rows(RESULTS)
+        writer.close()
+        
+        with open_input(path, "zstd") as stream:
+            assert stream.read() == self._write("csv")
+    
+    def test_zstd_without_package(self, tmp_path, monkeypatch):
+        """
+        Prueba el error claro cuando zstandard no está instalado.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            monkeypatch (MonkeyPatch): Utilidad de pytest para ocultar el paquete.
+        """
+        monkeypatch.setitem(sys.modules, "zstandard", None)
+        with pytest.raises(ImportError, match="zstandard"):
+            open_output(tmp_path / "reporte.csv.zst", "zstd")
+    
+    def test_unknown_compression(self, tmp_path):
+        """
+        Prueba que una compresión desconocida lanza ValueError.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        with pytest.raises(ValueError):
+            open_output(tmp_path / "reporte.csv.bz2", "bz2")
@@ -0,0 +1,187 @@
+"""
+Pruebas unitarias para los índices por requisito.
+"""
+import pytest
+from unittest.mock import Mock
+from benchmarks.synthetic_data import SyntheticCohort
+from src.mock_data import ESTUDIANTES_DATA
+from src.requirement_index import RequirementIndex, load_roster_index
+from src.resilience import CircuitOpenError, DeadlineExceeded
+from src.sqlite_connector import SQLiteDBConnector
+from src.validacion_grado import REQUIREMENT_NAMES, GraduationValidator
+
+class TestRequirementIndex:
+    """Clase para probar el índice por requisito."""
+    
+    @pytest.fixture
+    def cohort(self):
+        """
+        Fixture con los registros de una cohorte sintética.
+        
+        Returns:
+            dict: Diccionario {codigo: datos}.
+        """
+        cohort = SyntheticCohort(3000, seed=3)
+        return {cohort.code(i): cohort.record(i) for i in range(cohort.size)}
+    
+    def _scan(self, records, failed, passed):
+        """
+        Calcula una consulta validando todos los registros, como referencia.
+        
+        Args:
+            records (dict): Registros de la cohorte.
+            failed (tuple): Requisitos no cumplidos.
+            passed (tuple): Requisitos cumplidos.
+        
+        Returns:
+            list: Códigos seleccionados, en orden.
+        """
+        validator = GraduationValidator()
+        selected = []
+        for student_code, student_data in records.items():
+            _, requirements = validator.validate_student_record(student_data)
+            if all(not requirements[name] for name in failed) and all(requirements[name] for name in passed):
+                selected.append(student_code)
+        return selected
+    
+    @pytest.mark.parametrize("requirement", REQUIREMENT_NAMES)
+    def test_blocked_queries_match_scan(self, cohort, requirement):
+        """
+        Prueba que las consultas coinciden con validar todos los registros.
+        
+        Args:
+            cohort (dict): Registros de la cohorte.
+            requirement (str): Requisito consultado.
+        """
+        index = RequirementIndex(records=cohort)
+        others = tuple(name for name in REQUIREMENT_NAMES if name != requirement)
+        
+        assert index.blocked_by(requirement) == self._scan(cohort, (requirement,), ())
+        only = self._scan(cohort, (requirement,), others)
+        assert index.blocked_only_by(requirement) == only
+        assert index.summary()[requirement]["blocked_only"] == len(only)
+    
+    def test_updates_and_removals(self):
+        """Prueba que actualizar y quitar registros cambia solo sus bits."""
+        index = RequirementIndex(records=ESTUDIANTES_DATA)
+        assert index.blocked_only_by("derechos_de_grado_pagados") == ["20210005"]
+        
+        # El estudiante paga y otro deja de estar a paz y salvo
+        index.update("20210005", dict(ESTUDIANTES_DATA["20210005"], payment=True))
+        index.update("20210001", dict(ESTUDIANTES_DATA["20210001"], welfare=False))
+        assert index.count(failed=("derechos_de_grado_pagados",)) == 0
+        assert index.blocked_only_by("paz_y_salvo_bienestar") == ["20210001"]
+        
+        index.remove("20210001")
+        assert "20210001" not in index
+        assert len(index) == len(ESTUDIANTES_DATA) - 1
+        assert index.blocked_by("paz_y_salvo_bienestar") == []
+    
+    def test_unknown_requirement(self):
+        """Prueba que un requisito desconocido lanza ValueError."""
+        with pytest.raises(ValueError):
+            RequirementIndex(records=ESTUDIANTES_DATA).blocked_by("biblioteca")
+    
+    def test_sqlite_upsert_updates_index(self, tmp_path):
+        """
+        Prueba que upsert_students mantiene actualizado el índice del conector.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        index = RequirementIndex()
+        db_connector = SQLiteDBConnector(str(tmp_path / "estudiantes.db"), requirement_index=index)
+        db_connector.upsert_students(ESTUDIANTES_DATA)
+        assert index.blocked_only_by("promedio_minimo") == ["20210004"]
+        
+        db_connector.upsert_students({"20210004": dict(ESTUDIANTES_DATA["20210004"], average=3.9)})
+        assert index.blocked_only_by("promedio_minimo") == []
+        db_connector.close()
+    
+    def test_save_and_load(self, tmp_path):
+        """
+        Prueba que el índice guardado se lee con las mismas consultas.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        # Configurar
+        index = RequirementIndex(records=ESTUDIANTES_DATA)
+        index.update("99999999", {})
+        index.synced_at = 123.0
+        path = tmp_path / "indice.bin"
+        
+        # Ejecutar
+        index.save(path)
+        loaded = RequirementIndex.load(path)
+        
+        # Verificar
+        assert loaded.codes == index.codes
+        assert loaded.synced_at == 123.0
+        assert "99999999" not in loaded
+        assert loaded.summary() == index.summary()
+        other = GraduationValidator()
+        other.min_average = 4.0
+        with pytest.raises(ValueError):
+            RequirementIndex.load(path, other)
+    
+    def test_load_roster_index_reuses_saved_index(self, tmp_path):
+        """
+        Prueba que el índice se construye con el listado y después solo aplica los cambios.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        # Configurar
+        db_connector = SQLiteDBConnector(str(tmp_path / "estudiantes.db"))
+        db_connector.upsert_students(ESTUDIANTES_DATA)
+        validator = GraduationValidator(db_connector)
+        roster = ["20210004", "20210005", "99999999", "20210004"]
+        path = tmp_path / "indice.bin"
+        
+        # Ejecutar: la primera vez se consultan solo los estudiantes del listado
+        index = load_roster_index(validator, roster, path)
+        
+        # Verificar
+        assert index.codes == ["20210004", "20210005", "99999999"]
+        assert index.blocked_by("promedio_minimo") == ["20210004"]
+        
+        # Ejecutar: la segunda vez solo se leen los registros modificados
+        db_connector.upsert_students({"20210004": dict(ESTUDIANTES_DATA["20210004"], average=3.9)})
+        db_connector.get_students_bulk = None
+        index = load_roster_index(validator, roster, path)
+        
+        # Verificar
+        assert index.blocked_by("promedio_minimo") == []
+        assert index.blocked_only_by("derechos_de_grado_pagados") == ["20210005"]
+        db_connector.close()
+    
+    def test_unavailable_batches_are_left_out_and_not_saved(self, tmp_path, monkeypatch):
+        """
+        Prueba que una base de datos sin respuesta no aborta el índice ni lo guarda incompleto.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            monkeypatch (MonkeyPatch): Utilidad de pytest para simular la falla.
+        """
+        # Configurar
+        db_connector = SQLiteDBConnector(str(tmp_path / "estudiantes.db"))
+        db_connector.upsert_students(ESTUDIANTES_DATA)
+        validator = GraduationValidator(db_connector)
+        roster = ["20210004", "20210005", "99999999"]
+        path = tmp_path / "indice.bin"
+        load_roster_index(validator, roster, path)
+        saved = path.read_bytes()
+        monkeypatch.setattr(db_connector, "changed_since", Mock(side_effect=DeadlineExceeded("lento")))
+        monkeypatch.setattr(db_connector, "get_students_bulk", Mock(side_effect=CircuitOpenError("abierto")))
+        
+        # Ejecutar
+        index = load_roster_index(validator, roster, path)
+        
+        # Verificar
+        assert index.unavailable == roster
+        assert index.blocked_by("promedio_minimo") == []
+        assert path.read_bytes() == saved
+        load_roster_index(validator, roster, tmp_path / "otro.bin")
+        assert not (tmp_path / "otro.bin").exists()
+        db_connector.close()
@@ -0,0 +1,279 @@
+"""
+Pruebas unitarias para los plazos, respaldos, reintentos e interruptor de las consultas.
+"""
+import pickle
+import threading
+import time
+
+import pytest
+from src.db_connector import DBConnector
+from src.generate_report import generate_graduation_csv_report
+from src.metrics import Metrics
+from src.resilience import (CallPolicy, CircuitBreaker, CircuitOpenError, DeadlineExceeded,
+                            RetriesExhausted, RetryPolicy)
+from src.validacion_grado import INDETERMINATE, GraduationValidator
+
+class FaultInjectingDBConnector(DBConnector):
+    """
+    Conector que simula una base de datos con fallas.
+    
+    Cada consulta consume el siguiente elemento del guion: un número es una
+    demora en segundos antes de responder y una excepción se lanza. Cuando el
+    guion se agota las consultas responden de inmediato.
+    """
+    
+    def __init__(self, script=(), **kwargs):
+        super().__init__(**kwargs)
+        self.script = list(script)
+        self.calls = 0
+        self._script_lock = threading.Lock()
+    
+    def _next_fault(self):
+        with self._script_lock:
+            self.calls += 1
+            return self.script.pop(0) if self.script else 0
+    
+    def _inject(self):
+        fault = self._next_fault()
+        if isinstance(fault, BaseException):
+            raise fault
+        if fault:
+            time.sleep(fault)
+    
+    def _fetch_student_data(self, student_code):
+        self._inject()
+        return super()._fetch_student_data(student_code)
+    
+    def _fetch_students_bulk(self, student_codes):
+        self._inject()
+        return super()._fetch_students_bulk(student_codes)
+
+class TestCallPolicy:
+    """Clase para probar la política de llamadas del conector."""
+    
+    def test_deadline_stops_waiting_for_a_slow_query(self):
+        """Prueba que una consulta lenta termina en DeadlineExceeded al vencer su plazo."""
+        metrics = Metrics()
+        db_connector = FaultInjectingDBConnector(
+            [0.5], call_policy=CallPolicy(deadline=0.05, metrics=metrics)
+        )
+        
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            db_connector.get_student_data("20210001")
+        
+        assert time.monotonic() - start < 0.5
+        assert metrics.counters["query_timeouts"] == 1
+    
+    def test_hedged_query_answers_when_the_first_copy_is_slow(self):
+        """Prueba que tras el percentil 95 se envía una copia y se usa la primera respuesta."""
+        metrics = Metrics()
+        policy = CallPolicy(deadline=2.0, hedge_min_samples=5, metrics=metrics)
+        db_connector = FaultInjectingDBConnector([0.005] * 5 + [0.5], call_policy=policy)
+        for _ in range(5):
+            db_connector.get_student_data("20210001")
+        
+        start = time.monotonic()
+        student_data = db_connector.get_student_data("20210002")
+        
+        assert student_data["nombre"] == "Carlos Gutiérrez"
+        assert time.monotonic() - start < 0.5
+        assert metrics.counters["hedged_queries"] == 1
+        assert metrics.counters["hedge_wins"] == 1
+    
+    def test_no_hedging_before_enough_samples(self):
+        """Prueba que sin latencias observadas no se envían copias."""
+        policy = CallPolicy(hedge_min_samples=5)
+        
+        assert policy.hedge_delay("query_student_data") is None
+    
+    def test_retries_transient_errors(self):
+        """Prueba que los errores transitorios se reintentan con espera aleatoria."""
+        metrics = Metrics()
+        delays = []
+        policy = CallPolicy(
+            retry=RetryPolicy(attempts=3, base_delay=0.01, seed=1), metrics=metrics, sleep=delays.append
+        )
+        db_connector = FaultInjectingDBConnector(
+            [ConnectionError("reset"), ConnectionError("reset")], call_policy=policy
+        )
+        
+        assert db_connector.get_student_data("20210001")["nombre"] == "Ana Martínez"
+        assert db_connector.calls == 3
+        assert metrics.counters["query_retries"] == 2
+        assert 0 <= delays[0] <= 0.01 and 0 <= delays[1] <= 0.02
+    
+    def test_retries_exhausted(self):
+        """Prueba que se rinde tras el último intento conservando el error original."""
+        policy = CallPolicy(retry=RetryPolicy(attempts=2, base_delay=0), sleep=lambda _: None)
+        db_connector = FaultInjectingDBConnector(
+            [ConnectionError("a"), ConnectionError("b")], call_policy=policy
+        )
+        
+        with pytest.raises(RetriesExhausted) as error:
+            db_connector.get_student_data("20210001")
+        
+        assert str(error.value.__cause__) == "b"
+    
+    def test_non_retryable_errors_propagate(self):
+        """Prueba que los errores que no son transitorios no se reintentan."""
+        policy = CallPolicy(retry=RetryPolicy(attempts=3))
+        db_connector = FaultInjectingDBConnector([KeyError("bug")], call_policy=policy)
+        
+        with pytest.raises(KeyError):
+            db_connector.get_student_data("20210001")
+        assert db_connector.calls == 1
+    
+    def test_policy_can_be_pickled(self):
+        """Prueba que la política se puede enviar a otro proceso."""
+        policy = CallPolicy(deadline=0.5, breaker=CircuitBreaker())
+        policy.call("query", lambda: 1)
+        
+        copy = pickle.loads(pickle.dumps(policy))
+        
+        assert copy.deadline == 0.5
+        assert copy.call("query", lambda: 2) == 2
+
+class TestCircuitBreaker:
+    """Clase para probar el interruptor."""
+    
+    def test_opens_after_consecutive_failures(self):
+        """Prueba que tras los fallos consecutivos se rechazan consultas sin ejecutarlas."""
+        metrics = Metrics()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        policy = CallPolicy(breaker=breaker, metrics=metrics)
+        db_connector = FaultInjectingDBConnector(
+            [ConnectionError("caída"), ConnectionError("caída")], call_policy=policy
+        )
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                db_connector.get_student_data("20210001")
+        
+        with pytest.raises(CircuitOpenError):
+            db_connector.get_student_data("20210001")
+        assert db_connector.calls == 2
+        assert metrics.counters["circuit_rejections"] == 1
+    
+    def test_half_open_trial_closes_the_breaker(self):
+        """Prueba que pasado el tiempo de espera una consulta exitosa cierra el interruptor."""
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+        breaker.record_failure()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        
+        now[0] = 10.0
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_success()
+        
+        assert breaker.state == CircuitBreaker.CLOSED
+        breaker.before_call()
+    
+    def test_failed_trial_reopens_the_breaker(self):
+        """Prueba que una consulta de prueba fallida vuelve a abrir el interruptor."""
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=lambda: now[0])
+        for _ in range(3):
+            breaker.record_failure()
+        now[0] = 10.0
+        breaker.before_call()
+        
+        breaker.record_failure()
+        
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+class TestIndeterminateValidation:
+    """Clase para probar el estado indeterminado de los requisitos."""
+    
+    def test_slow_requirement_is_indeterminate(self):
+        """Prueba que un requisito cuya consulta vence su plazo queda INDETERMINATE."""
+        metrics = Metrics()
+        # El primer requisito en el orden de registro es la matrícula
+        db_connector = FaultInjectingDBConnector([0.5], call_policy=CallPolicy(deadline=0.05))
+        validator = GraduationValidator(db_connector=db_connector, metrics=metrics)
+        
+        graduation_status, requirements = validator.validate_graduation_requirements("20210001")
+        
+        assert requirements["matriculado"] is INDETERMINATE
+        assert requirements["promedio_minimo"] is True
+        assert graduation_status is INDETERMINATE
+        assert metrics.counters["indeterminate_requirements"] == 1
+    
+    def test_failed_requirement_wins_over_indeterminate(self):
+        """Prueba que un requisito no cumplido decide el resultado aunque otro sea indeterminado."""
+        db_connector = FaultInjectingDBConnector([0.5], call_policy=CallPolicy(deadline=0.05))
+        validator = GraduationValidator(db_connector=db_connector)
+        
+        # 20210005 no ha pagado los derechos de grado
+        graduation_status, requirements = validator.validate_graduation_requirements("20210005")
+        
+        assert requirements["matriculado"] is INDETERMINATE
+        assert graduation_status is False
+    
+    def test_open_circuit_makes_every_requirement_indeterminate(self):
+        """Prueba que con el interruptor abierto la validación responde sin consultar."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        db_connector = FaultInjectingDBConnector(call_policy=CallPolicy(breaker=breaker))
+        validator = GraduationValidator(db_connector=db_connector)
+        
+        report = validator.generate_graduation_report("20210001")
+        
+        assert db_connector.calls == 0
+        assert "No se pudo verificar a tiempo si el estudiante con código 20210001" in report
+        assert "- Matriculado: INDETERMINADO" in report
+    
+    def test_indeterminate_is_falsy_and_pickles_by_reference(self):
+        """Prueba que INDETERMINATE es falso y conserva su identidad al serializarse."""
+        assert not INDETERMINATE
+        assert pickle.loads(pickle.dumps(INDETERMINATE)) is INDETERMINATE
+    
+    def test_unavailable_batch_is_indeterminate_and_validation_continues(self):
+        """Prueba que un lote sin respuesta queda INDETERMINATE y se validan los siguientes."""
+        # Configurar
+        metrics = Metrics()
+        db_connector = FaultInjectingDBConnector([DeadlineExceeded("lote lento")])
+        validator = GraduationValidator(db_connector=db_connector, metrics=metrics)
+        
+        # Ejecutar
+        results = list(validator.validate_students_bulk(
+            ["20210001", "20210002", "20210003", "20210004"], batch_size=2
+        ))
+        
+        # Verificar
+        assert [result[0] for result in results] == ["20210001", "20210002", "20210003", "20210004"]
+        assert [result[2] for result in results[:2]] == [INDETERMINATE, INDETERMINATE]
+        assert all(value is INDETERMINATE for value in results[0][3].values())
+        assert results[2][2] is True
+        assert results[3][2] is False
+        assert metrics.counters["indeterminate_requirements"] == 8
+    
+    def test_report_writes_indeterminate_rows(self, tmp_path, monkeypatch):
+        """
+        Prueba que el reporte CSV escribe las filas de un lote sin respuesta como INDETERMINADO.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            monkeypatch (MonkeyPatch): Utilidad de pytest para cambiar el directorio.
+        """
+        # Configurar
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "estudiantes.txt").write_text("20210001\n20210004\n")
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        db_connector = FaultInjectingDBConnector(call_policy=CallPolicy(breaker=breaker))
+        validator = GraduationValidator(db_connector=db_connector)
+        
+        # Ejecutar
+        generate_graduation_csv_report("salida.csv", validator=validator)
+        
+        # Verificar
+        lines = (tmp_path / "salida.csv").read_text(encoding="utf-8").splitlines()
+        assert lines[1:] == [
+            "20210001,Desconocido,INDETERMINADO,INDETERMINADO,INDETERMINADO,INDETERMINADO,INDETERMINADO",
+            "20210004,Desconocido,INDETERMINADO,INDETERMINADO,INDETERMINADO,INDETERMINADO,INDETERMINADO",
+        ]
@@ -0,0 +1,74 @@
+"""
+Pruebas unitarias para la lectura incremental de listados de estudiantes.
+"""
+import gzip
+import io
+import itertools
+
+import pytest
+from src.roster import batched, iter_student_codes, open_roster
+
+class TestRoster:
+    """Clase para probar la lectura de listados de estudiantes."""
+    
+    def test_iter_student_codes_skips_blank_lines(self):
+        """
+        Prueba que iter_student_codes elimina espacios y omite líneas vacías.
+        """
+        # Configurar
+        stream = io.StringIO("20210001\r\n\n  20210002  \n\n")
+        
+        # Ejecutar y verificar
+        assert list(iter_student_codes(stream)) == ["20210001", "20210002"]
+    
+    def test_iter_student_codes_is_lazy(self):
+        """
+        Prueba que iter_student_codes no consume el flujo completo por adelantado.
+        """
+        # Configurar
+        lines = (f"{i}\n" for i in itertools.count())
+        
+        # Ejecutar
+        codes = list(itertools.islice(iter_student_codes(lines), 3))
+        
+        # Verificar
+        assert codes == ["0", "1", "2"]
+        assert next(lines) == "3\n"
+    
+    def test_open_roster_gzip(self, tmp_path):
+        """
+        Prueba que open_roster descomprime los listados terminados en '.gz'.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        # Configurar
+        roster_path = tmp_path / "estudiantes.txt.gz"
+        with gzip.open(roster_path, "wt", encoding="utf-8") as f:
+            f.write("20210001\n20210002\n")
+        
+        # Ejecutar
+        with open_roster(str(roster_path), encoding="utf-8") as roster:
+            codes = list(iter_student_codes(roster))
+        
+        # Verificar
+        assert codes == ["20210001", "20210002"]
+    
+    def test_open_roster_missing_file(self, tmp_path):
+        """
+        Prueba que open_roster informa cuando el archivo no existe.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        # Ejecutar y verificar
+        with pytest.raises(FileNotFoundError):
+            open_roster(str(tmp_path / "no_existe.txt"))
+    
+    def test_batched(self):
+        """
+        Prueba que batched divide en bloques de tamaño fijo.
+        """
+        # Ejecutar y verificar
+        assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+        assert list(batched([], 2)) == []
@@ -0,0 +1,173 @@
+"""
+Pruebas unitarias para el motor de reglas de validación.
+"""
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from unittest.mock import Mock
+from src.rule_engine import RuleEngine
+from src.validacion_grado import GraduationValidator
+
+class TestRuleEngine:
+    """Clase para probar el motor de reglas."""
+    
+    @pytest.fixture
+    def engine(self):
+        """
+        Fixture que proporciona un motor con dos reglas simuladas.
+        
+        Returns:
+            RuleEngine: Motor de reglas con las reglas 'costosa' y 'barata'.
+        """
+        engine = RuleEngine(reorder_every=10)
+        engine.register("costosa", Mock(return_value=True), cost=10.0)
+        engine.register("barata", Mock(return_value=False), cost=1.0)
+        return engine
+    
+    def test_evaluate_runs_all_rules_in_registration_order(self, engine):
+        """
+        Prueba que evaluate ejecuta todas las reglas y conserva el orden de registro.
+        
+        Args:
+            engine (RuleEngine): Motor de reglas.
+        """
+        # Ejecutar
+        status, results = engine.evaluate("12345")
+        
+        # Verificar
+        assert status is False
+        assert list(results.items()) == [("costosa", True), ("barata", False)]
+    
+    def test_is_satisfied_short_circuits_on_cheapest_failure(self, engine):
+        """
+        Prueba que el modo de solo veredicto evalúa primero la regla barata y se detiene.
+        
+        Args:
+            engine (RuleEngine): Motor de reglas.
+        """
+        # Ejecutar
+        result = engine.is_satisfied("12345")
+        
+        # Verificar
+        assert result is False
+        assert engine.execution_order() == ["barata", "costosa"]
+        engine.rules[0].check.assert_not_called()
+    
+    def test_reorders_by_observed_failure_rate(self):
+        """
+        Prueba que las reglas que fallan con frecuencia pasan al frente.
+        """
+        # Configurar
+        # Cada evaluación mide una latencia de una unidad para ambas reglas
+        engine = RuleEngine(reorder_every=5, clock=Mock(side_effect=itertools.count()))
+        engine.register("casi_siempre_cumple", Mock(return_value=True))
+        engine.register("suele_fallar", Mock(side_effect=lambda code: code != "falla"))
+        assert engine.execution_order() == ["casi_siempre_cumple", "suele_fallar"]
+        
+        # Ejecutar
+        for _ in range(5):
+            engine.evaluate("falla")
+        
+        # Verificar
+        assert engine.execution_order() == ["suele_fallar", "casi_siempre_cumple"]
+        assert engine.stats()["suele_fallar"]["failures"] == 5
+    
+    def test_unmeasured_rules_are_evaluated_first(self):
+        """
+        Prueba que una regla que nunca se alcanzó pasa al frente para medirla.
+        """
+        # Configurar
+        engine = RuleEngine(reorder_every=5, explore_every=0, clock=Mock(side_effect=itertools.count()))
+        engine.register("siempre_falla", Mock(return_value=False))
+        engine.register("nunca_evaluada", Mock(return_value=True))
+        
+        # Ejecutar
+        for _ in range(5):
+            engine.is_satisfied("12345")
+        
+        # Verificar
+        assert engine.stats()["nunca_evaluada"]["evaluations"] == 0
+        assert engine.stats()["nunca_evaluada"]["mean_latency"] is None
+        assert engine.execution_order() == ["nunca_evaluada", "siempre_falla"]
+    
+    def test_exploration_evaluates_all_rules(self, engine):
+        """
+        Prueba que cada explore_every llamadas se evalúan también las reglas de atrás.
+        
+        Args:
+            engine (RuleEngine): Motor de reglas.
+        """
+        # Configurar
+        engine.explore_every = 3
+        
+        # Ejecutar
+        results = [engine.is_satisfied("12345") for _ in range(6)]
+        
+        # Verificar
+        assert results == [False] * 6
+        assert engine.rules[0].check.call_count == 2
+        assert engine.stats()["barata"]["evaluations"] == 6
+    
+    def test_concurrent_evaluations_are_counted(self, engine):
+        """
+        Prueba que las estadísticas no pierden evaluaciones entre hilos.
+        
+        Args:
+            engine (RuleEngine): Motor de reglas.
+        """
+        # Ejecutar
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: engine.evaluate("12345", measure_latency=False), range(4000)))
+        
+        # Verificar
+        assert engine.stats()["costosa"]["evaluations"] == 4000
+        assert engine.stats()["barata"]["failures"] == 4000
+    
+    def test_duplicate_rule_name(self, engine):
+        """
+        Prueba que no se puede registrar dos veces el mismo nombre.
+        
+        Args:
+            engine (RuleEngine): Motor de reglas.
+        """
+        # Ejecutar y verificar
+        with pytest.raises(ValueError):
+            engine.register("barata", Mock())
+    
+    def test_validator_is_eligible_skips_remaining_checks(self):
+        """
+        Prueba que GraduationValidator.is_eligible verifica primero el pago y no consulta el resto.
+        """
+        # Configurar
+        mock_db_connector = Mock()
+        mock_db_connector.check_graduation_payment.return_value = False
+        validator = GraduationValidator(db_connector=mock_db_connector)
+        
+        # Ejecutar
+        result = validator.is_eligible("12345")
+        
+        # Verificar
+        assert result is False
+        mock_db_connector.check_graduation_payment.assert_called_once_with("12345")
+        mock_db_connector.check_student_enrollment.assert_not_called()
+        mock_db_connector.get_student_average.assert_not_called()
+        mock_db_connector.check_university_welfare_status.assert_not_called()
+    
+    def test_fresh_validator_checks_payment_first(self):
+        """
+        Prueba que, sin latencias medidas, el orden sale de los costos estimados.
+        """
+        # Configurar
+        validator = GraduationValidator()
+        
+        # Ejecutar
+        order = validator.rule_engine.execution_order()
+        
+        # Verificar
+        assert order[0] == "derechos_de_grado_pagados"
+        assert order[-1] == "promedio_minimo"
+        # Validar registros ya obtenidos no mide latencias, así que el pago sigue primero
+        for student_code in ("20210001", "20210004", "20210005") * 50:
+            validator.validate_student_record(validator.db_connector.get_student_data(student_code))
+        assert validator.rule_engine.execution_order()[0] == "derechos_de_grado_pagados"
@@ -0,0 +1,210 @@
+"""
+Pruebas unitarias para la generación del reporte por fragmentos.
+"""
+import os
+
+import pytest
+from main import parse_args
+from src.db_connector import DBConnector
+from src.generate_report import generate_graduation_csv_report
+from src.sharding import generate_sharded_csv_report, is_shard_complete, merge_shards
+from src.validacion_grado import GraduationValidator
+
+CODES = ["20210001", "20210002", "20210003", "20210004", "20210005", "99999999", "20210001"]
+
+class FailingDBConnector(DBConnector):
+    """Conector que falla después de una cantidad de consultas masivas."""
+    
+    def __init__(self, fail_after):
+        super().__init__()
+        self.fail_after = fail_after
+        self.bulk_calls = 0
+    
+    def _fetch_students_bulk(self, student_codes):
+        self.bulk_calls += 1
+        if self.bulk_calls > self.fail_after:
+            raise ConnectionError("Se perdió la conexión")
+        return super()._fetch_students_bulk(student_codes)
+
+class TestShardedReport:
+    """Clase para probar el reporte por fragmentos."""
+    
+    @pytest.fixture
+    def roster_path(self, tmp_path):
+        """
+        Fixture que crea el listado de estudiantes.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        
+        Returns:
+            str: Ruta del listado.
+        """
+        path = tmp_path / "estudiantes.txt"
+        path.write_text("\n".join(CODES) + "\n")
+        return str(path)
+    
+    @pytest.fixture
+    def expected(self, tmp_path, roster_path):
+        """
+        Fixture con el reporte generado sin fragmentos.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            roster_path (str): Ruta del listado.
+        
+        Returns:
+            bytes: Contenido del reporte.
+        """
+        path = tmp_path / "esperado.csv"
+        generate_graduation_csv_report(str(path), roster_path=roster_path)
+        return path.read_bytes()
+    
+    def test_matches_unsharded_report(self, tmp_path, roster_path, expected):
+        """
+        Prueba que el reporte unido es idéntico al generado sin fragmentos.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            roster_path (str): Ruta del listado.
+            expected (bytes): Reporte sin fragmentos.
+        """
+        output = tmp_path / "salida.csv"
+        assert generate_sharded_csv_report(str(output), shard_size=3, roster_path=roster_path) == len(CODES)
+        
+        assert output.read_bytes() == expected
+        assert not os.path.exists(str(output) + ".shards")
+    
+    def test_resume_after_failure(self, tmp_path, roster_path, expected):
+        """
+        Prueba que una ejecución interrumpida se reanuda sin repetir fragmentos.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            roster_path (str): Ruta del listado.
+            expected (bytes): Reporte sin fragmentos.
+        """
+        output = str(tmp_path / "salida.csv")
+        work_dir = output + ".shards"
+        
+        # Ejecutar: falla en el segundo fragmento
+        failing = GraduationValidator(FailingDBConnector(fail_after=1))
+        with pytest.raises(ConnectionError):
+            generate_sharded_csv_report(output, failing, shard_size=3, roster_path=roster_path)
+        
+        # Verificar: no hay reporte a medio escribir ni temporales
+        assert not os.path.exists(output)
+        assert is_shard_complete(work_dir, 0)
+        assert sorted(os.listdir(work_dir)) == ["manifest.json", "part-00000.csv", "part-00000.done.json"]
+        
+        # Reanudar: solo se consultan los dos fragmentos pendientes
+        connector = FailingDBConnector(fail_after=10)
+        rows = generate_sharded_csv_report(
+            output, GraduationValidator(connector), shard_size=3, resume=True, roster_path=roster_path
+        )
+        assert rows == len(CODES) - 3
+        assert connector.bulk_calls == 2
+        assert open(output, "rb").read() == expected
+    
+    def test_resume_rejects_other_parameters(self, tmp_path, roster_path):
+        """
+        Prueba que no se reanuda un directorio creado con otro tamaño de fragmento.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            roster_path (str): Ruta del listado.
+        """
+        output = str(tmp_path / "salida.csv")
+        generate_sharded_csv_report(output, shard_size=3, roster_path=roster_path, keep_shards=True)
+        
+        with pytest.raises(ValueError):
+            generate_sharded_csv_report(output, shard_size=2, resume=True, roster_path=roster_path)
+    
+    def test_multiple_workers(self, tmp_path, roster_path, expected):
+        """
+        Prueba que varios trabajadores completan el reporte sobre el mismo directorio.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            roster_path (str): Ruta del listado.
+            expected (bytes): Reporte sin fragmentos.
+        """
+        output = str(tmp_path / "salida.csv")
+        
+        # El primer trabajador no puede unir porque falta el fragmento del segundo
+        generate_sharded_csv_report(output, shard_size=2, worker_index=0, worker_count=2, roster_path=roster_path)
+        assert not os.path.exists(output)
+        with pytest.raises(ValueError):
+            merge_shards(output, output + ".shards")
+        
+        # El segundo se une al trabajo, completa los fragmentos y une el reporte
+        generate_sharded_csv_report(output, shard_size=2, resume=True, worker_index=1, worker_count=2,
+                                    roster_path=roster_path)
+        assert open(output, "rb").read() == expected
+    
+    def test_fresh_run_discards_previous_shards(self, tmp_path, roster_path):
+        """
+        Prueba que una ejecución con fresh no une fragmentos de una ejecución anterior.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            roster_path (str): Ruta del listado.
+        """
+        # Configurar: una ejecución completa con dos trabajadores conserva sus fragmentos
+        output = str(tmp_path / "salida.csv")
+        generate_sharded_csv_report(output, shard_size=2, worker_index=0, worker_count=2, roster_path=roster_path)
+        generate_sharded_csv_report(output, shard_size=2, resume=True, worker_index=1, worker_count=2,
+                                    roster_path=roster_path)
+        os.remove(output)
+        
+        # Ejecutar: el primer trabajador de una ejecución nueva
+        generate_sharded_csv_report(output, shard_size=2, fresh=True, worker_index=0, worker_count=2,
+                                    roster_path=roster_path)
+        
+        # Verificar: los fragmentos del otro trabajador ya no están y no se une el reporte
+        assert not os.path.exists(output)
+        assert not is_shard_complete(output + ".shards", 1)
+        with pytest.raises(ValueError):
+            generate_sharded_csv_report(output, shard_size=2, fresh=True, resume=True, roster_path=roster_path)
+    
+    def test_late_worker_keeps_finished_peer_shards(self, tmp_path, roster_path, expected):
+        """
+        Prueba que un trabajador lanzado sin resume después de otro no borra sus fragmentos.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            roster_path (str): Ruta del listado.
+            expected (bytes): Reporte sin fragmentos.
+        """
+        # Configurar: el segundo trabajador termina primero
+        output = str(tmp_path / "salida.csv")
+        generate_sharded_csv_report(output, shard_size=2, worker_index=1, worker_count=2, roster_path=roster_path)
+        
+        # Ejecutar
+        generate_sharded_csv_report(output, shard_size=2, worker_index=0, worker_count=2, roster_path=roster_path)
+        
+        # Verificar
+        assert open(output, "rb").read() == expected
+    
+    @pytest.mark.parametrize("shard_size", ["0", "-2"])
+    def test_main_rejects_non_positive_shard_size(self, shard_size, capsys):
+        """
+        Prueba que la línea de comandos rechaza un tamaño de fragmento menor que 1.
+        
+        Args:
+            shard_size (str): Tamaño de fragmento.
+            capsys (CaptureFixture): Captura de la salida de pytest.
+        """
+        with pytest.raises(SystemExit):
+            parse_args(["--shard-size", shard_size])
+        assert "--shard-size debe ser mayor que 0" in capsys.readouterr().err
+    
+    def test_invalid_worker_index(self, roster_path):
+        """
+        Prueba que un índice de trabajador fuera de rango lanza ValueError.
+        
+        Args:
+            roster_path (str): Ruta del listado.
+        """
+        with pytest.raises(ValueError):
+            generate_sharded_csv_report(worker_index=2, worker_count=2, roster_path=roster_path)
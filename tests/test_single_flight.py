@@ -0,0 +1,157 @@
+"""
+Pruebas unitarias para el agrupamiento de consultas concurrentes.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.async_validacion import AsyncGraduationValidator, CoalescingAsyncDBConnector
+from src.db_connector import DBConnector
+from src.metrics import Metrics
+from src.mock_data import ESTUDIANTES_DATA
+from src.single_flight import SingleFlight
+
+class SlowDBConnector(DBConnector):
+    """Conector que tarda en responder y cuenta las consultas que recibe."""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.fetched = []
+        self._fetched_lock = threading.Lock()
+    
+    def _fetch_student_data(self, student_code):
+        with self._fetched_lock:
+            self.fetched.append(student_code)
+        time.sleep(0.05)
+        return super()._fetch_student_data(student_code)
+    
+    def _fetch_students_bulk(self, student_codes):
+        with self._fetched_lock:
+            self.fetched.extend(student_codes)
+        time.sleep(0.05)
+        return super()._fetch_students_bulk(student_codes)
+
+class CountingAsyncDBConnector:
+    """Conector asíncrono que cuenta las consultas que recibe."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    async def _lookup(self, student_code, field, default):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        student_data = ESTUDIANTES_DATA.get(student_code, {})
+        return student_data if field is None else student_data.get(field, default)
+    
+    async def get_student_data(self, student_code):
+        return await self._lookup(student_code, None, {})
+    
+    async def check_student_enrollment(self, student_code):
+        return await self._lookup(student_code, "enrollment", False)
+    
+    async def get_student_average(self, student_code):
+        return await self._lookup(student_code, "average", 0.0)
+    
+    async def check_university_welfare_status(self, student_code):
+        return await self._lookup(student_code, "welfare", False)
+    
+    async def check_graduation_payment(self, student_code):
+        return await self._lookup(student_code, "payment", False)
+
+class TestSingleFlight:
+    """Clase para probar el agrupamiento entre hilos."""
+    
+    def test_concurrent_lookups_share_one_query(self):
+        """Prueba que varios hilos que piden el mismo código comparten una consulta."""
+        metrics = Metrics()
+        db_connector = SlowDBConnector(coalesce=True, metrics=metrics)
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(db_connector.get_student_data, ["20210001"] * 8))
+        
+        assert all(result["nombre"] == "Ana Martínez" for result in results)
+        assert db_connector.fetched == ["20210001"]
+        assert metrics.counters["db_queries"] == 1
+        assert metrics.counters["coalesced_queries"] == 7
+    
+    def test_sequential_lookups_are_not_cached(self):
+        """Prueba que una consulta terminada no se reutiliza."""
+        db_connector = SlowDBConnector(coalesce=True)
+        
+        db_connector.get_student_data("20210001")
+        db_connector.get_student_data("20210001")
+        
+        assert db_connector.fetched == ["20210001", "20210001"]
+    
+    def test_bulk_waits_for_lookups_in_flight(self):
+        """Prueba que la consulta masiva no repite los códigos que otro hilo consulta."""
+        db_connector = SlowDBConnector(coalesce=True)
+        
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            single = pool.submit(db_connector.get_student_data, "20210001")
+            time.sleep(0.01)
+            bulk = pool.submit(db_connector.get_students_bulk, ["20210001", "20210002", "99999999"])
+            assert single.result()["nombre"] == "Ana Martínez"
+            assert set(bulk.result()) == {"20210001", "20210002"}
+        
+        assert sorted(db_connector.fetched) == ["20210001", "20210002", "99999999"]
+        assert db_connector.single_flight.stats() == {"queries": 2, "coalesced": 1}
+    
+    def test_errors_are_shared(self):
+        """Prueba que la excepción de la consulta llega a todos los que la esperan."""
+        single_flight = SingleFlight()
+        started = threading.Event()
+        
+        def failing_query():
+            started.set()
+            time.sleep(0.05)
+            raise ConnectionError("Se perdió la conexión")
+        
+        def follower():
+            started.wait()
+            return single_flight.do("20210001", failing_query)
+        
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(single_flight.do, "20210001", failing_query)
+            waiting = pool.submit(follower)
+            for future in (leader, waiting):
+                with pytest.raises(ConnectionError):
+                    future.result()
+        
+        assert single_flight.stats() == {"queries": 1, "coalesced": 1}
+
+class TestAsyncSingleFlight:
+    """Clase para probar el agrupamiento entre tareas de asyncio."""
+    
+    def test_validator_shares_queries(self):
+        """Prueba que las validaciones concurrentes de un código comparten consultas."""
+        metrics = Metrics()
+        wrapped = CountingAsyncDBConnector()
+        validator = AsyncGraduationValidator(CoalescingAsyncDBConnector(wrapped, metrics=metrics))
+        
+        async def run():
+            return await asyncio.gather(*(validator.validate_student("20210004") for _ in range(10)))
+        
+        results = asyncio.run(run())
+        
+        assert all(result == results[0] for result in results)
+        assert results[0][1] is False
+        assert wrapped.calls == 1
+        assert metrics.counters["coalesced_queries"] == 9
+    
+    def test_cancelled_waiter_does_not_cancel_query(self):
+        """Prueba que cancelar una tarea que espera no afecta a las demás."""
+        wrapped = CountingAsyncDBConnector()
+        db_connector = CoalescingAsyncDBConnector(wrapped)
+        
+        async def run():
+            first = asyncio.ensure_future(db_connector.get_student_data("20210001"))
+            second = asyncio.ensure_future(db_connector.get_student_data("20210001"))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+        
+        assert asyncio.run(run())["nombre"] == "Ana Martínez"
+        assert wrapped.calls == 1
@@ -0,0 +1,149 @@
+"""
+Pruebas unitarias para la instantánea binaria mapeada en memoria.
+"""
+import mmap
+import pickle
+
+import pytest
+from src.mock_data import ESTUDIANTES_DATA
+from src.resilience import CallPolicy
+from src.snapshot import MmapDBConnector, compile_snapshot, main
+from src.sqlite_connector import SQLiteDBConnector
+from src.validacion_grado import GraduationValidator
+
+class TestMmapDBConnector:
+    """Clase para probar el conector sobre la instantánea binaria."""
+    
+    @pytest.fixture
+    def snapshot_path(self, tmp_path):
+        """
+        Fixture que compila una instantánea con los datos simulados.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        
+        Returns:
+            str: Ruta de la instantánea.
+        """
+        path = str(tmp_path / "estudiantes.snap")
+        compile_snapshot(ESTUDIANTES_DATA, path)
+        return path
+    
+    def test_lookups_match_source_data(self, snapshot_path):
+        """
+        Prueba que cada código devuelve el mismo registro que los datos de origen.
+        
+        Args:
+            snapshot_path (str): Ruta de la instantánea.
+        """
+        # Configurar
+        db_connector = MmapDBConnector(snapshot_path)
+        
+        # Ejecutar y verificar
+        assert len(db_connector) == 5
+        for student_code, student_data in ESTUDIANTES_DATA.items():
+            assert db_connector.get_student_data(student_code) == student_data
+        for unknown_code in ["99999999", "2021000", "202100011", "", "código"]:
+            assert db_connector.get_student_data(unknown_code) == {}
+        db_connector.close()
+    
+    def test_bulk_and_validator(self, snapshot_path):
+        """
+        Prueba la consulta por lotes y el uso con GraduationValidator.
+        
+        Args:
+            snapshot_path (str): Ruta de la instantánea.
+        """
+        # Configurar
+        validator = GraduationValidator(db_connector=MmapDBConnector(snapshot_path))
+        
+        # Ejecutar
+        results = list(validator.validate_students_bulk(["20210005", "99999999", "20210001"]))
+        
+        # Verificar
+        assert [status for _, _, status, _ in results] == [False, False, True]
+    
+    def test_pickled_connector_remaps_file(self, snapshot_path):
+        """
+        Prueba que una copia del conector (como la de un proceso del pool) vuelve a mapear el archivo.
+        
+        Args:
+            snapshot_path (str): Ruta de la instantánea.
+        """
+        # Ejecutar
+        copy = pickle.loads(pickle.dumps(MmapDBConnector(snapshot_path)))
+        
+        # Verificar
+        assert copy.get_student_data("20210003")["nombre"] == "María López"
+    
+    def test_rejects_invalid_file(self, tmp_path, monkeypatch):
+        """
+        Prueba que un archivo que no es una instantánea produce un error y libera su mapa.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            monkeypatch (MonkeyPatch): Utilidad de pytest para registrar los mapas abiertos.
+        """
+        # Configurar
+        path = tmp_path / "otro.bin"
+        path.write_bytes(b"x" * 64)
+        maps = []
+        original_mmap = mmap.mmap
+        
+        def recording_mmap(*args, **kwargs):
+            maps.append(original_mmap(*args, **kwargs))
+            return maps[-1]
+        
+        monkeypatch.setattr(mmap, "mmap", recording_mmap)
+        
+        # Ejecutar y verificar
+        with pytest.raises(ValueError):
+            MmapDBConnector(str(path))
+        assert maps[0].closed
+    
+    def test_lookups_across_blocks_skip_matches_inside_names(self, tmp_path):
+        """
+        Prueba la búsqueda en varios bloques y que un código dentro de un nombre no se confunde con un registro.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        # Configurar: el nombre de cada registro contiene el código del siguiente
+        records = {
+            f"{index:08d}": {"nombre": f"x{index + 1:08d}", "enrollment": True, "average": index / 100,
+                             "welfare": False, "payment": True}
+            for index in range(0, 1000, 2)
+        }
+        path = str(tmp_path / "bloques.snap")
+        compile_snapshot(records, path)
+        db_connector = MmapDBConnector(path, call_policy=CallPolicy(deadline=5.0))
+        
+        # Ejecutar y verificar
+        assert db_connector.call_policy is not None
+        for student_code, student_data in records.items():
+            assert db_connector.get_student_data(student_code) == student_data
+        assert db_connector.get_students_bulk([f"{index:08d}" for index in range(1, 1000, 2)]) == {}
+        assert db_connector.get_student_data("99999999") == {}
+        db_connector.close()
+    
+    def test_compile_from_sqlite(self, tmp_path, capsys):
+        """
+        Prueba la herramienta de línea de comandos con una base SQLite de origen.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            capsys (CaptureFixture): Captura de la salida estándar.
+        """
+        # Configurar
+        database = str(tmp_path / "estudiantes.db")
+        source = SQLiteDBConnector(database)
+        source.upsert_students(ESTUDIANTES_DATA)
+        source.close()
+        output = str(tmp_path / "estudiantes.snap")
+        
+        # Ejecutar
+        main([output, "--sqlite", database])
+        
+        # Verificar
+        assert "5 estudiantes" in capsys.readouterr().out
+        assert dict(MmapDBConnector(output).iter_student_records()) == ESTUDIANTES_DATA
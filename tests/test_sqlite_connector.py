@@ -0,0 +1,136 @@
+"""
+Pruebas unitarias para el conector SQLite.
+"""
+import threading
+
+import pytest
+from src.mock_data import ESTUDIANTES_DATA
+from src.record_cache import RecordCache
+from src.sqlite_connector import ConnectionPool, SQLiteDBConnector
+from src.validacion_grado import GraduationValidator
+
+class TestSQLiteDBConnector:
+    """Clase para probar el conector a una base de datos SQLite local."""
+    
+    @pytest.fixture
+    def db_connector(self, tmp_path):
+        """
+        Fixture que proporciona un conector SQLite cargado con los datos simulados.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            
+        Returns:
+            SQLiteDBConnector: Conector a la base de datos.
+        """
+        db_connector = SQLiteDBConnector(str(tmp_path / "estudiantes.db"), chunk_size=2)
+        db_connector.upsert_students(ESTUDIANTES_DATA)
+        yield db_connector
+        db_connector.close()
+    
+    def test_get_student_data(self, db_connector):
+        """
+        Prueba que get_student_data devuelve el mismo registro que los datos simulados.
+        
+        Args:
+            db_connector (SQLiteDBConnector): Conector a la base de datos.
+        """
+        # Ejecutar y verificar
+        assert db_connector.get_student_data("20210004") == ESTUDIANTES_DATA["20210004"]
+        assert db_connector.get_student_data("99999999") == {}
+    
+    def test_get_students_bulk_in_chunks(self, db_connector):
+        """
+        Prueba que get_students_bulk consulta en bloques y omite los códigos inexistentes.
+        
+        Args:
+            db_connector (SQLiteDBConnector): Conector a la base de datos.
+        """
+        # Configurar
+        codes = list(ESTUDIANTES_DATA) + ["99999999"]
+        
+        # Ejecutar
+        students_data = db_connector.get_students_bulk(codes)
+        
+        # Verificar
+        assert students_data == ESTUDIANTES_DATA
+    
+    def test_upsert_updates_and_invalidates_cache(self, tmp_path):
+        """
+        Prueba que upsert_students actualiza el registro y descarta la versión en caché.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        # Configurar
+        db_connector = SQLiteDBConnector(str(tmp_path / "estudiantes.db"), cache=RecordCache())
+        db_connector.upsert_students(ESTUDIANTES_DATA)
+        assert db_connector.check_graduation_payment("20210005") is False
+        
+        # Ejecutar
+        updated = dict(ESTUDIANTES_DATA["20210005"], payment=True)
+        db_connector.upsert_students({"20210005": updated})
+        
+        # Verificar
+        assert db_connector.check_graduation_payment("20210005") is True
+        db_connector.close()
+    
+    def test_drop_in_for_validator(self, db_connector):
+        """
+        Prueba que el conector puede usarse directamente con GraduationValidator.
+        
+        Args:
+            db_connector (SQLiteDBConnector): Conector a la base de datos.
+        """
+        # Configurar
+        validator = GraduationValidator(db_connector=db_connector)
+        
+        # Ejecutar
+        approved, _ = validator.validate_graduation_requirements("20210001")
+        rejected, requirements = validator.validate_graduation_requirements("20210004")
+        
+        # Verificar
+        assert approved is True
+        assert rejected is False
+        assert requirements["promedio_minimo"] is False
+    
+    def test_pool_reuses_connections_across_threads(self, tmp_path):
+        """
+        Prueba que el pool no abre más conexiones que su tamaño máximo.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        # Configurar
+        db_connector = SQLiteDBConnector(str(tmp_path / "estudiantes.db"), pool_size=2)
+        db_connector.upsert_students(ESTUDIANTES_DATA)
+        
+        def worker():
+            for _ in range(20):
+                db_connector.get_student_data("20210001")
+        
+        # Ejecutar
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # Verificar
+        assert db_connector.pool._created <= 2
+        db_connector.close()
+    
+    def test_pool_rejects_acquire_after_close(self, tmp_path):
+        """
+        Prueba que un pool cerrado no entrega conexiones.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        # Configurar
+        pool = ConnectionPool(str(tmp_path / "pool.db"))
+        pool.close()
+        
+        # Ejecutar y verificar
+        with pytest.raises(RuntimeError):
+            pool.acquire()
@@ -0,0 +1,165 @@
+"""
+Pruebas unitarias para el módulo de informes individuales.
+"""
+import tarfile
+import zipfile
+
+import pytest
+from src.generate_report import generate_graduation_csv_report
+from src.student_reports import generate_student_reports, report_file_name
+from src.validacion_grado import GraduationValidator
+
+CODES = ["20210001", "20210004", "20210005", "99999999"]
+
+class TestGenerateStudentReports:
+    """Clase para probar la generación de informes individuales."""
+    
+    @pytest.fixture
+    def roster_path(self, tmp_path):
+        """
+        Fixture que crea un listado de estudiantes.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        
+        Returns:
+            Path: Ruta del listado.
+        """
+        path = tmp_path / "estudiantes.txt"
+        path.write_text("\n".join(CODES) + "\n")
+        return path
+    
+    @pytest.fixture
+    def expected(self):
+        """
+        Fixture con los informes esperados, generados uno por uno.
+        
+        Returns:
+            dict: Contenido de cada informe por nombre de archivo.
+        """
+        validator = GraduationValidator()
+        return {
+            f"{code}.txt": validator.generate_graduation_report(code).encode("utf-8")
+            for code in CODES
+        }
+    
+    def test_directory(self, tmp_path, roster_path, expected):
+        """
+        Prueba que los informes del directorio coinciden con los individuales.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            roster_path (Path): Ruta del listado.
+            expected (dict): Informes esperados.
+        """
+        count = generate_student_reports(tmp_path / "informes", roster_path=roster_path)
+        
+        assert count == len(CODES)
+        assert {path.name: path.read_bytes() for path in (tmp_path / "informes").iterdir()} == expected
+    
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_zip_parallel(self, tmp_path, roster_path, expected, executor):
+        """
+        Prueba el archivo zip generado en paralelo, en el orden del listado.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            roster_path (Path): Ruta del listado.
+            expected (dict): Informes esperados.
+            executor (str): Tipo de pool.
+        """
+        destination = tmp_path / "informes.zip"
+        generate_student_reports(destination, roster_path=roster_path, workers=2,
+                                 executor=executor, chunk_size=1)
+        
+        with zipfile.ZipFile(destination) as archive:
+            assert archive.namelist() == list(expected)
+            assert {name: archive.read(name) for name in archive.namelist()} == expected
+    
+    @pytest.mark.parametrize("name", ["informes.tar", "informes.tar.gz"])
+    def test_tar(self, tmp_path, roster_path, expected, name):
+        """
+        Prueba los archivos tar con y sin compresión.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            roster_path (Path): Ruta del listado.
+            expected (dict): Informes esperados.
+            name (str): Nombre del archivo de salida.
+        """
+        generate_student_reports(tmp_path / name, roster_path=roster_path)
+        
+        with tarfile.open(tmp_path / name) as archive:
+            assert {member.name: archive.extractfile(member).read() for member in archive} == expected
+    
+    def test_missing_roster(self, tmp_path, capsys):
+        """
+        Prueba que un listado inexistente se informa sin crear el destino.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            capsys (CaptureFixture): Captura de la salida estándar.
+        """
+        assert generate_student_reports(tmp_path / "informes", roster_path=tmp_path / "no.txt") is None
+        assert "No se encontró" in capsys.readouterr().out
+        assert not (tmp_path / "informes").exists()
+    
+    def test_file_name_has_no_path_separators(self):
+        """Prueba que un código con separadores no escapa del destino."""
+        name = report_file_name("../2021/0001")
+        
+        assert name.startswith("___2021_0001.")
+        assert "/" not in name and ".." not in name
+        assert report_file_name("20210001") == "20210001.txt"
+    
+    def test_file_names_are_unique(self):
+        """Prueba que códigos que se sanean igual no comparten archivo."""
+        names = {report_file_name(code) for code in ["a/b", "a.b", "a_b", "a b"]}
+        
+        assert len(names) == 4
+    
+    def test_repeated_codes_write_one_report(self, tmp_path, capsys):
+        """
+        Prueba que un código repetido en el listado produce un solo informe.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            capsys (CaptureFixture): Captura de la salida estándar.
+        """
+        # Configurar
+        roster_path = tmp_path / "estudiantes.txt"
+        roster_path.write_text("20210001\n20210004\n20210001\n")
+        
+        # Ejecutar
+        written = generate_student_reports(tmp_path / "informes.zip", roster_path=roster_path)
+        
+        # Verificar
+        assert written == 2
+        with zipfile.ZipFile(tmp_path / "informes.zip") as archive:
+            assert archive.namelist() == ["20210001.txt", "20210004.txt"]
+        assert "1 códigos repetidos" in capsys.readouterr().out
+    
+    def test_same_pass_as_report(self, tmp_path, expected):
+        """
+        Prueba que el reporte CSV escribe los informes sin volver a validar el listado.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+            expected (dict): Informes esperados por nombre de archivo.
+        """
+        # Configurar
+        roster_path = tmp_path / "estudiantes.txt"
+        roster_path.write_text("\n".join(CODES) + "\n")
+        validator = GraduationValidator()
+        calls = []
+        get_students_bulk = validator.db_connector.get_students_bulk
+        validator.db_connector.get_students_bulk = lambda codes: calls.append(codes) or get_students_bulk(codes)
+        
+        # Ejecutar
+        generate_graduation_csv_report(tmp_path / "reporte.csv", validator=validator,
+                                       roster_path=roster_path,
+                                       student_reports_path=tmp_path / "informes")
+        
+        # Verificar
+        assert len(calls) == 1
+        assert {path.name: path.read_bytes() for path in (tmp_path / "informes").iterdir()} == expected
@@ -0,0 +1,135 @@
+"""
+Pruebas unitarias para los almacenes compactos de registros de estudiantes.
+"""
+import pytest
+from src.db_connector import DBConnector
+from src.generate_report import generate_graduation_csv_report
+from src.mock_data import ESTUDIANTES_DATA
+from src.student_store import ColumnarStudentStore, StudentRecord, StudentStore
+from src.validacion_grado import GraduationValidator
+
+class TestStudentRecord:
+    """Clase para probar el registro con __slots__."""
+    
+    def test_reads_like_a_dict(self):
+        """
+        Prueba que StudentRecord se lee igual que los diccionarios de los datos simulados.
+        """
+        # Ejecutar
+        record = StudentRecord.from_dict(ESTUDIANTES_DATA["20210001"])
+        
+        # Verificar
+        assert record.get("nombre") == "Ana Martínez"
+        assert record["average"] == 4.2
+        assert record.get("desconocido", "x") == "x"
+        assert record == ESTUDIANTES_DATA["20210001"]
+        assert not hasattr(record, "__dict__")
+
+@pytest.mark.parametrize("store_class", [StudentStore, ColumnarStudentStore])
+class TestStudentStores:
+    """Clase para probar ambos almacenes con la misma interfaz."""
+    
+    def test_get_and_get_many(self, store_class):
+        """
+        Prueba la búsqueda individual y por lotes.
+        
+        Args:
+            store_class (type): Clase de almacén a probar.
+        """
+        # Configurar
+        store = store_class(ESTUDIANTES_DATA)
+        
+        # Ejecutar y verificar
+        assert len(store) == 5
+        assert store.get("20210004") == ESTUDIANTES_DATA["20210004"]
+        assert store.get("99999999") is None
+        assert set(store.get_many(["20210001", "99999999"])) == {"20210001"}
+    
+    def test_put_replaces_existing_record(self, store_class):
+        """
+        Prueba que put reemplaza el registro de un código existente.
+        
+        Args:
+            store_class (type): Clase de almacén a probar.
+        """
+        # Configurar
+        store = store_class(ESTUDIANTES_DATA)
+        
+        # Ejecutar
+        store.put("20210005", dict(ESTUDIANTES_DATA["20210005"], payment=True))
+        
+        # Verificar
+        assert len(store) == 5
+        assert store.get("20210005").payment is True
+    
+    def test_connector_and_report_use_store(self, store_class, tmp_path, monkeypatch):
+        """
+        Prueba que DBConnector y el reporte CSV trabajan directamente sobre el almacén.
+        
+        Args:
+            store_class (type): Clase de almacén a probar.
+            tmp_path (Path): Directorio temporal de pytest.
+            monkeypatch (MonkeyPatch): Utilidad de pytest para cambiar el directorio.
+        """
+        # Configurar
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "estudiantes.txt").write_text("\n".join(ESTUDIANTES_DATA) + "\n")
+        validator = GraduationValidator(db_connector=DBConnector(store=store_class(ESTUDIANTES_DATA)))
+        
+        # Ejecutar
+        generate_graduation_csv_report("salida.csv", validator=validator)
+        
+        # Verificar
+        content = (tmp_path / "salida.csv").read_text(encoding="utf-8")
+        assert "20210004,Juan Rodríguez,Sí,No,Sí,Sí,RECHAZADO" in content
+        assert validator.check_payment("20210005") is False
+        assert validator.db_connector.get_student_data("99999999") == {}
+
+class TestColumnarStudentStore:
+    """Clase para probar la representación columnar."""
+    
+    def test_columns_feed_validate_batch(self):
+        """
+        Prueba que las columnas sirven directamente para la validación vectorizada.
+        """
+        # Configurar
+        store = ColumnarStudentStore(ESTUDIANTES_DATA)
+        
+        # Ejecutar
+        result = GraduationValidator().validate_batch(*store.columns())
+        
+        # Verificar
+        assert result.approved_codes() == ["20210001", "20210002", "20210003"]
+    
+    def test_columns_match_records_at_the_threshold(self):
+        """
+        Prueba que un promedio igual al mínimo aprueba tanto por registro como por columnas.
+        """
+        # Configurar
+        store = ColumnarStudentStore({"1": {"nombre": "N", "enrollment": True, "average": 3.3,
+                                            "welfare": True, "payment": True}})
+        validator = GraduationValidator()
+        validator.min_average = 3.3
+        
+        # Ejecutar
+        passed, _ = validator.validate_student_record(store.get("1"), "1")
+        result = validator.validate_batch(*store.columns())
+        
+        # Verificar
+        assert passed is True
+        assert result.approved_codes() == ["1"]
+    
+    def test_bitmaps_are_packed(self):
+        """
+        Prueba que los requisitos booleanos ocupan un bit por estudiante.
+        """
+        # Configurar
+        store = ColumnarStudentStore()
+        for index in range(17):
+            store.put(str(index), {"nombre": "N", "enrollment": index % 2 == 0, "average": 3.5,
+                                   "welfare": True, "payment": False})
+        
+        # Verificar
+        assert len(store._enrollment) == 3
+        assert [store.get(str(i)).enrollment for i in range(4)] == [True, False, True, False]
+        assert store.columns()[1] == bytes(int(i % 2 == 0) for i in range(17))
@@ -1,277 +1,402 @@
-"""
-Pruebas unitarias para el módulo de validación de requisitos de graduación.
-"""
-import pytest
-from unittest.mock import Mock, patch
-from src.validacion_grado import GraduationValidator
-
-class TestGraduationValidator:
-    """Clase para probar el validador de requisitos de graduación."""
-    
-    @pytest.fixture
-    def mock_db_connector(self):
-        """
-        Fixture que proporciona un conector de base de datos simulado.
-        
-        Returns:
-            Mock: Objeto mock para simular el conector de base de datos.
-        """
-        mock_db = Mock()
-        return mock_db
-    
-    @pytest.fixture
-    def validator(self, mock_db_connector):
-        """
-        Fixture que proporciona un validador con un conector de base de datos simulado.
-        
-        Args:
-            mock_db_connector (Mock): Conector de base de datos simulado.
-            
-        Returns:
-            GraduationValidator: Validador de requisitos de graduación.
-        """
-        return GraduationValidator(db_connector=mock_db_connector)
-    
-    def test_check_enrollment_true(self, validator, mock_db_connector):
-        """
-        Prueba que check_enrollment devuelve True cuando el estudiante está matriculado.
-        
-        Args:
-            validator (GraduationValidator): Validador de requisitos de graduación.
-            mock_db_connector (Mock): Conector de base de datos simulado.
-        """
-        # Configurar mock
-        mock_db_connector.check_student_enrollment.return_value = True
-        
-        # Ejecutar
-        result = validator.check_enrollment("12345")
-        
-        # Verificar
-        assert result is True
-        mock_db_connector.check_student_enrollment.assert_called_once_with("12345")
-    
-    def test_check_enrollment_false(self, validator, mock_db_connector):
-        """
-        Prueba que check_enrollment devuelve False cuando el estudiante no está matriculado.
-        
-        Args:
-            validator (GraduationValidator): Validador de requisitos de graduación.
-            mock_db_connector (Mock): Conector de base de datos simulado.
-        """
-        # Configurar mock
-        mock_db_connector.check_student_enrollment.return_value = False
-        
-        # Ejecutar
-        result = validator.check_enrollment("12345")
-        
-        # Verificar
-        assert result is False
-        mock_db_connector.check_student_enrollment.assert_called_once_with("12345")
-    
-    def test_check_academic_average_pass(self, validator, mock_db_connector):
-        """
-        Prueba que check_academic_average devuelve True cuando el promedio es suficiente.
-        
-        Args:
-            validator (GraduationValidator): Validador de requisitos de graduación.
-            mock_db_connector (Mock): Conector de base de datos simulado.
-        """
-        # Configurar mock
-        mock_db_connector.get_student_average.return_value = 4.0
-        
-        # Ejecutar
-        result = validator.check_academic_average("12345")
-        
-        # Verificar
-        assert result is True
-        mock_db_connector.get_student_average.assert_called_once_with("12345")
-    
-    def test_check_academic_average_fail(self, validator, mock_db_connector):
-        """
-        Prueba que check_academic_average devuelve False cuando el promedio es insuficiente.
-        
-        Args:
-            validator (GraduationValidator): Validador de requisitos de graduación.
-            mock_db_connector (Mock): Conector de base de datos simulado.
-        """
-        # Configurar mock
-        mock_db_connector.get_student_average.return_value = 3.0
-        
-        # Ejecutar
-        result = validator.check_academic_average("12345")
-        
-        # Verificar
-        assert result is False
-        mock_db_connector.get_student_average.assert_called_once_with("12345")
-    
-    def test_check_welfare_status_true(self, validator, mock_db_connector):
-        """
-        Prueba que check_welfare_status devuelve True cuando el estudiante está a paz y salvo.
-        
-        Args:
-            validator (GraduationValidator): Validador de requisitos de graduación.
-            mock_db_connector (Mock): Conector de base de datos simulado.
-        """
-        # Configurar mock
-        mock_db_connector.check_university_welfare_status.return_value = True
-        
-        # Ejecutar
-        result = validator.check_welfare_status("12345")
-        
-        # Verificar
-        assert result is True
-        mock_db_connector.check_university_welfare_status.assert_called_once_with("12345")
-    
-    def test_check_welfare_status_false(self, validator, mock_db_connector):
-        """
-        Prueba que check_welfare_status devuelve False cuando el estudiante no está a paz y salvo.
-        
-        Args:
-            validator (GraduationValidator): Validador de requisitos de graduación.
-            mock_db_connector (Mock): Conector de base de datos simulado.
-        """
-        # Configurar mock
-        mock_db_connector.check_university_welfare_status.return_value = False
-        
-        # Ejecutar
-        result = validator.check_welfare_status("12345")
-        
-        # Verificar
-        assert result is False
-        mock_db_connector.check_university_welfare_status.assert_called_once_with("12345")
-    
-    def test_check_payment_true(self, validator, mock_db_connector):
-        """
-        Prueba que check_payment devuelve True cuando el estudiante ha pagado.
-        
-        Args:
-            validator (GraduationValidator): Validador de requisitos de graduación.
-            mock_db_connector (Mock): Conector de base de datos simulado.
-        """
-        # Configurar mock
-        mock_db_connector.check_graduation_payment.return_value = True
-        
-        # Ejecutar
-        result = validator.check_payment("12345")
-        
-        # Verificar
-        assert result is True
-        mock_db_connector.check_graduation_payment.assert_called_once_with("12345")
-    
-    def test_check_payment_false(self, validator, mock_db_connector):
-        """
-        Prueba que check_payment devuelve False cuando el estudiante no ha pagado.
-        
-        Args:
-            validator (GraduationValidator): Validador de requisitos de graduación.
-            mock_db_connector (Mock): Conector de base de datos simulado.
-        """
-        # Configurar mock
-        mock_db_connector.check_graduation_payment.return_value = False
-        
-        # Ejecutar
-        result = validator.check_payment("12345")
-        
-        # Verificar
-        assert result is False
-        mock_db_connector.check_graduation_payment.assert_called_once_with("12345")
-    
-    def test_validate_graduation_requirements_all_pass(self, validator, mock_db_connector):
-        """
-        Prueba que validate_graduation_requirements devuelve True cuando se cumplen todos los requisitos.
-        
-        Args:
-            validator (GraduationValidator): Validador de requisitos de graduación.
-            mock_db_connector (Mock): Conector de base de datos simulado.
-        """
-        # Configurar mocks
-        mock_db_connector.check_student_enrollment.return_value = True
-        mock_db_connector.get_student_average.return_value = 4.0
-        mock_db_connector.check_university_welfare_status.return_value = True
-        mock_db_connector.check_graduation_payment.return_value = True
-        
-        # Ejecutar
-        all_requirements_met, requirements = validator.validate_graduation_requirements("12345")
-        
-        # Verificar
-        assert all_requirements_met is True
-        assert requirements == {
-            "matriculado": True,
-            "promedio_minimo": True,
-            "paz_y_salvo_bienestar": True,
-            "derechos_de_grado_pagados": True
-        }
-    
-    def test_validate_graduation_requirements_some_fail(self, validator, mock_db_connector):
-        """
-        Prueba que validate_graduation_requirements devuelve False cuando no se cumplen todos los requisitos.
-        
-        Args:
-            validator (GraduationValidator): Validador de requisitos de graduación.
-            mock_db_connector (Mock): Conector de base de datos simulado.
-        """
-        # Configurar mocks
-        mock_db_connector.check_student_enrollment.return_value = True
-        mock_db_connector.get_student_average.return_value = 3.0  # Por debajo del mínimo
-        mock_db_connector.check_university_welfare_status.return_value = True
-        mock_db_connector.check_graduation_payment.return_value = False  # No ha pagado
-        
-        # Ejecutar
-        all_requirements_met, requirements = validator.validate_graduation_requirements("12345")
-        
-        # Verificar
-        assert all_requirements_met is False
-        assert requirements == {
-            "matriculado": True,
-            "promedio_minimo": False,
-            "paz_y_salvo_bienestar": True,
-            "derechos_de_grado_pagados": False
-        }
-    
-    def test_generate_graduation_report_pass(self, validator, mock_db_connector):
-        """
-        Prueba que generate_graduation_report devuelve un mensaje de éxito cuando se cumplen todos los requisitos.
-        
-        Args:
-            validator (GraduationValidator): Validador de requisitos de graduación.
-            mock_db_connector (Mock): Conector de base de datos simulado.
-        """
-        # Configurar mocks
-        mock_db_connector.check_student_enrollment.return_value = True
-        mock_db_connector.get_student_average.return_value = 4.0
-        mock_db_connector.check_university_welfare_status.return_value = True
-        mock_db_connector.check_graduation_payment.return_value = True
-        
-        # Ejecutar
-        report = validator.generate_graduation_report("12345")
-        
-        # Verificar
-        assert "CUMPLE con todos los requisitos" in report
-        assert "Matriculado: CUMPLE" in report
-        assert "Promedio Minimo: CUMPLE" in report
-        assert "Paz Y Salvo Bienestar: CUMPLE" in report
-        assert "Derechos De Grado Pagados: CUMPLE" in report
-    
-    def test_generate_graduation_report_fail(self, validator, mock_db_connector):
-        """
-        Prueba que generate_graduation_report devuelve un mensaje de fallo cuando no se cumplen todos los requisitos.
-        
-        Args:
-            validator (GraduationValidator): Validador de requisitos de graduación.
-            mock_db_connector (Mock): Conector de base de datos simulado.
-        """
-        # Configurar mocks
-        mock_db_connector.check_student_enrollment.return_value = False
-        mock_db_connector.get_student_average.return_value = 3.0
-        mock_db_connector.check_university_welfare_status.return_value = True
-        mock_db_connector.check_graduation_payment.return_value = True
-        
-        # Ejecutar
-        report = validator.generate_graduation_report("12345")
-        
-        # Verificar
-        assert "NO CUMPLE con todos los requisitos" in report
-        assert "Matriculado: NO CUMPLE" in report
-        assert "Promedio Minimo: NO CUMPLE" in report
-        assert "Paz Y Salvo Bienestar: CUMPLE" in report
-        assert "Derechos De Grado Pagados: CUMPLE" in report
\ No newline at end of file
+"""
+Pruebas unitarias para el módulo de validación de requisitos de graduación.
+"""
+import pytest
+from unittest.mock import Mock, patch
+from src.metrics import Metrics
+from src.validacion_grado import GraduationValidator
+
+class TestGraduationValidator:
+    """Clase para probar el validador de requisitos de graduación."""
+    
+    @pytest.fixture
+    def mock_db_connector(self):
+        """
+        Fixture que proporciona un conector de base de datos simulado.
+        
+        Returns:
+            Mock: Objeto mock para simular el conector de base de datos.
+        """
+        mock_db = Mock()
+        return mock_db
+    
+    @pytest.fixture
+    def validator(self, mock_db_connector):
+        """
+        Fixture que proporciona un validador con un conector de base de datos simulado.
+        
+        Args:
+            mock_db_connector (Mock): Conector de base de datos simulado.
+        
+        Returns:
+            GraduationValidator: Validador de requisitos de graduación.
+        """
+        return GraduationValidator(db_connector=mock_db_connector)
+    
+    def test_check_enrollment_true(self, validator, mock_db_connector):
+        """
+        Prueba que check_enrollment devuelve True cuando el estudiante está matriculado.
+        
+        Args:
+            validator (GraduationValidator): Validador de requisitos de graduación.
+            mock_db_connector (Mock): Conector de base de datos simulado.
+        """
+        # Configurar mock
+        mock_db_connector.check_student_enrollment.return_value = True
+        
+        # Ejecutar
+        result = validator.check_enrollment("12345")
+        
+        # Verificar
+        assert result is True
+        mock_db_connector.check_student_enrollment.assert_called_once_with("12345")
+    
+    def test_check_enrollment_false(self, validator, mock_db_connector):
+        """
+        Prueba que check_enrollment devuelve False cuando el estudiante no está matriculado.
+        
+        Args:
+            validator (GraduationValidator): Validador de requisitos de graduación.
+            mock_db_connector (Mock): Conector de base de datos simulado.
+        """
+        # Configurar mock
+        mock_db_connector.check_student_enrollment.return_value = False
+        
+        # Ejecutar
+        result = validator.check_enrollment("12345")
+        
+        # Verificar
+        assert result is False
+        mock_db_connector.check_student_enrollment.assert_called_once_with("12345")
+    
+    def test_check_academic_average_pass(self, validator, mock_db_connector):
+        """
+        Prueba que check_academic_average devuelve True cuando el promedio es suficiente.
+        
+        Args:
+            validator (GraduationValidator): Validador de requisitos de graduación.
+            mock_db_connector (Mock): Conector de base de datos simulado.
+        """
+        # Configurar mock
+        mock_db_connector.get_student_average.return_value = 4.0
+        
+        # Ejecutar
+        result = validator.check_academic_average("12345")
+        
+        # Verificar
+        assert result is True
+        mock_db_connector.get_student_average.assert_called_once_with("12345")
+    
+    def test_check_academic_average_fail(self, validator, mock_db_connector):
+        """
+        Prueba que check_academic_average devuelve False cuando el promedio es insuficiente.
+        
+        Args:
+            validator (GraduationValidator): Validador de requisitos de graduación.
+            mock_db_connector (Mock): Conector de base de datos simulado.
+        """
+        # Configurar mock
+        mock_db_connector.get_student_average.return_value = 3.0
+        
+        # Ejecutar
+        result = validator.check_academic_average("12345")
+        
+        # Verificar
+        assert result is False
+        mock_db_connector.get_student_average.assert_called_once_with("12345")
+    
+    def test_check_welfare_status_true(self, validator, mock_db_connector):
+        """
+        Prueba que check_welfare_status devuelve True cuando el estudiante está a paz y salvo.
+        
+        Args:
+            validator (GraduationValidator): Validador de requisitos de graduación.
+            mock_db_connector (Mock): Conector de base de datos simulado.
+        """
+        # Configurar mock
+        mock_db_connector.check_university_welfare_status.return_value = True
+        
+        # Ejecutar
+        result = validator.check_welfare_status("12345")
+        
+        # Verificar
+        assert result is True
+        mock_db_connector.check_university_welfare_status.assert_called_once_with("12345")
+    
+    def test_check_welfare_status_false(self, validator, mock_db_connector):
+        """
+        Prueba que check_welfare_status devuelve False cuando el estudiante no está a paz y salvo.
+        
+        Args:
+            validator (GraduationValidator): Validador de requisitos de graduación.
+            mock_db_connector (Mock): Conector de base de datos simulado.
+        """
+        # Configurar mock
+        mock_db_connector.check_university_welfare_status.return_value = False
+        
+        # Ejecutar
+        result = validator.check_welfare_status("12345")
+        
+        # Verificar
+        assert result is False
+        mock_db_connector.check_university_welfare_status.assert_called_once_with("12345")
+    
+    def test_check_payment_true(self, validator, mock_db_connector):
+        """
+        Prueba que check_payment devuelve True cuando el estudiante ha pagado.
+        
+        Args:
+            validator (GraduationValidator): Validador de requisitos de graduación.
+            mock_db_connector (Mock): Conector de base de datos simulado.
+        """
+        # Configurar mock
+        mock_db_connector.check_graduation_payment.return_value = True
+        
+        # Ejecutar
+        result = validator.check_payment("12345")
+        
+        # Verificar
+        assert result is True
+        mock_db_connector.check_graduation_payment.assert_called_once_with("12345")
+    
+    def test_check_payment_false(self, validator, mock_db_connector):
+        """
+        Prueba que check_payment devuelve False cuando el estudiante no ha pagado.
+        
+        Args:
+            validator (GraduationValidator): Validador de requisitos de graduación.
+            mock_db_connector (Mock): Conector de base de datos simulado.
+        """
+        # Configurar mock
+        mock_db_connector.check_graduation_payment.return_value = False
+        
+        # Ejecutar
+        result = validator.check_payment("12345")
+        
+        # Verificar
+        assert result is False
+        mock_db_connector.check_graduation_payment.assert_called_once_with("12345")
+    
+    def test_validate_graduation_requirements_all_pass(self, validator, mock_db_connector):
+        """
+        Prueba que validate_graduation_requirements devuelve True cuando se cumplen todos los requisitos.
+        
+        Args:
+            validator (GraduationValidator): Validador de requisitos de graduación.
+            mock_db_connector (Mock): Conector de base de datos simulado.
+        """
+        # Configurar mocks
+        mock_db_connector.check_student_enrollment.return_value = True
+        mock_db_connector.get_student_average.return_value = 4.0
+        mock_db_connector.check_university_welfare_status.return_value = True
+        mock_db_connector.check_graduation_payment.return_value = True
+        
+        # Ejecutar
+        all_requirements_met, requirements = validator.validate_graduation_requirements("12345")
+        
+        # Verificar
+        assert all_requirements_met is True
+        assert requirements == {
+            "matriculado": True,
+            "promedio_minimo": True,
+            "paz_y_salvo_bienestar": True,
+            "derechos_de_grado_pagados": True
+        }
+    
+    def test_validate_graduation_requirements_some_fail(self, validator, mock_db_connector):
+        """
+        Prueba que validate_graduation_requirements devuelve False cuando no se cumplen todos los requisitos.
+        
+        Args:
+            validator (GraduationValidator): Validador de requisitos de graduación.
+            mock_db_connector (Mock): Conector de base de datos simulado.
+        """
+        # Configurar mocks
+        mock_db_connector.check_student_enrollment.return_value = True
+        mock_db_connector.get_student_average.return_value = 3.0  # Por debajo del mínimo
+        mock_db_connector.check_university_welfare_status.return_value = True
+        mock_db_connector.check_graduation_payment.return_value = False  # No ha pagado
+        
+        # Ejecutar
+        all_requirements_met, requirements = validator.validate_graduation_requirements("12345")
+        
+        # Verificar
+        assert all_requirements_met is False
+        assert requirements == {
+            "matriculado": True,
+            "promedio_minimo": False,
+            "paz_y_salvo_bienestar": True,
+            "derechos_de_grado_pagados": False
+        }
+    
+    def test_generate_graduation_report_pass(self, validator, mock_db_connector):
+        """
+        Prueba que generate_graduation_report devuelve un mensaje de éxito cuando se cumplen todos los requisitos.
+        
+        Args:
+            validator (GraduationValidator): Validador de requisitos de graduación.
+            mock_db_connector (Mock): Conector de base de datos simulado.
+        """
+        # Configurar mocks
+        mock_db_connector.check_student_enrollment.return_value = True
+        mock_db_connector.get_student_average.return_value = 4.0
+        mock_db_connector.check_university_welfare_status.return_value = True
+        mock_db_connector.check_graduation_payment.return_value = True
+        
+        # Ejecutar
+        report = validator.generate_graduation_report("12345")
+        
+        # Verificar
+        assert "CUMPLE con todos los requisitos" in report
+        assert "Matriculado: CUMPLE" in report
+        assert "Promedio Minimo: CUMPLE" in report
+        assert "Paz Y Salvo Bienestar: CUMPLE" in report
+        assert "Derechos De Grado Pagados: CUMPLE" in report
+    
+    def test_generate_graduation_report_fail(self, validator, mock_db_connector):
+        """
+        Prueba que generate_graduation_report devuelve un mensaje de fallo cuando no se cumplen todos los requisitos.
+        
+        Args:
+            validator (GraduationValidator): Validador de requisitos de graduación.
+            mock_db_connector (Mock): Conector de base de datos simulado.
+        """
+        # Configurar mocks
+        mock_db_connector.check_student_enrollment.return_value = False
+        mock_db_connector.get_student_average.return_value = 3.0
+        mock_db_connector.check_university_welfare_status.return_value = True
+        mock_db_connector.check_graduation_payment.return_value = True
+        
+        # Ejecutar
+        report = validator.generate_graduation_report("12345")
+        
+        # Verificar
+        assert "NO CUMPLE con todos los requisitos" in report
+        assert "Matriculado: NO CUMPLE" in report
+        assert "Promedio Minimo: NO CUMPLE" in report
+        assert "Paz Y Salvo Bienestar: CUMPLE" in report
+        assert "Derechos De Grado Pagados: CUMPLE" in report
+    
+    def test_validate_student_record_all_pass(self, validator, mock_db_connector):
+        """
+        Prueba que validate_student_record valida un registro sin consultar la base de datos.
+        
+        Args:
+            validator (GraduationValidator): Validador de requisitos de graduación.
+            mock_db_connector (Mock): Conector de base de datos simulado.
+        """
+        # Configurar datos
+        student_data = {
+            "nombre": "Ana Martínez",
+            "enrollment": True,
+            "average": 4.2,
+            "welfare": True,
+            "payment": True
+        }
+        
+        # Ejecutar
+        all_requirements_met, requirements = validator.validate_student_record(student_data)
+        
+        # Verificar
+        assert all_requirements_met is True
+        assert all(requirements.values())
+        mock_db_connector.check_student_enrollment.assert_not_called()
+        mock_db_connector.get_student_data.assert_not_called()
+    
+    def test_validate_student_record_unknown_student(self, validator):
+        """
+        Prueba que validate_student_record rechaza un registro vacío (estudiante inexistente).
+        
+        Args:
+            validator (GraduationValidator): Validador de requisitos de graduación.
+        """
+        # Ejecutar
+        all_requirements_met, requirements = validator.validate_student_record({})
+        
+        # Verificar
+        assert all_requirements_met is False
+        assert requirements == {
+            "matriculado": False,
+            "promedio_minimo": False,
+            "paz_y_salvo_bienestar": False,
+            "derechos_de_grado_pagados": False
+        }
+    
+    def test_validate_student_record_uses_rule_engine(self, mock_db_connector):
+        """
+        Prueba que validate_student_record pasa por las verificaciones check_*,
+        con sus mediciones y las estadísticas del motor de reglas.
+        
+        Args:
+            mock_db_connector (Mock): Conector de base de datos simulado.
+        """
+        # Configurar
+        metrics = Metrics()
+        validator = GraduationValidator(db_connector=mock_db_connector, metrics=metrics)
+        validator.min_average = 3.3
+        
+        # Ejecutar
+        all_requirements_met, requirements = validator.validate_student_record(
+            {"enrollment": True, "average": 3.3, "welfare": True, "payment": False}
+        )
+        
+        # Verificar
+        assert all_requirements_met is False
+        assert requirements["promedio_minimo"] is True
+        assert metrics.histograms["check_academic_average"].count == 1
+        assert validator.rule_engine.stats()["derechos_de_grado_pagados"]["failures"] == 1
+        mock_db_connector.get_student_average.assert_not_called()
+    
+    def test_validate_student_record_without_metrics_matches_rule_engine(self, mock_db_connector):
+        """
+        Prueba que el camino sin métricas da el mismo resultado que el motor de
+        reglas e incluye las reglas registradas después de usarlo.
+        
+        Args:
+            mock_db_connector (Mock): Conector de base de datos simulado.
+        """
+        # Configurar
+        fast = GraduationValidator(db_connector=mock_db_connector)
+        measured = GraduationValidator(db_connector=mock_db_connector, metrics=Metrics())
+        records = [
+            {"enrollment": True, "average": 4.0, "welfare": True, "payment": True},
+            {"enrollment": True, "average": 3.0, "welfare": True, "payment": False},
+            {}
+        ]
+        
+        # Ejecutar
+        results = [fast.validate_student_record(record, "20201") for record in records]
+        fast.rule_engine.register("sin_sanciones", lambda code, data=None: data.get("sanctions") is None)
+        extended = fast.validate_student_record(records[0], "20201")
+        
+        # Verificar
+        assert results == [measured.validate_student_record(record, "20201") for record in records]
+        assert extended[1]["sin_sanciones"] is True
+        assert fast.rule_engine.stats()["derechos_de_grado_pagados"]["evaluations"] == 0
+    
+    def test_validate_students_bulk_batches_queries(self, validator, mock_db_connector):
+        """
+        Prueba que validate_students_bulk consulta por lotes y conserva el orden de entrada.
+        
+        Args:
+            validator (GraduationValidator): Validador de requisitos de graduación.
+            mock_db_connector (Mock): Conector de base de datos simulado.
+        """
+        # Configurar mock
+        records = {
+            "1": {"nombre": "A", "enrollment": True, "average": 4.0, "welfare": True, "payment": True},
+            "2": {"nombre": "B", "enrollment": True, "average": 3.0, "welfare": True, "payment": True},
+        }
+        mock_db_connector.get_students_bulk.side_effect = (
+            lambda codes: {code: records[code] for code in codes if code in records}
+        )
+        
+        # Ejecutar
+        results = list(validator.validate_students_bulk(["2", "1", "3"], batch_size=2))
+        
+        # Verificar
+        assert [code for code, _, _, _ in results] == ["2", "1", "3"]
+        assert [status for _, _, status, _ in results] == [False, True, False]
+        assert results[2][1] == {}
+        assert mock_db_connector.get_students_bulk.call_count == 2
+        mock_db_connector.check_student_enrollment.assert_not_called()
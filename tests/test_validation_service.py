@@ -0,0 +1,187 @@
+"""
+Pruebas unitarias para el servicio local de validación.
+"""
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import urlopen
+
+import pytest
+from unittest.mock import Mock
+from src.db_connector import DBConnector
+from src.metrics import Metrics
+from src.resilience import DeadlineExceeded
+from src.validacion_grado import INDETERMINATE, GraduationValidator
+from src.validation_service import MicroBatcher, create_server, result_to_json
+
+class TestMicroBatcher:
+    """Clase para probar el agrupamiento de solicitudes."""
+    
+    def test_concurrent_requests_share_one_query(self):
+        """
+        Prueba que solicitudes simultáneas se resuelven con una sola consulta por lotes.
+        """
+        # Configurar
+        metrics = Metrics()
+        validator = GraduationValidator(db_connector=DBConnector(metrics=metrics))
+        batcher = MicroBatcher(validator, max_wait=0.2, max_batch=100)
+        
+        # Ejecutar
+        futures = [batcher.submit(code) for code in ["20210001", "20210004", "20210001", "99999999"]]
+        results = [future.result(timeout=5) for future in futures]
+        batcher.close()
+        
+        # Verificar
+        assert [status for _, _, status, _ in results] == [True, False, True, False]
+        assert results[3][1] == {}
+        assert metrics.counters["db_queries"] == 1
+        assert batcher.batches == 1
+    
+    def test_max_batch_splits_batches(self):
+        """
+        Prueba que no se agrupan más solicitudes que max_batch.
+        """
+        # Configurar
+        batcher = MicroBatcher(GraduationValidator(), max_wait=0.2, max_batch=2)
+        
+        # Ejecutar
+        futures = [batcher.submit("20210001") for _ in range(5)]
+        for future in futures:
+            future.result(timeout=5)
+        batcher.close()
+        
+        # Verificar
+        assert batcher.batches == 3
+    
+    def test_connector_errors_reach_every_request(self):
+        """
+        Prueba que un fallo de la consulta se propaga a todas las solicitudes del lote.
+        """
+        # Configurar
+        db_connector = DBConnector()
+        db_connector.get_students_bulk = lambda codes: 1 / 0
+        batcher = MicroBatcher(GraduationValidator(db_connector=db_connector))
+        
+        # Ejecutar y verificar
+        with pytest.raises(ZeroDivisionError):
+            batcher.validate("20210001", timeout=5)
+        batcher.close()
+    
+    def test_unavailable_batch_is_indeterminate(self):
+        """
+        Prueba que un lote sin respuesta se resuelve INDETERMINATE, como en el reporte.
+        """
+        # Configurar
+        metrics = Metrics()
+        db_connector = DBConnector()
+        db_connector.get_students_bulk = Mock(side_effect=DeadlineExceeded("lento"))
+        batcher = MicroBatcher(GraduationValidator(db_connector=db_connector, metrics=metrics))
+        
+        # Ejecutar
+        result = batcher.validate("20210005", timeout=5)
+        batcher.close()
+        
+        # Verificar
+        assert result[2] is INDETERMINATE
+        assert metrics.counters["indeterminate_requirements"] == 4
+        body = result_to_json(*result)
+        assert body["cumple"] == "INDETERMINADO"
+        assert body["encontrado"] is None
+        assert body["requisitos"]["derechos_de_grado_pagados"] is None
+
+class TestValidationServer:
+    """Clase para probar el servidor HTTP del servicio."""
+    
+    @pytest.fixture
+    def server(self):
+        """
+        Fixture que inicia el servicio en un puerto libre de localhost.
+        
+        Returns:
+            ValidationHTTPServer: Servidor en ejecución.
+        """
+        server = create_server(port=0, max_wait=0.01)
+        thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+    
+    def _get(self, server, path):
+        host, port = server.server_address[:2]
+        with urlopen(f"http://{host}:{port}{path}", timeout=5) as response:
+            return response.status, response.read().decode("utf-8")
+    
+    def test_text_report(self, server):
+        """
+        Prueba que el formato de texto coincide con generate_graduation_report.
+        
+        Args:
+            server (ValidationHTTPServer): Servidor en ejecución.
+        """
+        # Ejecutar
+        status, body = self._get(server, "/validate/20210004")
+        
+        # Verificar
+        assert status == 200
+        assert body == GraduationValidator().generate_graduation_report("20210004")
+    
+    def test_json_report_under_concurrency(self, server):
+        """
+        Prueba el formato JSON con muchas solicitudes concurrentes.
+        
+        Args:
+            server (ValidationHTTPServer): Servidor en ejecución.
+        """
+        # Ejecutar
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            responses = list(pool.map(
+                lambda _: self._get(server, "/validate/20210005?format=json"), range(64)
+            ))
+        
+        # Verificar
+        assert all(status == 200 for status, _ in responses)
+        result = json.loads(responses[0][1])
+        assert result["nombre"] == "Pedro Sánchez"
+        assert result["cumple"] is False
+        assert result["requisitos"]["derechos_de_grado_pagados"] is False
+        assert server.batcher.batches < 64
+    
+    def test_unix_socket(self, tmp_path):
+        """
+        Prueba el servicio sobre un socket Unix.
+        
+        Args:
+            tmp_path (Path): Directorio temporal de pytest.
+        """
+        # Configurar
+        path = str(tmp_path / "validacion.sock")
+        server = create_server(unix_socket=path)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        
+        # Ejecutar
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(path)
+            client.sendall(b"GET /validate/20210001?format=json HTTP/1.0\r\n\r\n")
+            response = b""
+            while chunk := client.recv(4096):
+                response += chunk
+        server.shutdown()
+        server.server_close()
+        
+        # Verificar
+        assert response.startswith(b"HTTP/1.1 200")
+        assert json.loads(response.split(b"\r\n\r\n", 1)[1])["cumple"] is True
+    
+    def test_unknown_path(self, server):
+        """
+        Prueba que una ruta desconocida devuelve 404.
+        
+        Args:
+            server (ValidationHTTPServer): Servidor en ejecución.
+        """
+        # Ejecutar y verificar
+        with pytest.raises(Exception) as error:
+            self._get(server, "/otra")
+        assert "404" in str(error.value)